@@ -0,0 +1,49 @@
+"""create lunar_refresh_checkpoints table
+
+Revision ID: b7e1c2d3f4a5
+Revises: 7c3d4e5f6g7h
+Create Date: 2026-10-18 10:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'b7e1c2d3f4a5'
+down_revision = '7c3d4e5f6g7h'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    """
+    Crée la table lunar_refresh_checkpoints (reprise du refresh batch après crash).
+    Migration idempotente : vérifie si la table existe déjà.
+    """
+    conn = op.get_bind()
+
+    from sqlalchemy import inspect
+    inspector = inspect(conn)
+    table_exists = 'lunar_refresh_checkpoints' in inspector.get_table_names()
+
+    if not table_exists:
+        op.create_table(
+            'lunar_refresh_checkpoints',
+            sa.Column('id', sa.Integer(), nullable=False),
+            sa.Column('run_key', sa.String(), nullable=False),
+            sa.Column('user_id', sa.Integer(), nullable=False),
+            sa.Column('status', sa.String(), nullable=False),
+            sa.Column('error', sa.String(), nullable=True),
+            sa.Column('duration_seconds', sa.Float(), nullable=True),
+            sa.Column('completed_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+            sa.PrimaryKeyConstraint('id'),
+            sa.UniqueConstraint('run_key', 'user_id', name='uq_lunar_refresh_checkpoints_run_user')
+        )
+
+        op.create_index('ix_lunar_refresh_checkpoints_run_key', 'lunar_refresh_checkpoints', ['run_key'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_lunar_refresh_checkpoints_run_key', table_name='lunar_refresh_checkpoints')
+    op.drop_table('lunar_refresh_checkpoints')
@@ -0,0 +1,54 @@
+"""create sky_snapshots table
+
+Revision ID: c8d2e4f6a1b3
+Revises: b7e1c2d3f4a5
+Create Date: 2026-10-18 14:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'c8d2e4f6a1b3'
+down_revision = 'b7e1c2d3f4a5'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    """
+    Crée la table sky_snapshots (instantanés du ciel horaires/quotidiens précalculés).
+    Migration idempotente : vérifie si la table existe déjà.
+    """
+    conn = op.get_bind()
+
+    from sqlalchemy import inspect
+    inspector = inspect(conn)
+    table_exists = 'sky_snapshots' in inspector.get_table_names()
+
+    if not table_exists:
+        op.create_table(
+            'sky_snapshots',
+            sa.Column('id', sa.Integer(), nullable=False),
+            sa.Column('granularity', sa.String(), nullable=False),
+            sa.Column('at', sa.DateTime(timezone=True), nullable=False),
+            sa.Column('moon_longitude', sa.Float(), nullable=False),
+            sa.Column('moon_speed', sa.Float(), nullable=False),
+            sa.Column('sun_longitude', sa.Float(), nullable=False),
+            sa.Column('sun_speed', sa.Float(), nullable=False),
+            sa.Column('moon_sign', sa.String(), nullable=False),
+            sa.Column('moon_phase', sa.String(), nullable=False),
+            sa.Column('mansion_id', sa.Integer(), nullable=False),
+            sa.Column('data', sa.JSON(), nullable=False),
+            sa.Column('computed_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+            sa.PrimaryKeyConstraint('id'),
+            sa.UniqueConstraint('granularity', 'at', name='uq_sky_snapshots_granularity_at')
+        )
+
+        op.create_index('ix_sky_snapshots_at', 'sky_snapshots', ['at'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_sky_snapshots_at', table_name='sky_snapshots')
+    op.drop_table('sky_snapshots')
@@ -0,0 +1,65 @@
+"""create llm_generation_jobs table
+
+Revision ID: d9e3f5a7b2c4
+Revises: c8d2e4f6a1b3
+Create Date: 2026-10-18 18:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision = 'd9e3f5a7b2c4'
+down_revision = 'c8d2e4f6a1b3'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    """
+    Crée la table llm_generation_jobs (file durable des générations LLM).
+    Migration idempotente : vérifie si la table existe déjà.
+    """
+    conn = op.get_bind()
+
+    from sqlalchemy import inspect
+    inspector = inspect(conn)
+    table_exists = 'llm_generation_jobs' in inspector.get_table_names()
+
+    if not table_exists:
+        op.create_table(
+            'llm_generation_jobs',
+            sa.Column('id', sa.Integer(), nullable=False),
+            sa.Column('kind', sa.String(length=20), nullable=False),
+            sa.Column('dedupe_key', sa.String(), nullable=False),
+            sa.Column('user_id', sa.Integer(), nullable=True),
+            sa.Column('payload', postgresql.JSONB(astext_type=sa.Text()), nullable=False),
+            sa.Column('priority', sa.Integer(), nullable=False, server_default='0'),
+            sa.Column('status', sa.String(length=20), nullable=False, server_default='pending'),
+            sa.Column('attempts', sa.Integer(), nullable=False, server_default='0'),
+            sa.Column('max_attempts', sa.Integer(), nullable=False, server_default='3'),
+            sa.Column('last_error', sa.Text(), nullable=True),
+            sa.Column('result_id', sa.String(), nullable=True),
+            sa.Column('run_after', sa.DateTime(timezone=True), nullable=False),
+            sa.Column('locked_by', sa.String(), nullable=True),
+            sa.Column('locked_at', sa.DateTime(timezone=True), nullable=True),
+            sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+            sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+            sa.Column('finished_at', sa.DateTime(timezone=True), nullable=True),
+            sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='CASCADE'),
+            sa.PrimaryKeyConstraint('id'),
+            sa.UniqueConstraint('dedupe_key', name='uq_llm_generation_jobs_dedupe_key')
+        )
+
+        op.create_index('ix_llm_generation_jobs_id', 'llm_generation_jobs', ['id'], unique=False)
+        op.create_index('ix_llm_generation_jobs_user_id', 'llm_generation_jobs', ['user_id'], unique=False)
+        op.create_index('ix_llm_generation_jobs_claim', 'llm_generation_jobs', ['status', 'priority', 'run_after'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_llm_generation_jobs_claim', table_name='llm_generation_jobs')
+    op.drop_index('ix_llm_generation_jobs_user_id', table_name='llm_generation_jobs')
+    op.drop_index('ix_llm_generation_jobs_id', table_name='llm_generation_jobs')
+    op.drop_table('llm_generation_jobs')
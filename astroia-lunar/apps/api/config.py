@@ -20,6 +20,7 @@ class Settings(BaseSettings):
     # Ephemeris API (legacy)
     EPHEMERIS_API_KEY: str = Field(default="")
     EPHEMERIS_API_URL: str = Field(default="https://api.astrology-api.io/v1")
+    LUNAR_RETURN_CHART_ENGINE: str = Field(default="local", description="Thème des révolutions lunaires: 'local' (Swiss Ephemeris, sans réseau) ou 'api' (Ephemeris API legacy)")
     
     # RapidAPI - Best Astrology API
     RAPIDAPI_KEY: str = Field(default="")
@@ -51,6 +52,8 @@ class Settings(BaseSettings):
     SECRET_KEY: str = Field(default="dev-secret-key-change-in-production")
     ALGORITHM: str = Field(default="HS256")
     ACCESS_TOKEN_EXPIRE_MINUTES: int = Field(default=10080)  # 7 jours
+    AUTH_PRINCIPAL_CACHE_TTL_SECONDS: float = Field(default=30.0, description="TTL (s) du cache du principal authentifié par process (0 = désactivé)")
+    AUTH_PRINCIPAL_CACHE_MAX_ENTRIES: int = Field(default=10000, description="Nombre max de principals en cache par process (LRU)")
     
     # Frontend
     FRONTEND_URL: str = Field(default="http://localhost:8081")
@@ -72,6 +75,47 @@ class Settings(BaseSettings):
     # Dev Purge
     ALLOW_DEV_PURGE: bool = Field(default=False, description="Mode DEV: autoriser purge des données (uniquement en development)")
     
+    # Pool de processus Swiss Ephemeris (services/ephemeris_executor.py)
+    EPHEMERIS_POOL_SIZE: int = Field(default=2, description="Workers du pool de calcul Swiss Ephemeris (0 = thread via asyncio.to_thread)")
+    EPHEMERIS_POOL_MAX_IN_FLIGHT: int = Field(default=0, description="Tâches soumises simultanément au pool, les suivantes attendent (0 = 2 × EPHEMERIS_POOL_SIZE)")
+
+    # Tables d'éphémérides précalculées (scripts/build_ephemeris_tables.py)
+    EPHEMERIS_TABLE_PATH: str = Field(default="data/ephemeris/moon_sun_1900_2100.npy", description="Table Lune/Soleil memory-mapped (relative à apps/api). Vide = calcul direct pyswisseph")
+
+    # Thème natal (services/natal_chart_engine.py)
+    NATAL_CHART_ENGINE: str = Field(default="local", description="Moteur du thème natal: 'local' (Swiss Ephemeris, sans appel réseau) ou 'rapidapi' (/api/v3/charts/natal)")
+
+    # Lecture natale (services/natal_reading_service.generate_natal_reading)
+    NATAL_READING_CHART_TIMEOUT: float = Field(default=30.0, description="Timeout (s) de l'appel thème natal de la lecture (bloquant)")
+    NATAL_READING_REPORT_TIMEOUT: float = Field(default=20.0, description="Timeout (s) de l'appel rapport d'interprétations (lecture servie sans interprétations au-delà)")
+
+    # Void of Course (calcul local Swiss Ephemeris)
+    VOC_PRECOMPUTE_DAYS: int = Field(default=90, description="Nombre de jours de fenêtres VoC précalculées en DB par le scheduler")
+    SKY_SNAPSHOT_DAYS: int = Field(default=90, description="Nombre de jours d'instantanés du ciel (horaires + quotidiens) précalculés en DB par le scheduler")
+    TODAY_MAX_AGE_SECONDS: int = Field(default=300, description="Cache-Control max-age maximal de GET /api/lunar/today (plafonné au prochain changement du ciel)")
+    MOON_INGRESS_INDEX_PATH: str = Field(default="data/ephemeris/moon_ingresses.json", description="Index des ingress de la Lune persisté par le scheduler (relatif à apps/api). Vide = mémoire uniquement")
+
+    # Cache partagé entre workers uvicorn (services/cache_backend.py)
+    CACHE_BACKEND: str = Field(default="memory", description="Backend du cache partagé: 'memory' (LRU par process), 'sqlite' (fichier partagé par les workers d'une machine) ou 'redis'")
+    CACHE_MEMORY_MAX_ENTRIES: int = Field(default=1024, description="Entrées max du backend 'memory' (LRU)")
+    CACHE_SQLITE_PATH: str = Field(default="data/cache/shared_cache.sqlite3", description="Fichier du backend 'sqlite' (relatif à apps/api)")
+    CACHE_REDIS_URL: str = Field(default="redis://localhost:6379/0", description="URL du backend 'redis' (package redis requis)")
+
+    # Client HTTP sortant partagé (services/http_client.py)
+    HTTP_MAX_CONNECTIONS: int = Field(default=20, description="Connexions max par fournisseur (pool httpx)")
+    HTTP_MAX_KEEPALIVE_CONNECTIONS: int = Field(default=10, description="Connexions keep-alive conservées par fournisseur")
+    HTTP_KEEPALIVE_EXPIRY_SECONDS: float = Field(default=60.0, description="Durée de vie d'une connexion keep-alive inactive")
+    RAPIDAPI_MAX_CONCURRENCY: int = Field(default=4, description="Requêtes RapidAPI simultanées max par process (0 = illimité)")
+    RAPIDAPI_RATE_PER_SECOND: float = Field(default=3.0, description="Débit RapidAPI max par process (plan PRO : 3 req/s, 0 = illimité)")
+    EPHEMERIS_API_MAX_CONCURRENCY: int = Field(default=4, description="Requêtes Ephemeris API simultanées max par process (0 = illimité)")
+    HTTP_CIRCUIT_FAILURE_THRESHOLD: int = Field(default=5, description="Échecs consécutifs (5xx, 429, timeout) avant ouverture du circuit d'un fournisseur (0 = désactivé)")
+    HTTP_CIRCUIT_RESET_SECONDS: float = Field(default=30.0, description="Durée d'ouverture du circuit avant un appel d'essai")
+
+    # Cache des réponses RapidAPI (services/rapidapi_cache.py)
+    RAPIDAPI_CACHE_ENABLED: bool = Field(default=True, description="Mettre en cache les réponses de rapidapi_client.post_json (clé = endpoint + hash du payload)")
+    RAPIDAPI_CACHE_PATH: str = Field(default="data/cache/rapidapi_cache.sqlite3", description="Fichier SQLite persistant des réponses RapidAPI (relatif à apps/api). Vide = backend du cache partagé")
+    RAPIDAPI_COST_PER_CALL_USD: float = Field(default=0.0022, description="Coût estimé d'un appel RapidAPI (plan PRO : 11 $ / 5000 requêtes) pour la métrique d'économies")
+
     # Dev VoC Populate
     ALLOW_DEV_VOC_POPULATE: bool = Field(default=False, description="Mode DEV: autoriser l'endpoint /voc/populate (uniquement en development)")
     
@@ -81,8 +125,24 @@ class Settings(BaseSettings):
 
     # Anthropic (Claude AI)
     ANTHROPIC_API_KEY: str = Field(default="", description="Clé API Anthropic pour génération interprétations")
+    ANTHROPIC_BASE_URL: str = Field(default="", description="URL de l'API Anthropic (vide = URL officielle ; serveur local pour les tests, proxy)")
+    LLM_MAX_CONCURRENCY: int = Field(default=8, description="Appels LLM simultanés max par process, tous modèles confondus (0 = illimité)")
+    LLM_REQUESTS_PER_MINUTE: float = Field(default=50.0, description="Débit max d'appels LLM par modèle et par process (0 = illimité)")
+    LLM_RATE_BURST: int = Field(default=5, description="Capacité du token bucket par modèle (appels en rafale)")
+    LLM_TIMEOUT_SECONDS: float = Field(default=30.0, description="Délai total par défaut d'un appel LLM, attente de créneau comprise (appel annulé au-delà)")
+    LLM_MAX_RETRIES: int = Field(default=2, description="Retries du SDK Anthropic sur 429, 5xx et erreurs réseau (backoff exponentiel)")
+
+    # File des générations LLM (table llm_generation_jobs)
+    LLM_JOB_QUEUE_ENABLED: bool = Field(default=False, description="Miss d'interprétation (natale/lunaire) : répondre avec le pré-généré/template et générer via LLM hors requête (file de jobs)")
+    LLM_JOB_WORKERS: int = Field(default=2, description="Workers de la file LLM lancés dans chaque process API (0 = worker dédié scripts/run_llm_job_worker.py)")
+    LLM_JOB_POLL_SECONDS: float = Field(default=1.0, description="Intervalle de scrutation de la file quand elle est vide")
+    LLM_JOB_MAX_ATTEMPTS: int = Field(default=3, description="Tentatives max d'un job avant statut 'failed'")
+    LLM_JOB_RETRY_BASE_SECONDS: float = Field(default=30.0, description="Délai avant la 2e tentative d'un job (doublé à chaque échec)")
+    LLM_JOB_LEASE_SECONDS: float = Field(default=300.0, description="Bail d'un job 'running' : au-delà, il est repris par un autre worker (crash)")
+    LLM_JOB_TIMEOUT_SECONDS: float = Field(default=180.0, description="Durée max d'exécution d'un job (toutes générations comprises)")
     NATAL_INTERPRETATION_VERSION: int = Field(default=2, description="Version du prompt d'interprétation (2=moderne avec micro-rituel, 3=senior expérimental déprécié, 4=senior professionnel structuré)")
     NATAL_LLM_MODE: str = Field(default="off", description="Mode LLM pour interprétations natales: 'off' (placeholder si pas en cache) ou 'anthropic' (appel API Claude)")
+    NATAL_INTERPRETATION_BATCH_CONCURRENCY: int = Field(default=4, description="Générations LLM simultanées max d'un appel POST /api/natal/interpretations/batch")
 
     # Aspect Explanations (v4)
     ASPECT_COPY_ENGINE: str = Field(default="template", description="Moteur de génération copy aspects: 'template' (déterministe) ou 'ai' (Haiku)")
@@ -93,6 +153,16 @@ class Settings(BaseSettings):
     LUNAR_INTERPRETATION_VERSION: int = Field(default=2, description="Version du prompt lunaire (1=templates 36 couches, 2=Opus 4.5 1728 combinaisons)")
     LUNAR_CLAUDE_MODEL: str = Field(default="opus", description="Modèle Claude pour génération lunaire: 'opus' (qualité max), 'sonnet' (équilibré), 'haiku' (rapide)")
 
+    # Cache de génération lunaire par caractéristiques du thème (services/lunar_generation_cache.py)
+    LUNAR_GENERATION_CACHE_ENABLED: bool = Field(default=True, description="Réutiliser le texte Claude d'un contexte identique (Lune, maison, ascendant lunaire, aspects majeurs) au lieu de régénérer")
+    LUNAR_GENERATION_CACHE_TTL_SECONDS: float = Field(default=90 * 24 * 3600, description="Conservation d'une génération partagée dans le backend de cache")
+    LUNAR_GENERATION_PERSONALIZATION: str = Field(default="none", description="Personnalisation du texte partagé: 'none' ou 'month' (en-tête avec le mois de la révolution)")
+
+    # Store des interprétations pré-générées (chargé en mémoire au démarrage)
+    INTERPRETATION_STORE_PRELOAD: bool = Field(default=True, description="Charge toutes les interprétations pré-générées (lunaires, natales, aspects) au démarrage de l'API")
+    INTERPRETATION_STORE_LANGS: str = Field(default="fr", description="Langues chargées au démarrage, séparées par des virgules (les autres sont lues clé par clé)")
+    INTERPRETATION_STORE_TTL_SECONDS: float = Field(default=900.0, description="Âge max du snapshot préchargé : au-delà, rechargé en tâche de fond à la lecture suivante (0 = jamais, redémarrage requis)")
+
     # === SCHEDULER ALERTS ===
     LUNAR_REFRESH_ALERT_THRESHOLD: float = Field(
         default=0.20,
@@ -110,6 +180,16 @@ class Settings(BaseSettings):
         description="Rafraîchir users dont la prochaine révolution lunaire est dans <= N jours (défaut: 14)"
     )
 
+    LUNAR_REFRESH_CONCURRENCY: int = Field(
+        default=4,
+        description="Nombre de users rafraîchis en parallèle (une session DB par worker)"
+    )
+
+    LUNAR_REFRESH_USER_TIMEOUT_SECONDS: float = Field(
+        default=120.0,
+        description="Timeout du rafraîchissement d'un user (secondes) : au-delà, compté en échec"
+    )
+
     @model_validator(mode='before')
     @classmethod
     def strip_string_values(cls, data: Any) -> Any:
@@ -70,6 +70,17 @@ def JSONBColumn(*args, **kwargs):
         return JSON(*args, **kwargs)
 
 
+def detached_session(db: AsyncSession) -> AsyncSession:
+    """
+    Nouvelle session sur le même engine que db
+
+    Pour un calcul partagé (single-flight) qui peut survivre à la requête
+    appelante : la session de get_db est fermée si le client se déconnecte.
+    Usage: async with detached_session(db) as session: ...
+    """
+    return AsyncSession(db.bind, expire_on_commit=False)
+
+
 async def get_db():
     """Dependency pour récupérer une session DB"""
     async with AsyncSessionLocal() as session:
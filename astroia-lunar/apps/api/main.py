@@ -11,8 +11,7 @@ import uuid
 
 from config import settings
 from database import engine, Base
-from routes import auth, natal, lunar_returns, lunar, transits, reports, natal_reading, natal_interpretation, natal_aspect_interpretation, journal, debug_natal
-from services import ephemeris_rapidapi
+from routes import auth, natal, lunar_returns, lunar, transits, reports, natal_reading, natal_interpretation, natal_aspect_interpretation, journal, debug_natal, llm_jobs
 from prometheus_client import make_asgi_app, Info
 
 # Import du generator pour enregistrer les métriques Prometheus
@@ -109,6 +108,16 @@ async def lifespan(app: FastAPI):
                 f"Le serveur continue mais le schéma n'a pas été validé."
             )
     
+    # Interprétations pré-générées en mémoire (lectures sans aller-retour DB)
+    if settings.INTERPRETATION_STORE_PRELOAD:
+        from services.interpretation_store import reload_interpretation_store
+        await reload_interpretation_store()
+
+    # Workers de la file des générations LLM (misses servis sans attendre Claude)
+    if settings.LLM_JOB_QUEUE_ENABLED:
+        from services import llm_job_queue
+        llm_job_queue.start_workers()
+
     # NOTE: Tables créées via Alembic migrations, pas create_all
     # En dev, utiliser : alembic upgrade head
     # if settings.APP_ENV == "development":
@@ -122,24 +131,32 @@ async def lifespan(app: FastAPI):
     logger.info("👋 Arrêt de l'API...")
     
     try:
-        await ephemeris_rapidapi.close_client()
+        # Fermeture des clients HTTP sortants partagés (RapidAPI, Ephemeris API, Google)
+        from services import http_client
+        await http_client.close_clients()
     except Exception as e:
-        logger.warning(f"Erreur fermeture ephemeris_rapidapi: {e}")
+        logger.warning(f"Erreur fermeture clients HTTP: {e}")
     
     try:
-        # Fermeture du client RapidAPI générique
-        from services import rapidapi_client
-        await rapidapi_client.close_client()
+        # Arrêt des workers LLM : les jobs en cours repassent en file
+        from services import llm_job_queue
+        await llm_job_queue.stop_workers()
     except Exception as e:
-        logger.warning(f"Erreur fermeture rapidapi_client: {e}")
+        logger.warning(f"Erreur arrêt workers LLM: {e}")
     
     try:
-        # Fermeture du client natal_reading_service
-        from services import natal_reading_service
-        await natal_reading_service.close_client()
+        # Fermeture du client Anthropic partagé (interprétations natales et lunaires)
+        from services import llm_gateway
+        await llm_gateway.close_client()
     except Exception as e:
-        logger.warning(f"Erreur fermeture natal_reading_service: {e}")
+        logger.warning(f"Erreur fermeture client LLM: {e}")
     
+    try:
+        from services.ephemeris_executor import shutdown_ephemeris_executor
+        shutdown_ephemeris_executor()
+    except Exception as e:
+        logger.warning(f"Erreur arrêt pool Swiss Ephemeris: {e}")
+
     try:
         await engine.dispose()
     except Exception as e:
@@ -195,6 +212,7 @@ app.include_router(lunar.router, tags=["Luna Pack"])
 app.include_router(transits.router, tags=["Transits"])
 app.include_router(reports.router, tags=["Reports"])
 app.include_router(journal.router, prefix="/api/journal", tags=["Journal"])
+app.include_router(llm_jobs.router, prefix="/api/llm-jobs", tags=["LLM Jobs"])
 app.include_router(debug_natal.router, tags=["Debug"])
 
 
@@ -3,28 +3,34 @@ from models.user import User
 from models.natal_chart import NatalChart
 from models.natal_reading import NatalReading
 from models.lunar_return import LunarReturn
+from models.lunar_refresh_checkpoint import LunarRefreshCheckpoint
 from models.lunar_pack import LunarReport, LunarVocWindow, LunarMansionDaily
+from models.sky_snapshot import SkySnapshot
 from models.transits import TransitsOverview, TransitsEvent
 from models.journal_entry import JournalEntry
 from models.pregenerated_natal_aspect import PregeneratedNatalAspect
 from models.pregenerated_lunar_interpretation import PregeneratedLunarInterpretation
 from models.lunar_interpretation import LunarInterpretation
 from models.lunar_interpretation_template import LunarInterpretationTemplate
+from models.llm_generation_job import LLMGenerationJob
 
 __all__ = [
     "User",
     "NatalChart",
     "NatalReading",
     "LunarReturn",
+    "LunarRefreshCheckpoint",
     "LunarReport",
     "LunarVocWindow",
     "LunarMansionDaily",
+    "SkySnapshot",
     "TransitsOverview",
     "TransitsEvent",
     "JournalEntry",
     "PregeneratedNatalAspect",
     "PregeneratedLunarInterpretation",
     "LunarInterpretation",
-    "LunarInterpretationTemplate"
+    "LunarInterpretationTemplate",
+    "LLMGenerationJob"
 ]
 
@@ -0,0 +1,45 @@
+"""Modèle LLMGenerationJob - File durable des générations d'interprétations par LLM"""
+
+from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey, Index
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.sql import func
+from database import Base
+
+
+class LLMGenerationJob(Base):
+    """
+    Une génération d'interprétation (natale ou lunaire) à faire hors requête HTTP.
+
+    dedupe_key identifie l'interprétation visée : une seule ligne par cible,
+    ré-enfilée (status 'pending') si elle est redemandée après 'done' ou 'failed'.
+    Les workers prennent les jobs 'pending' par priorité décroissante ; un job
+    'running' dont le bail (locked_at) a expiré est repris après un crash.
+    """
+    __tablename__ = "llm_generation_jobs"
+    __table_args__ = (
+        Index("ix_llm_generation_jobs_claim", "status", "priority", "run_after"),
+    )
+
+    id = Column(Integer, primary_key=True, index=True)
+    kind = Column(String(20), nullable=False)  # 'natal' | 'lunar'
+    dedupe_key = Column(String, nullable=False, unique=True)  # Ex: "lunar:42:full:fr:v2"
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=True, index=True)
+    payload = Column(JSONB, nullable=False)  # Arguments de génération (voir services/llm_job_queue)
+
+    priority = Column(Integer, nullable=False, default=0)  # Plus grand = traité d'abord
+    status = Column(String(20), nullable=False, default="pending")  # 'pending' | 'running' | 'done' | 'failed'
+    attempts = Column(Integer, nullable=False, default=0)
+    max_attempts = Column(Integer, nullable=False, default=3)
+    last_error = Column(Text, nullable=True)
+    result_id = Column(String, nullable=True)  # id de l'interprétation produite
+
+    run_after = Column(DateTime(timezone=True), nullable=False)  # Backoff entre deux tentatives
+    locked_by = Column(String, nullable=True)
+    locked_at = Column(DateTime(timezone=True), nullable=True)
+
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now(), nullable=False)
+    finished_at = Column(DateTime(timezone=True), nullable=True)
+
+    def __repr__(self):
+        return f"<LLMGenerationJob id={self.id} key={self.dedupe_key} status={self.status}>"
@@ -0,0 +1,31 @@
+"""Modèle LunarRefreshCheckpoint - Progression du refresh batch des révolutions lunaires"""
+
+from sqlalchemy import Column, Integer, String, Float, DateTime, UniqueConstraint
+from sqlalchemy.sql import func
+from database import Base
+
+
+class LunarRefreshCheckpoint(Base):
+    """
+    Une ligne par user traité dans un run de refresh.
+
+    Un run relancé (crash, redéploiement) avec le même run_key saute les users
+    déjà en succès ; les échecs sont retentés.
+    """
+    __tablename__ = "lunar_refresh_checkpoints"
+    __table_args__ = (
+        UniqueConstraint("run_key", "user_id", name="uq_lunar_refresh_checkpoints_run_user"),
+    )
+
+    id = Column(Integer, primary_key=True, index=True)
+    run_key = Column(String, nullable=False, index=True)  # Ex: "batch:2026-02-01:7-14"
+    user_id = Column(Integer, nullable=False)
+
+    status = Column(String, nullable=False)  # 'success' | 'failed' | 'timeout'
+    error = Column(String, nullable=True)
+    duration_seconds = Column(Float, nullable=True)
+
+    completed_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+
+    def __repr__(self):
+        return f"<LunarRefreshCheckpoint run={self.run_key} user_id={self.user_id} status={self.status}>"
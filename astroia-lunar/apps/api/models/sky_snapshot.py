@@ -0,0 +1,41 @@
+"""Modèle SkySnapshot - État du ciel précalculé (commun à tous les utilisateurs)"""
+
+from sqlalchemy import Column, Integer, String, Float, DateTime, JSON, UniqueConstraint
+from sqlalchemy.sql import func
+from database import Base
+
+
+class SkySnapshot(Base):
+    """
+    Instantané du ciel global, une ligne par heure et une par jour (UTC).
+
+    Écrit par le scheduler (services/sky_snapshot_service.refresh_sky_snapshots)
+    sur une fenêtre glissante de SKY_SNAPSHOT_DAYS jours ; les endpoints
+    /api/lunar/current, /daily-climate, /mansion/today et /sky le lisent par
+    (granularity, at) au lieu de recalculer.
+    """
+    __tablename__ = "sky_snapshots"
+    __table_args__ = (
+        UniqueConstraint("granularity", "at", name="uq_sky_snapshots_granularity_at"),
+    )
+
+    id = Column(Integer, primary_key=True, index=True)
+    granularity = Column(String, nullable=False)  # 'hour' | 'day'
+    at = Column(DateTime(timezone=True), nullable=False, index=True)  # Début de l'heure / du jour (UTC)
+
+    # Lune et Soleil à `at` (jour : à midi UTC) ; vitesses en degrés/jour pour interpoler
+    moon_longitude = Column(Float, nullable=False)
+    moon_speed = Column(Float, nullable=False)
+    sun_longitude = Column(Float, nullable=False)
+    sun_speed = Column(Float, nullable=False)
+    moon_sign = Column(String, nullable=False)
+    moon_phase = Column(String, nullable=False)
+    mansion_id = Column(Integer, nullable=False)
+
+    # hour : {"mansion", "is_voc"} ; day : {"mansion", "ingresses", "voc_windows", "phase_events"}
+    data = Column(JSON, nullable=False)
+
+    computed_at = Column(DateTime(timezone=True), server_default=func.now())
+
+    def __repr__(self):
+        return f"<SkySnapshot {self.granularity} at={self.at} moon={self.moon_sign} {self.moon_phase}>"
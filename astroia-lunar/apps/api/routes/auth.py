@@ -19,6 +19,8 @@ import httpx
 from database import get_db
 from models.user import User
 from config import settings
+from services import http_client
+from services.auth_principal import UserPrincipal, resolve_principal
 
 logger = logging.getLogger(__name__)
 
@@ -111,34 +113,36 @@ async def verify_google_token(id_token: str) -> dict:
     """
     try:
         # Utiliser l'endpoint tokeninfo de Google pour valider le token
-        async with httpx.AsyncClient() as client:
-            response = await client.get(
-                f"https://oauth2.googleapis.com/tokeninfo?id_token={id_token}"
-            )
+        response = await http_client.get(
+            "google",
+            "https://oauth2.googleapis.com/tokeninfo",
+            endpoint="/tokeninfo",
+            params={"id_token": id_token}
+        )
 
-            if response.status_code != 200:
-                logger.warning(f"Google token validation failed: {response.status_code}")
-                raise HTTPException(
-                    status_code=status.HTTP_401_UNAUTHORIZED,
-                    detail="Token Google invalide"
-                )
+        if response.status_code != 200:
+            logger.warning(f"Google token validation failed: {response.status_code}")
+            raise HTTPException(
+                status_code=status.HTTP_401_UNAUTHORIZED,
+                detail="Token Google invalide"
+            )
 
-            data = response.json()
+        data = response.json()
 
-            # Vérifier que l'email est vérifié
-            if not data.get("email_verified", "false") == "true":
-                raise HTTPException(
-                    status_code=status.HTTP_401_UNAUTHORIZED,
-                    detail="Email Google non vérifié"
-                )
+        # Vérifier que l'email est vérifié
+        if not data.get("email_verified", "false") == "true":
+            raise HTTPException(
+                status_code=status.HTTP_401_UNAUTHORIZED,
+                detail="Email Google non vérifié"
+            )
 
-            return {
-                "sub": data["sub"],
-                "email": data["email"],
-                "name": data.get("name"),
-                "picture": data.get("picture"),
-            }
-    except httpx.RequestError as e:
+        return {
+            "sub": data["sub"],
+            "email": data["email"],
+            "name": data.get("name"),
+            "picture": data.get("picture"),
+        }
+    except (httpx.RequestError, http_client.CircuitOpenError) as e:
         logger.error(f"Google token verification network error: {e}")
         raise HTTPException(
             status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
@@ -360,13 +364,123 @@ async def resolve_dev_user(
     )
 
 
+async def _resolve_dev_bypass_user(
+    x_dev_user_id: Optional[str],
+    x_dev_external_id: Optional[str],
+    db: AsyncSession
+):
+    """Résolution DEV_AUTH_BYPASS : User en DB, ou SimpleNamespace(id, email) lightweight"""
+    logger.info("🔧 DEV_AUTH_BYPASS enabled")
+
+    # Priorité 1: Si header X-Dev-External-Id présent (UUID, email), résoudre via DB
+    if x_dev_external_id:
+        logger.info(f"📥 DEV_AUTH_BYPASS: X-Dev-External-Id header={x_dev_external_id}")
+        user, method = await resolve_dev_user(x_dev_external_id, db)
+        logger.info(f"✅ DEV_AUTH_BYPASS resolved: user_id={user.id}, method={method}")
+        return user
+
+    # Priorité 2: Si header X-Dev-User-Id présent, essayer de résoudre via DB d'abord (pour UUID)
+    # Si c'est un int, créer un user lightweight avec email synthétique
+    if x_dev_user_id:
+        logger.info(f"📥 DEV_AUTH_BYPASS: X-Dev-User-Id header={x_dev_user_id}")
+
+        # Tenter de parser comme integer (cas le plus courant)
+        try:
+            user_id = int(x_dev_user_id)
+            logger.info(f"✅ DEV_AUTH_BYPASS: user lightweight créé avec id={user_id} (sans DB)")
+            # Retourner un objet lightweight avec id ET email pour éviter crash ailleurs
+            return SimpleNamespace(id=user_id, email=f"dev+{user_id}@local.dev")
+        except (ValueError, TypeError):
+            # Header présent mais non-int → essayer de résoudre via DB (peut être UUID/email)
+            logger.info(f"📥 DEV_AUTH_BYPASS: X-Dev-User-Id n'est pas un int, résolution via DB: {x_dev_user_id}")
+            try:
+                user, method = await resolve_dev_user(x_dev_user_id, db)
+                logger.info(f"✅ DEV_AUTH_BYPASS resolved: user_id={user.id}, method={method}")
+                return user
+            except HTTPException:
+                # Si résolution échoue, erreur explicite
+                logger.warning(f"❌ DEV_AUTH_BYPASS: X-Dev-User-Id invalide ou introuvable: {x_dev_user_id}")
+                raise HTTPException(
+                    status_code=status.HTTP_401_UNAUTHORIZED,
+                    detail=f"DEV_AUTH_BYPASS: X-Dev-User-Id invalide ou introuvable: {x_dev_user_id}",
+                    headers={"WWW-Authenticate": "Bearer"},
+                )
+    
+    # Priorité 3: Si pas de header mais DEV_USER_ID en env, utiliser celui-ci
+    if settings.DEV_USER_ID:
+        user_identifier = settings.DEV_USER_ID
+        logger.info(f"📥 DEV_AUTH_BYPASS: DEV_USER_ID env={user_identifier}")
+        
+        # Tenter de parser comme integer
+        try:
+            user_id = int(user_identifier)
+            logger.info(f"✅ DEV_AUTH_BYPASS: user lightweight créé avec id={user_id} depuis env (sans DB)")
+            # Retourner un objet lightweight avec id ET email pour éviter crash ailleurs
+            return SimpleNamespace(id=user_id, email=f"dev+{user_id}@local.dev")
+        except (ValueError, TypeError):
+            # DEV_USER_ID non-int → fallback vers resolve_dev_user (pour UUID/email)
+            logger.info(f"📥 DEV_AUTH_BYPASS: DEV_USER_ID n'est pas un int, résolution via DB: {user_identifier}")
+            user, method = await resolve_dev_user(user_identifier, db)
+            logger.info(f"✅ DEV_AUTH_BYPASS resolved: user_id={user.id}, method={method}")
+            return user
+    
+    # Fallback: chercher ou créer user avec email dev@local.dev
+    logger.info("📥 DEV_AUTH_BYPASS: pas de header/env, fallback vers dev@local.dev")
+    result = await db.execute(
+        select(User)
+        .where(User.email == "dev@local.dev")
+        .options(joinedload(User.natal_chart))
+    )
+    dev_user = result.scalar_one_or_none()
+
+    if dev_user:
+        logger.info(f"✅ DEV_AUTH_BYPASS resolved: user_id={dev_user.id}, method=dev_default")
+        return dev_user
+
+    # Créer le user dev@local.dev
+    logger.info("🆕 DEV_AUTH_BYPASS: création user dev@local.dev")
+    try:
+        # Utiliser un hash pré-calculé pour éviter les problèmes avec bcrypt
+        # Hash de "dev-password" pré-calculé avec bcrypt (généré avec bcrypt.gensalt())
+        dev_password_hash = "$2b$12$A2rj/gsY/fAzI5GY9TCQFOByzS/J8TIL3ElOyFSAAxHzVdg.OluOq"
+        dev_user = User(
+            email="dev@local.dev",
+            hashed_password=dev_password_hash,
+            is_active=True,
+            is_premium=False
+        )
+        db.add(dev_user)
+        await db.commit()
+        await db.refresh(dev_user)
+        logger.info(f"✅ DEV_AUTH_BYPASS created: user_id={dev_user.id}, method=dev_default")
+        return dev_user
+    except IntegrityError:
+        # L'utilisateur a peut-être été créé entre temps
+        await db.rollback()
+        result = await db.execute(
+            select(User)
+            .where(User.email == "dev@local.dev")
+            .options(joinedload(User.natal_chart))
+        )
+        dev_user = result.scalar_one_or_none()
+        if dev_user:
+            logger.info(f"✅ DEV_AUTH_BYPASS: user dev@local.dev trouvé après rollback - id={dev_user.id}")
+            return dev_user
+        raise
+
+
 async def get_current_user(
     x_dev_user_id: Optional[str] = Header(default=None, alias="X-Dev-User-Id"),
     x_dev_external_id: Optional[str] = Header(default=None, alias="X-Dev-External-Id"),
     token: Optional[str] = Depends(oauth2_scheme),
     db: AsyncSession = Depends(get_db)
-) -> User:
-    """Dependency pour récupérer le user connecté"""
+) -> UserPrincipal:
+    """
+    Dependency pour récupérer le user connecté (UserPrincipal en cache court)
+
+    Ne charge ni l'objet User ni le thème natal : les routes qui en ont besoin
+    dépendent de get_current_user_model / get_current_user_with_natal_chart.
+    """
     from jose.exceptions import ExpiredSignatureError
 
     credentials_exception = HTTPException(
@@ -377,103 +491,10 @@ async def get_current_user(
 
     # ===== MODE DEV: bypass avec header X-Dev-User-Id OU X-Dev-External-Id (uniquement en development) =====
     if settings.APP_ENV == "development" and settings.DEV_AUTH_BYPASS:
-        logger.info("🔧 DEV_AUTH_BYPASS enabled")
-
-        # Priorité 1: Si header X-Dev-External-Id présent (UUID, email), résoudre via DB
-        if x_dev_external_id:
-            logger.info(f"📥 DEV_AUTH_BYPASS: X-Dev-External-Id header={x_dev_external_id}")
-            user, method = await resolve_dev_user(x_dev_external_id, db)
-            logger.info(f"✅ DEV_AUTH_BYPASS resolved: user_id={user.id}, method={method}")
-            return user
-
-        # Priorité 2: Si header X-Dev-User-Id présent, essayer de résoudre via DB d'abord (pour UUID)
-        # Si c'est un int, créer un user lightweight avec email synthétique
-        if x_dev_user_id:
-            logger.info(f"📥 DEV_AUTH_BYPASS: X-Dev-User-Id header={x_dev_user_id}")
-
-            # Tenter de parser comme integer (cas le plus courant)
-            try:
-                user_id = int(x_dev_user_id)
-                logger.info(f"✅ DEV_AUTH_BYPASS: user lightweight créé avec id={user_id} (sans DB)")
-                # Retourner un objet lightweight avec id ET email pour éviter crash ailleurs
-                return SimpleNamespace(id=user_id, email=f"dev+{user_id}@local.dev")
-            except (ValueError, TypeError):
-                # Header présent mais non-int → essayer de résoudre via DB (peut être UUID/email)
-                logger.info(f"📥 DEV_AUTH_BYPASS: X-Dev-User-Id n'est pas un int, résolution via DB: {x_dev_user_id}")
-                try:
-                    user, method = await resolve_dev_user(x_dev_user_id, db)
-                    logger.info(f"✅ DEV_AUTH_BYPASS resolved: user_id={user.id}, method={method}")
-                    return user
-                except HTTPException:
-                    # Si résolution échoue, erreur explicite
-                    logger.warning(f"❌ DEV_AUTH_BYPASS: X-Dev-User-Id invalide ou introuvable: {x_dev_user_id}")
-                    raise HTTPException(
-                        status_code=status.HTTP_401_UNAUTHORIZED,
-                        detail=f"DEV_AUTH_BYPASS: X-Dev-User-Id invalide ou introuvable: {x_dev_user_id}",
-                        headers={"WWW-Authenticate": "Bearer"},
-                    )
-        
-        # Priorité 3: Si pas de header mais DEV_USER_ID en env, utiliser celui-ci
-        if settings.DEV_USER_ID:
-            user_identifier = settings.DEV_USER_ID
-            logger.info(f"📥 DEV_AUTH_BYPASS: DEV_USER_ID env={user_identifier}")
-            
-            # Tenter de parser comme integer
-            try:
-                user_id = int(user_identifier)
-                logger.info(f"✅ DEV_AUTH_BYPASS: user lightweight créé avec id={user_id} depuis env (sans DB)")
-                # Retourner un objet lightweight avec id ET email pour éviter crash ailleurs
-                return SimpleNamespace(id=user_id, email=f"dev+{user_id}@local.dev")
-            except (ValueError, TypeError):
-                # DEV_USER_ID non-int → fallback vers resolve_dev_user (pour UUID/email)
-                logger.info(f"📥 DEV_AUTH_BYPASS: DEV_USER_ID n'est pas un int, résolution via DB: {user_identifier}")
-                user, method = await resolve_dev_user(user_identifier, db)
-                logger.info(f"✅ DEV_AUTH_BYPASS resolved: user_id={user.id}, method={method}")
-                return user
-        
-        # Fallback: chercher ou créer user avec email dev@local.dev
-        logger.info("📥 DEV_AUTH_BYPASS: pas de header/env, fallback vers dev@local.dev")
-        result = await db.execute(
-            select(User)
-            .where(User.email == "dev@local.dev")
-            .options(joinedload(User.natal_chart))
-        )
-        dev_user = result.scalar_one_or_none()
-
-        if dev_user:
-            logger.info(f"✅ DEV_AUTH_BYPASS resolved: user_id={dev_user.id}, method=dev_default")
-            return dev_user
-
-        # Créer le user dev@local.dev
-        logger.info("🆕 DEV_AUTH_BYPASS: création user dev@local.dev")
-        try:
-            # Utiliser un hash pré-calculé pour éviter les problèmes avec bcrypt
-            # Hash de "dev-password" pré-calculé avec bcrypt (généré avec bcrypt.gensalt())
-            dev_password_hash = "$2b$12$A2rj/gsY/fAzI5GY9TCQFOByzS/J8TIL3ElOyFSAAxHzVdg.OluOq"
-            dev_user = User(
-                email="dev@local.dev",
-                hashed_password=dev_password_hash,
-                is_active=True,
-                is_premium=False
-            )
-            db.add(dev_user)
-            await db.commit()
-            await db.refresh(dev_user)
-            logger.info(f"✅ DEV_AUTH_BYPASS created: user_id={dev_user.id}, method=dev_default")
-            return dev_user
-        except IntegrityError:
-            # L'utilisateur a peut-être été créé entre temps
-            await db.rollback()
-            result = await db.execute(
-                select(User)
-                .where(User.email == "dev@local.dev")
-                .options(joinedload(User.natal_chart))
-            )
-            dev_user = result.scalar_one_or_none()
-            if dev_user:
-                logger.info(f"✅ DEV_AUTH_BYPASS: user dev@local.dev trouvé après rollback - id={dev_user.id}")
-                return dev_user
-            raise
+        user = await _resolve_dev_bypass_user(x_dev_user_id, x_dev_external_id, db)
+        if isinstance(user, User):
+            return await resolve_principal(db, user.id) or user
+        return user  # User lightweight (SimpleNamespace) sans ligne en DB
 
     # ===== MODE NORMAL: JWT =====
     if not token:
@@ -499,23 +520,53 @@ async def get_current_user(
         logger.warning(f"❌ JWT decode: erreur de signature/format: {e}")
         raise credentials_exception
 
-    # Eager loading pour optimiser les queries (évite N+1 queries dans les routes)
-    # - natal_chart: chargé systématiquement (one-to-one, toujours petit, utilisé partout)
-    # - lunar_reports, transits_overview: lazy load (one-to-many, chargés seulement si nécessaire)
-    result = await db.execute(
-        select(User)
-        .where(User.id == user_id)
-        .options(joinedload(User.natal_chart))
-    )
-    user = result.scalar_one_or_none()
+    # Principal léger (services/auth_principal) : pas de User ORM ni de positions JSONB
+    principal = await resolve_principal(db, user_id)
 
-    if user is None:
+    if principal is None:
         logger.warning(f"❌ User non trouvé en DB: user_id={user_id}")
         raise credentials_exception
 
+    return principal
+
+
+async def _load_current_user_model(current_user, db: AsyncSession, with_natal_chart: bool) -> User:
+    if not isinstance(current_user, UserPrincipal):
+        # User lightweight DEV (SimpleNamespace) ou override de tests : utilisé tel quel
+        return current_user
+
+    query = select(User).where(User.id == current_user.id)
+    if with_natal_chart:
+        query = query.options(joinedload(User.natal_chart))
+    result = await db.execute(query)
+    user = result.scalar_one_or_none()
+
+    if user is None:
+        logger.warning(f"❌ User non trouvé en DB: user_id={current_user.id}")
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Impossible de valider les identifiants",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
     return user
 
 
+async def get_current_user_model(
+    current_user: UserPrincipal = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db)
+) -> User:
+    """Dependency : objet User du user connecté (profil, écritures), thème natal non chargé"""
+    return await _load_current_user_model(current_user, db, with_natal_chart=False)
+
+
+async def get_current_user_with_natal_chart(
+    current_user: UserPrincipal = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db)
+) -> User:
+    """Dependency : objet User + thème natal complet (positions JSONB) en une jointure"""
+    return await _load_current_user_model(current_user, db, with_natal_chart=True)
+
+
 # === ROUTES ===
 @router.post("/register", response_model=Token, status_code=status.HTTP_201_CREATED)
 async def register(user_data: UserRegister, db: AsyncSession = Depends(get_db)):
@@ -671,7 +722,7 @@ async def oauth_login(
 
 
 @router.get("/me", response_model=UserResponse)
-async def get_me(current_user: User = Depends(get_current_user)):
+async def get_me(current_user: User = Depends(get_current_user_model)):
     """Récupère le profil de l'utilisateur connecté"""
     return current_user
 
@@ -0,0 +1,33 @@
+"""Routes de suivi des générations LLM en file (services/llm_job_queue)"""
+
+from fastapi import APIRouter, Depends, HTTPException, status
+from sqlalchemy.ext.asyncio import AsyncSession
+import logging
+
+from database import get_db
+from models.user import User
+from schemas.llm_job import LLMJobStatusResponse
+from services.llm_job_queue import get_job
+from routes.auth import get_current_user
+
+logger = logging.getLogger(__name__)
+router = APIRouter()
+
+
+@router.get("/{job_id}", response_model=LLMJobStatusResponse)
+async def get_llm_job_status(
+    job_id: int,
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    État d'une génération en file (polling après une réponse contenant "job").
+
+    - status 'done' : relire l'interprétation (servie depuis la DB)
+    - status 'failed' : last_error renseigné ; une nouvelle lecture ré-enfile la génération
+    """
+    job = await get_job(db, job_id)
+    # 404 aussi pour le job d'un autre utilisateur (pas de fuite d'existence)
+    if job is None or job.user_id != current_user.id:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Job introuvable")
+    return job
@@ -4,18 +4,19 @@ Endpoints pour Lunar Return Report, Void of Course, et Lunar Mansions
 """
 
 from datetime import timedelta
-from fastapi import APIRouter, HTTPException, Depends
-from sqlalchemy.ext.asyncio import AsyncSession
+from fastapi import APIRouter, HTTPException, Depends, Query, Request
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
 from sqlalchemy import select, and_, func
-from typing import Dict, Any
+from typing import Dict, Any, Optional
 from datetime import datetime, date, timezone
+import asyncio
 import logging
 import time
 
 from database import get_db
 from services import lunar_services
-from services.moon_position import get_current_moon_position
-from services.daily_climate import get_daily_climate
+from services.daily_climate import get_daily_climate_async
+from services import sky_snapshot_service
 from services import voc_cache_service
 from services import transits_services
 from schemas.lunar import (
@@ -28,6 +29,8 @@ from models.lunar_pack import LunarReport, LunarVocWindow, LunarMansionDaily
 from models.transits import TransitsOverview
 from models.user import User
 from routes.auth import get_current_user
+from config import settings
+from utils.http_cache import cached_json_response
 
 logger = logging.getLogger(__name__)
 
@@ -93,12 +96,14 @@ def _deduplicate_mansion_response(result: Dict[str, Any]) -> Dict[str, Any]:
 
 
 @router.get("/current")
-async def get_current_moon():
+async def get_current_moon(db: AsyncSession = Depends(get_db)):
     """
-    Calcule la position actuelle de la Lune avec Swiss Ephemeris.
+    Position actuelle de la Lune (instantané du ciel de l'heure courante).
 
-    Retourne la longitude écliptique, le signe zodiacal et la phase lunaire.
-    Les résultats sont mis en cache pendant 5 minutes côté serveur.
+    Retourne la longitude écliptique, le signe zodiacal et la phase lunaire,
+    extrapolés depuis la table sky_snapshots (précalculée par le scheduler).
+    Repli sur le calcul Swiss Ephemeris (cache 5 minutes) si l'heure n'est
+    pas précalculée.
 
     **Returns:**
     ```json
@@ -124,7 +129,7 @@ async def get_current_moon():
     Sagittarius, Capricorn, Aquarius, Pisces
     """
     try:
-        result = get_current_moon_position()
+        result = await sky_snapshot_service.get_current_moon_position(db)
         logger.info(f"[GET /api/lunar/current] ✅ Moon: {result['degree']}° {result['sign']}, Phase: {result['phase']}")
         return result
     except Exception as e:
@@ -136,7 +141,7 @@ async def get_current_moon():
 
 
 @router.get("/daily-climate")
-async def get_daily_lunar_climate():
+async def get_daily_lunar_climate(db: AsyncSession = Depends(get_db)):
     """
     Récupère le Daily Lunar Climate avec insight stable sur 24h.
 
@@ -166,7 +171,7 @@ async def get_daily_lunar_climate():
     **Cache:** 24h (invalidation automatique au changement de date)
     """
     try:
-        result = get_daily_climate()
+        result = await get_daily_climate_async(db)
         logger.info(f"[GET /api/lunar/daily-climate] ✅ Climate (date: {result['date']}, insight: {result['insight']['title']})")
         return result
     except Exception as e:
@@ -177,6 +182,95 @@ async def get_daily_lunar_climate():
         )
 
 
+@router.get("/today")
+async def get_today_dashboard(
+    request: Request,
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Écran d'accueil mobile en un seul appel.
+
+    Agrège en parallèle /current, /daily-climate, /voc/status, /mansion/today
+    et /api/lunar-returns/current (une session DB par partie).
+
+    **Cache HTTP:**
+    - ETag faible = hash du contenu hors degré de la Lune (extrapolé à
+      l'instant, il change toutes les ~70 s) ; If-None-Match identique → 304
+      sans corps tant que signe, phase, VoC, mansion, climat, cycle et
+      prochain changement du ciel sont inchangés
+    - Cache-Control/Expires alignés sur le prochain changement réel du ciel
+      (ingress, phase, début/fin de VoC), plafonnés à TODAY_MAX_AGE_SECONDS
+    - Partie en échec : valeur null, listée dans "degraded", pas de cache
+    """
+    from routes.lunar_returns import get_current_lunar_return
+
+    session_factory = async_sessionmaker(db.bind, class_=AsyncSession, expire_on_commit=False)
+
+    async def with_session(load):
+        async with session_factory() as session:
+            return await load(session)
+
+    now = datetime.now(timezone.utc)
+    parts = {
+        "moon": with_session(sky_snapshot_service.get_current_moon_position),
+        "daily_climate": with_session(get_daily_climate_async),
+        "voc": with_session(voc_cache_service.get_voc_status_cached),
+        "mansion": with_session(_load_today_mansion),
+        "lunar_return": get_current_lunar_return(current_user=current_user, db=db),
+        "next_change_at": with_session(lambda session: sky_snapshot_service.get_next_sky_change(session, now)),
+    }
+    results = dict(zip(parts, await asyncio.gather(*parts.values(), return_exceptions=True)))
+
+    degraded = []
+    for name, value in results.items():
+        if isinstance(value, BaseException):
+            logger.warning(f"[GET /api/lunar/today] ⚠️ Partie '{name}' indisponible: {value}")
+            results[name] = None
+            degraded.append(name)
+
+    payload = {**results, "degraded": degraded}
+    max_age = 0 if degraded else _seconds_until_next_change(payload, now)
+    return cached_json_response(request, payload, max_age, etag_content=_today_etag_content(payload))
+
+
+def _today_etag_content(payload: Dict[str, Any]) -> Dict[str, Any]:
+    """Tableau de bord sans le degré courant de la Lune (seules les vraies transitions changent l'ETag)"""
+    moon = payload.get("moon")
+    if not isinstance(moon, dict):
+        return payload
+    return {**payload, "moon": {key: value for key, value in moon.items() if key != "degree"}}
+
+
+def _seconds_until_next_change(payload: Dict[str, Any], now: datetime) -> int:
+    """
+    Secondes jusqu'au prochain changement du tableau de bord
+
+    Prochain événement du ciel, bornes VoC, fin du cycle lunaire et minuit
+    (climat du jour), plafonné à TODAY_MAX_AGE_SECONDS (la position de la
+    Lune avance en continu).
+    """
+    tomorrow = datetime.combine(date.today() + timedelta(days=1), datetime.min.time()).astimezone()
+    candidates = [payload["next_change_at"], tomorrow]
+
+    voc = payload["voc"] or {}
+    candidates += [(voc.get("now") or {}).get("end_at"), (voc.get("next") or {}).get("start_at")]
+    candidates.append((payload["lunar_return"] or {}).get("end_date"))
+
+    max_age = settings.TODAY_MAX_AGE_SECONDS
+    for candidate in candidates:
+        if isinstance(candidate, str):
+            candidate = datetime.fromisoformat(candidate)
+        if not isinstance(candidate, datetime):
+            continue
+        if candidate.tzinfo is None:
+            candidate = candidate.replace(tzinfo=timezone.utc)
+        seconds = int((candidate - now).total_seconds())
+        if seconds > 0:
+            max_age = min(max_age, seconds)
+    return max_age
+
+
 @router.post("/return/report", response_model=LunarResponse, status_code=200)
 async def lunar_return_report(
     request: LunarReturnReportRequest,
@@ -708,16 +802,27 @@ async def regenerate_lunar_interpretation(
         }
     )
 
+    metadata = {
+        'source': source,
+        'model_used': model,
+        'subject': subject,
+        'regenerated_at': datetime.utcnow().isoformat(),
+        'forced': True
+    }
+
+    # File de jobs : le texte renvoyé est le template, la régénération suit (polling)
+    if settings.LLM_JOB_QUEUE_ENABLED:
+        from services.llm_job_queue import get_job_by_key, lunar_job_key
+        from services.lunar_interpretation_generator import PROMPT_VERSION
+
+        job = await get_job_by_key(db, lunar_job_key(lunar_return_id, subject, 'fr', PROMPT_VERSION))
+        if job is not None:
+            metadata['job'] = {'id': job.id, 'status': job.status}
+
     return {
         'interpretation': output,
         'weekly_advice': weekly,
-        'metadata': {
-            'source': source,
-            'model_used': model,
-            'subject': subject,
-            'regenerated_at': datetime.utcnow().isoformat(),
-            'forced': True
-        }
+        'metadata': metadata
     }
 
 
@@ -772,31 +877,72 @@ async def get_current_voc_status(db: AsyncSession = Depends(get_db)):
 async def get_today_mansion(db: AsyncSession = Depends(get_db)):
     """
     Récupère la mansion lunaire du jour depuis le cache.
+
+    Données du provider (POST /api/lunar/mansion) si présentes, sinon la
+    mansion de l'instantané du ciel du jour (calcul local, midi UTC).
     """
     try:
-        today = date.today()
-        
-        stmt = select(LunarMansionDaily).where(LunarMansionDaily.date == today)
-        result = await db.execute(stmt)
-        mansion = result.scalar_one_or_none()
-        
-        if mansion:
-            return {
-                "date": mansion.date.isoformat(),
-                "mansion_id": mansion.mansion_id,
-                "data": mansion.data,
-                "cached": True
-            }
-        else:
-            return {
-                "message": "Aucune mansion en cache pour aujourd'hui. Utilisez POST /api/lunar/mansion."
-            }
+        return await _load_today_mansion(db)
             
     except Exception as e:
         logger.error(f"❌ Erreur récupération mansion du jour: {str(e)}")
         raise HTTPException(status_code=500, detail=str(e))
 
 
+async def _load_today_mansion(db: AsyncSession) -> Dict[str, Any]:
+    """Mansion du jour : données du provider, sinon instantané du ciel du jour"""
+    # Jour UTC : les instantanés du ciel sont indexés par jour UTC
+    today = datetime.now(timezone.utc).date()
+
+    stmt = select(LunarMansionDaily).where(LunarMansionDaily.date == today)
+    result = await db.execute(stmt)
+    mansion = result.scalar_one_or_none()
+
+    if mansion:
+        return {
+            "date": mansion.date.isoformat(),
+            "mansion_id": mansion.mansion_id,
+            "data": mansion.data,
+            "cached": True
+        }
+
+    sky = await sky_snapshot_service.get_day_sky(db, today)
+    if sky:
+        return {
+            "date": sky["date"],
+            "mansion_id": sky["mansion"]["number"],
+            "data": {"mansion": sky["mansion"], "moon": sky["moon"], "provider": "swiss_ephemeris"},
+            "cached": True
+        }
+    return {
+        "message": "Aucune mansion en cache pour aujourd'hui. Utilisez POST /api/lunar/mansion."
+    }
+
+
+@router.get("/sky", response_model=Dict[str, Any])
+async def get_day_sky(
+    day: Optional[date] = Query(None, alias="date", description="Jour UTC (YYYY-MM-DD), défaut: aujourd'hui"),
+    hours: bool = Query(False, description="Inclure les 24 instantanés horaires"),
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Ciel du jour précalculé (commun à tous les utilisateurs).
+
+    Lune à midi UTC, mansion, ingress, fenêtres VoC et événements de phase
+    du jour, lus dans la table sky_snapshots (SKY_SNAPSHOT_DAYS jours).
+    """
+    day = day or datetime.now(timezone.utc).date()
+    try:
+        sky = await sky_snapshot_service.get_day_sky(db, day, include_hours=hours)
+    except Exception as e:
+        logger.error(f"❌ Erreur lecture instantané du ciel: {str(e)}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+    if sky is None:
+        raise HTTPException(status_code=404, detail=f"Aucun instantané du ciel pour {day.isoformat()}")
+    return sky
+
+
 @router.get("/voc/next_window", response_model=Dict[str, Any])
 async def get_next_voc_window():
     """
@@ -821,6 +967,21 @@ async def get_next_voc_window():
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@router.get("/interpretation/generation_cache_stats", response_model=Dict[str, Any])
+async def get_lunar_generation_cache_stats():
+    """
+    Statistiques du cache de génération lunaire (monitoring) : hits / misses
+    par sujet, générations Claude évitées et tokens économisés (process courant)
+    """
+    try:
+        from services import lunar_generation_cache
+        return lunar_generation_cache.get_cache_stats()
+
+    except Exception as e:
+        logger.error(f"❌ Erreur récupération stats cache de génération: {str(e)}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+
 @router.get("/voc/cache_stats", response_model=Dict[str, Any])
 async def get_voc_cache_stats():
     """
@@ -832,7 +993,7 @@ async def get_voc_cache_stats():
     - Debugging en cas de problème
     """
     try:
-        return voc_cache_service.get_cache_stats()
+        return await voc_cache_service.get_cache_stats()
 
     except Exception as e:
         logger.error(f"❌ Erreur récupération cache stats: {str(e)}")
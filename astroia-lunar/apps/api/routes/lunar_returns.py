@@ -7,9 +7,8 @@ from uuid import uuid4
 from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select, delete, text, func
-from sqlalchemy.exc import IntegrityError
 from pydantic import BaseModel
-from typing import List, Dict, Any, Optional
+from typing import List, Optional
 from datetime import datetime, timedelta, date, timezone
 
 from database import get_db
@@ -17,11 +16,9 @@ from models.user import User
 from models.natal_chart import NatalChart
 from models.lunar_return import LunarReturn
 from routes.auth import get_current_user
-from services.ephemeris import ephemeris_client, EphemerisAPIKeyError
-from services.interpretations import generate_lunar_return_interpretation
 from utils.natal_chart_helpers import extract_moon_data_from_positions
-from services.swiss_ephemeris import find_lunar_return, get_moon_position, SWISS_EPHEMERIS_AVAILABLE
-from services.lunar_returns_service import generate_lunar_returns_for_user
+from services.swiss_ephemeris import get_moon_position
+from services.lunar_returns_service import generate_lunar_returns_for_user, _generate_rolling_returns
 from config import settings
 import os
 
@@ -164,89 +161,6 @@ class LunarReturnResponse(BaseModel):
 
 
 # === UTILITIES ===
-def _parse_return_date(raw_data: Dict[str, Any], month: str, correlation_id: str) -> datetime:
-    """
-    Parse return_date depuis raw_data avec fallback garanti non-null.
-    
-    Args:
-        raw_data: Données brutes d'Ephemeris
-        month: Mois au format YYYY-MM
-        correlation_id: ID de corrélation pour les logs
-    
-    Returns:
-        datetime UTC timezone-aware (jamais None)
-    """
-    return_date = None
-    
-    # Parser depuis return_datetime si disponible
-    if "return_datetime" in raw_data:
-        try:
-            return_datetime_str = str(raw_data["return_datetime"])
-            if return_datetime_str.endswith("Z"):
-                return_datetime_str = return_datetime_str[:-1]
-                if "+" not in return_datetime_str and "-" not in return_datetime_str[-6:]:
-                    return_datetime_str = return_datetime_str + "+00:00"
-            elif "+" not in return_datetime_str and "-" not in return_datetime_str[-6:]:
-                return_datetime_str = return_datetime_str + "+00:00"
-            return_date = datetime.fromisoformat(return_datetime_str)
-        except (ValueError, AttributeError, TypeError) as e:
-            logger.debug(
-                f"[corr={correlation_id}] ⚠️ Impossible de parser return_datetime '{raw_data.get('return_datetime')}': {e}"
-            )
-    
-    # Fallback MVP : 15 du mois à 12:00 UTC
-    if return_date is None:
-        try:
-            year, month_num = map(int, month.split('-'))
-            return_date = datetime(year, month_num, 15, 12, 0, 0, tzinfo=timezone.utc)
-            logger.info(
-                f"[corr={correlation_id}] ℹ️ Fallback return_date pour {month}: 15 du mois à 12:00 UTC"
-            )
-        except (ValueError, AttributeError) as fallback_error:
-            logger.warning(
-                f"[corr={correlation_id}] ⚠️ Impossible de créer fallback return_date pour {month}: {fallback_error}"
-            )
-            # Dernier recours : utiliser maintenant
-            return_date = datetime.now(timezone.utc)
-    
-    return return_date
-
-
-# Mapping signe zodiacal -> offset en degrés (0-360)
-SIGN_TO_LONGITUDE_OFFSET = {
-    'Aries': 0, 'Taurus': 30, 'Gemini': 60, 'Cancer': 90,
-    'Leo': 120, 'Virgo': 150, 'Libra': 180, 'Scorpio': 210,
-    'Sagittarius': 240, 'Capricorn': 270, 'Aquarius': 300, 'Pisces': 330,
-    # Variantes françaises
-    'Bélier': 0, 'Taureau': 30, 'Gémeaux': 60, 'Lion': 120,
-    'Vierge': 150, 'Balance': 180, 'Verseau': 300, 'Poissons': 330,
-}
-
-
-def _sign_degree_to_longitude(sign: str, degree: float) -> float:
-    """
-    Convertit un signe zodiacal + degré dans le signe en longitude écliptique absolue (0-360).
-
-    Args:
-        sign: Signe zodiacal (ex: 'Aries', 'Taurus', 'Bélier', etc.)
-        degree: Degré dans le signe (0-30)
-
-    Returns:
-        Longitude écliptique absolue (0-360)
-
-    Raises:
-        ValueError: Si le signe n'est pas reconnu
-    """
-    # Normaliser le signe (première lettre majuscule)
-    sign_normalized = sign.strip().title()
-
-    if sign_normalized not in SIGN_TO_LONGITUDE_OFFSET:
-        raise ValueError(f"Signe zodiacal non reconnu: {sign}")
-
-    offset = SIGN_TO_LONGITUDE_OFFSET[sign_normalized]
-    return (offset + degree) % 360
-
-
 def _compute_rolling_months(now_utc: datetime) -> List[str]:
     """
     Calcule la liste des 12 prochains mois rolling à partir de now_utc.
@@ -278,242 +192,6 @@ def _compute_rolling_months(now_utc: datetime) -> List[str]:
     return months
 
 
-async def _generate_rolling_returns(
-    db: AsyncSession,
-    user_id: int,
-    correlation_id: str,
-    months: List[str],
-    natal_moon_degree: float,
-    natal_moon_sign: str,
-    birth_latitude: float,
-    birth_longitude: float,
-    birth_timezone: str,
-    delete_existing: bool = False
-) -> int:
-    """
-    Service centralisé pour générer les révolutions lunaires rolling.
-
-    Args:
-        db: Session DB
-        user_id: ID utilisateur (primitif int pour éviter MissingGreenlet)
-        correlation_id: ID de corrélation pour les logs
-        months: Liste des mois à générer (format YYYY-MM)
-        natal_moon_degree: Degré de la Lune natale
-        natal_moon_sign: Signe de la Lune natale
-        birth_latitude: Latitude de naissance
-        birth_longitude: Longitude de naissance
-        birth_timezone: Timezone de naissance
-        delete_existing: Si True, supprime tous les retours existants avant génération
-    
-    Returns:
-        Nombre de retours générés avec succès
-    """
-    if delete_existing:
-        try:
-            delete_stmt = delete(LunarReturn).where(
-                LunarReturn.user_id == user_id
-            )
-            delete_result = await db.execute(delete_stmt)
-            deleted_count = extract_result_rowcount(delete_result)
-            if deleted_count is not None:
-                logger.info(
-                    f"[corr={correlation_id}] 🗑️  Suppression de toutes les révolutions lunaires existantes: "
-                    f"{deleted_count} retour(s) supprimé(s)"
-                )
-        except Exception as delete_error:
-            logger.warning(
-                f"[corr={correlation_id}] ⚠️ Erreur lors de la suppression des retours existants: {delete_error}"
-            )
-            await db.rollback()
-    
-    generated_count = 0
-
-    # Calculer la longitude écliptique absolue de la Lune natale (0-360°)
-    try:
-        natal_moon_longitude = _sign_degree_to_longitude(natal_moon_sign, natal_moon_degree)
-        logger.info(
-            f"[corr={correlation_id}] 🌙 Lune natale: {natal_moon_sign} {natal_moon_degree:.2f}° "
-            f"→ longitude absolue {natal_moon_longitude:.2f}°"
-        )
-    except ValueError as e:
-        logger.error(f"[corr={correlation_id}] ❌ Erreur conversion signe→longitude: {e}")
-        raise HTTPException(
-            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
-            detail={
-                "detail": f"Signe lunaire invalide: {natal_moon_sign}",
-                "correlation_id": correlation_id,
-                "step": "sign_to_longitude",
-            }
-        )
-
-    for month in months:
-        try:
-            logger.debug(
-                f"[corr={correlation_id}] 🔄 Calcul révolution lunaire {month}..."
-            )
-
-            # === ÉTAPE 1: Calculer la vraie date de révolution lunaire avec Swiss Ephemeris ===
-            year, month_num = map(int, month.split('-'))
-            # Point de départ: milieu du mois (approximation initiale)
-            search_start = datetime(year, month_num, 15, 12, 0, 0, tzinfo=timezone.utc)
-
-            return_date = None
-            if SWISS_EPHEMERIS_AVAILABLE:
-                # Rechercher la révolution lunaire dans une fenêtre de ±15 jours (couvre tout le mois)
-                return_date = find_lunar_return(
-                    natal_moon_longitude=natal_moon_longitude,
-                    start_dt=search_start - timedelta(days=15),  # Début du mois
-                    search_window_hours=31 * 24,  # Fenêtre de 31 jours pour couvrir le mois entier
-                    tolerance_seconds=60
-                )
-
-                if return_date:
-                    # Vérifier que la date trouvée est bien dans le mois cible
-                    if return_date.month == month_num and return_date.year == year:
-                        logger.info(
-                            f"[corr={correlation_id}] ✅ Révolution lunaire {month} trouvée: "
-                            f"{return_date.strftime('%Y-%m-%d %H:%M:%S')} UTC"
-                        )
-                    else:
-                        # La révolution n'est pas dans ce mois, chercher le mois suivant
-                        logger.debug(
-                            f"[corr={correlation_id}] ℹ️ Révolution lunaire trouvée {return_date.strftime('%Y-%m-%d')} "
-                            f"n'est pas dans {month}, on la garde quand même"
-                        )
-                else:
-                    logger.warning(
-                        f"[corr={correlation_id}] ⚠️ Swiss Ephemeris: aucune révolution trouvée pour {month}, "
-                        f"fallback sur API Ephemeris"
-                    )
-            else:
-                logger.debug(
-                    f"[corr={correlation_id}] ℹ️ Swiss Ephemeris non disponible, utilisation API Ephemeris"
-                )
-
-            # === ÉTAPE 2: Appeler l'API Ephemeris pour les données du thème (ascendant, maisons, aspects) ===
-            raw_data = {}
-            try:
-                raw_data = await ephemeris_client.calculate_lunar_return(
-                    natal_moon_degree=natal_moon_degree,
-                    natal_moon_sign=natal_moon_sign,
-                    target_month=month,
-                    birth_latitude=birth_latitude,
-                    birth_longitude=birth_longitude,
-                    timezone=birth_timezone,
-                )
-            except EphemerisAPIKeyError as e:
-                logger.warning(
-                    f"[corr={correlation_id}] ⚠️ Clé API Ephemeris manquante: {e}, "
-                    f"utilisation des données par défaut"
-                )
-                # Continuer avec raw_data vide, on a quand même la return_date de Swiss Ephemeris
-            except Exception as e:
-                logger.warning(
-                    f"[corr={correlation_id}] ⚠️ Erreur API Ephemeris pour {month}: {e}, "
-                    f"utilisation des données par défaut"
-                )
-                # Continuer avec raw_data vide
-
-            # === ÉTAPE 3: Si pas de return_date Swiss Ephemeris, utiliser celle de l'API ou fallback ===
-            if return_date is None:
-                return_date = _parse_return_date(raw_data, month, correlation_id)
-
-        except Exception as e:
-            logger.warning(
-                f"[corr={correlation_id}] ⚠️ Erreur calcul révolution lunaire {month}: {e}, continue"
-            )
-            continue
-
-        # Parser les données du thème
-        lunar_ascendant = raw_data.get("ascendant", {}).get("sign", "Unknown")
-        moon_house = raw_data.get("moon", {}).get("house", 1)
-        moon_sign = raw_data.get("moon", {}).get("sign", natal_moon_sign)
-        aspects = raw_data.get("aspects", [])
-        
-        # Générer l'interprétation
-        interpretation = generate_lunar_return_interpretation(
-            lunar_ascendant=lunar_ascendant,
-            moon_house=moon_house,
-            aspects=aspects,
-        )
-        
-        # Protection contre génération concurrente:
-        # Vérifier d'abord si l'entrée existe déjà (évite calcul inutile si doublon)
-        check_result = await db.execute(
-            select(LunarReturn).where(
-                LunarReturn.user_id == user_id,
-                LunarReturn.month == month
-            )
-        )
-        existing = check_result.scalar_one_or_none()
-
-        if existing:
-            logger.debug(
-                f"[corr={correlation_id}] ℹ️ {month} existe déjà (id={existing.id}), skip génération"
-            )
-            generated_count += 1
-            continue
-
-        # Créer l'entrée
-        lunar_return = LunarReturn(
-            user_id=user_id,
-            month=month,
-            return_date=return_date,
-            lunar_ascendant=lunar_ascendant,
-            moon_house=moon_house,
-            moon_sign=moon_sign,
-            aspects=aspects,
-            planets=raw_data.get("planets", {}),
-            houses=raw_data.get("houses", {}),
-            interpretation=interpretation,
-            raw_data=raw_data,
-        )
-        
-        # Protection contre génération concurrente au niveau DB:
-        # Utiliser un savepoint pour isoler chaque insertion et gérer les conflits individuellement
-        # Si un autre process a déjà inséré ce (user_id, month) entre le SELECT et l'INSERT,
-        # IntegrityError sera levée et on récupère l'entrée existante
-        savepoint = await db.begin_nested()  # Savepoint pour rollback individuel
-        try:
-            db.add(lunar_return)
-            await db.flush()  # Tenter l'insertion (sans commit global)
-            await savepoint.commit()  # Commit du savepoint (insertion réussie)
-            generated_count += 1
-            logger.debug(
-                f"[corr={correlation_id}] ✅ Insertion réussie pour {month}"
-            )
-        except IntegrityError:
-            # Conflit: un autre process a inséré ce (user_id, month) entre le SELECT et l'INSERT
-            await savepoint.rollback()
-            logger.debug(
-                f"[corr={correlation_id}] ℹ️ Conflit détecté pour {month} (inséré entre-temps), "
-                f"récupération de l'entrée existante..."
-            )
-            
-            # Refaire un SELECT pour récupérer l'entrée existante
-            result = await db.execute(
-                select(LunarReturn).where(
-                    LunarReturn.user_id == user_id,
-                    LunarReturn.month == month
-                )
-            )
-            existing = result.scalar_one_or_none()
-            
-            if existing:
-                logger.debug(
-                    f"[corr={correlation_id}] ✅ Entrée existante récupérée pour {month} (id={existing.id})"
-                )
-                generated_count += 1
-            else:
-                # Cas rare: conflit mais entrée non trouvée (peut arriver en cas de rollback concurrent)
-                logger.warning(
-                    f"[corr={correlation_id}] ⚠️ Conflit pour {month} mais entrée non trouvée après SELECT"
-                )
-    
-    return generated_count
-
-
-# === ROUTES ===
 async def _generate_rolling_if_empty(
     current_user: User,
     db: AsyncSession,
@@ -14,7 +14,7 @@ from database import get_db
 from models.user import User
 from models.natal_chart import NatalChart
 from models.lunar_return import LunarReturn
-from routes.auth import get_current_user
+from routes.auth import get_current_user, get_current_user_model
 from services.ephemeris_rapidapi import create_natal_chart
 from services.natal_reading_service import parse_positions_from_natal_chart, parse_aspects_from_natal_chart
 from utils.natal_chart_helpers import extract_big3_from_positions
@@ -51,7 +51,7 @@ class NatalChartResponse(BaseModel):
 @router.post("/natal-chart", response_model=NatalChartResponse, status_code=status.HTTP_201_CREATED)
 async def calculate_natal_chart(
     data: NatalChartRequest,
-    current_user: User = Depends(get_current_user),
+    current_user: User = Depends(get_current_user_model),
     x_dev_user_id: Optional[str] = Header(default=None, alias="X-Dev-User-Id"),
     db: AsyncSession = Depends(get_db),
     aspect_version: int = Query(5, ge=2, le=5, description="Version des interprétations d'aspects (2=v4, 5=v5)")
@@ -108,12 +108,12 @@ async def calculate_natal_chart(
             rapidapi_response = generate_mock_natal_chart(birth_data)
             logger.info(f"✅ Données MOCK générées - clés disponibles: {list(rapidapi_response.keys())}")
         else:
-            # Appel à RapidAPI via le service natal_reading_service
-            from services.natal_reading_service import call_rapidapi_natal_chart
+            # Calcul local Swiss Ephemeris (ou RapidAPI si NATAL_CHART_ENGINE='rapidapi'), même format de réponse
+            from services.natal_reading_service import get_natal_chart
 
-            logger.info(f"   📤 ENVOYÉ À RAPIDAPI: year={birth_data['year']}, month={birth_data['month']}, day={birth_data['day']}, hour={birth_data['hour']}, minute={birth_data['minute']}, timezone={birth_data['timezone']}")
-            rapidapi_response = await call_rapidapi_natal_chart(birth_data)
-            logger.info(f"✅ Réponse RapidAPI reçue - clés disponibles: {list(rapidapi_response.keys())}")
+            logger.info(f"   📤 THÈME NATAL ({settings.NATAL_CHART_ENGINE}): year={birth_data['year']}, month={birth_data['month']}, day={birth_data['day']}, hour={birth_data['hour']}, minute={birth_data['minute']}, timezone={birth_data['timezone']}")
+            rapidapi_response = await get_natal_chart(birth_data)
+            logger.info(f"✅ Thème natal reçu - clés disponibles: {list(rapidapi_response.keys())}")
         
         # Parser la réponse RapidAPI vers le format attendu
         # RapidAPI retourne: { "chart_data": { "planetary_positions": [...], "aspects": [...] } }
@@ -132,18 +132,12 @@ async def calculate_natal_chart(
         # Calculer les positions complémentaires manquantes (Uranus, Neptune, Pluton, Nœuds, Lilith, Chiron)
         # RapidAPI ne retourne que 9 positions, on complète avec Swiss Ephemeris si disponible
         try:
-            from services.natal_planets_complement import calculate_complementary_positions, merge_complementary_positions
-            from datetime import datetime, timezone as dt_timezone
-            
-            # Construire datetime de naissance en UTC
-            birth_datetime = datetime(
-                int(data.date.split("-")[0]),
-                int(data.date.split("-")[1]),
-                int(data.date.split("-")[2]),
-                int(birth_time.split(":")[0]),
-                int(birth_time.split(":")[1]),
-                tzinfo=dt_timezone.utc
-            )
+            from services.natal_planets_complement import merge_complementary_positions
+            from services.ephemeris_executor import calculate_complementary_positions_async
+            from services.natal_chart_engine import birth_data_to_utc
+
+            # Instant de naissance en UTC (heure locale convertie avec la timezone détectée)
+            birth_datetime = birth_data_to_utc(birth_data)
             
             # Extraire les cuspides des maisons depuis chart_data pour calculer les maisons des positions complémentaires
             house_cusps = []
@@ -156,7 +150,7 @@ async def calculate_natal_chart(
                         house_cusps.append(float(cusp))
             
             # Calculer positions complémentaires avec les cuspides pour déterminer les maisons
-            complementary_positions = calculate_complementary_positions(
+            complementary_positions = await calculate_complementary_positions_async(
                 birth_datetime,
                 data.latitude,
                 data.longitude,
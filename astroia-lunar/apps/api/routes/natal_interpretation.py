@@ -5,20 +5,32 @@ Version 2 - Prompt refondé, Sonnet + fallback Haiku
 """
 
 from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi.responses import StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
-from typing import Optional
+from typing import AsyncIterator, Dict, List, Optional, Tuple
+import asyncio
 import logging
 
-from database import get_db
+from config import settings
+from database import get_db, AsyncSessionLocal
 from models.natal_interpretation import NatalInterpretation
 from models.user import User
+from schemas.llm_job import LLMJobRef
 from schemas.natal_interpretation import (
     NatalInterpretationRequest,
-    NatalInterpretationResponse
+    NatalInterpretationResponse,
+    NatalInterpretationBatchItem,
+    NatalInterpretationBatchRequest,
+    NatalInterpretationBatchError,
+    NatalInterpretationBatchSummary
 )
+from services.llm_job_queue import enqueue_natal_job
 from services.natal_interpretation_service import (
     generate_with_sonnet_fallback_haiku,
+    load_pregenerated_interpretations_batch,
+    upsert_natal_interpretation,
+    DEFERRED_MODEL,
     PROMPT_VERSION
 )
 from routes.auth import get_current_user
@@ -134,7 +146,8 @@ async def generate_natal_interpretation(
         interpretation_text, model_used = await generate_with_sonnet_fallback_haiku(
             subject=request.subject,
             chart_payload=request.chart_payload.model_dump(),
-            db=db
+            db=db,
+            defer_llm=settings.LLM_JOB_QUEUE_ENABLED
         )
         
         # #region agent log
@@ -162,6 +175,10 @@ async def generate_natal_interpretation(
 
         logger.info(f"✅ Interprétation générée avec {model_used} ({len(interpretation_text)} chars)")
 
+        # Génération confiée à la file de jobs : répondre sans attendre le LLM
+        if model_used == DEFERRED_MODEL:
+            return await _deferred_response(user_id, request, version, interpretation_text, existing_interpretation)
+
         # Si force_refresh et qu'une interprétation existe, la supprimer avant d'insérer
         if request.force_refresh and existing_interpretation:
             logger.info(f"🗑️ Suppression ancienne interprétation (id={existing_interpretation.id}) pour régénération")
@@ -369,6 +386,280 @@ async def generate_natal_interpretation(
         )
 
 
+def _ndjson(model) -> str:
+    return model.model_dump_json() + "\n"
+
+
+def _batch_response(interpretation: NatalInterpretation, cached: bool) -> NatalInterpretationResponse:
+    return NatalInterpretationResponse(
+        id=str(interpretation.id),
+        text=interpretation.output_text,
+        cached=cached,
+        subject=interpretation.subject,
+        chart_id=interpretation.chart_id,
+        version=interpretation.version,
+        created_at=interpretation.created_at
+    )
+
+
+def _placement(item: NatalInterpretationBatchItem) -> Tuple[str, str, int]:
+    """(subject, signe, maison) comme dans generate_with_sonnet_fallback_haiku"""
+    return item.subject, item.chart_payload.sign or "", item.chart_payload.house or 1
+
+
+def _upsert_interpretation(
+    db: AsyncSession,
+    existing: Optional[NatalInterpretation],
+    user_id: int,
+    request: NatalInterpretationBatchRequest,
+    item: NatalInterpretationBatchItem,
+    version: int,
+    text: str
+) -> NatalInterpretation:
+    """Met à jour la ligne existante ou en ajoute une (commit à la charge de l'appelant)"""
+    return upsert_natal_interpretation(
+        db, existing,
+        user_id=user_id, chart_id=request.chart_id, subject=item.subject, lang=request.lang,
+        version=version, input_json=item.chart_payload.model_dump(), text=text
+    )
+
+
+async def _enqueue_generation(
+    user_id: int,
+    chart_id: str,
+    subject: str,
+    lang: str,
+    version: int,
+    chart_payload: Dict
+) -> Optional[LLMJobRef]:
+    """Enfile la génération LLM ; une file indisponible laisse le placeholder sans job"""
+    try:
+        job = await enqueue_natal_job(
+            user_id=user_id, chart_id=chart_id, subject=subject, lang=lang,
+            version=version, chart_payload=chart_payload
+        )
+        return LLMJobRef.model_validate(job)
+    except Exception as e:
+        logger.error(f"❌ Impossible d'enfiler la génération {subject} ({chart_id}): {e}")
+        return None
+
+
+async def _deferred_response(
+    user_id: int,
+    request: NatalInterpretationRequest,
+    version: int,
+    placeholder: str,
+    existing: Optional[NatalInterpretation]
+) -> NatalInterpretationResponse:
+    """
+    Miss servi sans attendre le LLM : rien n'est sauvegardé, le worker écrira
+    l'interprétation (une ligne existante, en force_refresh, reste servie jusque-là)
+    """
+    job = await _enqueue_generation(
+        user_id, request.chart_id, request.subject, request.lang, version, request.chart_payload.model_dump()
+    )
+    if existing is not None:
+        response = _batch_response(existing, cached=True)
+    else:
+        response = NatalInterpretationResponse(
+            text=placeholder,
+            cached=False,
+            subject=request.subject,
+            chart_id=request.chart_id,
+            version=version
+        )
+    response.job = job
+    logger.info(f"⏳ Interprétation {request.subject} servie en attente de génération (job={job.id if job else None})")
+    return response
+
+
+async def _generate_and_save(
+    user_id: int,
+    request: NatalInterpretationBatchRequest,
+    item: NatalInterpretationBatchItem,
+    version: int,
+    semaphore: asyncio.Semaphore
+) -> Tuple[str, str]:
+    """
+    Génération LLM d'un sujet (vrai miss), sauvegardée dans sa propre session
+
+    Returns:
+        (ligne NDJSON, 'generated' | 'pending' (placeholder, génération en file) | 'errors')
+    """
+    try:
+        async with semaphore:
+            text, model_used = await generate_with_sonnet_fallback_haiku(
+                subject=item.subject,
+                chart_payload=item.chart_payload,
+                version=version,
+                skip_pregenerated=True,
+                defer_llm=settings.LLM_JOB_QUEUE_ENABLED
+            )
+
+        if model_used == DEFERRED_MODEL:
+            job = await _enqueue_generation(
+                user_id, request.chart_id, item.subject, request.lang, version, item.chart_payload.model_dump()
+            )
+            response = NatalInterpretationResponse(
+                text=text, cached=False, subject=item.subject, chart_id=request.chart_id, version=version, job=job
+            )
+            return _ndjson(response), "pending"
+
+        # La session de la requête est fermée une fois la réponse streamée commencée
+        async with AsyncSessionLocal() as session:
+            result = await session.execute(
+                select(NatalInterpretation).where(
+                    NatalInterpretation.user_id == user_id,
+                    NatalInterpretation.chart_id == request.chart_id,
+                    NatalInterpretation.subject == item.subject,
+                    NatalInterpretation.lang == request.lang,
+                    NatalInterpretation.version == version
+                )
+            )
+            interpretation = _upsert_interpretation(
+                session, result.scalar_one_or_none(), user_id, request, item, version, text
+            )
+            await session.commit()
+
+        logger.info(f"✅ [Batch] {item.subject} généré avec {model_used} ({len(text)} chars)")
+        return _ndjson(_batch_response(interpretation, cached=False)), "generated"
+    except Exception as e:
+        logger.error(f"❌ [Batch] Erreur génération {item.subject}: {e}")
+        return _ndjson(NatalInterpretationBatchError(subject=item.subject, chart_id=request.chart_id, error=str(e))), "errors"
+
+
+@router.post("/interpretations/batch", status_code=status.HTTP_200_OK)
+async def generate_natal_interpretations_batch(
+    request: NatalInterpretationBatchRequest,
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Résout tous les sujets demandés d'un thème en un appel (jusqu'à 16)
+
+    Stratégie:
+    - 1 requête pour les interprétations déjà en DB (user, chart, lang, version)
+    - 1 requête pour les pré-générées des sujets restants (sauvegardées en un commit)
+    - Vrais miss uniquement → LLM en parallèle, borné par NATAL_INTERPRETATION_BATCH_CONCURRENCY
+      (LLM_JOB_QUEUE_ENABLED : placeholder immédiat + job en file, voir services/llm_job_queue)
+
+    Returns:
+        Flux NDJSON (application/x-ndjson), une ligne par sujet dès qu'il est prêt :
+        NatalInterpretationResponse, ou NatalInterpretationBatchError pour un sujet en
+        échec ; dernière ligne NatalInterpretationBatchSummary ({"done": true, ...})
+    """
+    # 🔒 CRITIQUE: Extraire user_id IMMÉDIATEMENT pour éviter MissingGreenlet
+    user_id = int(current_user.id)
+    version = PROMPT_VERSION
+
+    items: Dict[str, NatalInterpretationBatchItem] = {}
+    for item in request.items:
+        items.setdefault(item.subject, item)
+    total = len(items)
+
+    logger.info(
+        f"📖 Demande lot interprétations v{version} - user={user_id}, "
+        f"chart={request.chart_id}, sujets={len(items)}, lang={request.lang}"
+    )
+
+    ready: List[str] = []
+    counts = {"cached": 0, "generated": 0, "errors": 0, "pending": 0}
+
+    # Lilith non supportée en v3+ (versions senior) : erreur pour ce sujet seulement
+    if version >= 3 and 'lilith' in items:
+        items.pop('lilith')
+        counts["errors"] += 1
+        ready.append(_ndjson(NatalInterpretationBatchError(
+            subject='lilith',
+            chart_id=request.chart_id,
+            error=f"Lilith n'est pas supportée en version {version} (prompt senior professionnel)",
+            status_code=status.HTTP_400_BAD_REQUEST
+        )))
+
+    # 1 requête : interprétations déjà en DB
+    existing: Dict[str, NatalInterpretation] = {}
+    if items:
+        result = await db.execute(
+            select(NatalInterpretation).where(
+                NatalInterpretation.user_id == user_id,
+                NatalInterpretation.chart_id == request.chart_id,
+                NatalInterpretation.subject.in_(list(items)),
+                NatalInterpretation.lang == request.lang,
+                NatalInterpretation.version == version
+            )
+        )
+        existing = {row.subject: row for row in result.scalars().all()}
+
+    pending: List[NatalInterpretationBatchItem] = []
+    for subject, item in items.items():
+        if subject in existing and not request.force_refresh:
+            counts["cached"] += 1
+            ready.append(_ndjson(_batch_response(existing[subject], cached=True)))
+        else:
+            pending.append(item)
+
+    # 1 requête : pré-générées des sujets restants
+    pregenerated = await load_pregenerated_interpretations_batch(
+        db, [_placement(item) for item in pending], version=version
+    )
+
+    saved: List[NatalInterpretation] = []
+    misses: List[NatalInterpretationBatchItem] = []
+    for item in pending:
+        text = pregenerated.get(_placement(item))
+        if text is None:
+            misses.append(item)
+            continue
+        saved.append(_upsert_interpretation(db, existing.get(item.subject), user_id, request, item, version, text))
+
+    if saved:
+        try:
+            await db.commit()
+        except Exception as db_err:
+            logger.error(f"❌ Erreur DB lors de la sauvegarde du lot: {db_err}", exc_info=True)
+            await db.rollback()
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail=f"Erreur lors de la sauvegarde des interprétations: {str(db_err)}"
+            )
+        counts["generated"] += len(saved)
+        ready.extend(_ndjson(_batch_response(interpretation, cached=False)) for interpretation in saved)
+
+    logger.info(
+        f"✅ Lot {request.chart_id}: {counts['cached']} en cache, {len(saved)} pré-générées, "
+        f"{len(misses)} à générer via LLM"
+    )
+
+    async def stream() -> AsyncIterator[str]:
+        for line in ready:
+            yield line
+
+        semaphore = asyncio.Semaphore(max(1, settings.NATAL_INTERPRETATION_BATCH_CONCURRENCY))
+        tasks = [
+            asyncio.create_task(_generate_and_save(user_id, request, item, version, semaphore))
+            for item in misses
+        ]
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                line, outcome = await next_done
+                counts[outcome] += 1
+                yield line
+        finally:
+            # Client déconnecté : ne pas laisser tourner les générations restantes
+            for task in tasks:
+                task.cancel()
+
+        yield _ndjson(NatalInterpretationBatchSummary(
+            total=total,
+            cached=counts["cached"],
+            generated=counts["generated"],
+            errors=counts["errors"],
+            pending=counts["pending"]
+        ))
+
+    return StreamingResponse(stream(), media_type="application/x-ndjson")
+
+
 @router.delete("/interpretation/{chart_id}/{subject}", status_code=status.HTTP_204_NO_CONTENT)
 async def delete_natal_interpretation(
     chart_id: str,
@@ -94,8 +94,8 @@ async def create_natal_reading(
         # Retourner depuis le cache
         return NatalReadingResponse(**response_data)
     
-    # Pas en cache → générer via API
-    logger.info("🌐 Pas en cache → génération via RapidAPI")
+    # Pas en cache → générer (thème local ou RapidAPI + rapport RapidAPI)
+    logger.info("🌐 Pas en cache → génération de la lecture")
     
     try:
         result_data = await generate_natal_reading(
@@ -143,7 +143,8 @@ async def create_natal_reading(
             source="api",
             api_calls_count=result_data['api_calls_count'],
             created_at=new_reading.created_at,
-            last_accessed_at=new_reading.last_accessed_at
+            last_accessed_at=new_reading.last_accessed_at,
+            metadata=result_data.get('metadata')
         )
         
     except HTTPException as e:
@@ -0,0 +1,31 @@
+"""Schemas Pydantic pour la file des générations LLM (llm_generation_jobs)"""
+
+from pydantic import BaseModel, Field
+from typing import Optional
+from datetime import datetime
+
+
+class LLMJobRef(BaseModel):
+    """Génération en file, jointe à une réponse servie en attendant (placeholder / template)"""
+    id: int = Field(..., description="ID du job (GET /api/llm-jobs/{id})")
+    status: str = Field(..., description="'pending' | 'running' | 'done' | 'failed'")
+
+    class Config:
+        from_attributes = True
+
+
+class LLMJobStatusResponse(BaseModel):
+    """État d'un job de génération"""
+    id: int
+    kind: str = Field(..., description="'natal' | 'lunar'")
+    status: str = Field(..., description="'pending' | 'running' | 'done' | 'failed'")
+    attempts: int
+    max_attempts: int
+    last_error: Optional[str] = None
+    result_id: Optional[str] = Field(None, description="ID de l'interprétation produite (status 'done')")
+    run_after: Optional[datetime] = Field(None, description="Prochaine tentative au plus tôt")
+    created_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+
+    class Config:
+        from_attributes = True
@@ -3,9 +3,11 @@ Schémas Pydantic pour les interprétations de thème natal
 """
 
 from pydantic import BaseModel, Field
-from typing import Optional, Literal
+from typing import List, Optional, Literal
 from datetime import datetime
 
+from schemas.llm_job import LLMJobRef
+
 
 # Types pour les objets célestes supportés
 NatalSubject = Literal[
@@ -44,6 +46,39 @@ class NatalInterpretationResponse(BaseModel):
     chart_id: str = Field(..., description="ID du thème natal")
     version: int = Field(default=1, description="Version du prompt utilisé")
     created_at: Optional[datetime] = Field(None, description="Date de création")
+    job: Optional[LLMJobRef] = Field(None, description="Génération LLM en file : text est un placeholder jusqu'à son statut 'done'")
 
     class Config:
         from_attributes = True
+
+
+class NatalInterpretationBatchItem(BaseModel):
+    """Un sujet du lot avec ses données de chart"""
+    subject: NatalSubject = Field(..., description="Objet céleste à interpréter")
+    chart_payload: ChartPayload = Field(..., description="Données du chart pour génération")
+
+
+class NatalInterpretationBatchRequest(BaseModel):
+    """Request pour résoudre plusieurs sujets d'un même thème en un appel"""
+    chart_id: str = Field(..., description="ID stable du thème natal (hash)")
+    lang: str = Field(default='fr', description="Langue des interprétations")
+    items: List[NatalInterpretationBatchItem] = Field(..., min_length=1, max_length=16, description="Sujets à interpréter (doublons ignorés)")
+    force_refresh: bool = Field(default=False, description="Forcer la régénération même si cache existe")
+
+
+class NatalInterpretationBatchError(BaseModel):
+    """Ligne NDJSON d'un sujet en échec (les autres sujets du lot sont servis)"""
+    subject: NatalSubject
+    chart_id: str
+    error: str
+    status_code: int = 500
+
+
+class NatalInterpretationBatchSummary(BaseModel):
+    """Dernière ligne NDJSON du lot"""
+    done: bool = True
+    total: int
+    cached: int
+    generated: int
+    errors: int
+    pending: int = Field(default=0, description="Sujets servis en placeholder, générés par la file de jobs")
@@ -1,7 +1,7 @@
 """Schemas Pydantic pour NatalReading"""
 
 from pydantic import BaseModel, Field
-from typing import List, Optional, Literal
+from typing import Dict, List, Optional, Literal
 from datetime import datetime
 
 
@@ -96,6 +96,19 @@ class InterpretationsData(BaseModel):
     general_summary: Optional[str] = None
 
 
+class ReadingLegTiming(BaseModel):
+    """Issue et durée d'un appel de la génération (thème ou rapport)"""
+    status: Literal["ok", "timeout", "error", "skipped"]
+    duration_ms: Optional[float] = None
+
+
+class GenerationMetadata(BaseModel):
+    """Chronométrage de la génération (lecture fraîche uniquement)"""
+    total_ms: float
+    legs: Dict[str, ReadingLegTiming]  # { "chart": {...}, "report": {...} }
+    degraded: List[str] = []  # Appels en échec / timeout, lecture servie sans eux
+
+
 class NatalReadingResponse(BaseModel):
     """Réponse complète d'une lecture de thème natal"""
     id: int
@@ -110,6 +123,7 @@ class NatalReadingResponse(BaseModel):
     api_calls_count: int
     created_at: datetime
     last_accessed_at: datetime
+    metadata: Optional[GenerationMetadata] = None
     
     class Config:
         from_attributes = True
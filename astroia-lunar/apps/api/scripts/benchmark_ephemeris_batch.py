@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""
+Benchmark du noyau d'éphémérides batch (calc_positions_batch).
+
+Compare, pour une grille horaire Lune + Soleil, le coût par échantillon de :
+- l'ancien chemin scalaire (datetime → JD → helpers longitude Lune/Soleil à chaque pas)
+- le noyau batch (grille de JD numpy + une passe calc_ut par corps)
+- une boucle calc_ut brute (plancher théorique côté pyswisseph)
+
+Usage:
+    python scripts/benchmark_ephemeris_batch.py [--days N] [--step-minutes M]
+"""
+
+import argparse
+import logging
+import os
+import sys
+import time
+from datetime import datetime, timedelta, timezone
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+logging.disable(logging.WARNING)
+
+import numpy as np  # noqa: E402
+
+from services.swiss_ephemeris import (  # noqa: E402
+    SWISS_EPHEMERIS_AVAILABLE,
+    calc_positions_batch,
+    calculate_phase_from_elongation,
+    datetime_to_julian_day,
+    degree_to_sign,
+    get_moon_longitude,
+    get_sun_longitude,
+    julian_day_grid,
+    swe,
+)
+
+
+def _scalar(start: datetime, end: datetime, step: timedelta):
+    """Boucle telle qu'écrite avant le noyau batch (find_lunar_phase_changes historique)."""
+    longitudes = []
+    current = start
+    while current <= end:
+        jd = datetime_to_julian_day(current)
+        moon_lon = get_moon_longitude(jd)
+        sun_lon = get_sun_longitude(jd)
+        calculate_phase_from_elongation((moon_lon - sun_lon) % 360)
+        degree_to_sign(moon_lon)
+        longitudes.append(round(moon_lon, 2))
+        current += step
+    return longitudes
+
+
+def _batch(start: datetime, end: datetime, step: timedelta):
+    return calc_positions_batch(julian_day_grid(start, end, step), [swe.MOON, swe.SUN])
+
+
+def _raw(start: datetime, end: datetime, step: timedelta):
+    flags = swe.FLG_SWIEPH | swe.FLG_SPEED
+    return [
+        (swe.calc_ut(jd, swe.MOON, flags)[0], swe.calc_ut(jd, swe.SUN, flags)[0])
+        for jd in julian_day_grid(start, end, step).tolist()
+    ]
+
+
+def _timed(fn, *args):
+    t0 = time.perf_counter()
+    result = fn(*args)
+    return result, time.perf_counter() - t0
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--days", type=int, default=365, help="Durée de la grille en jours")
+    parser.add_argument("--step-minutes", type=int, default=60, help="Pas de la grille en minutes")
+    args = parser.parse_args()
+
+    if not SWISS_EPHEMERIS_AVAILABLE:
+        print("❌ pyswisseph non installé")
+        return 1
+
+    start = datetime(2026, 1, 1, tzinfo=timezone.utc)
+    end = start + timedelta(days=args.days)
+    step = timedelta(minutes=args.step_minutes)
+
+    # Échauffement (cache interne de pyswisseph)
+    _batch(start, start + timedelta(days=2), step)
+
+    scalar, scalar_elapsed = _timed(_scalar, start, end, step)
+    batch, batch_elapsed = _timed(_batch, start, end, step)
+    _, raw_elapsed = _timed(_raw, start, end, step)
+    n = len(scalar)
+
+    max_drift = float(np.max(np.abs(np.round(batch[:, 0, 0], 2) - np.asarray(scalar))))
+
+    print(f"🌙 Benchmark éphémérides - {n} échantillons Lune+Soleil ({args.days} j, pas {args.step_minutes} min)")
+    print(f"{'chemin':<28}{'µs/échantillon':>16}{'total ms':>12}")
+    print(f"{'scalaire (helpers par pas)':<28}{scalar_elapsed / n * 1e6:>16.2f}{scalar_elapsed * 1000:>12.1f}")
+    print(f"{'batch (calc_positions_batch)':<28}{batch_elapsed / n * 1e6:>16.2f}{batch_elapsed * 1000:>12.1f}")
+    print(f"{'calc_ut brut':<28}{raw_elapsed / n * 1e6:>16.2f}{raw_elapsed * 1000:>12.1f}")
+    print(f"speedup batch vs scalaire: x{scalar_elapsed / batch_elapsed:.1f}")
+    print(f"écart max longitude Lune: {max_drift:.4f}°")
+
+    return 0 if max_drift < 0.01 else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+"""
+Benchmark du calcul de révolution lunaire : scan 30 min + bisection vs Newton.
+
+Mesure, pour chaque méthode, le nombre d'appels swe.calc_ut et le temps
+wall-clock par révolution, sur les mêmes cas que _generate_rolling_returns
+(fenêtre de 31 jours démarrant le 1er du mois, 12 mois glissants).
+
+Usage:
+    python scripts/benchmark_lunar_return.py [--users N] [--months M] [--seed S]
+"""
+
+import argparse
+import logging
+import os
+import random
+import sys
+import time
+from datetime import datetime, timezone
+from statistics import mean
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+logging.disable(logging.WARNING)
+
+from services import swiss_ephemeris  # noqa: E402
+from services.swiss_ephemeris import (  # noqa: E402
+    SWISS_EPHEMERIS_AVAILABLE,
+    find_lunar_return,
+    _find_lunar_return_scan,
+)
+
+
+class CalcUtCounter:
+    """Compte les appels à swe.calc_ut sans modifier le résultat."""
+
+    def __init__(self, swe_module):
+        self._swe = swe_module
+        self._original = swe_module.calc_ut
+        self.calls = 0
+
+    def __enter__(self):
+        def counting_calc_ut(*args, **kwargs):
+            self.calls += 1
+            return self._original(*args, **kwargs)
+
+        self._swe.calc_ut = counting_calc_ut
+        return self
+
+    def __exit__(self, *exc):
+        self._swe.calc_ut = self._original
+        return False
+
+
+def _rolling_cases(users: int, months: int, seed: int):
+    """Génère (λ_natal, start_dt) comme _generate_rolling_returns."""
+    rng = random.Random(seed)
+    now = datetime.now(timezone.utc)
+    cases = []
+    for _ in range(users):
+        natal_lon = rng.uniform(0, 360)
+        year, month = now.year, now.month
+        for _ in range(months):
+            cases.append((natal_lon, datetime(year, month, 1, tzinfo=timezone.utc)))
+            month += 1
+            if month > 12:
+                month = 1
+                year += 1
+    return cases
+
+
+def _run(solver, cases):
+    results = []
+    with CalcUtCounter(swiss_ephemeris.swe) as counter:
+        start = time.perf_counter()
+        for natal_lon, start_dt in cases:
+            results.append(solver(natal_lon, start_dt, 31 * 24, 60))
+        elapsed = time.perf_counter() - start
+    return results, counter.calls, elapsed
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--users", type=int, default=10, help="Nombre de Lunes natales simulées")
+    parser.add_argument("--months", type=int, default=12, help="Mois glissants par user")
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    if not SWISS_EPHEMERIS_AVAILABLE:
+        print("❌ pyswisseph non installé")
+        return 1
+
+    cases = _rolling_cases(args.users, args.months, args.seed)
+    n = len(cases)
+
+    scan_results, scan_calls, scan_elapsed = _run(_find_lunar_return_scan, cases)
+    newton_results, newton_calls, newton_elapsed = _run(find_lunar_return, cases)
+
+    drifts = [
+        abs((a - b).total_seconds())
+        for a, b in zip(scan_results, newton_results)
+        if a is not None and b is not None
+    ]
+    mismatches = sum(1 for a, b in zip(scan_results, newton_results) if (a is None) != (b is None))
+
+    print(f"🌙 Benchmark Lunar Return - {n} révolutions ({args.users} users × {args.months} mois)")
+    print(f"{'méthode':<22}{'calc_ut/retour':>16}{'ms/retour':>12}")
+    print(f"{'scan 30min+bisection':<22}{scan_calls / n:>16.1f}{scan_elapsed / n * 1000:>12.3f}")
+    print(f"{'newton (FLG_SPEED)':<22}{newton_calls / n:>16.1f}{newton_elapsed / n * 1000:>12.3f}")
+    print(
+        f"speedup: x{scan_elapsed / newton_elapsed:.1f} (temps), "
+        f"x{scan_calls / max(newton_calls, 1):.1f} (appels calc_ut)"
+    )
+    if drifts:
+        print(f"écart scan/newton: moyen {mean(drifts):.1f}s, max {max(drifts):.1f}s")
+    print(f"résultats divergents (None vs date): {mismatches}")
+
+    return 0 if mismatches == 0 else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""
+Construit la table d'éphémérides précalculée (Lune/Soleil/planètes) lue par l'API.
+
+Échantillonne swe.calc_ut sur une grille régulière (par défaut : horaire,
+Lune + Soleil, 1900 → 2100), écrit <output>.npy + <output>.json, puis valide
+l'interpolation contre swe.calc_ut sur des instants aléatoires.
+
+Usage:
+    python scripts/build_ephemeris_tables.py [--output PATH] [--start-year 1900] [--end-year 2100]
+        [--step-hours 1] [--bodies Moon,Sun] [--validate 2000]
+
+L'API charge la table indiquée par EPHEMERIS_TABLE_PATH
+(défaut : data/ephemeris/moon_sun_1900_2100.npy).
+"""
+
+import argparse
+import logging
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+logging.basicConfig(level=logging.INFO, format="%(message)s")
+
+from config import settings  # noqa: E402
+from services.ephemeris_tables import (  # noqa: E402
+    SWISS_EPHEMERIS_AVAILABLE,
+    build_ephemeris_table,
+    swe,
+    validate_table,
+)
+
+# Précision visée : la seconde d'arc
+MAX_LONGITUDE_ERROR_ARCSEC = 1.0
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--output", default=None, help="Fichier .npy (défaut : EPHEMERIS_TABLE_PATH)")
+    parser.add_argument("--start-year", type=int, default=1900)
+    parser.add_argument("--end-year", type=int, default=2100)
+    parser.add_argument("--step-hours", type=float, default=1.0)
+    parser.add_argument("--bodies", default="Moon,Sun", help="Corps séparés par des virgules (noms Swiss Ephemeris)")
+    parser.add_argument("--validate", type=int, default=2000, help="Nombre d'instants de validation (0 = aucun)")
+    args = parser.parse_args()
+
+    if not SWISS_EPHEMERIS_AVAILABLE:
+        print("❌ pyswisseph non installé")
+        return 1
+
+    output = args.output or settings.EPHEMERIS_TABLE_PATH
+    if not os.path.isabs(output):
+        output = os.path.join(os.path.dirname(__file__), "..", output)
+
+    names = [name.strip() for name in args.bodies.split(",") if name.strip()]
+    bodies = [getattr(swe, name.upper()) for name in names]
+
+    start_jd = swe.julday(args.start_year, 1, 1, 0.0)
+    end_jd = swe.julday(args.end_year, 1, 1, 0.0)
+
+    print(f"🌙 Construction table {names} {args.start_year}-{args.end_year}, pas {args.step_hours}h → {output}")
+    t0 = time.perf_counter()
+    table = build_ephemeris_table(output, bodies, start_jd, end_jd, args.step_hours / 24)
+    size_mb = os.path.getsize(output) / 1024 / 1024
+    print(f"💾 {table.data.shape[0]} échantillons, {size_mb:.1f} Mo en {time.perf_counter() - t0:.1f}s")
+
+    if args.validate <= 0:
+        return 0
+
+    report = validate_table(table, samples=args.validate)
+    ok = True
+    print(f"{'corps':<10}{'écart max (″)':>16}{'écart vitesse (°/j)':>22}")
+    for name, body in zip(names, bodies):
+        errors = report[body]
+        ok = ok and errors["max_longitude_arcsec"] < MAX_LONGITUDE_ERROR_ARCSEC
+        print(f"{name:<10}{errors['max_longitude_arcsec']:>16.4f}{errors['max_speed_error']:>22.6f}")
+
+    print("✅ Validation OK" if ok else f"❌ Écart > {MAX_LONGITUDE_ERROR_ARCSEC}″")
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
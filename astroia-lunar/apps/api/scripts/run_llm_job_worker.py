@@ -0,0 +1,46 @@
+#!/usr/bin/env python3
+"""
+Worker dédié de la file des générations LLM (table llm_generation_jobs)
+Usage: python scripts/run_llm_job_worker.py [nombre_de_workers]
+
+À utiliser avec LLM_JOB_WORKERS=0 côté API : les process web enfilent,
+ce process génère. Ctrl+C / SIGTERM : les jobs en cours repassent en file.
+"""
+
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import asyncio
+import logging
+import signal
+
+from config import settings
+from services import llm_job_queue
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+async def main(count: int) -> None:
+    stop = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(sig, stop.set)
+
+    logger.info(f"🚀 {count} worker(s) LLM (poll={settings.LLM_JOB_POLL_SECONDS}s, tentatives={settings.LLM_JOB_MAX_ATTEMPTS})")
+    workers = [asyncio.create_task(llm_job_queue.worker_loop(stop=stop)) for _ in range(count)]
+    await stop.wait()
+    for task in workers:
+        task.cancel()
+    await asyncio.gather(*workers, return_exceptions=True)
+    logger.info("👋 Workers LLM arrêtés")
+
+
+if __name__ == "__main__":
+    try:
+        count = int(sys.argv[1]) if len(sys.argv) > 1 else max(1, settings.LLM_JOB_WORKERS)
+    except ValueError:
+        logger.error(f"❌ Nombre de workers invalide: {sys.argv[1]}")
+        sys.exit(1)
+    asyncio.run(main(count))
@@ -15,9 +15,13 @@ import re
 from typing import Dict, Any, List, Optional, Tuple
 import hashlib
 from datetime import datetime
+from functools import lru_cache
 
 logger = logging.getLogger(__name__)
 
+# Markdowns distincts gardés parsés (matrice des aspects × versions)
+PARSED_COPY_CACHE_SIZE = 1024
+
 
 # === CHARGEMENT DB INTERPRÉTATIONS PRÉ-GÉNÉRÉES ===
 
@@ -30,7 +34,7 @@ async def load_pregenerated_aspect_interpretation(
     lang: str = 'fr'
 ) -> Optional[str]:
     """
-    Charge une interprétation pré-générée depuis la DB.
+    Charge une interprétation pré-générée (store en mémoire, sinon DB).
 
     Normalise les planètes en ordre alphabétique pour la symétrie.
 
@@ -39,16 +43,12 @@ async def load_pregenerated_aspect_interpretation(
     """
     from sqlalchemy import select
     from models.pregenerated_natal_aspect import PregeneratedNatalAspect
+    from services import interpretation_store
+    from services.interpretation_store import ASPECTS
 
-    # Normaliser en ordre alphabétique
-    p1_norm = planet1.lower().strip()
-    p2_norm = planet2.lower().strip()
-    if p1_norm > p2_norm:
-        p1_norm, p2_norm = p2_norm, p1_norm
-
-    aspect_norm = aspect_type.lower().strip()
+    p1_norm, p2_norm, aspect_norm = _aspect_key(planet1, planet2, aspect_type)
 
-    try:
+    async def fetch():
         result = await db_session.execute(
             select(PregeneratedNatalAspect).where(
                 PregeneratedNatalAspect.planet1 == p1_norm,
@@ -59,18 +59,109 @@ async def load_pregenerated_aspect_interpretation(
             )
         )
         row = result.scalar_one_or_none()
-        if row:
+        return row.content if row else None
+
+    try:
+        content = await interpretation_store.lookup(
+            ASPECTS, (p1_norm, p2_norm, aspect_norm, version, lang), lang, fetch
+        )
+        if content:
             logger.debug(f"[AspectDB] Trouvé: {p1_norm}-{p2_norm} {aspect_norm}")
-            return row.content
         else:
             logger.debug(f"[AspectDB] Non trouvé: {p1_norm}-{p2_norm} {aspect_norm}")
-            return None
+        return content
     except Exception as e:
         logger.warning(f"[AspectDB] Erreur chargement {p1_norm}-{p2_norm} {aspect_norm}: {e}")
         return None
 
 
+def _aspect_key(planet1: str, planet2: str, aspect_type: str) -> Tuple[str, str, str]:
+    """(planet1, planet2, aspect_type) normalisés, planètes en ordre alphabétique"""
+    p1_norm = planet1.lower().strip()
+    p2_norm = planet2.lower().strip()
+    if p1_norm > p2_norm:
+        p1_norm, p2_norm = p2_norm, p1_norm
+    return p1_norm, p2_norm, aspect_type.lower().strip()
+
+
+async def load_pregenerated_aspect_interpretations_batch(
+    aspect_keys: List[Tuple[str, str, str]],
+    db_session,
+    versions: Tuple[int, ...] = (5,),
+    lang: str = 'fr'
+) -> Dict[Tuple[str, str, str, int], str]:
+    """
+    Charge les interprétations pré-générées de plusieurs aspects en une requête.
+
+    Store en mémoire d'abord ; les clés manquantes (toutes versions confondues)
+    sont lues en un seul SELECT ... WHERE (planet1, planet2, aspect_type) IN (...).
+
+    Args:
+        aspect_keys: Clés normalisées (voir _aspect_key)
+        versions: Versions à charger (ex: (5, 2) pour v5 + fallback v4)
+
+    Returns:
+        {(planet1, planet2, aspect_type, version): markdown} pour les clés trouvées
+    """
+    from sqlalchemy import select, tuple_
+    from models.pregenerated_natal_aspect import PregeneratedNatalAspect
+    from services import interpretation_store
+    from services.interpretation_store import ASPECTS
+
+    store_keys = [
+        (p1, p2, aspect_type, version, lang)
+        for p1, p2, aspect_type in dict.fromkeys(aspect_keys)
+        for version in versions
+    ]
+    if not store_keys:
+        return {}
+
+    async def fetch_many(missing):
+        triples = list(dict.fromkeys(key[:3] for key in missing))
+        result = await db_session.execute(
+            select(
+                PregeneratedNatalAspect.planet1,
+                PregeneratedNatalAspect.planet2,
+                PregeneratedNatalAspect.aspect_type,
+                PregeneratedNatalAspect.version,
+                PregeneratedNatalAspect.content
+            ).where(
+                tuple_(
+                    PregeneratedNatalAspect.planet1,
+                    PregeneratedNatalAspect.planet2,
+                    PregeneratedNatalAspect.aspect_type
+                ).in_(triples),
+                PregeneratedNatalAspect.version.in_({key[3] for key in missing}),
+                PregeneratedNatalAspect.lang == lang
+            )
+        )
+        wanted = set(missing)
+        rows = {(p1, p2, aspect_type, version, lang): content for p1, p2, aspect_type, version, content in result.all()}
+        return {key: content for key, content in rows.items() if key in wanted}
+
+    try:
+        found = await interpretation_store.lookup_many(ASPECTS, store_keys, lang, fetch_many)
+    except Exception as e:
+        logger.warning(f"[AspectDB] Erreur chargement groupé ({len(store_keys)} clés): {e}")
+        return {}
+
+    logger.debug(f"[AspectDB] Chargement groupé: {len(found)}/{len(store_keys)} clés trouvées")
+    return {key[:4]: content for key, content in found.items()}
+
+
 def parse_markdown_to_copy(markdown_content: str) -> Dict[str, Any]:
+    """
+    Parse le markdown V2/V5 en format copy (mémoïsé, voir _parse_markdown_to_copy).
+
+    Returns:
+        Un dict neuf à chaque appel (l'appelant peut le modifier)
+    """
+    parsed = _parse_markdown_to_copy(markdown_content)
+    return {**parsed, 'why': list(parsed['why'])}
+
+
+@lru_cache(maxsize=PARSED_COPY_CACHE_SIZE)
+def _parse_markdown_to_copy(markdown_content: str) -> Dict[str, Any]:
     """
     Parse le markdown V2/V5 en format copy {summary, why[], manifestation, advice, shadow}.
 
@@ -865,9 +956,10 @@ async def enrich_aspects_v4_async(
     1. Filtrer aspects v4 (types majeurs + sextile, orbe ≤6°, exclure Lilith)
     2. Trier par orbe croissant
     3. Limiter à N aspects (default: 10)
-    4. Pour chaque aspect:
+    4. Charger les interprétations de tous les aspects en une requête (version + fallback v4)
+    5. Pour chaque aspect:
        - Calculer métadonnées (expectedAngle, actualAngle, placements)
-       - Charger copy depuis DB version spécifiée (fallback templates si non trouvé)
+       - Parser la copy depuis le markdown (fallback templates si non trouvé)
        - Ajouter ID unique (hash stable)
 
     Args:
@@ -889,12 +981,22 @@ async def enrich_aspects_v4_async(
     # 2. Limiter
     limited_aspects = filtered_aspects[:limit]
 
-    # 3. Enrichir avec DB-first
+    # 3. Charger toutes les interprétations en une fois (version demandée + fallback v4 si v5)
+    versions = (version, 2) if version >= 5 else (version,)
+    aspect_keys = [
+        _aspect_key(aspect.get('planet1', ''), aspect.get('planet2', ''), aspect.get('type', ''))
+        for aspect in limited_aspects
+    ]
+    markdowns = await load_pregenerated_aspect_interpretations_batch(
+        aspect_keys, db_session, versions=versions
+    )
+
+    # 4. Enrichir avec DB-first
     enriched = []
     db_hits = 0
     template_fallbacks = 0
 
-    for aspect in limited_aspects:
+    for aspect, aspect_key in zip(limited_aspects, aspect_keys):
         try:
             planet1 = aspect.get('planet1', '')
             planet2 = aspect.get('planet2', '')
@@ -903,37 +1005,18 @@ async def enrich_aspects_v4_async(
             # Calculer métadonnées
             metadata = calculate_aspect_metadata(aspect, planets_data)
 
-            # Essayer de charger depuis DB (version spécifiée)
-            markdown_content = await load_pregenerated_aspect_interpretation(
-                planet1, planet2, aspect_type, db_session, version=version
-            )
+            # Première version trouvée (v5 puis fallback v4), sinon templates génériques
+            markdown_version = next((v for v in versions if (*aspect_key, v) in markdowns), None)
 
-            if markdown_content:
-                # Parser le markdown en format copy
-                copy = parse_markdown_to_copy(markdown_content)
+            if markdown_version is not None:
+                # Parser le markdown en format copy (mémoïsé par contenu)
+                copy = parse_markdown_to_copy(markdowns[(*aspect_key, markdown_version)])
                 db_hits += 1
-                logger.debug(f"[AspectExplanation] DB hit v{version}: {planet1}-{planet2} {aspect_type}")
+                logger.debug(f"[AspectExplanation] DB hit v{markdown_version}: {planet1}-{planet2} {aspect_type}")
             else:
-                # Fallback intelligent: essayer v4 si on demandait v5
-                if version >= 5:
-                    logger.debug(f"[AspectExplanation] v5 non trouvé, essai fallback v4: {planet1}-{planet2} {aspect_type}")
-                    markdown_content = await load_pregenerated_aspect_interpretation(
-                        planet1, planet2, aspect_type, db_session, version=2
-                    )
-                    if markdown_content:
-                        copy = parse_markdown_to_copy(markdown_content)
-                        db_hits += 1
-                        logger.debug(f"[AspectExplanation] Fallback v4 OK: {planet1}-{planet2} {aspect_type}")
-                    else:
-                        # Dernier recours: templates génériques
-                        copy = build_aspect_explanation_v4(aspect, metadata)
-                        template_fallbacks += 1
-                        logger.debug(f"[AspectExplanation] Template fallback: {planet1}-{planet2} {aspect_type}")
-                else:
-                    # Version 2-4 demandée mais pas trouvée → templates
-                    copy = build_aspect_explanation_v4(aspect, metadata)
-                    template_fallbacks += 1
-                    logger.debug(f"[AspectExplanation] Template fallback: {planet1}-{planet2} {aspect_type}")
+                copy = build_aspect_explanation_v4(aspect, metadata)
+                template_fallbacks += 1
+                logger.debug(f"[AspectExplanation] Template fallback: {planet1}-{planet2} {aspect_type}")
 
             # Générer ID unique (hash stable basé sur planet1+planet2+type)
             aspect_id = hashlib.md5(
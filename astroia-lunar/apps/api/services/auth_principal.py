@@ -0,0 +1,220 @@
+"""
+Principal authentifié (routes/auth.get_current_user)
+
+get_current_user ne charge plus User + NatalChart (positions JSONB complet) à
+chaque requête : il résout un UserPrincipal léger (id, email, flags, id du thème,
+longitude de la Lune natale), lu en une requête ciblée puis gardé en cache
+mémoire par process (LRU borné à AUTH_PRINCIPAL_CACHE_MAX_ENTRIES, TTL court
+AUTH_PRINCIPAL_CACHE_TTL_SECONDS).
+
+Invalidation : toute écriture ORM d'un User ou d'un NatalChart (insert, update,
+delete) retire le principal du cache au flush puis au commit (listeners
+SQLAlchemy en bas de module). Les autres workers se resynchronisent au plus
+tard après le TTL.
+
+Les routes qui ont besoin de l'objet User (écriture, profil) ou du thème complet
+le déclarent via routes/auth.get_current_user_model / get_current_user_with_natal_chart.
+"""
+
+import logging
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Dict, Optional, Set, Tuple
+
+from prometheus_client import Counter
+from sqlalchemy import event, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, object_session
+
+from config import settings
+from models.natal_chart import NatalChart
+from models.user import User
+from services.lunar_returns_service import _sign_degree_to_longitude
+
+logger = logging.getLogger(__name__)
+
+auth_principal_cache_requests_total = Counter(
+    'auth_principal_cache_requests_total',
+    'Authenticated principal resolutions',
+    ['result']  # result: 'hit' | 'miss' | 'not_found'
+)
+
+
+@dataclass(frozen=True)
+class UserPrincipal:
+    """Utilisateur authentifié, sans relations ni JSONB (sûr à partager entre requêtes)"""
+    id: int
+    email: str
+    is_active: bool = True
+    is_premium: bool = False
+    auth_provider: Optional[str] = None
+    dev_external_id: Optional[str] = None
+    natal_chart_id: Optional[str] = None
+    natal_moon_longitude: Optional[float] = None  # Longitude écliptique absolue (0-360)
+
+    @property
+    def has_natal_chart(self) -> bool:
+        return self.natal_chart_id is not None
+
+
+# {user_id: (expire_at, UserPrincipal)}, ordre = récence d'accès
+_PRINCIPALS: "OrderedDict[int, Tuple[float, UserPrincipal]]" = OrderedDict()
+_LOCK = threading.Lock()
+_STATS = {"hits": 0, "misses": 0, "invalidations": 0}
+
+
+def natal_moon_longitude(moon: Optional[Dict[str, Any]]) -> Optional[float]:
+    """Longitude absolue depuis positions['moon'] ({"sign": "Taurus", "degree": 12.5}) ; None si illisible"""
+    if not isinstance(moon, dict) or not moon.get("sign") or moon.get("degree") is None:
+        return None
+    try:
+        return round(_sign_degree_to_longitude(moon["sign"], float(moon["degree"])), 4)
+    except (ValueError, TypeError):
+        return None
+
+
+async def load_principal(db: AsyncSession, user_id: int) -> Optional[UserPrincipal]:
+    """Une requête : colonnes du User + id du thème + positions['moon'] (sans le JSONB complet)"""
+    result = await db.execute(
+        select(
+            User.id,
+            User.email,
+            User.is_active,
+            User.is_premium,
+            User.auth_provider,
+            User.dev_external_id,
+            NatalChart.id,
+            NatalChart.positions["moon"],
+        )
+        .outerjoin(NatalChart, NatalChart.user_id == User.id)
+        .where(User.id == user_id)
+    )
+    row = result.first()
+    if row is None:
+        return None
+
+    id_, email, is_active, is_premium, auth_provider, dev_external_id, chart_id, moon = row
+    return UserPrincipal(
+        id=id_,
+        email=email,
+        is_active=is_active is not False,
+        is_premium=bool(is_premium),
+        auth_provider=auth_provider,
+        dev_external_id=dev_external_id,
+        natal_chart_id=str(chart_id) if chart_id is not None else None,
+        natal_moon_longitude=natal_moon_longitude(moon),
+    )
+
+
+def get_cached_principal(user_id: int) -> Optional[UserPrincipal]:
+    with _LOCK:
+        entry = _PRINCIPALS.get(user_id)
+        if entry is None or entry[0] <= time.monotonic():
+            if entry is not None:
+                del _PRINCIPALS[user_id]
+            return None
+        _PRINCIPALS.move_to_end(user_id)
+        return entry[1]
+
+
+def store_principal(principal: UserPrincipal) -> None:
+    if settings.AUTH_PRINCIPAL_CACHE_TTL_SECONDS <= 0:
+        return
+    with _LOCK:
+        _PRINCIPALS[principal.id] = (time.monotonic() + settings.AUTH_PRINCIPAL_CACHE_TTL_SECONDS, principal)
+        _PRINCIPALS.move_to_end(principal.id)
+        while len(_PRINCIPALS) > settings.AUTH_PRINCIPAL_CACHE_MAX_ENTRIES:
+            _PRINCIPALS.popitem(last=False)
+
+
+async def resolve_principal(db: AsyncSession, user_id: int) -> Optional[UserPrincipal]:
+    """
+    Principal de user_id : cache mémoire, sinon requête ciblée (mise en cache)
+
+    Returns:
+        UserPrincipal ou None si le user n'existe pas (jamais mis en cache)
+    """
+    principal = get_cached_principal(user_id)
+    if principal is not None:
+        auth_principal_cache_requests_total.labels(result='hit').inc()
+        with _LOCK:
+            _STATS["hits"] += 1
+        return principal
+
+    principal = await load_principal(db, user_id)
+    with _LOCK:
+        _STATS["misses"] += 1
+    if principal is None:
+        auth_principal_cache_requests_total.labels(result='not_found').inc()
+        return None
+
+    auth_principal_cache_requests_total.labels(result='miss').inc()
+    store_principal(principal)
+    return principal
+
+
+def invalidate_principal(user_id: Optional[int]) -> None:
+    if user_id is None:
+        return
+    with _LOCK:
+        if _PRINCIPALS.pop(user_id, None) is not None:
+            _STATS["invalidations"] += 1
+
+
+def get_cache_stats() -> Dict[str, Any]:
+    with _LOCK:
+        stats = dict(_STATS, size=len(_PRINCIPALS))
+    lookups = stats["hits"] + stats["misses"]
+    return {
+        **stats,
+        "max_entries": settings.AUTH_PRINCIPAL_CACHE_MAX_ENTRIES,
+        "ttl_seconds": settings.AUTH_PRINCIPAL_CACHE_TTL_SECONDS,
+        "hit_rate": round(stats["hits"] / lookups, 3) if lookups else None,
+    }
+
+
+def clear_cache() -> None:
+    with _LOCK:
+        _PRINCIPALS.clear()
+        for key in _STATS:
+            _STATS[key] = 0
+
+
+# === INVALIDATION SUR ÉCRITURE (User, NatalChart) ===
+
+_PENDING_KEY = "auth_principal_invalidations"
+
+
+def _on_write(user_id: Optional[int], target: Any) -> None:
+    # Immédiat (flush) puis au commit : couvre une lecture concurrente entre les deux
+    invalidate_principal(user_id)
+    session = object_session(target)
+    if session is not None and user_id is not None:
+        pending: Set[int] = session.info.setdefault(_PENDING_KEY, set())
+        pending.add(user_id)
+
+
+def _on_user_write(mapper, connection, target: User) -> None:
+    _on_write(target.id, target)
+
+
+def _on_natal_chart_write(mapper, connection, target: NatalChart) -> None:
+    _on_write(target.user_id, target)
+
+
+def _on_commit(session: Session) -> None:
+    for user_id in session.info.pop(_PENDING_KEY, ()):
+        invalidate_principal(user_id)
+
+
+def _on_rollback(session: Session, previous_transaction: Any) -> None:
+    session.info.pop(_PENDING_KEY, None)
+
+
+for _event in ("after_insert", "after_update", "after_delete"):
+    event.listen(User, _event, _on_user_write)
+    event.listen(NatalChart, _event, _on_natal_chart_write)
+event.listen(Session, "after_commit", _on_commit)
+event.listen(Session, "after_soft_rollback", _on_rollback)
@@ -0,0 +1,505 @@
+"""
+Cache partagé entre workers uvicorn (second niveau derrière les caches dict)
+
+Les caches des services (moon_position, daily_climate, VoC) restent des dicts
+de module (premier niveau, sans I/O). Sur un miss, ils consultent ce backend
+avant de recalculer, et y publient leur résultat : avec N workers, un seul
+calcul alimente tous les process.
+
+Backends (settings.CACHE_BACKEND) :
+- memory : LRU par process (comportement mono-worker, défaut)
+- sqlite : fichier WAL partagé par les workers d'une machine, sans service externe
+- redis  : optionnel (package redis), partagé entre machines
+
+Valeurs sérialisées en JSON (orjson si installé). Les compteurs hits/misses/sets
+sont agrégés dans le backend lui-même : stats() couvre tous les workers.
+Une panne du backend n'échoue jamais une requête (miss + warning).
+
+Depuis du code async, utiliser aget/aset/adelete_namespace/astats : les
+backends sqlite et redis font des I/O bloquantes, exécutées hors de l'event loop.
+"""
+
+import asyncio
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Callable, Dict, List, NamedTuple, Optional, Tuple
+
+from prometheus_client import Counter
+
+from config import settings
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import redis
+    REDIS_AVAILABLE = True
+except ImportError:
+    REDIS_AVAILABLE = False
+    redis = None
+
+logger = logging.getLogger(__name__)
+
+# Compteurs locaux poussés vers le backend toutes les N opérations (ou à stats())
+STATS_FLUSH_EVERY = 100
+
+# === MÉTRIQUES PROMETHEUS - CACHE PARTAGÉ (par process) ===
+
+shared_cache_operations_total = Counter(
+    'shared_cache_operations_total',
+    'Shared cache backend operations',
+    ['backend', 'operation', 'result']  # result: 'hit' | 'miss' | 'ok' | 'error'
+)
+
+
+def dumps(value: Any) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(value)
+    return json.dumps(value, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+
+
+def loads(data: bytes) -> Any:
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+class CacheEntry(NamedTuple):
+    value: Any
+    stored_at: float  # Unix time du calcul (l'âge est le même pour tous les workers)
+
+
+def _namespace(key: str) -> str:
+    return key.split(":", 1)[0]
+
+
+class CacheBackend(ABC):
+    """
+    Interface des backends ; clés "namespace:clé" (ex: "voc_status:default")
+
+    Les sous-classes implémentent _get/_set/_delete/_delete_namespace/_clear,
+    _flush_stats et _read_stats ; les erreurs sont absorbées ici.
+    """
+
+    name = "base"
+    # I/O bloquantes (fichier, réseau) : les méthodes async passent par un thread
+    blocking = True
+
+    def __init__(self):
+        self._pending: Dict[str, Dict[str, int]] = {}
+        self._pending_ops = 0
+        self._stats_lock = threading.Lock()
+
+    # --- API publique ---
+
+    def get(self, key: str) -> Optional[CacheEntry]:
+        try:
+            entry = self._get(key, time.time())
+        except Exception as e:
+            self._error("get", e)
+            return None
+        result = 'hit' if entry is not None else 'miss'
+        shared_cache_operations_total.labels(backend=self.name, operation='get', result=result).inc()
+        self._count(_namespace(key), "hits" if entry is not None else "misses")
+        return entry
+
+    def set(self, key: str, value: Any, ttl: float, stored_at: Optional[float] = None) -> None:
+        stored_at = stored_at or time.time()
+        try:
+            self._set(key, dumps(value), stored_at, stored_at + ttl)
+        except Exception as e:
+            self._error("set", e)
+            return
+        shared_cache_operations_total.labels(backend=self.name, operation='set', result='ok').inc()
+        self._count(_namespace(key), "sets")
+
+    def delete(self, key: str) -> None:
+        try:
+            self._delete(key)
+        except Exception as e:
+            self._error("delete", e)
+
+    def delete_namespace(self, namespace: str) -> None:
+        try:
+            self._delete_namespace(namespace)
+        except Exception as e:
+            self._error("delete", e)
+
+    def clear(self) -> None:
+        with self._stats_lock:
+            self._pending = {}
+            self._pending_ops = 0
+        try:
+            self._clear()
+        except Exception as e:
+            self._error("clear", e)
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Statistiques agrégées (tous les workers pour sqlite/redis)
+
+        Returns:
+            {"backend": str, "entries": int, "namespaces": {ns: {"hits", "misses", "sets", "hit_rate"}}}
+        """
+        self._flush()
+        try:
+            entries, counters = self._read_stats(time.time())
+        except Exception as e:
+            self._error("stats", e)
+            return {"backend": self.name, "error": str(e)}
+
+        namespaces = {}
+        for namespace, counts in sorted(counters.items()):
+            lookups = counts.get("hits", 0) + counts.get("misses", 0)
+            namespaces[namespace] = {
+                "hits": counts.get("hits", 0),
+                "misses": counts.get("misses", 0),
+                "sets": counts.get("sets", 0),
+                "hit_rate": round(counts.get("hits", 0) / lookups, 3) if lookups else None,
+            }
+        return {"backend": self.name, "entries": entries, "namespaces": namespaces}
+
+    def close(self) -> None:
+        self._flush()
+
+    # --- API async (event loop) ---
+
+    async def aget(self, key: str) -> Optional[CacheEntry]:
+        return await self._off_loop(self.get, key)
+
+    async def aset(self, key: str, value: Any, ttl: float, stored_at: Optional[float] = None) -> None:
+        await self._off_loop(self.set, key, value, ttl, stored_at)
+
+    async def adelete(self, key: str) -> None:
+        await self._off_loop(self.delete, key)
+
+    async def adelete_namespace(self, namespace: str) -> None:
+        await self._off_loop(self.delete_namespace, namespace)
+
+    async def astats(self) -> Dict[str, Any]:
+        return await self._off_loop(self.stats)
+
+    async def _off_loop(self, fn: Callable[..., Any], *args: Any) -> Any:
+        if not self.blocking:
+            return fn(*args)
+        return await asyncio.to_thread(fn, *args)
+
+    # --- compteurs ---
+
+    def _count(self, namespace: str, field: str) -> None:
+        with self._stats_lock:
+            counts = self._pending.setdefault(namespace, {})
+            counts[field] = counts.get(field, 0) + 1
+            self._pending_ops += 1
+            should_flush = self._pending_ops >= STATS_FLUSH_EVERY
+        if should_flush:
+            self._flush()
+
+    def _flush(self) -> None:
+        with self._stats_lock:
+            pending, self._pending, self._pending_ops = self._pending, {}, 0
+        if not pending:
+            return
+        try:
+            self._flush_stats(pending)
+        except Exception as e:
+            self._error("stats", e)
+
+    def _error(self, operation: str, error: Exception) -> None:
+        shared_cache_operations_total.labels(backend=self.name, operation=operation, result='error').inc()
+        logger.warning(f"[SharedCache:{self.name}] ⚠️ {operation} impossible: {error}")
+
+    # --- à implémenter ---
+
+    @abstractmethod
+    def _get(self, key: str, now: float) -> Optional[CacheEntry]:
+        ...
+
+    @abstractmethod
+    def _set(self, key: str, payload: bytes, stored_at: float, expires_at: float) -> None:
+        ...
+
+    @abstractmethod
+    def _delete(self, key: str) -> None:
+        ...
+
+    @abstractmethod
+    def _delete_namespace(self, namespace: str) -> None:
+        ...
+
+    @abstractmethod
+    def _clear(self) -> None:
+        ...
+
+    @abstractmethod
+    def _flush_stats(self, pending: Dict[str, Dict[str, int]]) -> None:
+        ...
+
+    @abstractmethod
+    def _read_stats(self, now: float) -> Tuple[int, Dict[str, Dict[str, int]]]:
+        ...
+
+
+class MemoryCacheBackend(CacheBackend):
+    """LRU en mémoire du process (valeurs sérialisées : mêmes copies que les autres backends)"""
+
+    name = "memory"
+    blocking = False
+
+    def __init__(self, max_entries: int = 1024):
+        super().__init__()
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()
+        self._counters: Dict[str, Dict[str, int]] = {}
+        self._lock = threading.Lock()
+
+    def _get(self, key, now):
+        with self._lock:
+            item = self._entries.get(key)
+            if item is None:
+                return None
+            payload, stored_at, expires_at = item
+            if expires_at <= now:
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+        return CacheEntry(loads(payload), stored_at)
+
+    def _set(self, key, payload, stored_at, expires_at):
+        with self._lock:
+            self._entries[key] = (payload, stored_at, expires_at)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def _delete(self, key):
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def _delete_namespace(self, namespace):
+        with self._lock:
+            for key in [k for k in self._entries if _namespace(k) == namespace]:
+                del self._entries[key]
+
+    def _clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._counters = {}
+
+    def _flush_stats(self, pending):
+        with self._lock:
+            for namespace, counts in pending.items():
+                totals = self._counters.setdefault(namespace, {})
+                for field, count in counts.items():
+                    totals[field] = totals.get(field, 0) + count
+
+    def _read_stats(self, now):
+        with self._lock:
+            entries = sum(1 for _, _, expires_at in self._entries.values() if expires_at > now)
+            return entries, {ns: dict(counts) for ns, counts in self._counters.items()}
+
+
+class SQLiteCacheBackend(CacheBackend):
+    """Fichier SQLite (WAL) partagé par les workers d'une même machine"""
+
+    name = "sqlite"
+
+    def __init__(self, path: str):
+        super().__init__()
+        self.path = path
+        self._local = threading.local()
+        # Connexions ouvertes par les threads du process (fermées par close())
+        self._connections: List[Tuple[int, sqlite3.Connection]] = []
+        self._connections_lock = threading.Lock()
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        with self._connection() as conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS cache_entries ("
+                "key TEXT PRIMARY KEY, value BLOB NOT NULL, stored_at REAL NOT NULL, expires_at REAL NOT NULL)"
+            )
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS cache_stats ("
+                "namespace TEXT NOT NULL, field TEXT NOT NULL, count INTEGER NOT NULL DEFAULT 0, "
+                "PRIMARY KEY (namespace, field))"
+            )
+
+    def _connection(self) -> sqlite3.Connection:
+        # Une connexion par thread et par process (jamais héritée d'un fork)
+        conn = getattr(self._local, "conn", None)
+        if conn is None or getattr(self._local, "pid", None) != os.getpid():
+            # check_same_thread=False : utilisée par un seul thread, mais fermée par close()
+            conn = sqlite3.connect(self.path, timeout=1.0, isolation_level=None, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+            self._local.pid = os.getpid()
+            with self._connections_lock:
+                self._connections.append((os.getpid(), conn))
+        return conn
+
+    def _get(self, key, now):
+        row = self._connection().execute(
+            "SELECT value, stored_at FROM cache_entries WHERE key = ? AND expires_at > ?", (key, now)
+        ).fetchone()
+        return CacheEntry(loads(row[0]), row[1]) if row else None
+
+    def _set(self, key, payload, stored_at, expires_at):
+        conn = self._connection()
+        conn.execute(
+            "INSERT INTO cache_entries (key, value, stored_at, expires_at) VALUES (?, ?, ?, ?) "
+            "ON CONFLICT(key) DO UPDATE SET value = excluded.value, stored_at = excluded.stored_at, "
+            "expires_at = excluded.expires_at",
+            (key, payload, stored_at, expires_at)
+        )
+        # Purge opportuniste des entrées expirées
+        conn.execute("DELETE FROM cache_entries WHERE expires_at <= ?", (stored_at,))
+
+    def _delete(self, key):
+        self._connection().execute("DELETE FROM cache_entries WHERE key = ?", (key,))
+
+    def _delete_namespace(self, namespace):
+        self._connection().execute("DELETE FROM cache_entries WHERE key LIKE ?", (f"{namespace}:%",))
+
+    def _clear(self):
+        conn = self._connection()
+        conn.execute("DELETE FROM cache_entries")
+        conn.execute("DELETE FROM cache_stats")
+
+    def _flush_stats(self, pending):
+        self._connection().executemany(
+            "INSERT INTO cache_stats (namespace, field, count) VALUES (?, ?, ?) "
+            "ON CONFLICT(namespace, field) DO UPDATE SET count = count + excluded.count",
+            [(namespace, field, count) for namespace, counts in pending.items() for field, count in counts.items()]
+        )
+
+    def _read_stats(self, now):
+        conn = self._connection()
+        entries = conn.execute("SELECT COUNT(*) FROM cache_entries WHERE expires_at > ?", (now,)).fetchone()[0]
+        counters: Dict[str, Dict[str, int]] = {}
+        for namespace, field, count in conn.execute("SELECT namespace, field, count FROM cache_stats"):
+            counters.setdefault(namespace, {})[field] = count
+        return entries, counters
+
+    def close(self):
+        super().close()
+        with self._connections_lock:
+            connections, self._connections = self._connections, []
+        for pid, conn in connections:
+            if pid == os.getpid():
+                conn.close()
+        self._local = threading.local()
+
+
+class RedisCacheBackend(CacheBackend):
+    """Redis (optionnel) : partagé entre machines, expiration native"""
+
+    name = "redis"
+    PREFIX = "astroia:cache:"
+    STATS_KEY = "astroia:cache_stats"
+
+    def __init__(self, url: str):
+        super().__init__()
+        if not REDIS_AVAILABLE:
+            raise ImportError("Le backend redis nécessite le package redis. Installez-le avec: pip install redis")
+        self._client = redis.Redis.from_url(url, socket_timeout=0.1, socket_connect_timeout=0.5)
+
+    def _get(self, key, now):
+        payload = self._client.get(self.PREFIX + key)
+        if payload is None:
+            return None
+        stored_at, value = loads(payload)
+        return CacheEntry(value, stored_at)
+
+    def _set(self, key, payload, stored_at, expires_at):
+        # Enveloppe [stored_at, valeur] : l'âge reste cohérent entre workers
+        envelope = b"[" + dumps(stored_at) + b"," + payload + b"]"
+        self._client.set(self.PREFIX + key, envelope, px=max(1, int((expires_at - time.time()) * 1000)))
+
+    def _delete(self, key):
+        self._client.delete(self.PREFIX + key)
+
+    def _delete_namespace(self, namespace):
+        keys = list(self._client.scan_iter(match=f"{self.PREFIX}{namespace}:*"))
+        if keys:
+            self._client.delete(*keys)
+
+    def _clear(self):
+        keys = list(self._client.scan_iter(match=f"{self.PREFIX}*"))
+        if keys:
+            self._client.delete(*keys)
+        self._client.delete(self.STATS_KEY)
+
+    def _flush_stats(self, pending):
+        pipe = self._client.pipeline(transaction=False)
+        for namespace, counts in pending.items():
+            for field, count in counts.items():
+                pipe.hincrby(self.STATS_KEY, f"{namespace}:{field}", count)
+        pipe.execute()
+
+    def _read_stats(self, now):
+        entries = sum(1 for _ in self._client.scan_iter(match=f"{self.PREFIX}*"))
+        counters: Dict[str, Dict[str, int]] = {}
+        for name, count in self._client.hgetall(self.STATS_KEY).items():
+            namespace, field = name.decode().rsplit(":", 1)
+            counters.setdefault(namespace, {})[field] = int(count)
+        return entries, counters
+
+
+_BACKEND: Optional[CacheBackend] = None
+_BACKEND_LOCK = threading.Lock()
+
+
+def _sqlite_path() -> str:
+    path = Path(settings.CACHE_SQLITE_PATH)
+    if not path.is_absolute():
+        path = Path(__file__).parent.parent / path
+    return str(path)
+
+
+def create_cache_backend(kind: Optional[str] = None) -> CacheBackend:
+    """
+    Construit le backend configuré (settings.CACHE_BACKEND par défaut)
+
+    Redis indisponible (package absent) : repli sur memory avec un warning.
+    """
+    kind = (kind or settings.CACHE_BACKEND).lower()
+    if kind == "sqlite":
+        return SQLiteCacheBackend(_sqlite_path())
+    if kind == "redis":
+        try:
+            return RedisCacheBackend(settings.CACHE_REDIS_URL)
+        except ImportError as e:
+            logger.warning(f"[SharedCache] ⚠️ {e} - repli sur le backend memory")
+    elif kind != "memory":
+        logger.warning(f"[SharedCache] ⚠️ CACHE_BACKEND inconnu '{kind}' - backend memory")
+    return MemoryCacheBackend(settings.CACHE_MEMORY_MAX_ENTRIES)
+
+
+def get_cache_backend() -> CacheBackend:
+    """Backend partagé du process (créé au premier appel, après le fork des workers)"""
+    global _BACKEND
+    if _BACKEND is not None:
+        return _BACKEND
+
+    with _BACKEND_LOCK:
+        if _BACKEND is None:
+            _BACKEND = create_cache_backend()
+            logger.info(f"[SharedCache] ✅ Backend {_BACKEND.name}")
+    return _BACKEND
+
+
+def set_cache_backend(backend: Optional[CacheBackend]) -> None:
+    """Remplace le backend du process (tests). None = recréé au prochain accès"""
+    global _BACKEND
+    if _BACKEND is not None and _BACKEND is not backend:
+        _BACKEND.close()
+    _BACKEND = backend
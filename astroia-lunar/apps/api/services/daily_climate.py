@@ -6,11 +6,15 @@ Service pour générer le Daily Lunar Climate
 """
 
 import logging
-from typing import Dict, Any
+from typing import Dict, Any, Optional
 from datetime import datetime, timezone, date
 import hashlib
 
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from services.cache_backend import CacheEntry, get_cache_backend
 from services.moon_position import get_current_moon_position
+from services.single_flight import SingleFlight
 
 logger = logging.getLogger(__name__)
 
@@ -20,6 +24,12 @@ _CACHE: Dict[str, Any] = {
     "data": None,
 }
 
+# Un seul calcul par date en cours (get_daily_climate_async)
+DAILY_CLIMATE_FLIGHT = SingleFlight("daily_climate")
+
+# Durée de vie dans le cache partagé entre workers (clé "daily_climate:<date>")
+DAILY_CLIMATE_SHARED_TTL = 86400
+
 # Mapping déterministe: (sign, phase) -> insights templates
 # Chaque combinaison a plusieurs variations pour enrichir
 INSIGHT_TEMPLATES = {
@@ -784,17 +794,86 @@ def get_daily_climate() -> Dict[str, Any]:
     # Date actuelle (UTC) au format YYYY-MM-DD
     current_date = date.today().isoformat()
 
-    # Vérifier le cache
-    if _CACHE["date"] == current_date and _CACHE["data"] is not None:
-        logger.info(f"[DailyClimate] ✅ Cache hit (date: {current_date})")
-        return _CACHE["data"]
+    # Vérifier le cache (process puis partagé)
+    cached = _get_cached_climate(current_date)
+    if cached is not None:
+        return cached
 
     # Cache miss ou nouvelle date
     logger.info(f"[DailyClimate] 🔄 Cache miss, génération insight (date: {current_date})")
 
     # Récupérer position lunaire actuelle (avec son propre cache 5min)
-    moon_position = get_current_moon_position()
+    result = _build_daily_climate(current_date, get_current_moon_position())
+    get_cache_backend().set(_shared_key(current_date), result, DAILY_CLIMATE_SHARED_TTL)
+    return result
+
+
+async def get_daily_climate_async(db: Optional[AsyncSession] = None) -> Dict[str, Any]:
+    """
+    get_daily_climate sans bloquer l'event loop, un seul calcul par date
+
+    La position lunaire vient de l'instantané du ciel de l'heure (db fournie)
+    ou est calculée dans le pool d'éphémérides ; les requêtes concurrentes
+    d'un cache froid (changement de date, déploiement) attendent le même calcul.
+    """
+    from database import detached_session
+    from services.ephemeris_executor import get_current_moon_position_async
+    from services.sky_snapshot_service import get_current_moon_position
+
+    current_date = date.today().isoformat()
+    cached = _get_process_climate(current_date)
+    if cached is None:
+        cached = _adopt_shared_climate(current_date, await get_cache_backend().aget(_shared_key(current_date)))
+    if cached is not None:
+        return cached
+
+    async def compute() -> Dict[str, Any]:
+        logger.info(f"[DailyClimate] 🔄 Cache miss, génération insight (date: {current_date})")
+        if db is None:
+            moon = await get_current_moon_position_async()
+        else:
+            # Session propre : le calcul survit à l'annulation de la requête leader
+            async with detached_session(db) as session:
+                moon = await get_current_moon_position(session)
+        result = _build_daily_climate(current_date, moon)
+        await get_cache_backend().aset(_shared_key(current_date), result, DAILY_CLIMATE_SHARED_TTL)
+        return result
+
+    return await DAILY_CLIMATE_FLIGHT.do(current_date, compute)
+
+
+def _shared_key(current_date: str) -> str:
+    return f"{DAILY_CLIMATE_FLIGHT.name}:{current_date}"
+
+
+def _get_cached_climate(current_date: str) -> Optional[Dict[str, Any]]:
+    """Climat du jour du cache du process, sinon celui publié par un autre worker"""
+    cached = _get_process_climate(current_date)
+    if cached is not None:
+        return cached
+    return _adopt_shared_climate(current_date, get_cache_backend().get(_shared_key(current_date)))
+
+
+def _get_process_climate(current_date: str) -> Optional[Dict[str, Any]]:
+    if _CACHE["date"] == current_date and _CACHE["data"] is not None:
+        logger.info(f"[DailyClimate] ✅ Cache hit (date: {current_date})")
+        return _CACHE["data"]
+    return None
+
+
+def _adopt_shared_climate(current_date: str, entry: Optional[CacheEntry]) -> Optional[Dict[str, Any]]:
+    """Reprend le climat publié par un autre worker dans le cache du process"""
+    if entry is None:
+        return None
+
+    _CACHE["date"] = current_date
+    _CACHE["data"] = entry.value
+    logger.info(f"[DailyClimate] ✅ Cache partagé hit (date: {current_date})")
+    return entry.value
+
 
+def _build_daily_climate(current_date: str, moon_position: Dict[str, Any]) -> Dict[str, Any]:
+    """Construit le climat du jour et met le cache du process à jour (publication par l'appelant)"""
     # Générer insight déterministe
     insight = _get_deterministic_insight(
         current_date,
@@ -829,4 +908,5 @@ def clear_cache():
     global _CACHE
     _CACHE["date"] = None
     _CACHE["data"] = None
+    get_cache_backend().delete_namespace(DAILY_CLIMATE_FLIGHT.name)
     logger.info("[DailyClimate] 🗑️ Cache effacé")
@@ -7,6 +7,7 @@ import httpx
 from typing import Dict, Any, Optional
 from datetime import datetime, timedelta
 from config import settings
+from services import http_client
 import logging
 
 from utils.api_key_validator import is_configured_api_key
@@ -34,6 +35,12 @@ class EphemerisClient:
             else:
                 logger.warning("⚠️ EPHEMERIS_API_KEY non configurée ou placeholder - configurez-la ou activez DEV_MOCK_EPHEMERIS=1")
     
+    def _headers(self) -> Dict[str, str]:
+        return {
+            "Authorization": f"Bearer {self.api_key}",
+            "Content-Type": "application/json"
+        }
+
     async def calculate_natal_chart(
         self,
         date: str,  # YYYY-MM-DD
@@ -82,28 +89,26 @@ class EphemerisClient:
             "house_system": "placidus"  # Système de maisons standard
         }
         
-        async with httpx.AsyncClient(timeout=30.0) as client:
-            try:
-                response = await client.post(
-                    f"{self.base_url}/natal-chart",
-                    json=payload,
-                    headers={
-                        "Authorization": f"Bearer {self.api_key}",
-                        "Content-Type": "application/json"
-                    }
-                )
-                response.raise_for_status()
-                data = response.json()
-                
-                # Normaliser le format de réponse pour garantir cohérence
-                normalized_data = self._normalize_natal_chart_response(data)
-                
-                logger.info(f"✅ Thème natal calculé pour {birth_datetime}")
-                return normalized_data
-                
-            except httpx.HTTPError as e:
-                logger.error(f"❌ Erreur Ephemeris API: {e}")
-                raise Exception(f"Erreur calcul thème natal: {str(e)}")
+        try:
+            response = await http_client.post(
+                "ephemeris",
+                f"{self.base_url}/natal-chart",
+                endpoint="/natal-chart",
+                json=payload,
+                headers=self._headers()
+            )
+            response.raise_for_status()
+            data = response.json()
+
+            # Normaliser le format de réponse pour garantir cohérence
+            normalized_data = self._normalize_natal_chart_response(data)
+
+            logger.info(f"✅ Thème natal calculé pour {birth_datetime}")
+            return normalized_data
+
+        except (httpx.HTTPError, http_client.CircuitOpenError) as e:
+            logger.error(f"❌ Erreur Ephemeris API: {e}")
+            raise Exception(f"Erreur calcul thème natal: {str(e)}")
     
     async def calculate_lunar_return(
         self,
@@ -135,7 +140,9 @@ class EphemerisClient:
         if self.mock_mode:
             logger.info("🎭 DEV_MOCK_EPHEMERIS activé - utilisation de Swiss Ephemeris local")
             from utils.ephemeris_mock import generate_mock_lunar_return
-            return generate_mock_lunar_return(
+            from services.ephemeris_executor import run_ephemeris
+            return await run_ephemeris(
+                generate_mock_lunar_return,
                 natal_moon_degree, natal_moon_sign, target_month,
                 birth_latitude, birth_longitude, timezone
             )
@@ -166,28 +173,26 @@ class EphemerisClient:
             "house_system": "placidus"
         }
         
-        async with httpx.AsyncClient(timeout=30.0) as client:
-            try:
-                response = await client.post(
-                    f"{self.base_url}/lunar-return",
-                    json=payload,
-                    headers={
-                        "Authorization": f"Bearer {self.api_key}",
-                        "Content-Type": "application/json"
-                    }
-                )
-                response.raise_for_status()
-                data = response.json()
-                
-                logger.info(f"✅ Révolution lunaire calculée pour {target_month}")
-                return data
-                
-            except httpx.HTTPError as e:
-                logger.error(f"❌ Erreur Ephemeris API: {e}")
-                # Fallback si l'API ne supporte pas lunar-return directement
-                return await self._calculate_lunar_return_fallback(
-                    estimate_date, birth_latitude, birth_longitude, timezone
-                )
+        try:
+            response = await http_client.post(
+                "ephemeris",
+                f"{self.base_url}/lunar-return",
+                endpoint="/lunar-return",
+                json=payload,
+                headers=self._headers()
+            )
+            response.raise_for_status()
+            data = response.json()
+
+            logger.info(f"✅ Révolution lunaire calculée pour {target_month}")
+            return data
+
+        except httpx.HTTPError as e:
+            logger.error(f"❌ Erreur Ephemeris API: {e}")
+            # Fallback si l'API ne supporte pas lunar-return directement
+            return await self._calculate_lunar_return_fallback(
+                estimate_date, birth_latitude, birth_longitude, timezone
+            )
     
     async def _calculate_lunar_return_fallback(
         self,
@@ -211,17 +216,15 @@ class EphemerisClient:
             "house_system": "placidus"
         }
         
-        async with httpx.AsyncClient(timeout=30.0) as client:
-            response = await client.post(
-                f"{self.base_url}/chart",
-                json=payload,
-                headers={
-                    "Authorization": f"Bearer {self.api_key}",
-                    "Content-Type": "application/json"
-                }
-            )
-            response.raise_for_status()
-            return response.json()
+        response = await http_client.post(
+            "ephemeris",
+            f"{self.base_url}/chart",
+            endpoint="/chart",
+            json=payload,
+            headers=self._headers()
+        )
+        response.raise_for_status()
+        return response.json()
     
     def _normalize_natal_chart_response(self, api_response: Dict[str, Any]) -> Dict[str, Any]:
         """
@@ -341,17 +344,16 @@ class EphemerisClient:
             "planet": "Moon"
         }
         
-        async with httpx.AsyncClient(timeout=15.0) as client:
-            response = await client.post(
-                f"{self.base_url}/planet-position",
-                json=payload,
-                headers={
-                    "Authorization": f"Bearer {self.api_key}",
-                    "Content-Type": "application/json"
-                }
-            )
-            response.raise_for_status()
-            return response.json()
+        response = await http_client.post(
+            "ephemeris",
+            f"{self.base_url}/planet-position",
+            endpoint="/planet-position",
+            json=payload,
+            headers=self._headers(),
+            timeout=15.0
+        )
+        response.raise_for_status()
+        return response.json()
 
 
 # Instance singleton
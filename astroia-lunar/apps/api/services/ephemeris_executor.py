@@ -0,0 +1,256 @@
+"""
+Exécuteur des calculs Swiss Ephemeris hors de l'event loop
+
+pyswisseph est synchrone et garde le GIL : un find_lunar_return ou un calcul de
+maisons lancé directement dans un handler async bloque toutes les requêtes.
+Ce module les exécute dans un pool de processus dédié :
+
+- Pool dimensionné par EPHEMERIS_POOL_SIZE (0 = thread unique via asyncio.to_thread)
+- Workers préchauffés (table d'éphémérides mmap, index des ingress, fichiers .se1)
+- Back-pressure : au plus EPHEMERIS_POOL_MAX_IN_FLIGHT tâches soumises, les
+  suivantes attendent (profondeur de file exportée sur /metrics)
+- Façades async pour chaque calcul (find_lunar_return_async, ...)
+"""
+
+import asyncio
+import logging
+import multiprocessing
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from prometheus_client import Counter, Gauge, Histogram
+
+from config import settings
+
+logger = logging.getLogger(__name__)
+
+# === MÉTRIQUES PROMETHEUS - EPHEMERIS EXECUTOR ===
+
+ephemeris_executor_queue_depth = Gauge(
+    'ephemeris_executor_queue_depth',
+    'Ephemeris tasks waiting for a pool slot (back-pressure)'
+)
+
+ephemeris_executor_in_flight = Gauge(
+    'ephemeris_executor_in_flight',
+    'Ephemeris tasks submitted to the pool and not finished'
+)
+
+ephemeris_executor_tasks_total = Counter(
+    'ephemeris_executor_tasks_total',
+    'Ephemeris tasks executed',
+    ['function', 'status']  # status: 'success' | 'error'
+)
+
+ephemeris_executor_wait_seconds = Histogram(
+    'ephemeris_executor_wait_seconds',
+    'Time spent waiting for a pool slot',
+    buckets=(0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1, 5)
+)
+
+ephemeris_executor_run_seconds = Histogram(
+    'ephemeris_executor_run_seconds',
+    'Ephemeris task duration inside the worker',
+    ['function'],
+    buckets=(0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1, 5)
+)
+
+# Pool et sémaphore (créés au premier appel, dans l'event loop courant)
+_EXECUTOR: Optional[ProcessPoolExecutor] = None
+_SEMAPHORE: Optional[asyncio.Semaphore] = None
+_SEMAPHORE_LOOP: Optional[asyncio.AbstractEventLoop] = None
+
+
+def _warm_worker() -> None:
+    """Initializer des workers : charge les données partagées avant la 1re tâche"""
+    from services import ephemeris_tables
+    from services.moon_ingress_index import get_moon_ingress_index
+    from services.swiss_ephemeris import SWISS_EPHEMERIS_AVAILABLE, get_moon_position
+
+    ephemeris_tables.get_default_table()
+    get_moon_ingress_index()
+    if SWISS_EPHEMERIS_AVAILABLE:
+        # Premier calc_ut : ouvre les fichiers d'éphémérides du worker
+        get_moon_position(datetime.now(timezone.utc))
+
+
+def _timed_call(fn: Callable, args: Tuple, kwargs: Dict[str, Any]) -> Tuple[Any, float]:
+    """Exécuté dans le worker : (résultat, durée du calcul en secondes)"""
+    started = time.perf_counter()
+    result = fn(*args, **kwargs)
+    return result, time.perf_counter() - started
+
+
+def _max_in_flight() -> int:
+    return max(1, settings.EPHEMERIS_POOL_MAX_IN_FLIGHT or 2 * max(1, settings.EPHEMERIS_POOL_SIZE))
+
+
+def _get_executor() -> Optional[ProcessPoolExecutor]:
+    global _EXECUTOR
+    if settings.EPHEMERIS_POOL_SIZE <= 0:
+        return None
+
+    if _EXECUTOR is None:
+        # spawn : pas de fork d'un process qui a déjà des threads (APScheduler, asyncpg)
+        _EXECUTOR = ProcessPoolExecutor(
+            max_workers=settings.EPHEMERIS_POOL_SIZE,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_warm_worker,
+        )
+        logger.info(f"[EphemerisExecutor] 🚀 Pool démarré ({settings.EPHEMERIS_POOL_SIZE} workers)")
+    return _EXECUTOR
+
+
+def _get_semaphore() -> asyncio.Semaphore:
+    global _SEMAPHORE, _SEMAPHORE_LOOP
+    loop = asyncio.get_running_loop()
+    if _SEMAPHORE is None or _SEMAPHORE_LOOP is not loop:
+        _SEMAPHORE = asyncio.Semaphore(_max_in_flight())
+        _SEMAPHORE_LOOP = loop
+    return _SEMAPHORE
+
+
+async def run_ephemeris(fn: Callable, *args, **kwargs) -> Any:
+    """
+    Exécute un calcul synchrone Swiss Ephemeris hors de l'event loop
+
+    Args:
+        fn: fonction de module (picklable), ex: swiss_ephemeris.find_lunar_return
+
+    Returns:
+        Le résultat de fn(*args, **kwargs) ; les exceptions sont propagées
+    """
+    function_name = fn.__name__
+    semaphore = _get_semaphore()
+
+    ephemeris_executor_queue_depth.inc()
+    wait_started = time.perf_counter()
+    try:
+        await semaphore.acquire()
+    finally:
+        ephemeris_executor_queue_depth.dec()
+    ephemeris_executor_wait_seconds.observe(time.perf_counter() - wait_started)
+
+    ephemeris_executor_in_flight.inc()
+    try:
+        executor = _get_executor()
+        loop = asyncio.get_running_loop()
+        if executor is None:
+            result, run_seconds = await asyncio.to_thread(_timed_call, fn, args, kwargs)
+        else:
+            result, run_seconds = await loop.run_in_executor(executor, _timed_call, fn, args, kwargs)
+    except Exception:
+        ephemeris_executor_tasks_total.labels(function=function_name, status='error').inc()
+        raise
+    finally:
+        ephemeris_executor_in_flight.dec()
+        semaphore.release()
+
+    ephemeris_executor_tasks_total.labels(function=function_name, status='success').inc()
+    ephemeris_executor_run_seconds.labels(function=function_name).observe(run_seconds)
+    return result
+
+
+def shutdown_ephemeris_executor(wait: bool = True) -> None:
+    """Arrête le pool (shutdown de l'API)"""
+    global _EXECUTOR
+    if _EXECUTOR is not None:
+        _EXECUTOR.shutdown(wait=wait, cancel_futures=True)
+        _EXECUTOR = None
+        logger.info("[EphemerisExecutor] 🛑 Pool arrêté")
+
+
+# === FAÇADES ASYNC ===
+
+async def find_lunar_return_async(
+    natal_moon_longitude: float,
+    start_dt: datetime,
+    search_window_hours: int = 48,
+    tolerance_seconds: int = 60
+) -> Optional[datetime]:
+    """swiss_ephemeris.find_lunar_return dans le pool"""
+    from services.swiss_ephemeris import find_lunar_return
+
+    return await run_ephemeris(
+        find_lunar_return, natal_moon_longitude, start_dt, search_window_hours, tolerance_seconds
+    )
+
+
+async def find_lunar_return_series_async(
+    natal_moon_longitude: float,
+    start_dt: datetime,
+    count: Optional[int] = None,
+    end_dt: Optional[datetime] = None,
+    tolerance_seconds: int = 60
+) -> List[datetime]:
+    """swiss_ephemeris.find_lunar_return_series dans le pool"""
+    from services.swiss_ephemeris import find_lunar_return_series
+
+    return await run_ephemeris(
+        find_lunar_return_series, natal_moon_longitude, start_dt, count, end_dt, tolerance_seconds
+    )
+
+
+async def compute_lunar_return_charts_async(
+    return_dates: List[datetime],
+    latitude: float,
+    longitude: float,
+    house_system: str = 'P'
+) -> List[Dict[str, Any]]:
+    """lunar_return_chart.compute_lunar_return_charts dans le pool (une tâche pour tous les mois)"""
+    from services.lunar_return_chart import compute_lunar_return_charts
+
+    return await run_ephemeris(compute_lunar_return_charts, return_dates, latitude, longitude, house_system)
+
+
+async def compute_natal_chart_async(birth_data: Dict[str, Any], house_system: str = 'P') -> Dict[str, Any]:
+    """natal_chart_engine.compute_natal_chart dans le pool"""
+    from services.natal_chart_engine import compute_natal_chart
+
+    return await run_ephemeris(compute_natal_chart, birth_data, house_system)
+
+
+async def calculate_houses_async(
+    dt: datetime,
+    latitude: float,
+    longitude: float,
+    house_system: str = 'P'
+):
+    """swiss_ephemeris.calculate_houses dans le pool"""
+    from services.swiss_ephemeris import calculate_houses
+
+    return await run_ephemeris(calculate_houses, dt, latitude, longitude, house_system)
+
+
+async def calculate_complementary_positions_async(
+    birth_datetime: datetime,
+    latitude: float,
+    longitude: float,
+    house_cusps: Optional[List[float]] = None
+) -> List[Dict[str, Any]]:
+    """natal_planets_complement.calculate_complementary_positions dans le pool"""
+    from services.natal_planets_complement import calculate_complementary_positions
+
+    return await run_ephemeris(calculate_complementary_positions, birth_datetime, latitude, longitude, house_cusps)
+
+
+async def get_current_moon_position_async() -> Dict[str, Any]:
+    """
+    moon_position.get_current_moon_position sans bloquer l'event loop
+
+    Le cache 5 min reste dans le process API : seul le calcul part dans le pool.
+    Un seul calcul à la fois (les requêtes concurrentes l'attendent) ; passé le
+    TTL, la position précédente reste servie MOON_POSITION_STALE_TTL secondes
+    pendant le recalcul en arrière-plan.
+    """
+    from services import moon_position
+
+    async def compute() -> Dict[str, Any]:
+        result = await run_ephemeris(moon_position.compute_current_moon_position)
+        if moon_position.SWISS_EPHEMERIS_AVAILABLE:
+            moon_position.store_moon_position(result)
+        return result
+
+    return await moon_position.get_current_moon_position_cached(compute)
@@ -6,12 +6,13 @@ Calcul de thèmes natals via l'endpoint chart_natal
 import httpx
 from typing import Dict, Any
 from config import settings
+from services import http_client
 import logging
 
 logger = logging.getLogger(__name__)
 
-# Client HTTP asynchrone avec timeout
-client = httpx.AsyncClient(timeout=30.0)
+# Timeout du calcul chart_natal (client partagé du fournisseur "rapidapi")
+NATAL_CHART_TIMEOUT = 30.0
 
 
 async def create_natal_chart(payload: Dict[str, Any]) -> Dict[str, Any]:
@@ -36,10 +37,13 @@ async def create_natal_chart(payload: Dict[str, Any]) -> Dict[str, Any]:
     logger.info(f"Appel RapidAPI chart_natal avec payload: {payload}")
     
     try:
-        response = await client.post(
+        response = await http_client.post(
+            "rapidapi",
             settings.NATAL_URL,
+            endpoint="/api/v3/charts/natal",
             json=payload,
-            headers=headers
+            headers=headers,
+            timeout=NATAL_CHART_TIMEOUT
         )
         response.raise_for_status()
         
@@ -56,9 +60,3 @@ async def create_natal_chart(payload: Dict[str, Any]) -> Dict[str, Any]:
     except Exception as e:
         logger.error(f"Erreur inattendue lors de l'appel RapidAPI: {str(e)}")
         raise
-
-
-async def close_client():
-    """Ferme le client HTTP (à appeler au shutdown de l'app)"""
-    await client.aclose()
-
@@ -0,0 +1,285 @@
+"""
+Tables d'éphémérides précalculées (Lune, Soleil, planètes)
+
+Le builder (scripts/build_ephemeris_tables.py) échantillonne swe.calc_ut sur une
+grille régulière et écrit deux fichiers :
+- <table>.npy  : float64 (n_samples, n_bodies, 2) = [longitude, vitesse °/jour]
+- <table>.json : métadonnées (start_jd, step_days, bodies)
+
+Le lecteur mappe le .npy en lecture seule (np.load(mmap_mode='r')) : tous les
+workers partagent les mêmes pages via le cache OS. Entre deux échantillons, la
+position est interpolée par Hermite cubique (longitude + vitesse aux bornes) :
+au pas horaire l'écart à Swiss Ephemeris reste sous 0.01".
+
+swiss_ephemeris.calc_positions_batch et get_body_longitude_and_speed passent par
+la table par défaut (settings.EPHEMERIS_TABLE_PATH) quand elle couvre la requête,
+et retombent sur pyswisseph sinon.
+"""
+
+try:
+    import swisseph as swe
+    SWISS_EPHEMERIS_AVAILABLE = True
+except ImportError:
+    SWISS_EPHEMERIS_AVAILABLE = False
+    swe = None
+
+import json
+import logging
+import random
+from pathlib import Path
+from typing import Dict, Optional, Sequence, Tuple
+
+import numpy as np
+
+from config import settings
+
+logger = logging.getLogger(__name__)
+
+# Grille par défaut du builder : horaire, 1900-01-01 → 2100-01-01
+DEFAULT_START_JD = 2415020.5
+DEFAULT_END_JD = 2488069.5
+DEFAULT_STEP_DAYS = 1 / 24
+
+# Taille des blocs écrits par le builder (échantillons)
+BUILD_CHUNK_SIZE = 24 * 365
+
+# Table par défaut, chargée une seule fois par process
+_DEFAULT_TABLE: Optional["EphemerisTable"] = None
+_DEFAULT_TABLE_LOADED = False
+
+
+def _metadata_path(path: Path) -> Path:
+    return path.with_suffix(".json")
+
+
+def _hermite(
+    p0: np.ndarray,
+    v0: np.ndarray,
+    p1: np.ndarray,
+    v1: np.ndarray,
+    t: np.ndarray,
+    h: float
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Interpolation Hermite cubique d'une longitude (avec passage 360° → 0°)
+
+    Args:
+        p0, v0: longitude et vitesse à la borne basse
+        p1, v1: longitude et vitesse à la borne haute
+        t: position relative dans l'intervalle (0-1)
+        h: pas de la grille (jours)
+
+    Returns:
+        (longitude 0-360, vitesse °/jour)
+    """
+    delta = (p1 - p0 + 180.0) % 360.0 - 180.0
+    t2 = t * t
+    t3 = t2 * t
+
+    h10 = t3 - 2 * t2 + t
+    h01 = -2 * t3 + 3 * t2
+    h11 = t3 - t2
+    longitude = (p0 + h10 * v0 * h + h01 * delta + h11 * v1 * h) % 360.0
+
+    dh10 = 3 * t2 - 4 * t + 1
+    dh01 = -6 * t2 + 6 * t
+    dh11 = 3 * t2 - 2 * t
+    speed = dh10 * v0 + dh01 * delta / h + dh11 * v1
+
+    return longitude, speed
+
+
+class EphemerisTable:
+    """Table d'éphémérides (mémoire ou mmap) interpolée par Hermite cubique"""
+
+    def __init__(self, data: np.ndarray, start_jd: float, step_days: float, bodies: Sequence[int]):
+        if data.ndim != 3 or data.shape[1] != len(bodies) or data.shape[2] != 2 or data.shape[0] < 2:
+            raise ValueError(f"Table d'éphémérides invalide: shape={data.shape}, bodies={list(bodies)}")
+
+        self.data = data
+        self.start_jd = float(start_jd)
+        self.step_days = float(step_days)
+        self.bodies = tuple(int(b) for b in bodies)
+        self.end_jd = self.start_jd + self.step_days * (data.shape[0] - 1)
+        self._body_index = {body: i for i, body in enumerate(self.bodies)}
+
+    @classmethod
+    def load(cls, path) -> "EphemerisTable":
+        """
+        Ouvre une table en lecture seule (memory-mapped)
+
+        Args:
+            path: chemin du fichier .npy (les métadonnées sont dans le .json voisin)
+        """
+        path = Path(path)
+        metadata = json.loads(_metadata_path(path).read_text(encoding="utf-8"))
+        data = np.load(path, mmap_mode="r")
+        return cls(data, metadata["start_jd"], metadata["step_days"], metadata["bodies"])
+
+    def covers(self, jd_min: float, jd_max: Optional[float] = None) -> bool:
+        """True si [jd_min, jd_max] est dans la plage de la table"""
+        jd_max = jd_min if jd_max is None else jd_max
+        return self.start_jd <= jd_min and jd_max <= self.end_jd
+
+    def has_bodies(self, bodies: Sequence[int]) -> bool:
+        """True si tous les corps sont présents dans la table"""
+        return all(body in self._body_index for body in bodies)
+
+    def can_serve(self, jd_min: float, jd_max: float, bodies: Sequence[int]) -> bool:
+        return self.covers(jd_min, jd_max) and self.has_bodies(bodies)
+
+    def position(self, jd: float, body: int) -> Tuple[float, float]:
+        """
+        Longitude et vitesse d'un corps à un Julian Day (chemin scalaire)
+
+        Returns:
+            (longitude 0-360, vitesse °/jour)
+        """
+        x = (jd - self.start_jd) / self.step_days
+        i = min(max(int(x), 0), self.data.shape[0] - 2)
+        column = self._body_index[body]
+        (p0, v0), (p1, v1) = self.data[i:i + 2, column].tolist()
+
+        longitude, speed = _hermite(p0, v0, p1, v1, x - i, self.step_days)
+        return float(longitude), float(speed)
+
+    def positions(self, jds: Sequence[float], bodies: Sequence[int]) -> np.ndarray:
+        """
+        Positions de plusieurs corps sur un tableau de Julian Days
+
+        Returns:
+            float64 (n_times, n_bodies, 2), même format que calc_positions_batch
+        """
+        jds = np.asarray(jds, dtype=np.float64).ravel()
+        x = (jds - self.start_jd) / self.step_days
+        i = np.clip(np.floor(x).astype(np.int64), 0, self.data.shape[0] - 2)
+        t = (x - i)[:, None]
+        columns = [self._body_index[body] for body in bodies]
+
+        lower = self.data[i[:, None], columns]
+        upper = self.data[i[:, None] + 1, columns]
+        longitude, speed = _hermite(
+            lower[..., 0], lower[..., 1], upper[..., 0], upper[..., 1], t, self.step_days
+        )
+        return np.stack([longitude, speed], axis=-1)
+
+
+def _calc_ut_rows(jds: Sequence[float], bodies: Sequence[int]) -> np.ndarray:
+    flags = swe.FLG_SWIEPH | swe.FLG_SPEED
+    samples = [[swe.calc_ut(jd, body, flags)[0] for body in bodies] for jd in jds]
+    return np.array(samples, dtype=np.float64)[:, :, [0, 3]]
+
+
+def build_ephemeris_table(
+    path,
+    bodies: Sequence[int],
+    start_jd: float = DEFAULT_START_JD,
+    end_jd: float = DEFAULT_END_JD,
+    step_days: float = DEFAULT_STEP_DAYS
+) -> EphemerisTable:
+    """
+    Calcule une table avec swe.calc_ut et l'écrit sur disque (.npy + .json)
+
+    Args:
+        path: chemin du fichier .npy à écrire
+        bodies: constantes Swiss Ephemeris (swe.MOON, swe.SUN, ...)
+        start_jd, end_jd: plage couverte (Julian Days UT, bornes incluses)
+        step_days: pas de la grille en jours
+
+    Returns:
+        La table, ouverte en lecture seule
+    """
+    if not SWISS_EPHEMERIS_AVAILABLE:
+        raise ImportError("Swiss Ephemeris (pyswisseph) n'est pas installé. Installez-le avec: pip install pyswisseph")
+
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    count = int(round((end_jd - start_jd) / step_days)) + 1
+
+    data = np.lib.format.open_memmap(path, mode="w+", dtype=np.float64, shape=(count, len(bodies), 2))
+    for chunk_start in range(0, count, BUILD_CHUNK_SIZE):
+        chunk_end = min(chunk_start + BUILD_CHUNK_SIZE, count)
+        jds = start_jd + np.arange(chunk_start, chunk_end, dtype=np.float64) * step_days
+        data[chunk_start:chunk_end] = _calc_ut_rows(jds.tolist(), bodies)
+    data.flush()
+    del data
+
+    metadata = {"start_jd": start_jd, "step_days": step_days, "bodies": [int(b) for b in bodies]}
+    _metadata_path(path).write_text(json.dumps(metadata), encoding="utf-8")
+
+    logger.info(f"[EphemerisTable] 💾 Table écrite: {path} ({count} échantillons × {len(bodies)} corps)")
+    return EphemerisTable.load(path)
+
+
+def validate_table(table: EphemerisTable, samples: int = 1000, seed: int = 0) -> Dict[int, Dict[str, float]]:
+    """
+    Compare la table à swe.calc_ut sur des instants tirés au hasard
+
+    Returns:
+        {body: {"max_longitude_arcsec": ..., "max_speed_error": ...}}
+    """
+    if not SWISS_EPHEMERIS_AVAILABLE:
+        raise ImportError("Swiss Ephemeris (pyswisseph) n'est pas installé. Installez-le avec: pip install pyswisseph")
+
+    rng = random.Random(seed)
+    jds = [rng.uniform(table.start_jd, table.end_jd) for _ in range(samples)]
+
+    expected = _calc_ut_rows(jds, table.bodies)
+    actual = table.positions(jds, table.bodies)
+
+    longitude_errors = np.abs((actual[..., 0] - expected[..., 0] + 180.0) % 360.0 - 180.0) * 3600
+    speed_errors = np.abs(actual[..., 1] - expected[..., 1])
+
+    return {
+        body: {
+            "max_longitude_arcsec": float(longitude_errors[:, i].max()),
+            "max_speed_error": float(speed_errors[:, i].max()),
+        }
+        for i, body in enumerate(table.bodies)
+    }
+
+
+def get_default_table() -> Optional[EphemerisTable]:
+    """
+    Table configurée par settings.EPHEMERIS_TABLE_PATH (chargée au premier appel)
+
+    Returns:
+        La table, ou None si désactivée / absente / illisible
+    """
+    global _DEFAULT_TABLE, _DEFAULT_TABLE_LOADED
+    if _DEFAULT_TABLE_LOADED:
+        return _DEFAULT_TABLE
+
+    _DEFAULT_TABLE_LOADED = True
+    if not settings.EPHEMERIS_TABLE_PATH:
+        return None
+
+    path = Path(settings.EPHEMERIS_TABLE_PATH)
+    if not path.is_absolute():
+        path = Path(__file__).parent.parent / path
+
+    if not path.exists():
+        logger.info(f"[EphemerisTable] Pas de table précalculée ({path}), calcul direct pyswisseph")
+        return None
+
+    try:
+        _DEFAULT_TABLE = EphemerisTable.load(path)
+        logger.info(f"[EphemerisTable] ✅ Table chargée: {path}")
+    except Exception as e:
+        logger.warning(f"[EphemerisTable] ⚠️ Table illisible ({path}): {e}")
+
+    return _DEFAULT_TABLE
+
+
+def set_default_table(table: Optional[EphemerisTable]) -> None:
+    """Remplace la table par défaut (tests, scripts)"""
+    global _DEFAULT_TABLE, _DEFAULT_TABLE_LOADED
+    _DEFAULT_TABLE = table
+    _DEFAULT_TABLE_LOADED = True
+
+
+def reset_default_table() -> None:
+    """Oublie la table par défaut : elle sera rechargée au prochain appel"""
+    global _DEFAULT_TABLE, _DEFAULT_TABLE_LOADED
+    _DEFAULT_TABLE = None
+    _DEFAULT_TABLE_LOADED = False
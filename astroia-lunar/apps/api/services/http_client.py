@@ -0,0 +1,354 @@
+"""
+Client HTTP sortant partagé (RapidAPI, Ephemeris API, Google OAuth)
+
+Un httpx.AsyncClient par fournisseur et par process, au lieu d'un client par
+module ou par appel :
+- Pool de connexions keep-alive réglé (HTTP/2 si le package h2 est installé)
+- Concurrence bornée par fournisseur (sémaphore) + débit (token bucket)
+- Circuit breaker : après N échecs consécutifs (5xx, 429, timeout, réseau),
+  les appels échouent immédiatement (CircuitOpenError) pendant reset_seconds,
+  puis un appel d'essai décide de la réouverture. Les appelants replient sur
+  leurs mocks / cache périmé (voir rapidapi_client.post_json).
+- Latence par fournisseur et endpoint exportée sur /metrics
+"""
+
+import asyncio
+import logging
+import time
+from typing import Any, Awaitable, Callable, Dict, NamedTuple, Optional
+
+import httpx
+from prometheus_client import Counter, Gauge, Histogram
+
+from config import settings
+
+try:
+    import h2  # noqa: F401 (requis par httpx pour http2=True)
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+# === MÉTRIQUES PROMETHEUS - HTTP SORTANT ===
+
+outbound_http_request_duration_seconds = Histogram(
+    'outbound_http_request_duration_seconds',
+    'Outbound HTTP request latency per provider and endpoint',
+    ['provider', 'endpoint', 'status'],  # status: code HTTP | 'timeout' | 'error'
+    buckets=(0.05, 0.1, 0.25, 0.5, 1, 2, 5, 10, 30, 60)
+)
+
+outbound_http_wait_seconds = Histogram(
+    'outbound_http_wait_seconds',
+    'Time spent waiting for a provider concurrency slot or rate-limit token',
+    ['provider'],
+    buckets=(0.001, 0.01, 0.05, 0.1, 0.5, 1, 5)
+)
+
+outbound_http_rejected_total = Counter(
+    'outbound_http_rejected_total',
+    'Outbound HTTP requests rejected without being sent',
+    ['provider', 'reason']  # reason: 'circuit_open'
+)
+
+outbound_http_circuit_state = Gauge(
+    'outbound_http_circuit_state',
+    'Circuit breaker state per provider (0=closed, 1=half_open, 2=open)',
+    ['provider']
+)
+
+CIRCUIT_STATE_VALUES = {"closed": 0, "half_open": 1, "open": 2}
+
+
+class ProviderConfig(NamedTuple):
+    timeout: float             # Timeout par défaut (secondes), surchargeable par requête
+    max_concurrency: int       # Requêtes simultanées max (0 = illimité)
+    rate_per_second: float     # Débit max (0 = illimité)
+    burst: int                 # Capacité du token bucket
+
+
+def _provider_configs() -> Dict[str, ProviderConfig]:
+    return {
+        "rapidapi": ProviderConfig(
+            timeout=10.0,
+            max_concurrency=settings.RAPIDAPI_MAX_CONCURRENCY,
+            rate_per_second=settings.RAPIDAPI_RATE_PER_SECOND,
+            burst=max(1, int(settings.RAPIDAPI_RATE_PER_SECOND)),
+        ),
+        "ephemeris": ProviderConfig(
+            timeout=30.0,
+            max_concurrency=settings.EPHEMERIS_API_MAX_CONCURRENCY,
+            rate_per_second=0,
+            burst=1,
+        ),
+        "google": ProviderConfig(timeout=10.0, max_concurrency=0, rate_per_second=0, burst=1),
+    }
+
+
+class CircuitOpenError(Exception):
+    """Fournisseur en échec répété : appel refusé sans requête réseau"""
+
+    def __init__(self, provider: str, retry_in: float):
+        super().__init__(f"Circuit ouvert pour {provider} (nouvel essai dans {retry_in:.0f}s)")
+        self.provider = provider
+        self.retry_in = retry_in
+
+
+class CircuitBreaker:
+    """
+    closed → open après failure_threshold échecs consécutifs ;
+    open → half_open après reset_seconds (un seul appel d'essai) ;
+    half_open → closed si l'essai réussit, open sinon.
+    """
+
+    def __init__(self, provider: str, failure_threshold: int, reset_seconds: float):
+        self.provider = provider
+        self.failure_threshold = failure_threshold
+        self.reset_seconds = reset_seconds
+        self.state = "closed"
+        self.failures = 0
+        self.opened_at = 0.0
+        self._trial: Optional[int] = None  # Jeton de l'appel d'essai half-open en cours
+        self._trials = 0
+        outbound_http_circuit_state.labels(provider=provider).set(0)
+
+    def _set_state(self, state: str) -> None:
+        if state != self.state:
+            logger.warning(f"[HTTP:{self.provider}] ⚡ Circuit {self.state} → {state}")
+        self.state = state
+        outbound_http_circuit_state.labels(provider=self.provider).set(CIRCUIT_STATE_VALUES[state])
+
+    def before_request(self) -> Optional[int]:
+        """
+        Lève CircuitOpenError si l'appel ne doit pas partir
+
+        Returns:
+            Jeton si cet appel est l'essai half-open (à passer à record_cancelled), None sinon
+        """
+        if self.failure_threshold <= 0 or self.state == "closed":
+            return None
+        now = time.monotonic()
+        if self.state == "open":
+            retry_in = self.opened_at + self.reset_seconds - now
+            if retry_in > 0:
+                raise CircuitOpenError(self.provider, retry_in)
+            self._set_state("half_open")
+        if self._trial is not None:
+            raise CircuitOpenError(self.provider, 0)
+        self._trials += 1
+        self._trial = self._trials
+        return self._trial
+
+    def record_success(self) -> None:
+        self.failures = 0
+        self._trial = None
+        if self.state != "closed":
+            self._set_state("closed")
+
+    def record_cancelled(self, trial: Optional[int]) -> None:
+        """
+        Requête annulée ou erreur locale : ni succès ni échec du fournisseur
+
+        Libère l'essai half-open seulement si trial est son jeton : une requête
+        partie avant l'ouverture du circuit ne libère pas l'essai en cours.
+        """
+        if trial is not None and trial == self._trial:
+            self._trial = None
+
+    def reset(self) -> None:
+        self.failures = 0
+        self._trial = None
+        self._set_state("closed")
+
+    def record_failure(self) -> None:
+        self.failures += 1
+        self._trial = None
+        if self.failure_threshold <= 0:
+            return
+        if self.state == "half_open" or self.failures >= self.failure_threshold:
+            self.opened_at = time.monotonic()
+            self._set_state("open")
+
+
+class TokenBucket:
+    """Débit moyen rate_per_second, rafales jusqu'à burst requêtes"""
+
+    def __init__(self, rate_per_second: float, burst: int):
+        self.rate = rate_per_second
+        self.capacity = float(max(1, burst))
+        self.tokens = self.capacity
+        self.updated_at = time.monotonic()
+
+    def refill(self) -> None:
+        self.tokens = self.capacity
+        self.updated_at = time.monotonic()
+
+    async def acquire(self) -> None:
+        if self.rate <= 0:
+            return
+        while True:
+            now = time.monotonic()
+            self.tokens = min(self.capacity, self.tokens + (now - self.updated_at) * self.rate)
+            self.updated_at = now
+            if self.tokens >= 1:
+                self.tokens -= 1
+                return
+            await asyncio.sleep((1 - self.tokens) / self.rate)
+
+
+class _Provider:
+    """Client, limites et circuit d'un fournisseur (par process)"""
+
+    def __init__(self, name: str, config: ProviderConfig):
+        self.name = name
+        self.config = config
+        self.client = httpx.AsyncClient(
+            timeout=config.timeout,
+            http2=HTTP2_AVAILABLE,
+            limits=httpx.Limits(
+                max_connections=settings.HTTP_MAX_CONNECTIONS,
+                max_keepalive_connections=settings.HTTP_MAX_KEEPALIVE_CONNECTIONS,
+                keepalive_expiry=settings.HTTP_KEEPALIVE_EXPIRY_SECONDS,
+            ),
+        )
+        self.breaker = CircuitBreaker(
+            name, settings.HTTP_CIRCUIT_FAILURE_THRESHOLD, settings.HTTP_CIRCUIT_RESET_SECONDS
+        )
+        self.bucket = TokenBucket(config.rate_per_second, config.burst)
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._semaphore_loop: Optional[asyncio.AbstractEventLoop] = None
+
+    def semaphore(self) -> Optional[asyncio.Semaphore]:
+        if self.config.max_concurrency <= 0:
+            return None
+        loop = asyncio.get_running_loop()
+        if self._semaphore is None or self._semaphore_loop is not loop:
+            self._semaphore = asyncio.Semaphore(self.config.max_concurrency)
+            self._semaphore_loop = loop
+        return self._semaphore
+
+
+_PROVIDERS: Dict[str, _Provider] = {}
+
+
+def _get_provider(provider: str) -> _Provider:
+    state = _PROVIDERS.get(provider)
+    if state is None or state.client.is_closed:
+        configs = _provider_configs()
+        if provider not in configs:
+            raise ValueError(f"Fournisseur HTTP inconnu: {provider}")
+        state = _PROVIDERS[provider] = _Provider(provider, configs[provider])
+        logger.info(f"[HTTP:{provider}] ✅ Client créé (http2={HTTP2_AVAILABLE}, concurrence={state.config.max_concurrency or '∞'})")
+    return state
+
+
+def get_client(provider: str) -> httpx.AsyncClient:
+    """httpx.AsyncClient partagé du fournisseur ('rapidapi', 'ephemeris', 'google')"""
+    return _get_provider(provider).client
+
+
+def get_circuit_breaker(provider: str) -> CircuitBreaker:
+    return _get_provider(provider).breaker
+
+
+def _is_failure(response: httpx.Response) -> bool:
+    return response.status_code == 429 or response.status_code >= 500
+
+
+async def _send(provider: str, endpoint: str, call: Callable[[httpx.AsyncClient], Awaitable[httpx.Response]]) -> httpx.Response:
+    state = _get_provider(provider)
+    try:
+        trial = state.breaker.before_request()
+    except CircuitOpenError:
+        outbound_http_rejected_total.labels(provider=provider, reason='circuit_open').inc()
+        raise
+
+    # À partir d'ici, l'essai half-open éventuel est réservé : toute sortie
+    # (annulation pendant l'attente de créneau comprise) doit le libérer
+    semaphore = state.semaphore()
+    acquired = False
+    wait_started = time.perf_counter()
+    try:
+        if semaphore is not None:
+            await semaphore.acquire()
+            acquired = True
+        await state.bucket.acquire()
+        outbound_http_wait_seconds.labels(provider=provider).observe(time.perf_counter() - wait_started)
+
+        started = time.perf_counter()
+        try:
+            response = await call(state.client)
+        except httpx.TimeoutException:
+            outbound_http_request_duration_seconds.labels(provider=provider, endpoint=endpoint, status='timeout').observe(time.perf_counter() - started)
+            state.breaker.record_failure()
+            raise
+        except httpx.RequestError:
+            outbound_http_request_duration_seconds.labels(provider=provider, endpoint=endpoint, status='error').observe(time.perf_counter() - started)
+            state.breaker.record_failure()
+            raise
+    except httpx.RequestError:
+        raise  # Déjà compté comme échec du fournisseur
+    except BaseException:
+        # Annulation ou erreur inattendue : ne compte pas comme échec du fournisseur
+        state.breaker.record_cancelled(trial)
+        raise
+    finally:
+        if acquired:
+            semaphore.release()
+
+    outbound_http_request_duration_seconds.labels(
+        provider=provider, endpoint=endpoint, status=str(response.status_code)
+    ).observe(time.perf_counter() - started)
+    if _is_failure(response):
+        state.breaker.record_failure()
+    else:
+        state.breaker.record_success()
+    return response
+
+
+async def post(provider: str, url: str, endpoint: str, **kwargs: Any) -> httpx.Response:
+    """
+    POST via le client partagé du fournisseur
+
+    Args:
+        provider: 'rapidapi' | 'ephemeris' | 'google'
+        url: URL complète
+        endpoint: Libellé de l'endpoint pour les métriques (chemin, sans identifiants)
+        **kwargs: Arguments httpx (json, headers, timeout, ...)
+
+    Raises:
+        CircuitOpenError: Circuit ouvert pour ce fournisseur
+        httpx.RequestError: Erreur réseau / timeout
+    """
+    return await _send(provider, endpoint, lambda client: client.post(url, **kwargs))
+
+
+async def get(provider: str, url: str, endpoint: str, **kwargs: Any) -> httpx.Response:
+    """GET via le client partagé du fournisseur (voir post)"""
+    return await _send(provider, endpoint, lambda client: client.get(url, **kwargs))
+
+
+def get_http_stats() -> Dict[str, Any]:
+    """État des circuits par fournisseur (monitoring)"""
+    return {
+        name: {"circuit": state.breaker.state, "consecutive_failures": state.breaker.failures}
+        for name, state in _PROVIDERS.items()
+    }
+
+
+def reset_provider_state() -> None:
+    """Referme tous les circuits et remplit les token buckets (tests, intervention manuelle)"""
+    for state in _PROVIDERS.values():
+        state.breaker.reset()
+        state.bucket.refill()
+
+
+async def close_clients() -> None:
+    """Ferme les clients de tous les fournisseurs (shutdown de l'API)"""
+    for name, state in list(_PROVIDERS.items()):
+        try:
+            await state.client.aclose()
+        except Exception as e:
+            logger.warning(f"[HTTP:{name}] ⚠️ Erreur fermeture client: {e}")
+    _PROVIDERS.clear()
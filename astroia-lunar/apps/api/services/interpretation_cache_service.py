@@ -1,7 +1,8 @@
 """
 Service de cache optimisé pour interprétations astrologiques (DB)
-- Cache en mémoire avec TTL configurable (1h pour données statiques)
-- Retry logic pour requêtes DB
+- Lectures servies par le store immuable en mémoire (services/interpretation_store.py),
+  chargé en bloc au démarrage, sans TTL (données statiques)
+- Retry logic pour requêtes DB (langues non préchargées)
 - Performance optimisée pour requêtes fréquentes
 """
 
@@ -15,46 +16,23 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
 from sqlalchemy.exc import SQLAlchemyError
 
+from services import interpretation_store
+from services.interpretation_store import LUNAR, NATAL
+
 logger = logging.getLogger(__name__)
 
-# Configuration cache (1h = 3600s pour données statiques)
-INTERPRETATION_CACHE_TTL = 3600  # 1 heure
+# Pas d'expiration : le store est remplacé en bloc par reload_interpretation_store()
+INTERPRETATION_CACHE_TTL = None
 
 # Configuration retry logic
 MAX_DB_RETRIES = 3
 BASE_DB_BACKOFF = 0.2  # secondes
 MAX_DB_BACKOFF = 2.0   # secondes
 
-# Caches globaux avec timestamp
-_LUNAR_CLIMATE_CACHE: Dict[str, Any] = {
-    "data": {},  # Clé: (moon_sign, version, lang) → interprétation
-    "timestamp": 0,
-    "ttl": INTERPRETATION_CACHE_TTL
-}
-
-_LUNAR_FOCUS_CACHE: Dict[str, Any] = {
-    "data": {},  # Clé: (moon_house, version, lang) → interprétation
-    "timestamp": 0,
-    "ttl": INTERPRETATION_CACHE_TTL
-}
-
-_LUNAR_APPROACH_CACHE: Dict[str, Any] = {
-    "data": {},  # Clé: (lunar_ascendant, version, lang) → interprétation
-    "timestamp": 0,
-    "ttl": INTERPRETATION_CACHE_TTL
-}
-
-_LUNAR_V2_FULL_CACHE: Dict[str, Any] = {
-    "data": {},  # Clé: (moon_sign, moon_house, lunar_ascendant, version, lang) → (interpretation, weekly_advice)
-    "timestamp": 0,
-    "ttl": INTERPRETATION_CACHE_TTL
-}
-
-_NATAL_PREGENERATED_CACHE: Dict[str, Any] = {
-    "data": {},  # Clé: (subject, sign, house, version, lang) → interprétation
-    "timestamp": 0,
-    "ttl": INTERPRETATION_CACHE_TTL
-}
+# Encodage des couches v1 dans pregenerated_lunar_interpretations
+_CLIMATE_ASCENDANT = '_climate_'
+_FOCUS_MARKER = '_focus_'
+_APPROACH_SIGN = '_approach_'
 
 
 def _with_db_retry(max_retries: int = MAX_DB_RETRIES):
@@ -155,10 +133,10 @@ async def get_lunar_climate_cached(
     lang: str = 'fr'
 ) -> Optional[str]:
     """
-    Récupère le template de climat lunaire avec cache (TTL: 1h).
+    Récupère le template de climat lunaire depuis le store en mémoire.
 
     Args:
-        db: Session DB async
+        db: Session DB async (lecture seulement si la langue n'est pas préchargée)
         moon_sign: Signe lunaire
         version: Version du prompt
         lang: Langue
@@ -166,42 +144,18 @@ async def get_lunar_climate_cached(
     Returns:
         Texte d'interprétation ou None
     """
-    global _LUNAR_CLIMATE_CACHE
-
-    cache_key = (moon_sign, version, lang)
-    current_time = time.time()
-
-    # Vérifier le cache
-    if (
-        _LUNAR_CLIMATE_CACHE["timestamp"] > 0
-        and (current_time - _LUNAR_CLIMATE_CACHE["timestamp"]) < _LUNAR_CLIMATE_CACHE["ttl"]
-        and cache_key in _LUNAR_CLIMATE_CACHE["data"]
-    ):
-        cache_age = int(current_time - _LUNAR_CLIMATE_CACHE["timestamp"])
-        logger.debug(f"[LunarClimate] ✅ Cache hit for {moon_sign} (age: {cache_age}s)")
-        return _LUNAR_CLIMATE_CACHE["data"][cache_key]
-
-    # Cache miss - fetch from DB
-    logger.debug(f"[LunarClimate] 🔄 Cache miss for {moon_sign}, fetching from DB")
-
-    try:
-        interpretation = await _fetch_lunar_climate_from_db(db, moon_sign, version, lang)
-
-        # Mettre à jour le cache
-        if interpretation:
-            _LUNAR_CLIMATE_CACHE["data"][cache_key] = interpretation
-            _LUNAR_CLIMATE_CACHE["timestamp"] = current_time
-            logger.debug(f"[LunarClimate] 💾 Cache updated for {moon_sign}")
-
-        return interpretation
-
-    except Exception as e:
-        logger.error(f"[LunarClimate] ❌ Error fetching {moon_sign}: {str(e)}", exc_info=True)
-        # Si cache existe (même expiré), le retourner en fallback
-        if cache_key in _LUNAR_CLIMATE_CACHE["data"]:
-            logger.warning(f"[LunarClimate] ⚠️  Returning stale cache for {moon_sign}")
-            return _LUNAR_CLIMATE_CACHE["data"][cache_key]
-        raise
+    async def fetch():
+        try:
+            interpretation = await _fetch_lunar_climate_from_db(db, moon_sign, version, lang)
+        except Exception as e:
+            logger.error(f"[LunarClimate] ❌ Error fetching {moon_sign}: {str(e)}", exc_info=True)
+            raise
+        return (interpretation, None) if interpretation else None
+
+    row = await interpretation_store.lookup(
+        LUNAR, (moon_sign, 0, _CLIMATE_ASCENDANT, version, lang), lang, fetch
+    )
+    return row[0] if row else None
 
 
 # ============================================================================
@@ -249,10 +203,10 @@ async def get_lunar_focus_cached(
     lang: str = 'fr'
 ) -> Optional[str]:
     """
-    Récupère le template de focus lunaire avec cache (TTL: 1h).
+    Récupère le template de focus lunaire depuis le store en mémoire.
 
     Args:
-        db: Session DB async
+        db: Session DB async (lecture seulement si la langue n'est pas préchargée)
         moon_house: Maison lunaire (1-12)
         version: Version du prompt
         lang: Langue
@@ -260,42 +214,18 @@ async def get_lunar_focus_cached(
     Returns:
         Texte d'interprétation ou None
     """
-    global _LUNAR_FOCUS_CACHE
-
-    cache_key = (moon_house, version, lang)
-    current_time = time.time()
-
-    # Vérifier le cache
-    if (
-        _LUNAR_FOCUS_CACHE["timestamp"] > 0
-        and (current_time - _LUNAR_FOCUS_CACHE["timestamp"]) < _LUNAR_FOCUS_CACHE["ttl"]
-        and cache_key in _LUNAR_FOCUS_CACHE["data"]
-    ):
-        cache_age = int(current_time - _LUNAR_FOCUS_CACHE["timestamp"])
-        logger.debug(f"[LunarFocus] ✅ Cache hit for M{moon_house} (age: {cache_age}s)")
-        return _LUNAR_FOCUS_CACHE["data"][cache_key]
-
-    # Cache miss - fetch from DB
-    logger.debug(f"[LunarFocus] 🔄 Cache miss for M{moon_house}, fetching from DB")
-
-    try:
-        interpretation = await _fetch_lunar_focus_from_db(db, moon_house, version, lang)
-
-        # Mettre à jour le cache
-        if interpretation:
-            _LUNAR_FOCUS_CACHE["data"][cache_key] = interpretation
-            _LUNAR_FOCUS_CACHE["timestamp"] = current_time
-            logger.debug(f"[LunarFocus] 💾 Cache updated for M{moon_house}")
-
-        return interpretation
-
-    except Exception as e:
-        logger.error(f"[LunarFocus] ❌ Error fetching M{moon_house}: {str(e)}", exc_info=True)
-        # Si cache existe (même expiré), le retourner en fallback
-        if cache_key in _LUNAR_FOCUS_CACHE["data"]:
-            logger.warning(f"[LunarFocus] ⚠️  Returning stale cache for M{moon_house}")
-            return _LUNAR_FOCUS_CACHE["data"][cache_key]
-        raise
+    async def fetch():
+        try:
+            interpretation = await _fetch_lunar_focus_from_db(db, moon_house, version, lang)
+        except Exception as e:
+            logger.error(f"[LunarFocus] ❌ Error fetching M{moon_house}: {str(e)}", exc_info=True)
+            raise
+        return (interpretation, None) if interpretation else None
+
+    row = await interpretation_store.lookup(
+        LUNAR, (_FOCUS_MARKER, moon_house, _FOCUS_MARKER, version, lang), lang, fetch
+    )
+    return row[0] if row else None
 
 
 # ============================================================================
@@ -343,10 +273,10 @@ async def get_lunar_approach_cached(
     lang: str = 'fr'
 ) -> Optional[str]:
     """
-    Récupère le template d'approche lunaire avec cache (TTL: 1h).
+    Récupère le template d'approche lunaire depuis le store en mémoire.
 
     Args:
-        db: Session DB async
+        db: Session DB async (lecture seulement si la langue n'est pas préchargée)
         lunar_ascendant: Ascendant lunaire
         version: Version du prompt
         lang: Langue
@@ -354,42 +284,18 @@ async def get_lunar_approach_cached(
     Returns:
         Texte d'interprétation ou None
     """
-    global _LUNAR_APPROACH_CACHE
-
-    cache_key = (lunar_ascendant, version, lang)
-    current_time = time.time()
-
-    # Vérifier le cache
-    if (
-        _LUNAR_APPROACH_CACHE["timestamp"] > 0
-        and (current_time - _LUNAR_APPROACH_CACHE["timestamp"]) < _LUNAR_APPROACH_CACHE["ttl"]
-        and cache_key in _LUNAR_APPROACH_CACHE["data"]
-    ):
-        cache_age = int(current_time - _LUNAR_APPROACH_CACHE["timestamp"])
-        logger.debug(f"[LunarApproach] ✅ Cache hit for {lunar_ascendant} (age: {cache_age}s)")
-        return _LUNAR_APPROACH_CACHE["data"][cache_key]
-
-    # Cache miss - fetch from DB
-    logger.debug(f"[LunarApproach] 🔄 Cache miss for {lunar_ascendant}, fetching from DB")
-
-    try:
-        interpretation = await _fetch_lunar_approach_from_db(db, lunar_ascendant, version, lang)
-
-        # Mettre à jour le cache
-        if interpretation:
-            _LUNAR_APPROACH_CACHE["data"][cache_key] = interpretation
-            _LUNAR_APPROACH_CACHE["timestamp"] = current_time
-            logger.debug(f"[LunarApproach] 💾 Cache updated for {lunar_ascendant}")
-
-        return interpretation
-
-    except Exception as e:
-        logger.error(f"[LunarApproach] ❌ Error fetching {lunar_ascendant}: {str(e)}", exc_info=True)
-        # Si cache existe (même expiré), le retourner en fallback
-        if cache_key in _LUNAR_APPROACH_CACHE["data"]:
-            logger.warning(f"[LunarApproach] ⚠️  Returning stale cache for {lunar_ascendant}")
-            return _LUNAR_APPROACH_CACHE["data"][cache_key]
-        raise
+    async def fetch():
+        try:
+            interpretation = await _fetch_lunar_approach_from_db(db, lunar_ascendant, version, lang)
+        except Exception as e:
+            logger.error(f"[LunarApproach] ❌ Error fetching {lunar_ascendant}: {str(e)}", exc_info=True)
+            raise
+        return (interpretation, None) if interpretation else None
+
+    row = await interpretation_store.lookup(
+        LUNAR, (_APPROACH_SIGN, 0, lunar_ascendant, version, lang), lang, fetch
+    )
+    return row[0] if row else None
 
 
 # ============================================================================
@@ -446,10 +352,10 @@ async def get_lunar_v2_full_cached(
     lang: str = 'fr'
 ) -> Optional[Tuple[str, Optional[Dict[str, Any]]]]:
     """
-    Récupère une interprétation lunaire complète v2 avec cache (TTL: 1h).
+    Récupère une interprétation lunaire complète v2 depuis le store en mémoire.
 
     Args:
-        db: Session DB async
+        db: Session DB async (lecture seulement si la langue n'est pas préchargée)
         moon_sign: Signe lunaire
         moon_house: Maison lunaire (1-12)
         lunar_ascendant: Ascendant lunaire
@@ -459,55 +365,21 @@ async def get_lunar_v2_full_cached(
     Returns:
         Tuple (interpretation_full, weekly_advice) ou None
     """
-    global _LUNAR_V2_FULL_CACHE
-
-    cache_key = (moon_sign, moon_house, lunar_ascendant, version, lang)
-    current_time = time.time()
-
-    # Vérifier le cache
-    if (
-        _LUNAR_V2_FULL_CACHE["timestamp"] > 0
-        and (current_time - _LUNAR_V2_FULL_CACHE["timestamp"]) < _LUNAR_V2_FULL_CACHE["ttl"]
-        and cache_key in _LUNAR_V2_FULL_CACHE["data"]
-    ):
-        cache_age = int(current_time - _LUNAR_V2_FULL_CACHE["timestamp"])
-        logger.debug(
-            f"[LunarV2Full] ✅ Cache hit for {moon_sign}/M{moon_house}/ASC_{lunar_ascendant} (age: {cache_age}s)"
-        )
-        return _LUNAR_V2_FULL_CACHE["data"][cache_key]
-
-    # Cache miss - fetch from DB
-    logger.debug(
-        f"[LunarV2Full] 🔄 Cache miss for {moon_sign}/M{moon_house}/ASC_{lunar_ascendant}, fetching from DB"
-    )
-
-    try:
-        result = await _fetch_lunar_v2_full_from_db(
-            db, moon_sign, moon_house, lunar_ascendant, version, lang
-        )
-
-        # Mettre à jour le cache
-        if result:
-            _LUNAR_V2_FULL_CACHE["data"][cache_key] = result
-            _LUNAR_V2_FULL_CACHE["timestamp"] = current_time
-            logger.debug(
-                f"[LunarV2Full] 💾 Cache updated for {moon_sign}/M{moon_house}/ASC_{lunar_ascendant}"
+    async def fetch():
+        try:
+            return await _fetch_lunar_v2_full_from_db(
+                db, moon_sign, moon_house, lunar_ascendant, version, lang
             )
-
-        return result
-
-    except Exception as e:
-        logger.error(
-            f"[LunarV2Full] ❌ Error fetching {moon_sign}/M{moon_house}/ASC_{lunar_ascendant}: {str(e)}",
-            exc_info=True
-        )
-        # Si cache existe (même expiré), le retourner en fallback
-        if cache_key in _LUNAR_V2_FULL_CACHE["data"]:
-            logger.warning(
-                f"[LunarV2Full] ⚠️  Returning stale cache for {moon_sign}/M{moon_house}/ASC_{lunar_ascendant}"
+        except Exception as e:
+            logger.error(
+                f"[LunarV2Full] ❌ Error fetching {moon_sign}/M{moon_house}/ASC_{lunar_ascendant}: {str(e)}",
+                exc_info=True
             )
-            return _LUNAR_V2_FULL_CACHE["data"][cache_key]
-        raise
+            raise
+
+    return await interpretation_store.lookup(
+        LUNAR, (moon_sign, moon_house, lunar_ascendant, version, lang), lang, fetch
+    )
 
 
 # ============================================================================
@@ -561,10 +433,10 @@ async def get_natal_pregenerated_cached(
     lang: str = 'fr'
 ) -> Optional[str]:
     """
-    Récupère une interprétation natale pré-générée avec cache (TTL: 1h).
+    Récupère une interprétation natale pré-générée depuis le store en mémoire.
 
     Args:
-        db: Session DB async
+        db: Session DB async (lecture seulement si la langue n'est pas préchargée)
         subject: Sujet (sun, moon, etc.)
         sign: Signe (aries, taurus, etc. - en anglais normalisé)
         house: Maison (1-12)
@@ -574,49 +446,19 @@ async def get_natal_pregenerated_cached(
     Returns:
         Texte d'interprétation ou None
     """
-    global _NATAL_PREGENERATED_CACHE
-
-    cache_key = (subject, sign, house, version, lang)
-    current_time = time.time()
-
-    # Vérifier le cache
-    if (
-        _NATAL_PREGENERATED_CACHE["timestamp"] > 0
-        and (current_time - _NATAL_PREGENERATED_CACHE["timestamp"]) < _NATAL_PREGENERATED_CACHE["ttl"]
-        and cache_key in _NATAL_PREGENERATED_CACHE["data"]
-    ):
-        cache_age = int(current_time - _NATAL_PREGENERATED_CACHE["timestamp"])
-        logger.debug(f"[NatalPregenerated] ✅ Cache hit for {subject}/{sign}/M{house} (age: {cache_age}s)")
-        return _NATAL_PREGENERATED_CACHE["data"][cache_key]
-
-    # Cache miss - fetch from DB
-    logger.debug(f"[NatalPregenerated] 🔄 Cache miss for {subject}/{sign}/M{house}, fetching from DB")
-
-    try:
-        interpretation = await _fetch_natal_pregenerated_from_db(
-            db, subject, sign, house, version, lang
-        )
-
-        # Mettre à jour le cache
-        if interpretation:
-            _NATAL_PREGENERATED_CACHE["data"][cache_key] = interpretation
-            _NATAL_PREGENERATED_CACHE["timestamp"] = current_time
-            logger.debug(f"[NatalPregenerated] 💾 Cache updated for {subject}/{sign}/M{house}")
-
-        return interpretation
-
-    except Exception as e:
-        logger.error(
-            f"[NatalPregenerated] ❌ Error fetching {subject}/{sign}/M{house}: {str(e)}",
-            exc_info=True
-        )
-        # Si cache existe (même expiré), le retourner en fallback
-        if cache_key in _NATAL_PREGENERATED_CACHE["data"]:
-            logger.warning(
-                f"[NatalPregenerated] ⚠️  Returning stale cache for {subject}/{sign}/M{house}"
+    async def fetch():
+        try:
+            return await _fetch_natal_pregenerated_from_db(db, subject, sign, house, version, lang)
+        except Exception as e:
+            logger.error(
+                f"[NatalPregenerated] ❌ Error fetching {subject}/{sign}/M{house}: {str(e)}",
+                exc_info=True
             )
-            return _NATAL_PREGENERATED_CACHE["data"][cache_key]
-        raise
+            raise
+
+    return await interpretation_store.lookup(
+        NATAL, (subject, sign, house, version, lang), lang, fetch
+    )
 
 
 # ============================================================================
@@ -624,72 +466,50 @@ async def get_natal_pregenerated_cached(
 # ============================================================================
 
 def clear_cache():
-    """Invalide tous les caches d'interprétation (utile pour tests ou mise à jour DB)"""
-    global _LUNAR_CLIMATE_CACHE, _LUNAR_FOCUS_CACHE, _LUNAR_APPROACH_CACHE
-    global _LUNAR_V2_FULL_CACHE, _NATAL_PREGENERATED_CACHE
-
-    _LUNAR_CLIMATE_CACHE["data"] = {}
-    _LUNAR_CLIMATE_CACHE["timestamp"] = 0
-
-    _LUNAR_FOCUS_CACHE["data"] = {}
-    _LUNAR_FOCUS_CACHE["timestamp"] = 0
-
-    _LUNAR_APPROACH_CACHE["data"] = {}
-    _LUNAR_APPROACH_CACHE["timestamp"] = 0
+    """Vide le store d'interprétations (utile pour tests ou mise à jour DB)"""
+    interpretation_store.reset_interpretation_store()
+    logger.info("[InterpretationCache] 🗑️  All caches cleared")
 
-    _LUNAR_V2_FULL_CACHE["data"] = {}
-    _LUNAR_V2_FULL_CACHE["timestamp"] = 0
 
-    _NATAL_PREGENERATED_CACHE["data"] = {}
-    _NATAL_PREGENERATED_CACHE["timestamp"] = 0
-
-    logger.info("[InterpretationCache] 🗑️  All caches cleared")
+def _lunar_layer(key: Tuple) -> str:
+    """Couche d'une clé lunar (moon_sign, moon_house, lunar_ascendant, version, lang)"""
+    moon_sign, _, lunar_ascendant = key[:3]
+    if lunar_ascendant == _CLIMATE_ASCENDANT:
+        return "lunar_climate"
+    if moon_sign == _FOCUS_MARKER:
+        return "lunar_focus"
+    if moon_sign == _APPROACH_SIGN:
+        return "lunar_approach"
+    return "lunar_v2_full"
 
 
 def get_cache_stats() -> Dict[str, Any]:
     """
-    Retourne les statistiques des caches d'interprétation (pour monitoring).
+    Retourne les statistiques du store d'interprétations (pour monitoring).
 
     Returns:
         {
-            "lunar_climate": {"size": int, "age_seconds": int, "ttl": int},
+            "lunar_climate": {"size": int, "age_seconds": int, "ttl": None},
             "lunar_focus": {...},
             "lunar_approach": {...},
             "lunar_v2_full": {...},
             "natal_pregenerated": {...}
         }
     """
-    current_time = time.time()
+    store = interpretation_store.get_interpretation_store()
+
+    sizes = {"lunar_climate": 0, "lunar_focus": 0, "lunar_approach": 0, "lunar_v2_full": 0}
+    for key in store.table(LUNAR):
+        sizes[_lunar_layer(key)] += 1
+    sizes["natal_pregenerated"] = len(store.table(NATAL))
+
+    age_seconds = int(time.time() - store.loaded_at) if store.loaded_at else None
 
     return {
-        "lunar_climate": {
-            "size": len(_LUNAR_CLIMATE_CACHE["data"]),
-            "age_seconds": int(current_time - _LUNAR_CLIMATE_CACHE["timestamp"])
-                if _LUNAR_CLIMATE_CACHE["timestamp"] > 0 else None,
-            "ttl": _LUNAR_CLIMATE_CACHE["ttl"]
-        },
-        "lunar_focus": {
-            "size": len(_LUNAR_FOCUS_CACHE["data"]),
-            "age_seconds": int(current_time - _LUNAR_FOCUS_CACHE["timestamp"])
-                if _LUNAR_FOCUS_CACHE["timestamp"] > 0 else None,
-            "ttl": _LUNAR_FOCUS_CACHE["ttl"]
-        },
-        "lunar_approach": {
-            "size": len(_LUNAR_APPROACH_CACHE["data"]),
-            "age_seconds": int(current_time - _LUNAR_APPROACH_CACHE["timestamp"])
-                if _LUNAR_APPROACH_CACHE["timestamp"] > 0 else None,
-            "ttl": _LUNAR_APPROACH_CACHE["ttl"]
-        },
-        "lunar_v2_full": {
-            "size": len(_LUNAR_V2_FULL_CACHE["data"]),
-            "age_seconds": int(current_time - _LUNAR_V2_FULL_CACHE["timestamp"])
-                if _LUNAR_V2_FULL_CACHE["timestamp"] > 0 else None,
-            "ttl": _LUNAR_V2_FULL_CACHE["ttl"]
-        },
-        "natal_pregenerated": {
-            "size": len(_NATAL_PREGENERATED_CACHE["data"]),
-            "age_seconds": int(current_time - _NATAL_PREGENERATED_CACHE["timestamp"])
-                if _NATAL_PREGENERATED_CACHE["timestamp"] > 0 else None,
-            "ttl": _NATAL_PREGENERATED_CACHE["ttl"]
+        name: {
+            "size": size,
+            "age_seconds": age_seconds if size else None,
+            "ttl": INTERPRETATION_CACHE_TTL
         }
+        for name, size in sizes.items()
     }
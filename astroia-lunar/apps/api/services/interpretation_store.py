@@ -0,0 +1,364 @@
+"""
+Store en mémoire des interprétations pré-générées (lunaires, natales, aspects)
+
+Ces tables sont statiques à l'exécution (écrites uniquement par les scripts de
+génération) : elles sont chargées en bloc, une requête par table, dans un
+snapshot immuable partagé par tout le process.
+
+- Snapshot immuable (MappingProxyType), remplacé atomiquement à chaque reload
+- Langues chargées au démarrage (INTERPRETATION_STORE_LANGS) : une clé absente
+  est absente en DB, aucune requête n'est faite
+- Autres langues : lecture clé par clé, la ligne trouvée est ajoutée par
+  copie du snapshot (jamais de mutation en place)
+- Lectures DB concurrentes d'une même clé coalescées (single-flight)
+- Snapshot plus vieux que INTERPRETATION_STORE_TTL_SECONDS : rechargé en tâche
+  de fond à la lecture suivante (lignes écrites par les scripts de génération
+  visibles sans redémarrer les workers ; l'ancien snapshot sert en attendant)
+- Métriques Prometheus : hits/misses par table, taille, reloads
+"""
+
+import asyncio
+import logging
+import time
+from types import MappingProxyType
+from typing import Any, Callable, Dict, Iterable, List, Mapping, Optional, Tuple
+
+from prometheus_client import Counter, Gauge
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from config import settings
+from services.single_flight import SingleFlight
+
+logger = logging.getLogger(__name__)
+
+# Tables du store
+LUNAR = "lunar"
+NATAL = "natal"
+ASPECTS = "aspects"
+
+# === MÉTRIQUES PROMETHEUS - INTERPRETATION STORE ===
+
+interpretation_store_lookups_total = Counter(
+    'interpretation_store_lookups_total',
+    'Interpretation store lookups',
+    ['table', 'result']  # result: 'hit' | 'absent' (langue chargée, pas de DB) | 'miss' (lecture DB)
+)
+
+interpretation_store_entries = Gauge(
+    'interpretation_store_entries',
+    'Interpretations held in the in-memory store',
+    ['table']
+)
+
+interpretation_store_reloads_total = Counter(
+    'interpretation_store_reloads_total',
+    'Interpretation store bulk loads',
+    ['status']  # status: 'success' | 'error'
+)
+
+interpretation_store_loaded_timestamp = Gauge(
+    'interpretation_store_loaded_timestamp_seconds',
+    'Unix time of the last successful bulk load'
+)
+
+
+class InterpretationStore:
+    """
+    Snapshot immuable des interprétations pré-générées
+
+    Clés (identiques aux colonnes uniques des tables) :
+    - lunar:   (moon_sign, moon_house, lunar_ascendant, version, lang) → (interpretation_full, weekly_advice)
+    - natal:   (subject, sign, house, version, lang) → content
+    - aspects: (planet1, planet2, aspect_type, version, lang) → content (planètes en ordre alphabétique)
+
+    Les couches v1 (climat, focus, approche) sont des lignes lunar encodées
+    ('_climate_', '_focus_', '_approach_').
+    """
+
+    __slots__ = ("_tables", "langs", "loaded_at")
+
+    def __init__(
+        self,
+        lunar: Optional[Mapping[Tuple, Tuple[str, Optional[Dict[str, Any]]]]] = None,
+        natal: Optional[Mapping[Tuple, str]] = None,
+        aspects: Optional[Mapping[Tuple, str]] = None,
+        langs: Iterable[str] = (),
+        loaded_at: Optional[float] = None
+    ):
+        self._tables = MappingProxyType({
+            LUNAR: MappingProxyType(dict(lunar or {})),
+            NATAL: MappingProxyType(dict(natal or {})),
+            ASPECTS: MappingProxyType(dict(aspects or {})),
+        })
+        # Langues chargées en entier : une clé absente est absente en DB
+        self.langs = frozenset(langs)
+        self.loaded_at = loaded_at
+
+    def table(self, name: str) -> Mapping[Tuple, Any]:
+        return self._tables[name]
+
+    def is_complete(self, lang: str) -> bool:
+        return lang in self.langs
+
+    def sizes(self) -> Dict[str, int]:
+        return {name: len(entries) for name, entries in self._tables.items()}
+
+    def with_entry(self, table: str, key: Tuple, value: Any) -> "InterpretationStore":
+        """Copie du snapshot avec une ligne en plus (lue clé par clé)"""
+        return self.with_entries(table, {key: value})
+
+    def with_entries(self, table: str, entries: Mapping[Tuple, Any]) -> "InterpretationStore":
+        """Copie du snapshot avec des lignes en plus (une seule copie par lot)"""
+        tables = {name: dict(rows) for name, rows in self._tables.items()}
+        tables[table].update(entries)
+        return InterpretationStore(
+            tables[LUNAR], tables[NATAL], tables[ASPECTS],
+            langs=self.langs,
+            loaded_at=self.loaded_at or time.time()
+        )
+
+
+_STORE = InterpretationStore()
+
+# Lectures DB des langues non préchargées : une seule par clé en cours
+_FETCH_FLIGHT = SingleFlight("interpretation_store")
+
+# Délai min entre deux rechargements de fond (échecs répétés : DB indisponible)
+RELOAD_RETRY_SECONDS = 60
+
+_RELOAD_TASK: Optional[asyncio.Task] = None
+_RELOAD_ATTEMPTED_AT = 0.0
+
+
+def get_interpretation_store() -> InterpretationStore:
+    """Snapshot courant (une seule lecture de référence, cohérent pour l'appelant)"""
+    return _STORE
+
+
+def set_interpretation_store(store: InterpretationStore) -> None:
+    """Remplace atomiquement le snapshot partagé"""
+    global _STORE
+    _STORE = store
+    for name, size in store.sizes().items():
+        interpretation_store_entries.labels(table=name).set(size)
+
+
+def reset_interpretation_store() -> None:
+    """Vide le store (tests, ou avant un rechargement complet)"""
+    global _RELOAD_TASK, _RELOAD_ATTEMPTED_AT
+    _RELOAD_TASK = None
+    _RELOAD_ATTEMPTED_AT = 0.0
+    set_interpretation_store(InterpretationStore())
+
+
+def _reload_if_stale(store: InterpretationStore) -> None:
+    """Lance un rechargement de fond si le snapshot préchargé a dépassé son TTL"""
+    global _RELOAD_TASK, _RELOAD_ATTEMPTED_AT
+    ttl = settings.INTERPRETATION_STORE_TTL_SECONDS
+    if ttl <= 0 or not store.langs or store.loaded_at is None:
+        return
+    if time.time() - store.loaded_at < ttl:
+        return
+    if _RELOAD_TASK is not None and not _RELOAD_TASK.done():
+        return
+    now = time.monotonic()
+    if now - _RELOAD_ATTEMPTED_AT < RELOAD_RETRY_SECONDS:
+        return
+
+    _RELOAD_ATTEMPTED_AT = now
+    _RELOAD_TASK = asyncio.create_task(reload_interpretation_store(store.langs))
+
+
+async def lookup(
+    table: str,
+    key: Tuple,
+    lang: str,
+    fetch: Callable[[], Any]
+) -> Optional[Any]:
+    """
+    Lecture d'une interprétation : store d'abord, DB seulement si la langue
+    n'a pas été chargée en bloc
+
+    Args:
+        table: LUNAR, NATAL ou ASPECTS
+        key: Clé complète (version et lang inclus)
+        lang: Langue de la clé
+        fetch: Coroutine function de lecture DB d'une seule ligne
+
+    Returns:
+        La valeur stockée, ou None si absente
+    """
+    store = get_interpretation_store()
+    _reload_if_stale(store)
+    value = store.table(table).get(key)
+    if value is not None:
+        interpretation_store_lookups_total.labels(table=table, result='hit').inc()
+        return value
+
+    if store.is_complete(lang):
+        interpretation_store_lookups_total.labels(table=table, result='absent').inc()
+        return None
+
+    interpretation_store_lookups_total.labels(table=table, result='miss').inc()
+
+    async def fetch_and_remember():
+        value = await fetch()
+        if value is not None:
+            # Relire le store : un reload a pu le remplacer pendant la requête
+            set_interpretation_store(get_interpretation_store().with_entry(table, key, value))
+        return value
+
+    # Requêtes concurrentes sur la même clé : une seule lecture DB
+    return await _FETCH_FLIGHT.do((table, key), fetch_and_remember)
+
+
+async def lookup_many(
+    table: str,
+    keys: Iterable[Tuple],
+    lang: str,
+    fetch_many: Callable[[List[Tuple]], Any]
+) -> Dict[Tuple, Any]:
+    """
+    Lecture groupée : les clés absentes du store sont lues en une seule requête
+
+    Args:
+        table: LUNAR, NATAL ou ASPECTS
+        keys: Clés complètes (version et lang inclus), même langue
+        lang: Langue des clés
+        fetch_many: Coroutine function (clés manquantes) → {clé: valeur} trouvées en DB
+
+    Returns:
+        {clé: valeur} pour les clés trouvées
+    """
+    store = get_interpretation_store()
+    _reload_if_stale(store)
+    entries = store.table(table)
+
+    found: Dict[Tuple, Any] = {}
+    missing: List[Tuple] = []
+    for key in dict.fromkeys(keys):
+        value = entries.get(key)
+        if value is not None:
+            found[key] = value
+        else:
+            missing.append(key)
+
+    interpretation_store_lookups_total.labels(table=table, result='hit').inc(len(found))
+    if not missing:
+        return found
+
+    if store.is_complete(lang):
+        interpretation_store_lookups_total.labels(table=table, result='absent').inc(len(missing))
+        return found
+
+    interpretation_store_lookups_total.labels(table=table, result='miss').inc(len(missing))
+
+    async def fetch_and_remember():
+        fetched = {key: value for key, value in (await fetch_many(missing)).items() if value is not None}
+        if fetched:
+            set_interpretation_store(get_interpretation_store().with_entries(table, fetched))
+        return fetched
+
+    found.update(await _FETCH_FLIGHT.do((table, tuple(missing)), fetch_and_remember))
+    return found
+
+
+async def load_interpretation_store(db: AsyncSession, langs: Iterable[str]) -> InterpretationStore:
+    """
+    Charge les trois tables pour les langues données (une requête par table)
+
+    Returns:
+        Un nouveau snapshot (non installé, voir set_interpretation_store)
+    """
+    from models.pregenerated_lunar_interpretation import PregeneratedLunarInterpretation
+    from models.pregenerated_natal_aspect import PregeneratedNatalAspect
+    from models.pregenerated_natal_interpretation import PregeneratedNatalInterpretation
+
+    langs = tuple(langs)
+
+    lunar_rows = await db.execute(
+        select(
+            PregeneratedLunarInterpretation.moon_sign,
+            PregeneratedLunarInterpretation.moon_house,
+            PregeneratedLunarInterpretation.lunar_ascendant,
+            PregeneratedLunarInterpretation.version,
+            PregeneratedLunarInterpretation.lang,
+            PregeneratedLunarInterpretation.interpretation_full,
+            PregeneratedLunarInterpretation.weekly_advice,
+        ).where(PregeneratedLunarInterpretation.lang.in_(langs))
+    )
+    lunar = {tuple(row[:5]): (row[5], row[6]) for row in lunar_rows.all()}
+
+    natal_rows = await db.execute(
+        select(
+            PregeneratedNatalInterpretation.subject,
+            PregeneratedNatalInterpretation.sign,
+            PregeneratedNatalInterpretation.house,
+            PregeneratedNatalInterpretation.version,
+            PregeneratedNatalInterpretation.lang,
+            PregeneratedNatalInterpretation.content,
+        ).where(PregeneratedNatalInterpretation.lang.in_(langs))
+    )
+    natal = {tuple(row[:5]): row[5] for row in natal_rows.all()}
+
+    aspect_rows = await db.execute(
+        select(
+            PregeneratedNatalAspect.planet1,
+            PregeneratedNatalAspect.planet2,
+            PregeneratedNatalAspect.aspect_type,
+            PregeneratedNatalAspect.version,
+            PregeneratedNatalAspect.lang,
+            PregeneratedNatalAspect.content,
+        ).where(PregeneratedNatalAspect.lang.in_(langs))
+    )
+    aspects = {tuple(row[:5]): row[5] for row in aspect_rows.all()}
+
+    return InterpretationStore(lunar, natal, aspects, langs=langs, loaded_at=time.time())
+
+
+def configured_langs() -> Tuple[str, ...]:
+    return tuple(lang.strip() for lang in settings.INTERPRETATION_STORE_LANGS.split(",") if lang.strip())
+
+
+async def reload_interpretation_store(
+    langs: Optional[Iterable[str]] = None,
+    session_factory: Optional[Callable[[], Any]] = None
+) -> Optional[InterpretationStore]:
+    """
+    Recharge le store depuis la DB et l'installe atomiquement
+
+    En cas d'erreur, le snapshot précédent reste en place.
+
+    Args:
+        langs: Langues à charger (défaut: INTERPRETATION_STORE_LANGS)
+        session_factory: Fabrique de sessions (défaut: database.AsyncSessionLocal)
+
+    Returns:
+        Le nouveau snapshot, ou None si le chargement a échoué
+    """
+    if session_factory is None:
+        from database import AsyncSessionLocal
+        session_factory = AsyncSessionLocal
+    langs = tuple(langs) if langs is not None else configured_langs()
+
+    started = time.perf_counter()
+    try:
+        async with session_factory() as db:
+            store = await load_interpretation_store(db, langs)
+    except Exception as e:
+        interpretation_store_reloads_total.labels(status='error').inc()
+        logger.warning(f"[InterpretationStore] ⚠️ Chargement impossible ({', '.join(langs)}): {e}")
+        return None
+
+    set_interpretation_store(store)
+    interpretation_store_reloads_total.labels(status='success').inc()
+    interpretation_store_loaded_timestamp.set(store.loaded_at)
+
+    sizes = store.sizes()
+    logger.info(
+        f"[InterpretationStore] ✅ Chargé ({', '.join(langs)}) en {time.perf_counter() - started:.2f}s: "
+        f"{sizes[LUNAR]} lunaires, {sizes[NATAL]} natales, {sizes[ASPECTS]} aspects"
+    )
+    return store
+
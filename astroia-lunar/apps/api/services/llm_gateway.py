@@ -0,0 +1,195 @@
+"""
+Passerelle LLM (Anthropic) des interprétations natales et lunaires
+
+Un AsyncAnthropic partagé par process, au lieu d'un client synchrone créé à
+chaque appel puis exécuté dans la boucle (bloquante) ou dans un thread :
+- Pool de connexions keep-alive réutilisé (HTTP_MAX_CONNECTIONS)
+- Concurrence globale bornée (LLM_MAX_CONCURRENCY) : une rafale de générations
+  (batch natal, cron lunaire) ne dépasse pas la capacité du compte
+- Débit par modèle (token bucket, LLM_REQUESTS_PER_MINUTE / LLM_RATE_BURST)
+- Timeout réel : l'appel est awaité, asyncio.wait_for l'annule (attente de
+  créneau comprise) et la requête HTTP en cours est abandonnée
+- Retries 429 / 5xx / réseau délégués au SDK (LLM_MAX_RETRIES, backoff exponentiel)
+- Latence, attente et tokens par modèle exportés sur /metrics
+
+ANTHROPIC_BASE_URL permet de viser un serveur local (faux serveur de tests, proxy).
+"""
+
+import asyncio
+import logging
+import time
+from typing import Any, Dict, Optional
+
+from anthropic import APIConnectionError, APIStatusError, APITimeoutError, AsyncAnthropic, DefaultAsyncHttpxClient
+from anthropic.types import Message
+import httpx
+from prometheus_client import Counter, Histogram
+
+from config import settings
+from services.http_client import TokenBucket
+
+logger = logging.getLogger(__name__)
+
+# === MÉTRIQUES PROMETHEUS - LLM ===
+
+llm_request_duration_seconds = Histogram(
+    'llm_request_duration_seconds',
+    'LLM call latency per model (SDK retries included)',
+    ['model', 'status'],  # status: 'ok' | code HTTP | 'timeout' | 'error'
+    buckets=(0.5, 1, 2, 5, 10, 20, 30, 60, 120)
+)
+
+llm_wait_seconds = Histogram(
+    'llm_wait_seconds',
+    'Time spent waiting for a global LLM concurrency slot or a per-model rate-limit token',
+    ['model'],
+    buckets=(0.001, 0.01, 0.1, 0.5, 1, 5, 10, 30)
+)
+
+llm_tokens_total = Counter(
+    'llm_tokens_total',
+    'LLM tokens consumed per model',
+    ['model', 'kind']  # kind: 'input' | 'output'
+)
+
+
+class LLMTimeoutError(asyncio.TimeoutError):
+    """Appel LLM non terminé dans le délai (requête annulée)"""
+
+    def __init__(self, model: str, timeout: float):
+        super().__init__(f"Appel {model} interrompu après {timeout:.0f}s")
+        self.model = model
+        self.timeout = timeout
+
+
+_CLIENT: Optional[AsyncAnthropic] = None
+_BUCKETS: Dict[str, TokenBucket] = {}
+_SEMAPHORE: Optional[asyncio.Semaphore] = None
+_SEMAPHORE_LOOP: Optional[asyncio.AbstractEventLoop] = None
+
+
+def get_client() -> AsyncAnthropic:
+    """
+    Client AsyncAnthropic partagé (créé au premier appel)
+
+    Raises:
+        ValueError: ANTHROPIC_API_KEY absent
+    """
+    global _CLIENT
+    if _CLIENT is None or _CLIENT.is_closed():
+        if not settings.ANTHROPIC_API_KEY:
+            raise ValueError("ANTHROPIC_API_KEY non défini dans .env")
+        _CLIENT = AsyncAnthropic(
+            api_key=settings.ANTHROPIC_API_KEY,
+            base_url=settings.ANTHROPIC_BASE_URL or None,
+            timeout=settings.LLM_TIMEOUT_SECONDS,
+            max_retries=settings.LLM_MAX_RETRIES,
+            http_client=DefaultAsyncHttpxClient(
+                limits=httpx.Limits(
+                    max_connections=settings.HTTP_MAX_CONNECTIONS,
+                    max_keepalive_connections=settings.HTTP_MAX_KEEPALIVE_CONNECTIONS,
+                    keepalive_expiry=settings.HTTP_KEEPALIVE_EXPIRY_SECONDS,
+                ),
+            ),
+        )
+        logger.info(f"[LLM] ✅ Client Anthropic créé (concurrence={settings.LLM_MAX_CONCURRENCY or '∞'}, {settings.LLM_REQUESTS_PER_MINUTE or '∞'} req/min par modèle)")
+    return _CLIENT
+
+
+def set_client(client: Optional[AsyncAnthropic]) -> None:
+    """Remplace le client partagé (tests). None = recréé au prochain appel"""
+    global _CLIENT
+    _CLIENT = client
+
+
+def _semaphore() -> Optional[asyncio.Semaphore]:
+    global _SEMAPHORE, _SEMAPHORE_LOOP
+    if settings.LLM_MAX_CONCURRENCY <= 0:
+        return None
+    loop = asyncio.get_running_loop()
+    if _SEMAPHORE is None or _SEMAPHORE_LOOP is not loop:
+        _SEMAPHORE = asyncio.Semaphore(settings.LLM_MAX_CONCURRENCY)
+        _SEMAPHORE_LOOP = loop
+    return _SEMAPHORE
+
+
+def _bucket(model: str) -> TokenBucket:
+    bucket = _BUCKETS.get(model)
+    if bucket is None:
+        bucket = _BUCKETS[model] = TokenBucket(settings.LLM_REQUESTS_PER_MINUTE / 60, settings.LLM_RATE_BURST)
+    return bucket
+
+
+async def _send(client: AsyncAnthropic, model: str, timeout: float, params: Dict[str, Any]) -> Message:
+    semaphore = _semaphore()
+    wait_started = time.perf_counter()
+    if semaphore is not None:
+        await semaphore.acquire()
+    try:
+        await _bucket(model).acquire()
+        llm_wait_seconds.labels(model=model).observe(time.perf_counter() - wait_started)
+
+        started = time.perf_counter()
+        try:
+            message = await client.messages.create(model=model, timeout=timeout, **params)
+        except APIStatusError as e:
+            llm_request_duration_seconds.labels(model=model, status=str(e.status_code)).observe(time.perf_counter() - started)
+            raise
+        except APITimeoutError:
+            llm_request_duration_seconds.labels(model=model, status='timeout').observe(time.perf_counter() - started)
+            raise
+        except APIConnectionError:
+            llm_request_duration_seconds.labels(model=model, status='error').observe(time.perf_counter() - started)
+            raise
+    finally:
+        if semaphore is not None:
+            semaphore.release()
+
+    llm_request_duration_seconds.labels(model=model, status='ok').observe(time.perf_counter() - started)
+    usage = getattr(message, "usage", None)
+    if usage is not None:
+        llm_tokens_total.labels(model=model, kind='input').inc(usage.input_tokens or 0)
+        llm_tokens_total.labels(model=model, kind='output').inc(usage.output_tokens or 0)
+    return message
+
+
+async def create_message(*, model: str, timeout: Optional[float] = None, **params: Any) -> Message:
+    """
+    messages.create via le client partagé (mêmes arguments que le SDK)
+
+    Args:
+        model: Identifiant du modèle Claude
+        timeout: Délai total (secondes), attente de créneau comprise ; défaut LLM_TIMEOUT_SECONDS
+        **params: max_tokens, messages, system, temperature, ...
+
+    Raises:
+        LLMTimeoutError: Délai dépassé (l'appel est annulé)
+        ValueError: ANTHROPIC_API_KEY absent
+        anthropic.APIError: Erreur API après les retries du SDK
+    """
+    timeout = timeout or settings.LLM_TIMEOUT_SECONDS
+    client = get_client()
+    started = time.perf_counter()
+    try:
+        return await asyncio.wait_for(_send(client, model, timeout, params), timeout=timeout)
+    except asyncio.TimeoutError:
+        llm_request_duration_seconds.labels(model=model, status='timeout').observe(time.perf_counter() - started)
+        logger.warning(f"[LLM:{model}] ⏱️ Timeout après {timeout:.0f}s, appel annulé")
+        raise LLMTimeoutError(model, timeout) from None
+
+
+def reset_gateway_state() -> None:
+    """Token buckets recréés pleins avec les réglages courants (tests, intervention manuelle)"""
+    _BUCKETS.clear()
+
+
+async def close_client() -> None:
+    """Ferme le client partagé (shutdown de l'API)"""
+    global _CLIENT
+    if _CLIENT is None:
+        return
+    try:
+        await _CLIENT.close()
+    except Exception as e:
+        logger.warning(f"[LLM] ⚠️ Erreur fermeture client: {e}")
+    _CLIENT = None
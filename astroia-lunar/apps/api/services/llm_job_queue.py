@@ -0,0 +1,445 @@
+"""
+File durable des générations d'interprétations par LLM (table llm_generation_jobs)
+
+Avec LLM_JOB_QUEUE_ENABLED, un miss d'interprétation ne fait plus attendre la
+requête HTTP sur Claude (30s et plus) :
+- la route répond tout de suite avec le pré-généré / template / placeholder
+  (non sauvegardé comme interprétation) et enfile un job ;
+- des workers (LLM_JOB_WORKERS par process API, ou scripts/run_llm_job_worker.py)
+  génèrent et sauvegardent l'interprétation, que la lecture suivante sert
+  depuis la DB ;
+- GET /api/llm-jobs/{id} expose l'état du job (polling client).
+
+Dédoublonnage : une ligne par interprétation visée (dedupe_key), un même miss
+redemandé pendant la génération ne crée pas de second job.
+Priorité : les demandes d'un utilisateur (PRIORITY_INTERACTIVE) passent avant
+les préchauffages en lot (PRIORITY_BACKGROUND).
+Retries : backoff exponentiel (LLM_JOB_RETRY_BASE_SECONDS) jusqu'à
+LLM_JOB_MAX_ATTEMPTS ; un job 'running' dont le bail a expiré (worker tué)
+est repris.
+"""
+
+import asyncio
+import logging
+import os
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+from prometheus_client import Counter, Histogram
+from sqlalchemy import and_, or_, select, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from config import settings
+from database import AsyncSessionLocal
+from models.llm_generation_job import LLMGenerationJob
+
+logger = logging.getLogger(__name__)
+
+JOB_KIND_NATAL = "natal"
+JOB_KIND_LUNAR = "lunar"
+
+PRIORITY_INTERACTIVE = 10
+PRIORITY_BACKGROUND = 0
+
+ACTIVE_STATUSES = ("pending", "running")
+
+# === MÉTRIQUES PROMETHEUS - FILE LLM ===
+
+llm_jobs_enqueued_total = Counter(
+    'llm_jobs_enqueued_total',
+    'LLM generation jobs enqueued',
+    ['kind', 'result']  # result: 'created' | 'deduplicated' | 'requeued'
+)
+
+llm_jobs_processed_total = Counter(
+    'llm_jobs_processed_total',
+    'LLM generation job attempts',
+    ['kind', 'status']  # status: 'done' | 'retry' | 'failed'
+)
+
+llm_job_duration_seconds = Histogram(
+    'llm_job_duration_seconds',
+    'Duration of one LLM generation job attempt',
+    ['kind'],
+    buckets=(1, 2, 5, 10, 20, 30, 60, 120, 300)
+)
+
+llm_job_queue_wait_seconds = Histogram(
+    'llm_job_queue_wait_seconds',
+    'Time between job enqueue and first claim by a worker',
+    ['kind'],
+    buckets=(0.1, 0.5, 1, 5, 10, 30, 60, 300, 900)
+)
+
+
+class LLMJobError(Exception):
+    """Génération non exploitable (placeholder, réponse vide) : le job est retenté"""
+
+
+def natal_job_key(user_id: int, chart_id: str, subject: str, lang: str, version: int) -> str:
+    return f"{JOB_KIND_NATAL}:{user_id}:{chart_id}:{subject}:{lang}:v{version}"
+
+
+def lunar_job_key(lunar_return_id: int, subject: str, lang: str, version: int) -> str:
+    return f"{JOB_KIND_LUNAR}:{lunar_return_id}:{subject}:{lang}:v{version}"
+
+
+def _utcnow() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+def _as_utc(value: Optional[datetime]) -> Optional[datetime]:
+    # SQLite rend des datetimes naïfs (stockés en UTC)
+    if value is not None and value.tzinfo is None:
+        return value.replace(tzinfo=timezone.utc)
+    return value
+
+
+# === ENQUEUE ===
+
+async def _enqueue(db: AsyncSession, kind: str, dedupe_key: str, payload: Dict[str, Any],
+                   user_id: Optional[int], priority: int) -> LLMGenerationJob:
+    now = _utcnow()
+    job = (await db.execute(
+        select(LLMGenerationJob).where(LLMGenerationJob.dedupe_key == dedupe_key)
+    )).scalar_one_or_none()
+
+    if job is None:
+        job = LLMGenerationJob(
+            kind=kind,
+            dedupe_key=dedupe_key,
+            user_id=user_id,
+            payload=payload,
+            priority=priority,
+            status="pending",
+            attempts=0,
+            max_attempts=settings.LLM_JOB_MAX_ATTEMPTS,
+            run_after=now,
+            created_at=now,
+        )
+        db.add(job)
+        result = "created"
+    elif job.status in ACTIVE_STATUSES:
+        # Déjà en file ou en cours : au plus une remontée de priorité
+        job.priority = max(job.priority, priority)
+        result = "deduplicated"
+    else:
+        # 'done' (interprétation supprimée / régénération demandée) ou 'failed' : nouveau cycle
+        job.payload = payload
+        job.priority = priority
+        job.status = "pending"
+        job.attempts = 0
+        job.max_attempts = settings.LLM_JOB_MAX_ATTEMPTS
+        job.last_error = None
+        job.result_id = None
+        job.run_after = now
+        job.locked_by = None
+        job.locked_at = None
+        job.finished_at = None
+        job.created_at = now
+        result = "requeued"
+
+    await db.commit()
+    llm_jobs_enqueued_total.labels(kind=kind, result=result).inc()
+    logger.info(f"[LLMJobs] 📥 Job {job.id} {result} ({dedupe_key}, priorité {job.priority})")
+    return job
+
+
+async def enqueue_job(
+    kind: str,
+    dedupe_key: str,
+    payload: Dict[str, Any],
+    user_id: Optional[int] = None,
+    priority: int = PRIORITY_INTERACTIVE
+) -> LLMGenerationJob:
+    """
+    Enfile une génération (idempotent par dedupe_key), dans sa propre session :
+    la session de la requête appelante n'est ni commitée ni annulée
+
+    Returns:
+        Le job (créé, existant ou ré-enfilé), détaché de la session
+    """
+    async with AsyncSessionLocal() as db:
+        try:
+            return await _enqueue(db, kind, dedupe_key, payload, user_id, priority)
+        except IntegrityError:
+            # Course avec une autre requête sur la même clé : reprendre sa ligne
+            await db.rollback()
+            return await _enqueue(db, kind, dedupe_key, payload, user_id, priority)
+
+
+async def enqueue_natal_job(
+    user_id: int,
+    chart_id: str,
+    subject: str,
+    lang: str,
+    version: int,
+    chart_payload: Dict[str, Any],
+    priority: int = PRIORITY_INTERACTIVE
+) -> LLMGenerationJob:
+    return await enqueue_job(
+        JOB_KIND_NATAL,
+        natal_job_key(user_id, chart_id, subject, lang, version),
+        {
+            "user_id": user_id,
+            "chart_id": chart_id,
+            "subject": subject,
+            "lang": lang,
+            "version": version,
+            "chart_payload": chart_payload,
+        },
+        user_id=user_id,
+        priority=priority,
+    )
+
+
+async def enqueue_lunar_job(
+    lunar_return_id: int,
+    user_id: int,
+    subject: str,
+    version: int,
+    lang: str,
+    priority: int = PRIORITY_INTERACTIVE,
+    refresh: bool = False
+) -> LLMGenerationJob:
+    return await enqueue_job(
+        JOB_KIND_LUNAR,
+        lunar_job_key(lunar_return_id, subject, lang, version),
+        {
+            "lunar_return_id": lunar_return_id,
+            "user_id": user_id,
+            "subject": subject,
+            "version": version,
+            "lang": lang,
+            "refresh": refresh,
+        },
+        user_id=user_id,
+        priority=priority,
+    )
+
+
+async def get_job(db: AsyncSession, job_id: int) -> Optional[LLMGenerationJob]:
+    return await db.get(LLMGenerationJob, job_id)
+
+
+async def get_job_by_key(db: AsyncSession, dedupe_key: str) -> Optional[LLMGenerationJob]:
+    result = await db.execute(select(LLMGenerationJob).where(LLMGenerationJob.dedupe_key == dedupe_key))
+    return result.scalar_one_or_none()
+
+
+# === HANDLERS ===
+
+async def _run_natal_job(db: AsyncSession, payload: Dict[str, Any]) -> str:
+    from services.natal_interpretation_service import (
+        generate_with_sonnet_fallback_haiku,
+        save_natal_interpretation,
+    )
+
+    text, model_used = await generate_with_sonnet_fallback_haiku(
+        subject=payload["subject"],
+        chart_payload=payload["chart_payload"],
+        version=payload["version"],
+        skip_pregenerated=True
+    )
+    if model_used.startswith("placeholder"):
+        # Clé invalide, crédits épuisés, mode LLM désactivé : ne pas figer un placeholder
+        raise LLMJobError(f"Génération indisponible ({model_used})")
+
+    interpretation = await save_natal_interpretation(
+        db,
+        user_id=payload["user_id"],
+        chart_id=payload["chart_id"],
+        subject=payload["subject"],
+        lang=payload["lang"],
+        version=payload["version"],
+        input_json=payload["chart_payload"],
+        text=text
+    )
+    return str(interpretation.id)
+
+
+async def _run_lunar_job(db: AsyncSession, payload: Dict[str, Any]) -> str:
+    from services.lunar_interpretation_generator import generate_and_store_interpretation
+
+    interpretation = await generate_and_store_interpretation(
+        db,
+        lunar_return_id=payload["lunar_return_id"],
+        user_id=payload["user_id"],
+        subject=payload["subject"],
+        version=payload["version"],
+        lang=payload["lang"],
+        refresh=payload.get("refresh", False)
+    )
+    return str(interpretation.id)
+
+
+JobHandler = Callable[[AsyncSession, Dict[str, Any]], Awaitable[str]]
+
+JOB_HANDLERS: Dict[str, JobHandler] = {
+    JOB_KIND_NATAL: _run_natal_job,
+    JOB_KIND_LUNAR: _run_lunar_job,
+}
+
+
+# === WORKER ===
+
+async def claim_jobs(worker_id: str, limit: int = 1) -> List[LLMGenerationJob]:
+    """
+    Réserve jusqu'à limit jobs exécutables (pending échus, ou running au bail expiré),
+    par priorité décroissante puis ancienneté. FOR UPDATE SKIP LOCKED sous PostgreSQL :
+    deux workers ne prennent jamais le même job.
+    """
+    now = _utcnow()
+    lease_expired = now - timedelta(seconds=settings.LLM_JOB_LEASE_SECONDS)
+
+    async with AsyncSessionLocal() as db:
+        result = await db.execute(
+            select(LLMGenerationJob)
+            .where(or_(
+                and_(LLMGenerationJob.status == "pending", LLMGenerationJob.run_after <= now),
+                and_(LLMGenerationJob.status == "running", LLMGenerationJob.locked_at < lease_expired),
+            ))
+            .order_by(LLMGenerationJob.priority.desc(), LLMGenerationJob.id)
+            .limit(limit)
+            .with_for_update(skip_locked=True)
+        )
+        jobs = list(result.scalars().all())
+        for job in jobs:
+            if job.attempts == 0:
+                llm_job_queue_wait_seconds.labels(kind=job.kind).observe(
+                    max(0.0, (now - _as_utc(job.created_at)).total_seconds())
+                )
+            job.status = "running"
+            job.attempts += 1
+            job.locked_by = worker_id
+            job.locked_at = now
+        await db.commit()
+    return jobs
+
+
+async def _finish(job: LLMGenerationJob, worker_id: str, values: Dict[str, Any]) -> None:
+    async with AsyncSessionLocal() as db:
+        # Bail repris par un autre worker entre-temps : ne pas écraser son état
+        await db.execute(
+            update(LLMGenerationJob)
+            .where(LLMGenerationJob.id == job.id, LLMGenerationJob.locked_by == worker_id)
+            .values(locked_by=None, locked_at=None, **values)
+        )
+        await db.commit()
+
+
+async def process_job(job: LLMGenerationJob, worker_id: str) -> str:
+    """
+    Exécute un job réservé et enregistre son issue
+
+    Returns:
+        'done' | 'retry' | 'failed'
+    """
+    handler = JOB_HANDLERS.get(job.kind)
+    started = time.perf_counter()
+    try:
+        if handler is None:
+            raise LLMJobError(f"Type de job inconnu: {job.kind}")
+        async with AsyncSessionLocal() as db:
+            result_id = await asyncio.wait_for(handler(db, job.payload), timeout=settings.LLM_JOB_TIMEOUT_SECONDS)
+    except asyncio.CancelledError:
+        # Arrêt du worker : le job repasse en file sans consommer de tentative
+        await asyncio.shield(_finish(job, worker_id, {"status": "pending", "attempts": max(0, job.attempts - 1)}))
+        raise
+    except Exception as e:
+        error = f"{type(e).__name__}: {e}"[:2000]
+        llm_job_duration_seconds.labels(kind=job.kind).observe(time.perf_counter() - started)
+        if job.attempts >= job.max_attempts or handler is None:
+            await _finish(job, worker_id, {"status": "failed", "last_error": error, "finished_at": _utcnow()})
+            llm_jobs_processed_total.labels(kind=job.kind, status='failed').inc()
+            logger.error(f"[LLMJobs] ❌ Job {job.id} abandonné après {job.attempts} tentative(s): {error}")
+            return "failed"
+
+        delay = settings.LLM_JOB_RETRY_BASE_SECONDS * (2 ** (job.attempts - 1))
+        await _finish(job, worker_id, {
+            "status": "pending",
+            "last_error": error,
+            "run_after": _utcnow() + timedelta(seconds=delay),
+        })
+        llm_jobs_processed_total.labels(kind=job.kind, status='retry').inc()
+        logger.warning(f"[LLMJobs] ⚠️ Job {job.id} en échec (tentative {job.attempts}/{job.max_attempts}), nouvel essai dans {delay:.0f}s: {error}")
+        return "retry"
+
+    duration = time.perf_counter() - started
+    llm_job_duration_seconds.labels(kind=job.kind).observe(duration)
+    await _finish(job, worker_id, {"status": "done", "result_id": result_id, "last_error": None, "finished_at": _utcnow()})
+    llm_jobs_processed_total.labels(kind=job.kind, status='done').inc()
+    logger.info(f"[LLMJobs] ✅ Job {job.id} terminé en {duration:.1f}s ({job.dedupe_key})")
+    return "done"
+
+
+async def run_pending_jobs(worker_id: Optional[str] = None, max_jobs: Optional[int] = None) -> int:
+    """
+    Traite les jobs exécutables un par un jusqu'à file vide (ou max_jobs)
+
+    Returns:
+        Nombre de jobs traités
+    """
+    worker_id = worker_id or _default_worker_id()
+    processed = 0
+    while max_jobs is None or processed < max_jobs:
+        jobs = await claim_jobs(worker_id, limit=1)
+        if not jobs:
+            break
+        await process_job(jobs[0], worker_id)
+        processed += 1
+    return processed
+
+
+def _default_worker_id() -> str:
+    return f"{os.getpid()}-{uuid.uuid4().hex[:8]}"
+
+
+async def worker_loop(worker_id: Optional[str] = None, stop: Optional[asyncio.Event] = None) -> None:
+    """Boucle d'un worker : traite la file, attend LLM_JOB_POLL_SECONDS quand elle est vide"""
+    worker_id = worker_id or _default_worker_id()
+    stop = stop or asyncio.Event()
+    logger.info(f"[LLMJobs] 🚀 Worker {worker_id} démarré")
+    while not stop.is_set():
+        try:
+            processed = await run_pending_jobs(worker_id)
+        except Exception as e:
+            logger.error(f"[LLMJobs] ❌ Worker {worker_id}: {e}", exc_info=True)
+            processed = 0
+        if processed == 0:
+            try:
+                await asyncio.wait_for(stop.wait(), timeout=settings.LLM_JOB_POLL_SECONDS)
+            except asyncio.TimeoutError:
+                pass
+    logger.info(f"[LLMJobs] 👋 Worker {worker_id} arrêté")
+
+
+_WORKERS: List[asyncio.Task] = []
+_STOP: Optional[asyncio.Event] = None
+
+
+def start_workers(count: Optional[int] = None) -> int:
+    """Lance les workers dans la boucle courante (startup de l'API)"""
+    global _STOP
+    count = settings.LLM_JOB_WORKERS if count is None else count
+    if _WORKERS or count <= 0:
+        return len(_WORKERS)
+    _STOP = asyncio.Event()
+    prefix = _default_worker_id()
+    for index in range(count):
+        _WORKERS.append(asyncio.create_task(worker_loop(f"{prefix}-{index}", _STOP)))
+    logger.info(f"[LLMJobs] ✅ {count} worker(s) de génération LLM démarrés")
+    return count
+
+
+async def stop_workers() -> None:
+    """Arrête les workers (shutdown) : les jobs en cours repassent en file"""
+    if _STOP is not None:
+        _STOP.set()
+    for task in _WORKERS:
+        task.cancel()
+    await asyncio.gather(*_WORKERS, return_exceptions=True)
+    _WORKERS.clear()
@@ -0,0 +1,235 @@
+"""
+Cache de génération des interprétations lunaires (déduplication par contenu)
+
+LunarInterpretation est mis en cache par lunar_return_id : deux utilisateurs (ou
+le même utilisateur deux mois différents) avec la même Lune, la même maison,
+le même ascendant lunaire et les mêmes aspects majeurs déclenchaient chacun un
+appel Claude pour un prompt identique.
+
+Clé = sha256 des seules caractéristiques lues par _build_prompt pour le sujet
+(SUBJECT_FEATURES), des PROMPT_MAX_ASPECTS premiers aspects normalisés (même
+limite que _format_aspects), du sujet, de la version, de la langue et du
+modèle. Les champs propres à l'utilisateur (user_id, lunar_return_id, month,
+return_date, planets, houses, generated_at) n'entrent pas dans la clé.
+
+Compteurs : métriques Prometheus et GET /api/lunar/interpretation/generation_cache_stats.
+
+Le texte brut généré est stocké dans le backend partagé (services/cache_backend) ;
+la personnalisation (LUNAR_GENERATION_PERSONALIZATION) est appliquée par-dessus
+à chaque service, qu'il vienne de Claude ou du cache.
+"""
+
+import hashlib
+import json
+import logging
+import threading
+from typing import Any, Dict, List, Optional
+
+from prometheus_client import Counter
+
+from config import settings
+from services.cache_backend import get_cache_backend
+
+logger = logging.getLogger(__name__)
+
+CACHE_NAMESPACE = "lunar_gen"
+
+# Champs de l'input_context utilisés par _build_prompt, par sujet
+SUBJECT_FEATURES: Dict[str, tuple] = {
+    'full': ('moon_sign', 'moon_house', 'lunar_ascendant', 'aspects'),
+    'climate': ('moon_sign',),
+    'focus': ('moon_house',),
+    'approach': ('lunar_ascendant',),
+}
+
+MOIS_FR = {
+    1: 'janvier', 2: 'février', 3: 'mars', 4: 'avril',
+    5: 'mai', 6: 'juin', 7: 'juillet', 8: 'août',
+    9: 'septembre', 10: 'octobre', 11: 'novembre', 12: 'décembre'
+}
+
+# === MÉTRIQUES PROMETHEUS - CACHE DE GÉNÉRATION LUNAIRE ===
+
+lunar_generation_cache_requests_total = Counter(
+    'lunar_generation_cache_requests_total',
+    'Lunar generation cache lookups (content-addressed on chart features)',
+    ['subject', 'result']  # result: 'hit' | 'miss' | 'bypass' (régénération forcée)
+)
+
+lunar_generation_cache_avoided_total = Counter(
+    'lunar_generation_cache_avoided_total',
+    'Claude generations avoided by reusing an identical-context lunar interpretation',
+    ['subject', 'model']
+)
+
+lunar_generation_cache_tokens_saved_total = Counter(
+    'lunar_generation_cache_tokens_saved_total',
+    'LLM tokens saved by the lunar generation cache (usage of the original generation)',
+    ['model', 'kind']  # kind: 'input' | 'output'
+)
+
+# Compteurs du process pour get_cache_stats() : {subject: {"hit": n, "miss": n, ...}}
+_STATS: Dict[str, Dict[str, int]] = {}
+_TOKENS_SAVED: Dict[str, int] = {"input": 0, "output": 0}
+_STATS_LOCK = threading.Lock()
+
+
+def _normalize_aspects(aspects: Any) -> List[List[str]]:
+    """Aspects réduits à (planète, planète, type) - les seuls éléments du prompt"""
+    from services.lunar_interpretation_generator import PROMPT_MAX_ASPECTS
+
+    if not isinstance(aspects, list):
+        return []
+    normalized = []
+    for aspect in aspects[:PROMPT_MAX_ASPECTS]:
+        if not isinstance(aspect, dict):
+            continue
+        normalized.append([
+            str(aspect.get('first_planet', '?')),
+            str(aspect.get('second_planet', '?')),
+            str(aspect.get('aspect', '?')),
+        ])
+    return normalized
+
+
+def generation_features(input_context: Dict[str, Any], model: str) -> Dict[str, Any]:
+    """Sous-ensemble canonique de l'input_context qui détermine le prompt"""
+    subject = input_context.get('subject')
+    features = {
+        'subject': subject,
+        'version': input_context.get('version'),
+        'lang': input_context.get('lang'),
+        'model': model,
+    }
+    for field in SUBJECT_FEATURES.get(subject, SUBJECT_FEATURES['full']):
+        value = input_context.get(field)
+        features[field] = _normalize_aspects(value) if field == 'aspects' else value
+    return features
+
+
+def cache_key(input_context: Dict[str, Any], model: str) -> str:
+    """Clé "lunar_gen:<subject>:<sha256 des caractéristiques canoniques>" """
+    features = generation_features(input_context, model)
+    canonical = json.dumps(features, sort_keys=True, separators=(",", ":"), ensure_ascii=False, default=str)
+    digest = hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+    return f"{CACHE_NAMESPACE}:{features['subject']}:{digest}"
+
+
+def _record(subject: str, result: str) -> None:
+    lunar_generation_cache_requests_total.labels(subject=subject, result=result).inc()
+    with _STATS_LOCK:
+        counts = _STATS.setdefault(subject, {})
+        counts[result] = counts.get(result, 0) + 1
+
+
+async def lookup(input_context: Dict[str, Any], model: str) -> Optional[Dict[str, Any]]:
+    """
+    Génération déjà produite pour ces caractéristiques
+
+    Returns:
+        {"output_text", "weekly_advice", "input_tokens", "output_tokens"} ou None
+    """
+    subject = input_context.get('subject')
+    entry = await get_cache_backend().aget(cache_key(input_context, model))
+    if entry is None or not isinstance(entry.value, dict):
+        _record(subject, "miss")
+        return None
+
+    cached = entry.value
+    _record(subject, "hit")
+    lunar_generation_cache_avoided_total.labels(subject=subject, model=model).inc()
+    for kind in ("input", "output"):
+        tokens = int(cached.get(f"{kind}_tokens") or 0)
+        lunar_generation_cache_tokens_saved_total.labels(model=model, kind=kind).inc(tokens)
+        with _STATS_LOCK:
+            _TOKENS_SAVED[kind] += tokens
+    return cached
+
+
+def record_bypass(subject: str) -> None:
+    _record(subject, "bypass")
+
+
+async def store(
+    input_context: Dict[str, Any],
+    model: str,
+    output_text: str,
+    weekly_advice: Optional[Dict],
+    input_tokens: int = 0,
+    output_tokens: int = 0
+) -> None:
+    """Enregistre le texte brut (avant personnalisation) et l'usage de la génération"""
+    await get_cache_backend().aset(
+        cache_key(input_context, model),
+        {
+            "output_text": output_text,
+            "weekly_advice": weekly_advice,
+            "input_tokens": input_tokens,
+            "output_tokens": output_tokens,
+        },
+        ttl=settings.LUNAR_GENERATION_CACHE_TTL_SECONDS
+    )
+
+
+def _month_label(month: Any) -> Optional[str]:
+    """'2026-10' → 'Octobre 2026'"""
+    try:
+        year, month_number = str(month).split("-")[:2]
+        return f"{MOIS_FR[int(month_number)].capitalize()} {int(year)}"
+    except (ValueError, KeyError):
+        return None
+
+
+def personalize(output_text: str, input_context: Dict[str, Any]) -> str:
+    """
+    Couche de personnalisation appliquée au texte partagé
+
+    LUNAR_GENERATION_PERSONALIZATION :
+    - none  : texte tel quel
+    - month : ligne d'en-tête avec le mois de la révolution (ex: "_Octobre 2026_")
+    """
+    mode = settings.LUNAR_GENERATION_PERSONALIZATION.lower()
+    if mode == "month":
+        label = _month_label(input_context.get('month'))
+        if label:
+            return f"_{label}_\n\n{output_text}"
+    elif mode != "none":
+        logger.warning(f"[LunarGenCache] ⚠️ Personnalisation inconnue '{mode}' - texte tel quel")
+    return output_text
+
+
+def get_cache_stats() -> Dict[str, Any]:
+    """
+    Statistiques du process par sujet
+
+    Returns:
+        {"subjects": {subject: {"hits", "misses", "bypass", "hit_rate"}},
+         "generations_avoided": int, "tokens_saved": {"input": int, "output": int}}
+    """
+    with _STATS_LOCK:
+        snapshot = {subject: dict(counts) for subject, counts in _STATS.items()}
+        tokens_saved = dict(_TOKENS_SAVED)
+
+    subjects = {}
+    for subject, counts in sorted(snapshot.items()):
+        hits, misses = counts.get("hit", 0), counts.get("miss", 0)
+        lookups = hits + misses
+        subjects[subject] = {
+            "hits": hits,
+            "misses": misses,
+            "bypass": counts.get("bypass", 0),
+            "hit_rate": round(hits / lookups, 3) if lookups else None,
+        }
+    return {
+        "subjects": subjects,
+        "generations_avoided": sum(s["hits"] for s in subjects.values()),
+        "tokens_saved": tokens_saved,
+    }
+
+
+def clear_cache() -> None:
+    """Vide les générations en cache et les compteurs du process"""
+    get_cache_backend().delete_namespace(CACHE_NAMESPACE)
+    with _STATS_LOCK:
+        _STATS.clear()
+        _TOKENS_SAVED.update(input=0, output=0)
@@ -5,6 +5,7 @@ Architecture v2 : séparation faits (LunarReturn) vs narration (LunarInterpretat
 Hiérarchie de génération:
 1. LunarInterpretation (DB temporelle) - PRIORITÉ
 2. Génération Claude Opus 4.5 - FALLBACK 1
+   (hors requête via services/llm_job_queue si LLM_JOB_QUEUE_ENABLED)
 3. LunarInterpretationTemplate (DB templates) - FALLBACK 2
 4. Templates hardcodés (CLIMATE_TEMPLATES) - FALLBACK 3
 """
@@ -16,11 +17,11 @@ from typing import Dict, Any, Optional, Tuple
 from datetime import datetime
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
-from anthropic import Anthropic, APIError, APIConnectionError, RateLimitError
+from anthropic import APIError, APIConnectionError, RateLimitError
 from config import settings
 from prometheus_client import Counter, Histogram, Gauge
 import structlog
-from tenacity import retry, stop_after_attempt, wait_exponential, retry_if_exception_type
+from services import llm_gateway, lunar_generation_cache
 
 # Custom exceptions for error categorization
 class LunarInterpretationError(Exception):
@@ -76,6 +77,9 @@ lunar_active_generations = Gauge(
 # Version du prompt (utilisé pour le cache et le versionning)
 PROMPT_VERSION = 2
 
+# Aspects repris dans le prompt (aussi utilisés par la clé de lunar_generation_cache)
+PROMPT_MAX_ASPECTS = 5
+
 # Configuration Claude
 CLAUDE_MODELS = {
     'opus': 'claude-opus-4-5-20251101',
@@ -211,80 +215,86 @@ async def generate_or_get_interpretation(
                 )
 
         # 3. Génération via Claude Opus 4.5
-        try:
-            logger.info("generating_via_claude")
-            output_text, weekly_advice, input_context = await _generate_via_claude(
-                lunar_return_id=lr_id,
-                user_id=lr_user_id,
-                month=lr_month,
-                return_date=lr_return_date,
-                moon_sign=moon_sign_str,
-                moon_house=moon_house_int,
-                lunar_ascendant=lunar_ascendant_str,
-                aspects=lr_aspects,
-                planets=lr_planets,
-                houses=lr_houses,
-                subject=subject,
-                version=version,
-                lang=lang
-            )
+        #    Avec LLM_JOB_QUEUE_ENABLED : pas d'appel pendant la requête, un job est
+        #    enfilé et le template sert en attendant (la lecture suivante lit la DB)
+        if settings.LLM_JOB_QUEUE_ENABLED:
+            await _enqueue_generation(lr_id, user_id, subject, version, lang, refresh=force_regenerate)
+        else:
+            try:
+                logger.info("generating_via_claude")
+                output_text, weekly_advice, input_context = await _generate_via_claude(
+                    lunar_return_id=lr_id,
+                    user_id=lr_user_id,
+                    month=lr_month,
+                    return_date=lr_return_date,
+                    moon_sign=moon_sign_str,
+                    moon_house=moon_house_int,
+                    lunar_ascendant=lunar_ascendant_str,
+                    aspects=lr_aspects,
+                    planets=lr_planets,
+                    houses=lr_houses,
+                    subject=subject,
+                    version=version,
+                    lang=lang,
+                    use_generation_cache=not force_regenerate
+                )
 
-            # Sauvegarder en DB temporelle
-            interpretation = LunarInterpretation(
-                user_id=user_id,
-                lunar_return_id=lunar_return_id,
-                subject=subject,
-                version=version,
-                lang=lang,
-                input_json=input_context,
-                output_text=output_text,
-                weekly_advice=weekly_advice,
-                model_used=get_configured_model()
-            )
-            db.add(interpretation)
-            await db.commit()
-            await db.refresh(interpretation)
-
-            # Record metrics for generation
-            lunar_interpretation_generated.labels(
-                source='claude',
-                model=get_configured_model(),
-                subject=subject,
-                version=str(version)
-            ).inc()
+                # Sauvegarder en DB temporelle
+                interpretation = LunarInterpretation(
+                    user_id=user_id,
+                    lunar_return_id=lunar_return_id,
+                    subject=subject,
+                    version=version,
+                    lang=lang,
+                    input_json=input_context,
+                    output_text=output_text,
+                    weekly_advice=weekly_advice,
+                    model_used=get_configured_model()
+                )
+                db.add(interpretation)
+                await db.commit()
+                await db.refresh(interpretation)
+
+                # Record metrics for generation
+                lunar_interpretation_generated.labels(
+                    source='claude',
+                    model=get_configured_model(),
+                    subject=subject,
+                    version=str(version)
+                ).inc()
 
-            duration = time.time() - start_time
-            lunar_interpretation_duration.labels(
-                source='claude',
-                subject=subject
-            ).observe(duration)
+                duration = time.time() - start_time
+                lunar_interpretation_duration.labels(
+                    source='claude',
+                    subject=subject
+                ).observe(duration)
 
-            logger.info(
-                "lunar_interpretation_generated",
-                lunar_return_id=lunar_return_id,
-                interpretation_id=str(interpretation.id),
-                source='claude',
-                model_used=get_configured_model(),
-                duration_ms=int(duration * 1000)
-            )
+                logger.info(
+                    "lunar_interpretation_generated",
+                    lunar_return_id=lunar_return_id,
+                    interpretation_id=str(interpretation.id),
+                    source='claude',
+                    model_used=get_configured_model(),
+                    duration_ms=int(duration * 1000)
+                )
 
-            return output_text, weekly_advice, 'claude', get_configured_model()
+                return output_text, weekly_advice, 'claude', get_configured_model()
 
-        except ClaudeAPIError as e:
-            logger.warning(
-                "claude_generation_failed",
-                lunar_return_id=lunar_return_id,
-                error=str(e)
-            )
-            # Rollback si erreur lors du save
-            await db.rollback()
-        except Exception as e:
-            logger.error(
-                "lunar_interpretation_generation_error",
-                lunar_return_id=lunar_return_id,
-                error=str(e)
-            )
-            await db.rollback()
+            except ClaudeAPIError as e:
+                logger.warning(
+                    "claude_generation_failed",
+                    lunar_return_id=lunar_return_id,
+                    error=str(e)
+                )
+                # Rollback si erreur lors du save
+                await db.rollback()
+            except Exception as e:
+                logger.error(
+                    "lunar_interpretation_generation_error",
+                    lunar_return_id=lunar_return_id,
+                    error=str(e)
+                )
+                await db.rollback()
 
         # 4. Fallback vers templates DB
         logger.info("falling_back_to_db_template")
@@ -359,18 +369,21 @@ async def generate_or_get_interpretation(
         lunar_active_generations.dec()  # End tracking
 
 
-@retry(
-    stop=stop_after_attempt(3),
-    wait=wait_exponential(multiplier=1, min=2, max=10),
-    retry=retry_if_exception_type((APIConnectionError, RateLimitError)),
-    reraise=True
-)
-async def _call_claude_with_retry(client: Anthropic, prompt: str, max_tokens: int, model: str) -> str:
-    """Call Claude with automatic retry on transient errors + Prompt Caching (-90% cost)"""
+async def _call_claude(prompt: str, max_tokens: int, model: str, timeout: float) -> Tuple[str, Dict[str, int]]:
+    """
+    Call Claude via llm_gateway + Prompt Caching (-90% cost)
+
+    Retries on transient errors (429, 5xx, network) are handled by the SDK
+    (LLM_MAX_RETRIES); the call is cancelled after timeout seconds.
+
+    Returns:
+        Tuple[text, {"input_tokens", "output_tokens"}]
+    """
     logger.debug("calling_claude_api")
 
-    response = client.messages.create(
+    response = await llm_gateway.create_message(
         model=model,
+        timeout=timeout,
         max_tokens=max_tokens,
         temperature=0.7,
         system=[
@@ -383,7 +396,13 @@ async def _call_claude_with_retry(client: Anthropic, prompt: str, max_tokens: in
         messages=[{"role": "user", "content": prompt}]
     )
 
-    return response.content[0].text
+    usage = getattr(response, "usage", None)
+    tokens = {}
+    for field in ("input_tokens", "output_tokens"):
+        value = getattr(usage, field, None)
+        tokens[field] = value if isinstance(value, int) else 0
+
+    return response.content[0].text, tokens
 
 
 async def _generate_via_claude(
@@ -399,11 +418,16 @@ async def _generate_via_claude(
     houses: Any,
     subject: str,
     version: int,
-    lang: str
+    lang: str,
+    use_generation_cache: bool = True
 ) -> Tuple[str, Optional[Dict], Dict]:
     """
     Génère une interprétation via Claude Opus 4.5
 
+    Un contexte identique (mêmes caractéristiques de prompt) déjà généré est
+    réutilisé via services/lunar_generation_cache, sauf use_generation_cache=False
+    (régénération forcée). La personnalisation s'applique dans les deux cas.
+
     Args acceptent des primitives pour éviter MissingGreenlet errors
 
     Returns:
@@ -429,20 +453,37 @@ async def _generate_via_claude(
     # Construire le prompt
     prompt = _build_prompt(input_context, subject, version, lang)
 
-    # Appeler Claude
-    client = Anthropic(api_key=settings.ANTHROPIC_API_KEY)
+    model = get_configured_model()
+
+    # Génération partagée pour un contexte identique (autre user / autre mois)
+    if settings.LUNAR_GENERATION_CACHE_ENABLED:
+        if use_generation_cache:
+            cached = await lunar_generation_cache.lookup(input_context, model)
+            if cached is not None:
+                logger.info(
+                    "lunar_generation_cache_hit",
+                    lunar_return_id=lunar_return_id,
+                    subject=subject,
+                    tokens_saved=cached.get("input_tokens", 0) + cached.get("output_tokens", 0)
+                )
+                return (
+                    lunar_generation_cache.personalize(cached["output_text"], input_context),
+                    cached.get("weekly_advice"),
+                    input_context
+                )
+        else:
+            lunar_generation_cache.record_bypass(subject)
+
+    # Appeler Claude (client partagé, concurrence et débit bornés par llm_gateway)
     max_tokens = 1200 if subject == 'full' else 600
+    timeout = settings.LLM_TIMEOUT_SECONDS
 
     try:
-        # Call Claude with retry logic and timeout
-        output_text = await asyncio.wait_for(
-            _call_claude_with_retry(
-                client=client,
-                prompt=prompt,
-                max_tokens=max_tokens,
-                model=get_configured_model()
-            ),
-            timeout=30.0  # 30 seconds max
+        output_text, tokens = await _call_claude(
+            prompt=prompt,
+            max_tokens=max_tokens,
+            model=model,
+            timeout=timeout
         )
 
         # Parser weekly_advice si subject='full'
@@ -450,16 +491,131 @@ async def _generate_via_claude(
         if subject == 'full':
             weekly_advice = _parse_weekly_advice(output_text)
 
-        return output_text, weekly_advice, input_context
+        if settings.LUNAR_GENERATION_CACHE_ENABLED:
+            await lunar_generation_cache.store(input_context, model, output_text, weekly_advice, **tokens)
+
+        return lunar_generation_cache.personalize(output_text, input_context), weekly_advice, input_context
 
     except asyncio.TimeoutError:
-        logger.error("claude_timeout", timeout_seconds=30)
-        raise ClaudeAPIError("Claude API timeout after 30s")
+        logger.error("claude_timeout", timeout_seconds=timeout)
+        raise ClaudeAPIError(f"Claude API timeout after {timeout:.0f}s")
     except (APIError, APIConnectionError, RateLimitError) as e:
         logger.error("claude_api_call_failed", error=str(e), retries_exhausted=True)
         raise ClaudeAPIError(f"Claude API failed: {e}")
 
 
+async def _enqueue_generation(
+    lunar_return_id: int,
+    user_id: int,
+    subject: str,
+    version: int,
+    lang: str,
+    refresh: bool = False
+) -> None:
+    """Enfile la génération Claude (file durable) ; une file indisponible ne bloque pas la lecture"""
+    from services.llm_job_queue import enqueue_lunar_job
+
+    try:
+        job = await enqueue_lunar_job(
+            lunar_return_id=lunar_return_id,
+            user_id=user_id,
+            subject=subject,
+            version=version,
+            lang=lang,
+            refresh=refresh
+        )
+        logger.info("claude_generation_enqueued", lunar_return_id=lunar_return_id, job_id=job.id, job_status=job.status)
+    except Exception as e:
+        logger.error("claude_generation_enqueue_failed", lunar_return_id=lunar_return_id, error=str(e))
+
+
+async def generate_and_store_interpretation(
+    db: AsyncSession,
+    lunar_return_id: int,
+    user_id: int,
+    subject: str = 'full',
+    version: int = PROMPT_VERSION,
+    lang: str = 'fr',
+    refresh: bool = False
+):
+    """
+    Génère via Claude et enregistre (insert ou remplacement) l'interprétation
+    temporelle - exécuté par les workers de services/llm_job_queue
+
+    refresh=True (régénération forcée) ignore le cache de génération partagé
+
+    Returns:
+        LunarInterpretation sauvegardée
+
+    Raises:
+        InvalidLunarReturnError: LunarReturn introuvable
+        ClaudeAPIError: Échec de l'appel Claude
+    """
+    from models import LunarInterpretation, LunarReturn
+
+    start_time = time.time()
+    lunar_return = await db.get(LunarReturn, lunar_return_id)
+    if not lunar_return:
+        raise InvalidLunarReturnError(f"LunarReturn {lunar_return_id} not found")
+
+    output_text, weekly_advice, input_context = await _generate_via_claude(
+        lunar_return_id=int(lunar_return.id),
+        user_id=int(lunar_return.user_id),
+        month=str(lunar_return.month) if lunar_return.month else None,
+        return_date=lunar_return.return_date,
+        moon_sign=str(lunar_return.moon_sign) if lunar_return.moon_sign else None,
+        moon_house=int(lunar_return.moon_house) if lunar_return.moon_house is not None else None,
+        lunar_ascendant=str(lunar_return.lunar_ascendant) if lunar_return.lunar_ascendant else None,
+        aspects=lunar_return.aspects,
+        planets=lunar_return.planets,
+        houses=lunar_return.houses,
+        subject=subject,
+        version=version,
+        lang=lang,
+        use_generation_cache=not refresh
+    )
+
+    result = await db.execute(
+        select(LunarInterpretation).filter_by(
+            lunar_return_id=lunar_return_id,
+            subject=subject,
+            version=version,
+            lang=lang
+        )
+    )
+    interpretation = result.scalar_one_or_none()
+    if interpretation is None:
+        interpretation = LunarInterpretation(
+            user_id=user_id,
+            lunar_return_id=lunar_return_id,
+            subject=subject,
+            version=version,
+            lang=lang
+        )
+        db.add(interpretation)
+    interpretation.input_json = input_context
+    interpretation.output_text = output_text
+    interpretation.weekly_advice = weekly_advice
+    interpretation.model_used = get_configured_model()
+    await db.commit()
+
+    lunar_interpretation_generated.labels(
+        source='claude',
+        model=get_configured_model(),
+        subject=subject,
+        version=str(version)
+    ).inc()
+    logger.info(
+        "lunar_interpretation_generated",
+        lunar_return_id=lunar_return_id,
+        interpretation_id=str(interpretation.id),
+        source='claude',
+        model_used=get_configured_model(),
+        duration_ms=int((time.time() - start_time) * 1000)
+    )
+    return interpretation
+
+
 def _build_input_context(
     lunar_return_id: int,
     user_id: int,
@@ -601,7 +757,7 @@ def _format_aspects(aspects: list) -> str:
         return "Aucun aspect majeur"
 
     formatted = []
-    for aspect in aspects[:5]:  # Limiter à 5 aspects
+    for aspect in aspects[:PROMPT_MAX_ASPECTS]:
         planet1 = aspect.get('first_planet', '?')
         planet2 = aspect.get('second_planet', '?')
         aspect_type = aspect.get('aspect', '?')
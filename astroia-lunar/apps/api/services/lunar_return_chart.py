@@ -0,0 +1,110 @@
+"""
+Thème de révolution lunaire calculé localement (Swiss Ephemeris)
+
+Produit le même raw_data que l'API Ephemeris /lunar-return, à l'instant exact
+du retour : ascendant, Lune (signe, degré, maison), planètes avec maisons,
+cuspides et aspects. Aucun appel réseau : _generate_rolling_returns calcule
+les 12 thèmes d'un user en une seule tâche du pool d'éphémérides.
+"""
+
+import logging
+from datetime import datetime
+from typing import Any, Dict, List, Sequence
+
+from services.swiss_ephemeris import (
+    SWISS_EPHEMERIS_AVAILABLE,
+    calculate_all_aspects,
+    calculate_houses,
+    degree_to_sign,
+    get_all_planet_positions,
+    get_moon_position,
+    get_planet_house,
+)
+
+logger = logging.getLogger(__name__)
+
+# Orbe des aspects du thème de révolution (identique au mock DEV / API)
+LUNAR_RETURN_ASPECT_ORB = 8.0
+
+
+def compute_lunar_return_chart(
+    return_dt: datetime,
+    latitude: float,
+    longitude: float,
+    house_system: str = 'P'
+) -> Dict[str, Any]:
+    """
+    Thème de révolution lunaire au format raw_data de l'API Ephemeris
+
+    Args:
+        return_dt: Instant exact de la révolution lunaire (UTC)
+        latitude: Latitude du lieu (naissance)
+        longitude: Longitude du lieu (naissance)
+        house_system: Système de maisons Swiss Ephemeris ('P' = Placidus)
+
+    Returns:
+        {
+            "return_datetime": "2026-01-24T16:52:45+00:00",
+            "ascendant": {"sign": "Leo", "degree": 8.98},
+            "moon": {"sign": "Aries", "degree": 15.5, "house": 9, "longitude": 15.5},
+            "planets": {"Sun": {"longitude": ..., "sign": ..., "degree": ..., "house": 6}, ...},
+            "houses": {"1": {"cusp": 128.98, "sign": "Leo"}, ...},
+            "aspects": [{"planet1": "Sun", "planet2": "Mercury", "type": "conjunction", "orb": 2.06}, ...]
+        }
+        ascendant et maisons sont absents si le calcul des maisons échoue.
+
+    Raises:
+        ImportError: Si Swiss Ephemeris n'est pas installé
+    """
+    if not SWISS_EPHEMERIS_AVAILABLE:
+        raise ImportError("Swiss Ephemeris (pyswisseph) n'est pas installé. Installez-le avec: pip install pyswisseph")
+
+    moon_pos = get_moon_position(return_dt)
+    houses_data = calculate_houses(return_dt, latitude, longitude, house_system)
+    planets = get_all_planet_positions(return_dt)
+
+    chart: Dict[str, Any] = {
+        "return_datetime": return_dt.isoformat(),
+        "moon": {
+            "sign": moon_pos.sign,
+            "degree": moon_pos.degree,
+            "longitude": moon_pos.longitude
+        },
+        "planets": planets,
+        "houses": {},
+        "aspects": calculate_all_aspects(
+            {name: data["longitude"] for name, data in planets.items()},
+            orb=LUNAR_RETURN_ASPECT_ORB
+        )
+    }
+
+    if houses_data:
+        chart["ascendant"] = {
+            "sign": degree_to_sign(houses_data.ascendant),
+            "degree": round(houses_data.ascendant % 30, 2)
+        }
+        chart["moon"]["house"] = get_planet_house(moon_pos.longitude, houses_data.cusps)
+        for planet_data in planets.values():
+            planet_data["house"] = get_planet_house(planet_data["longitude"], houses_data.cusps)
+        for i, cusp in enumerate(houses_data.cusps):
+            chart["houses"][str(i + 1)] = {
+                "cusp": round(cusp, 2),
+                "sign": degree_to_sign(cusp)
+            }
+    else:
+        logger.warning(f"[LunarReturnChart] ⚠️ Maisons non calculées pour {return_dt.isoformat()}")
+
+    return chart
+
+
+def compute_lunar_return_charts(
+    return_dates: Sequence[datetime],
+    latitude: float,
+    longitude: float,
+    house_system: str = 'P'
+) -> List[Dict[str, Any]]:
+    """Thèmes de plusieurs révolutions pour un même lieu (une tâche du pool)"""
+    return [
+        compute_lunar_return_chart(return_dt, latitude, longitude, house_system)
+        for return_dt in return_dates
+    ]
@@ -10,7 +10,7 @@ from uuid import UUID
 
 from lib.supabase_client import get_supabase_client
 from services.natal_reading_service import (
-    call_rapidapi_natal_chart,
+    get_natal_chart,
     parse_positions_from_natal_chart,
     parse_aspects_from_natal_chart
 )
@@ -277,7 +277,7 @@ async def calculate_planet_positions(
     """
     Calcule les positions planétaires à une date donnée
     
-    Utilise RapidAPI pour obtenir les positions exactes
+    Thème calculé localement (Swiss Ephemeris) ou via RapidAPI selon NATAL_CHART_ENGINE
     """
     logger.info(f"🌍 Calcul positions planétaires pour {date.date()}")
     
@@ -296,8 +296,7 @@ async def calculate_planet_positions(
     }
     
     try:
-        # Appel à RapidAPI pour obtenir les positions
-        chart_response = await call_rapidapi_natal_chart(birth_data)
+        chart_response = await get_natal_chart(birth_data)
         positions = parse_positions_from_natal_chart(chart_response)
         
         logger.info(f"✅ {len(positions)} positions calculées")
@@ -5,21 +5,27 @@ Centralise la logique de génération des révolutions lunaires pour réutilisat
 dans les routes API et le cron job mensuel.
 """
 
+import asyncio
 import logging
+import math
 import time
 import uuid
 from datetime import datetime, timedelta, timezone
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional, Sequence
 
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select, delete, func
 from sqlalchemy.exc import IntegrityError
 from fastapi import HTTPException, status
 
+from config import settings
+from database import AsyncSessionLocal
 from models.natal_chart import NatalChart
 from models.user import User
 from models.lunar_return import LunarReturn
-from services.swiss_ephemeris import find_lunar_return, SWISS_EPHEMERIS_AVAILABLE
+from models.lunar_refresh_checkpoint import LunarRefreshCheckpoint
+from services.swiss_ephemeris import SWISS_EPHEMERIS_AVAILABLE
+from services.ephemeris_executor import compute_lunar_return_charts_async, find_lunar_return_series_async
 from services.ephemeris import ephemeris_client, EphemerisAPIKeyError
 from services.interpretations import generate_lunar_return_interpretation
 from utils.natal_chart_helpers import extract_moon_data_from_positions
@@ -158,6 +164,45 @@ def _compute_rolling_months(now_utc: datetime) -> List[str]:
     return months
 
 
+def _months_span(months: List[str]):
+    """
+    Plage UTC couvrant une liste de mois YYYY-MM.
+
+    Returns:
+        (1er jour du premier mois 00:00, 1er jour du mois suivant le dernier 00:00)
+    """
+    ordered = sorted(months)
+    first_year, first_month = map(int, ordered[0].split('-'))
+    last_year, last_month = map(int, ordered[-1].split('-'))
+    if last_month == 12:
+        last_year, last_month = last_year + 1, 1
+    else:
+        last_month += 1
+
+    return (
+        datetime(first_year, first_month, 1, tzinfo=timezone.utc),
+        datetime(last_year, last_month, 1, tzinfo=timezone.utc),
+    )
+
+
+def group_lunar_returns_by_month(return_dates: List[datetime], months: List[str]) -> Dict[str, List[datetime]]:
+    """
+    Répartit une série de révolutions lunaires par mois YYYY-MM (UTC).
+
+    Les révolutions sont espacées d'environ 27.3 jours : un mois de 31 jours
+    peut en contenir deux (liste de 2), un mois hors série aucune (liste vide).
+
+    Returns:
+        {month: [return_date, ...]} pour chaque mois demandé, dates triées
+    """
+    grouped: Dict[str, List[datetime]] = {month: [] for month in months}
+    for return_date in sorted(return_dates):
+        month = return_date.astimezone(timezone.utc).strftime('%Y-%m')
+        if month in grouped:
+            grouped[month].append(return_date)
+    return grouped
+
+
 async def _generate_rolling_returns(
     db: AsyncSession,
     user_id: int,
@@ -173,6 +218,11 @@ async def _generate_rolling_returns(
     """
     Service centralisé pour générer les révolutions lunaires rolling.
 
+    Les dates exactes viennent d'une seule série Swiss Ephemeris couvrant tous
+    les mois (find_lunar_return_series), les thèmes sont calculés localement
+    (LUNAR_RETURN_CHART_ENGINE='local', l'API Ephemeris ne sert plus que de
+    repli) et les lignes sont insérées en un flush.
+
     Args:
         db: Session DB
         user_id: ID utilisateur (primitif int pour éviter MissingGreenlet)
@@ -226,75 +276,111 @@ async def _generate_rolling_returns(
             }
         )
 
-    for month in months:
+    # === ÉTAPE 1: Série des révolutions lunaires couvrant tous les mois (un seul passage) ===
+    returns_by_month: Dict[str, List[datetime]] = {month: [] for month in months}
+    if SWISS_EPHEMERIS_AVAILABLE:
+        series_start, series_end = _months_span(months)
         try:
+            return_dates = await find_lunar_return_series_async(
+                natal_moon_longitude=natal_moon_longitude,
+                start_dt=series_start,
+                end_dt=series_end,
+                tolerance_seconds=60
+            )
+            returns_by_month = group_lunar_returns_by_month(return_dates, months)
+            logger.info(
+                f"[corr={correlation_id}] ✅ {len(return_dates)} révolutions lunaires calculées "
+                f"({series_start.date()} → {series_end.date()})"
+            )
+        except Exception as e:
+            logger.warning(
+                f"[corr={correlation_id}] ⚠️ Erreur calcul série Swiss Ephemeris: {e}, fallback sur API Ephemeris"
+            )
+    else:
+        logger.debug(
+            f"[corr={correlation_id}] ℹ️ Swiss Ephemeris non disponible, utilisation API Ephemeris"
+        )
+
+    # Mois déjà présents (génération concurrente) : un seul SELECT
+    existing_result = await db.execute(
+        select(LunarReturn).where(
+            LunarReturn.user_id == user_id,
+            LunarReturn.month.in_(months)
+        )
+    )
+    existing_months = {lunar_return.month for lunar_return in existing_result.scalars()}
+
+    # === ÉTAPE 2: Thèmes des révolutions calculés localement (une tâche pour tous les mois) ===
+    local_charts: Dict[str, Dict[str, Any]] = {}
+    chart_months = [
+        month for month in months
+        if month not in existing_months and returns_by_month.get(month)
+    ]
+    if settings.LUNAR_RETURN_CHART_ENGINE == "local" and SWISS_EPHEMERIS_AVAILABLE and chart_months:
+        try:
+            charts = await compute_lunar_return_charts_async(
+                [returns_by_month[month][0] for month in chart_months],
+                birth_latitude,
+                birth_longitude
+            )
+            local_charts = dict(zip(chart_months, charts))
+        except Exception as e:
+            logger.warning(
+                f"[corr={correlation_id}] ⚠️ Erreur thème local: {e}, fallback sur API Ephemeris"
+            )
+
+    new_rows: List[LunarReturn] = []
+
+    for month in months:
+        if month in existing_months:
             logger.debug(
-                f"[corr={correlation_id}] 🔄 Calcul révolution lunaire {month}..."
+                f"[corr={correlation_id}] ℹ️ {month} existe déjà, skip génération"
             )
+            generated_count += 1
+            continue
 
-            # === ÉTAPE 1: Calculer la vraie date de révolution lunaire avec Swiss Ephemeris ===
-            year, month_num = map(int, month.split('-'))
-            # Point de départ: milieu du mois (approximation initiale)
-            search_start = datetime(year, month_num, 15, 12, 0, 0, tzinfo=timezone.utc)
-
-            return_date = None
-            if SWISS_EPHEMERIS_AVAILABLE:
-                # Rechercher la révolution lunaire dans une fenêtre de ±15 jours (couvre tout le mois)
-                return_date = find_lunar_return(
-                    natal_moon_longitude=natal_moon_longitude,
-                    start_dt=search_start - timedelta(days=15),  # Début du mois
-                    search_window_hours=31 * 24,  # Fenêtre de 31 jours pour couvrir le mois entier
-                    tolerance_seconds=60
-                )
+        try:
+            month_returns = returns_by_month.get(month, [])
+            return_date = month_returns[0] if month_returns else None
 
-                if return_date:
-                    # Vérifier que la date trouvée est bien dans le mois cible
-                    if return_date.month == month_num and return_date.year == year:
-                        logger.info(
-                            f"[corr={correlation_id}] ✅ Révolution lunaire {month} trouvée: "
-                            f"{return_date.strftime('%Y-%m-%d %H:%M:%S')} UTC"
-                        )
-                    else:
-                        # La révolution n'est pas dans ce mois, chercher le mois suivant
-                        logger.debug(
-                            f"[corr={correlation_id}] ℹ️ Révolution lunaire trouvée {return_date.strftime('%Y-%m-%d')} "
-                            f"n'est pas dans {month}, on la garde quand même"
-                        )
-                else:
-                    logger.warning(
-                        f"[corr={correlation_id}] ⚠️ Swiss Ephemeris: aucune révolution trouvée pour {month}, "
-                        f"fallback sur API Ephemeris"
-                    )
-            else:
+            if len(month_returns) > 1:
                 logger.debug(
-                    f"[corr={correlation_id}] ℹ️ Swiss Ephemeris non disponible, utilisation API Ephemeris"
-                )
-
-            # === ÉTAPE 2: Appeler l'API Ephemeris pour les données du thème (ascendant, maisons, aspects) ===
-            raw_data = {}
-            try:
-                raw_data = await ephemeris_client.calculate_lunar_return(
-                    natal_moon_degree=natal_moon_degree,
-                    natal_moon_sign=natal_moon_sign,
-                    target_month=month,
-                    birth_latitude=birth_latitude,
-                    birth_longitude=birth_longitude,
-                    timezone=birth_timezone,
-                )
-            except EphemerisAPIKeyError as e:
-                logger.warning(
-                    f"[corr={correlation_id}] ⚠️ Clé API Ephemeris manquante: {e}, "
-                    f"utilisation des données par défaut"
+                    f"[corr={correlation_id}] ℹ️ {len(month_returns)} révolutions lunaires en {month}, "
+                    f"on garde la première ({return_date.strftime('%Y-%m-%d %H:%M')} UTC)"
                 )
-                # Continuer avec raw_data vide, on a quand même la return_date de Swiss Ephemeris
-            except Exception as e:
+            elif SWISS_EPHEMERIS_AVAILABLE and return_date is None:
                 logger.warning(
-                    f"[corr={correlation_id}] ⚠️ Erreur API Ephemeris pour {month}: {e}, "
-                    f"utilisation des données par défaut"
+                    f"[corr={correlation_id}] ⚠️ Swiss Ephemeris: aucune révolution trouvée pour {month}, "
+                    f"fallback sur API Ephemeris"
                 )
-                # Continuer avec raw_data vide
 
-            # === ÉTAPE 3: Si pas de return_date Swiss Ephemeris, utiliser celle de l'API ou fallback ===
+            # === ÉTAPE 3: Sinon, appeler l'API Ephemeris pour les données du thème (ascendant, maisons, aspects) ===
+            raw_data = local_charts.get(month)
+            if raw_data is None:
+                raw_data = {}
+                try:
+                    raw_data = await ephemeris_client.calculate_lunar_return(
+                        natal_moon_degree=natal_moon_degree,
+                        natal_moon_sign=natal_moon_sign,
+                        target_month=month,
+                        birth_latitude=birth_latitude,
+                        birth_longitude=birth_longitude,
+                        timezone=birth_timezone,
+                    )
+                except EphemerisAPIKeyError as e:
+                    logger.warning(
+                        f"[corr={correlation_id}] ⚠️ Clé API Ephemeris manquante: {e}, "
+                        f"utilisation des données par défaut"
+                    )
+                    # Continuer avec raw_data vide, on a quand même la return_date de Swiss Ephemeris
+                except Exception as e:
+                    logger.warning(
+                        f"[corr={correlation_id}] ⚠️ Erreur API Ephemeris pour {month}: {e}, "
+                        f"utilisation des données par défaut"
+                    )
+                    # Continuer avec raw_data vide
+
+            # === ÉTAPE 4: Si pas de return_date Swiss Ephemeris, utiliser celle de l'API ou fallback ===
             if return_date is None:
                 return_date = _parse_return_date(raw_data, month, correlation_id)
 
@@ -317,25 +403,7 @@ async def _generate_rolling_returns(
             aspects=aspects,
         )
 
-        # Protection contre génération concurrente:
-        # Vérifier d'abord si l'entrée existe déjà (évite calcul inutile si doublon)
-        check_result = await db.execute(
-            select(LunarReturn).where(
-                LunarReturn.user_id == user_id,
-                LunarReturn.month == month
-            )
-        )
-        existing = check_result.scalar_one_or_none()
-
-        if existing:
-            logger.debug(
-                f"[corr={correlation_id}] ℹ️ {month} existe déjà (id={existing.id}), skip génération"
-            )
-            generated_count += 1
-            continue
-
-        # Créer l'entrée
-        lunar_return = LunarReturn(
+        new_rows.append(LunarReturn(
             user_id=user_id,
             month=month,
             return_date=return_date,
@@ -347,47 +415,74 @@ async def _generate_rolling_returns(
             houses=raw_data.get("houses", {}),
             interpretation=interpretation,
             raw_data=raw_data,
+        ))
+
+    generated_count += await _insert_lunar_returns(db, new_rows, correlation_id)
+    return generated_count
+
+
+async def _insert_lunar_returns(
+    db: AsyncSession,
+    rows: List[LunarReturn],
+    correlation_id: str
+) -> int:
+    """
+    Insère les révolutions lunaires en un seul flush (bulk insert dans un savepoint).
+
+    Si un autre process a inséré un (user_id, month) entre-temps, IntegrityError
+    annule le savepoint : on retombe alors sur une insertion ligne par ligne,
+    chaque conflit récupérant l'entrée existante.
+
+    Returns:
+        Nombre de mois présents en base après insertion
+    """
+    if not rows:
+        return 0
+
+    savepoint = await db.begin_nested()
+    try:
+        db.add_all(rows)
+        await db.flush()
+        await savepoint.commit()
+        logger.debug(f"[corr={correlation_id}] ✅ Insertion groupée de {len(rows)} révolutions lunaires")
+        return len(rows)
+    except IntegrityError:
+        await savepoint.rollback()
+        logger.debug(
+            f"[corr={correlation_id}] ℹ️ Conflit détecté sur l'insertion groupée, "
+            f"insertion ligne par ligne..."
         )
 
-        # Protection contre génération concurrente au niveau DB:
-        # Utiliser un savepoint pour isoler chaque insertion et gérer les conflits individuellement
-        # Si un autre process a déjà inséré ce (user_id, month) entre le SELECT et l'INSERT,
-        # IntegrityError sera levée et on récupère l'entrée existante
-        savepoint = await db.begin_nested()  # Savepoint pour rollback individuel
+    generated_count = 0
+    for lunar_return in rows:
+        # Savepoint par ligne : isole chaque conflit (user_id, month)
+        savepoint = await db.begin_nested()
         try:
             db.add(lunar_return)
-            await db.flush()  # Tenter l'insertion (sans commit global)
-            await savepoint.commit()  # Commit du savepoint (insertion réussie)
+            await db.flush()
+            await savepoint.commit()
             generated_count += 1
-            logger.debug(
-                f"[corr={correlation_id}] ✅ Insertion réussie pour {month}"
-            )
         except IntegrityError:
-            # Conflit: un autre process a inséré ce (user_id, month) entre le SELECT et l'INSERT
             await savepoint.rollback()
-            logger.debug(
-                f"[corr={correlation_id}] ℹ️ Conflit détecté pour {month} (inséré entre-temps), "
-                f"récupération de l'entrée existante..."
-            )
 
             # Refaire un SELECT pour récupérer l'entrée existante
             result = await db.execute(
                 select(LunarReturn).where(
-                    LunarReturn.user_id == user_id,
-                    LunarReturn.month == month
+                    LunarReturn.user_id == lunar_return.user_id,
+                    LunarReturn.month == lunar_return.month
                 )
             )
             existing = result.scalar_one_or_none()
 
             if existing:
                 logger.debug(
-                    f"[corr={correlation_id}] ✅ Entrée existante récupérée pour {month} (id={existing.id})"
+                    f"[corr={correlation_id}] ✅ Entrée existante récupérée pour {lunar_return.month} (id={existing.id})"
                 )
                 generated_count += 1
             else:
                 # Cas rare: conflit mais entrée non trouvée (peut arriver en cas de rollback concurrent)
                 logger.warning(
-                    f"[corr={correlation_id}] ⚠️ Conflit pour {month} mais entrée non trouvée après SELECT"
+                    f"[corr={correlation_id}] ⚠️ Conflit pour {lunar_return.month} mais entrée non trouvée après SELECT"
                 )
 
     return generated_count
@@ -514,17 +609,199 @@ async def generate_lunar_returns_for_user(
     }
 
 
-async def refresh_all_lunar_returns(db: AsyncSession) -> dict:
+def _percentile(values: Sequence[float], pct: float) -> float:
+    """Percentile (méthode nearest-rank) d'une liste de durées, 0 si vide"""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(1, math.ceil(pct / 100 * len(ordered)))
+    return ordered[rank - 1]
+
+
+async def _record_refresh_checkpoint(
+    session: AsyncSession,
+    run_key: str,
+    user_id: int,
+    status_: str,
+    error: Optional[str],
+    duration_seconds: float
+) -> None:
+    """Enregistre (ou met à jour) le résultat d'un user pour ce run"""
+    result = await session.execute(
+        select(LunarRefreshCheckpoint).where(
+            LunarRefreshCheckpoint.run_key == run_key,
+            LunarRefreshCheckpoint.user_id == user_id
+        )
+    )
+    checkpoint = result.scalar_one_or_none()
+
+    if checkpoint is None:
+        checkpoint = LunarRefreshCheckpoint(run_key=run_key, user_id=user_id)
+        session.add(checkpoint)
+
+    checkpoint.status = status_
+    checkpoint.error = error[:500] if error else None
+    checkpoint.duration_seconds = round(duration_seconds, 3)
+    checkpoint.completed_at = datetime.now(timezone.utc)
+    await session.flush()
+
+
+async def _refresh_one_user(
+    user_id: int,
+    run_key: str,
+    log_tag: str,
+    user_timeout_seconds: float,
+    session_factory
+) -> Dict[str, Any]:
+    """
+    Rafraîchit un user dans sa propre session (commit des lunar returns + checkpoint ensemble)
+
+    Returns:
+        {"user_id": 1, "status": "success" | "failed" | "timeout", "error": None, "duration_seconds": 1.2}
+    """
+    started = time.perf_counter()
+    status_ = "success"
+    error = None
+
+    async with session_factory() as session:
+        try:
+            await asyncio.wait_for(
+                generate_lunar_returns_for_user(user_id=user_id, db=session, force_regenerate=True),
+                timeout=user_timeout_seconds
+            )
+            await _record_refresh_checkpoint(
+                session, run_key, user_id, status_, None, time.perf_counter() - started
+            )
+            await session.commit()
+        except asyncio.TimeoutError:
+            status_ = "timeout"
+            error = f"Timeout après {user_timeout_seconds:.0f}s"
+            logger.error(f"⏱️ [{log_tag}] Timeout génération pour user_id={user_id} ({user_timeout_seconds:.0f}s)")
+        except Exception as e:
+            status_ = "failed"
+            error = str(e)
+            logger.error(
+                f"❌ [{log_tag}] Échec génération pour user_id={user_id}: {error}",
+                exc_info=True
+            )
+
+        duration = time.perf_counter() - started
+
+        if status_ != "success":
+            try:
+                await session.rollback()
+                await _record_refresh_checkpoint(session, run_key, user_id, status_, error, duration)
+                await session.commit()
+            except Exception as checkpoint_error:
+                logger.warning(
+                    f"⚠️ [{log_tag}] Checkpoint non enregistré pour user_id={user_id}: {checkpoint_error}"
+                )
+
+    return {"user_id": user_id, "status": status_, "error": error, "duration_seconds": duration}
+
+
+async def _refresh_users_concurrently(
+    db: AsyncSession,
+    user_ids: Sequence[int],
+    run_key: str,
+    log_tag: str,
+    concurrency: Optional[int] = None,
+    user_timeout_seconds: Optional[float] = None,
+    session_factory=None
+) -> Dict[str, Any]:
+    """
+    Moteur du refresh : N workers en parallèle, une session DB par user, reprise par checkpoint.
+
+    Les users déjà en succès pour run_key (run précédent interrompu) sont sautés.
+
+    Returns:
+        {"successful", "failed", "timeouts", "skipped", "errors", "users_per_second", "p95_user_seconds"}
+    """
+    from services.scheduler_services import lunar_returns_refresh_user_duration_seconds
+
+    concurrency = max(1, concurrency or settings.LUNAR_REFRESH_CONCURRENCY)
+    user_timeout_seconds = user_timeout_seconds or settings.LUNAR_REFRESH_USER_TIMEOUT_SECONDS
+    session_factory = session_factory or AsyncSessionLocal
+
+    # Reprise : users déjà rafraîchis avec succès dans ce run
+    done_result = await db.execute(
+        select(LunarRefreshCheckpoint.user_id).where(
+            LunarRefreshCheckpoint.run_key == run_key,
+            LunarRefreshCheckpoint.status == "success"
+        )
+    )
+    done_ids = set(done_result.scalars().all())
+    pending = [user_id for user_id in user_ids if user_id not in done_ids]
+    skipped = len(user_ids) - len(pending)
+
+    if skipped:
+        logger.info(f"⏩ [{log_tag}] Reprise du run {run_key}: {skipped} users déjà rafraîchis")
+
+    queue: asyncio.Queue = asyncio.Queue()
+    for user_id in pending:
+        queue.put_nowait(user_id)
+
+    outcomes: List[Dict[str, Any]] = []
+
+    async def worker():
+        while True:
+            try:
+                user_id = queue.get_nowait()
+            except asyncio.QueueEmpty:
+                return
+            outcome = await _refresh_one_user(
+                user_id, run_key, log_tag, user_timeout_seconds, session_factory
+            )
+            lunar_returns_refresh_user_duration_seconds.observe(outcome["duration_seconds"])
+            outcomes.append(outcome)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(min(concurrency, len(pending)))))
+    elapsed = time.perf_counter() - started
+
+    durations = [outcome["duration_seconds"] for outcome in outcomes]
+    return {
+        "successful": sum(1 for outcome in outcomes if outcome["status"] == "success"),
+        "failed": sum(1 for outcome in outcomes if outcome["status"] != "success"),
+        "timeouts": sum(1 for outcome in outcomes if outcome["status"] == "timeout"),
+        "skipped": skipped,
+        "errors": [
+            {"user_id": outcome["user_id"], "error": outcome["error"]}
+            for outcome in outcomes if outcome["status"] != "success"
+        ],
+        "users_per_second": round(len(outcomes) / elapsed, 3) if outcomes and elapsed > 0 else 0.0,
+        "p95_user_seconds": round(_percentile(durations, 95), 3),
+    }
+
+
+async def refresh_all_lunar_returns(
+    db: AsyncSession,
+    concurrency: Optional[int] = None,
+    user_timeout_seconds: Optional[float] = None,
+    session_factory=None,
+    run_key: Optional[str] = None
+) -> dict:
     """
     Régénère lunar returns pour tous les users actifs.
     Appelé par cron job mensuel.
 
+    Args:
+        db: Session utilisée pour sélectionner les users (chaque user a sa propre session)
+        concurrency: Users traités en parallèle (défaut: LUNAR_REFRESH_CONCURRENCY)
+        user_timeout_seconds: Timeout par user (défaut: LUNAR_REFRESH_USER_TIMEOUT_SECONDS)
+        session_factory: Fabrique de sessions des workers (défaut: AsyncSessionLocal)
+        run_key: Identifiant du run pour la reprise (défaut: "all:<date UTC>")
+
     Returns:
         {
             "total_users": 100,
             "successful": 95,
             "failed": 5,
+            "timeouts": 1,
+            "skipped": 0,
             "duration_seconds": 120.5,
+            "users_per_second": 0.8,
+            "p95_user_seconds": 2.4,
             "errors": [{"user_id": 5, "error": "..."}]
         }
     """
@@ -534,53 +811,46 @@ async def refresh_all_lunar_returns(db: AsyncSession) -> dict:
     # 1. Récupérer tous users avec natal_chart
     stmt = select(User).join(NatalChart).where(NatalChart.id.isnot(None))
     result = await db.execute(stmt)
-    users = result.scalars().all()
-
-    total_users = len(users)
-    successful = 0
-    failed = 0
-    errors = []
+    user_ids = [user.id for user in result.scalars().all()]
+    total_users = len(user_ids)
 
-    # 2. Parcourir chaque user
-    for user in users:
-        try:
-            await generate_lunar_returns_for_user(
-                user_id=user.id,
-                db=db,
-                force_regenerate=True
-            )
-            successful += 1
-
-        except Exception as e:
-            failed += 1
-            error_msg = str(e)
-            logger.error(
-                f"❌ [REFRESH_ALL] Échec génération pour user_id={user.id}: {error_msg}",
-                exc_info=True
-            )
-            errors.append({"user_id": user.id, "error": error_msg})
+    # 2. Rafraîchir en parallèle (reprise si le run du jour a été interrompu)
+    run_key = run_key or f"all:{datetime.now(timezone.utc).date().isoformat()}"
+    stats = await _refresh_users_concurrently(
+        db=db,
+        user_ids=user_ids,
+        run_key=run_key,
+        log_tag="REFRESH_ALL",
+        concurrency=concurrency,
+        user_timeout_seconds=user_timeout_seconds,
+        session_factory=session_factory
+    )
 
     duration = time.time() - start_time
 
     logger.info(
         f"✅ [REFRESH_ALL] Terminé - "
-        f"total={total_users}, success={successful}, failed={failed}, "
-        f"duration={duration:.1f}s"
+        f"total={total_users}, success={stats['successful']}, failed={stats['failed']}, "
+        f"skipped={stats['skipped']}, {stats['users_per_second']:.2f} users/s, "
+        f"p95={stats['p95_user_seconds']:.1f}s, duration={duration:.1f}s"
     )
 
     return {
         "total_users": total_users,
-        "successful": successful,
-        "failed": failed,
+        **stats,
         "duration_seconds": round(duration, 2),
-        "errors": errors
+        "run_key": run_key
     }
 
 
 async def refresh_lunar_returns_batch(
     db: AsyncSession,
     window_start_days: int = 7,
-    window_end_days: int = 14
+    window_end_days: int = 14,
+    concurrency: Optional[int] = None,
+    user_timeout_seconds: Optional[float] = None,
+    session_factory=None,
+    run_key: Optional[str] = None
 ) -> dict:
     """
     Rafraîchit lunar returns pour les users dans une fenêtre temporelle.
@@ -588,19 +858,29 @@ async def refresh_lunar_returns_batch(
     Cible : Users dont la prochaine révolution lunaire tombe entre
     [NOW + window_start_days, NOW + window_end_days].
 
-    Utilisé par cron quotidien pour distribuer la charge.
+    Utilisé par cron quotidien pour distribuer la charge. Les users sont traités
+    en parallèle (une session par user) et chaque résultat est checkpointé :
+    un run interrompu relancé le même jour reprend où il s'était arrêté.
 
     Args:
-        db: Session AsyncSession
+        db: Session AsyncSession (sélection des users et lecture des checkpoints)
         window_start_days: Début de la fenêtre (ex: 7 jours)
         window_end_days: Fin de la fenêtre (ex: 14 jours)
+        concurrency: Users traités en parallèle (défaut: LUNAR_REFRESH_CONCURRENCY)
+        user_timeout_seconds: Timeout par user (défaut: LUNAR_REFRESH_USER_TIMEOUT_SECONDS)
+        session_factory: Fabrique de sessions des workers (défaut: AsyncSessionLocal)
+        run_key: Identifiant du run (défaut: "batch:<date UTC>:<start>-<end>")
 
     Returns:
         {
             "total_users": 10,
             "successful": 9,
             "failed": 1,
+            "timeouts": 0,
+            "skipped": 0,
             "duration_seconds": 45.2,
+            "users_per_second": 1.5,
+            "p95_user_seconds": 3.1,
             "errors": [{"user_id": 5, "error": "..."}],
             "window": {"start": "2026-02-01", "end": "2026-02-08"}
         }
@@ -652,48 +932,37 @@ async def refresh_lunar_returns_batch(
     )
 
     result = await db.execute(stmt)
-    users = result.scalars().all()
-
-    total_users = len(users)
-    successful = 0
-    failed = 0
-    errors = []
+    user_ids = [user.id for user in result.scalars().all()]
+    total_users = len(user_ids)
 
     logger.info(f"🎯 [REFRESH_BATCH] {total_users} users identifiés dans la fenêtre")
 
-    # === Parcourir chaque user ===
-    for user in users:
-        try:
-            await generate_lunar_returns_for_user(
-                user_id=user.id,
-                db=db,
-                force_regenerate=True
-            )
-            successful += 1
-
-        except Exception as e:
-            failed += 1
-            error_msg = str(e)
-            logger.error(
-                f"❌ [REFRESH_BATCH] Échec génération pour user_id={user.id}: {error_msg}",
-                exc_info=True
-            )
-            errors.append({"user_id": user.id, "error": error_msg})
+    # === Rafraîchir en parallèle (reprise si le run du jour a été interrompu) ===
+    run_key = run_key or f"batch:{now_utc.date().isoformat()}:{window_start_days}-{window_end_days}"
+    stats = await _refresh_users_concurrently(
+        db=db,
+        user_ids=user_ids,
+        run_key=run_key,
+        log_tag="REFRESH_BATCH",
+        concurrency=concurrency,
+        user_timeout_seconds=user_timeout_seconds,
+        session_factory=session_factory
+    )
 
     duration = time.time() - start_time
 
     logger.info(
         f"✅ [REFRESH_BATCH] Terminé - "
-        f"total={total_users}, success={successful}, failed={failed}, "
-        f"duration={duration:.1f}s"
+        f"total={total_users}, success={stats['successful']}, failed={stats['failed']}, "
+        f"skipped={stats['skipped']}, {stats['users_per_second']:.2f} users/s, "
+        f"p95={stats['p95_user_seconds']:.1f}s, duration={duration:.1f}s"
     )
 
     return {
         "total_users": total_users,
-        "successful": successful,
-        "failed": failed,
+        **stats,
         "duration_seconds": round(duration, 2),
-        "errors": errors,
+        "run_key": run_key,
         "window": {
             "start": window_start.date().isoformat(),
             "end": window_end.date().isoformat()
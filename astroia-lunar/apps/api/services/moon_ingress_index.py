@@ -0,0 +1,233 @@
+"""
+Index des ingress de la Lune (changements de signe exacts)
+
+Les ingress sont des faits globaux (indépendants de l'utilisateur) : ils sont
+résolus une seule fois (Newton, swiss_ephemeris._moon_ingresses) puis gardés
+dans un index trié, partagé par tout le process et étendu à la demande.
+
+- Lookup O(log n) par bisect (ingresses_between, next_ingress, previous_ingress)
+- Extension incrémentale par blocs de INGRESS_INDEX_CHUNK_DAYS
+- Persistance JSON (settings.MOON_INGRESS_INDEX_PATH) : rechargé au premier
+  accès, sauvegardé par le scheduler après le précalcul VoC
+"""
+
+import json
+import logging
+import os
+import threading
+from bisect import bisect_left, bisect_right
+from pathlib import Path
+from typing import List, Optional, Tuple
+
+from config import settings
+
+logger = logging.getLogger(__name__)
+
+# Marge ajoutée à chaque extension (~11 ingress par bloc)
+INGRESS_INDEX_CHUNK_DAYS = 30.0
+
+# Au-delà, une plage disjointe de l'index est calculée sans être indexée
+# (ex: Lune natale de 1950) pour ne pas combler des décennies d'ingress
+INGRESS_INDEX_MAX_GAP_DAYS = 400.0
+
+# Deux ingress à moins d'une seconde sont le même
+_SAME_INGRESS_DAYS = 1 / 86400
+
+
+class MoonIngressIndex:
+    """
+    Ingress exacts de la Lune, triés, couvrant [start_jd, end_jd] sans trou
+
+    L'état (jds, signes, start_jd, end_jd) est un tuple jamais modifié en place :
+    une extension construit de nouvelles listes et remplace le tuple d'un coup
+    sous le verrou. Les lecteurs prennent le tuple une fois, sans verrou, et
+    voient toujours des jds et des signes alignés.
+    """
+
+    def __init__(self, ingresses: Optional[List[Tuple[float, int]]] = None,
+                 start_jd: Optional[float] = None, end_jd: Optional[float] = None):
+        ingresses = sorted(ingresses or [])
+        self._state: Tuple[List[float], List[int], Optional[float], Optional[float]] = (
+            [jd for jd, _ in ingresses],
+            [sign for _, sign in ingresses],
+            start_jd,
+            end_jd,
+        )
+        self._lock = threading.Lock()
+
+    @property
+    def start_jd(self) -> Optional[float]:
+        return self._state[2]
+
+    @property
+    def end_jd(self) -> Optional[float]:
+        return self._state[3]
+
+    def __len__(self) -> int:
+        return len(self._state[0])
+
+    def covers(self, start_jd: float, end_jd: float) -> bool:
+        _, _, covered_start, covered_end = self._state
+        return covered_start is not None and covered_start <= start_jd and end_jd <= covered_end
+
+    def ensure_range(self, start_jd: float, end_jd: float) -> bool:
+        """
+        Étend l'index pour couvrir [start_jd, end_jd]
+
+        Returns:
+            False si la plage est trop loin de l'index (non indexée)
+        """
+        if self.covers(start_jd, end_jd):
+            return True
+
+        from services.swiss_ephemeris import _moon_ingresses
+
+        with self._lock:
+            if self.covers(start_jd, end_jd):
+                return True
+
+            jds, signs, covered_start, covered_end = self._state
+
+            if covered_start is None:
+                new_start = start_jd - INGRESS_INDEX_CHUNK_DAYS
+                new_end = end_jd + INGRESS_INDEX_CHUNK_DAYS
+                jds, signs = self._merged([], [], _moon_ingresses(new_start, new_end))
+                self._state = (jds, signs, new_start, new_end)
+                return True
+
+            if start_jd < covered_start - INGRESS_INDEX_MAX_GAP_DAYS or end_jd > covered_end + INGRESS_INDEX_MAX_GAP_DAYS:
+                return False
+
+            if end_jd > covered_end:
+                new_end = end_jd + INGRESS_INDEX_CHUNK_DAYS
+                jds, signs = self._merged(jds, signs, _moon_ingresses(covered_end, new_end))
+                covered_end = new_end
+            if start_jd < covered_start:
+                new_start = start_jd - INGRESS_INDEX_CHUNK_DAYS
+                jds, signs = self._merged(jds, signs, _moon_ingresses(new_start, covered_start))
+                covered_start = new_start
+            self._state = (jds, signs, covered_start, covered_end)
+
+        logger.debug(f"[IngressIndex] Index étendu: {len(self)} ingress")
+        return True
+
+    @staticmethod
+    def _merged(jds: List[float], signs: List[int],
+                ingresses: List[Tuple[float, int]]) -> Tuple[List[float], List[int]]:
+        """Nouvelles listes avec les ingress ajoutés (ignorés s'ils sont déjà présents)"""
+        jds, signs = list(jds), list(signs)
+        for jd, sign in ingresses:
+            i = bisect_left(jds, jd - _SAME_INGRESS_DAYS)
+            if i < len(jds) and abs(jds[i] - jd) < _SAME_INGRESS_DAYS:
+                continue
+            jds.insert(i, jd)
+            signs.insert(i, sign)
+        return jds, signs
+
+    def ingresses_between(self, start_jd: float, end_jd: float) -> List[Tuple[float, int]]:
+        """
+        Ingress dans [start_jd, end_jd] (même contrat que _moon_ingresses)
+
+        Returns:
+            [(jd, index du nouveau signe 0-11), ...] triés
+        """
+        if not self.ensure_range(start_jd, end_jd):
+            from services.swiss_ephemeris import _moon_ingresses
+            return _moon_ingresses(start_jd, end_jd)
+
+        jds, signs, _, _ = self._state
+        lo = bisect_left(jds, start_jd)
+        hi = bisect_right(jds, end_jd)
+        return list(zip(jds[lo:hi], signs[lo:hi]))
+
+    def next_ingress(self, jd: float) -> Optional[Tuple[float, int]]:
+        """Premier ingress strictement après jd: (jd, nouveau signe)"""
+        ingresses = self.ingresses_between(jd, jd + INGRESS_INDEX_CHUNK_DAYS)
+        return next(((ingress_jd, sign) for ingress_jd, sign in ingresses if ingress_jd > jd), None)
+
+    def previous_ingress(self, jd: float) -> Optional[Tuple[float, int]]:
+        """Dernier ingress <= jd: (jd, signe d'entrée)"""
+        ingresses = self.ingresses_between(jd - INGRESS_INDEX_CHUNK_DAYS, jd)
+        return ingresses[-1] if ingresses else None
+
+    def to_dict(self) -> dict:
+        jds, signs, start_jd, end_jd = self._state
+        return {
+            "start_jd": start_jd,
+            "end_jd": end_jd,
+            "ingresses": [[jd, sign] for jd, sign in zip(jds, signs)],
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "MoonIngressIndex":
+        return cls(
+            [(jd, sign) for jd, sign in data["ingresses"]],
+            start_jd=data["start_jd"],
+            end_jd=data["end_jd"],
+        )
+
+
+_INDEX: Optional[MoonIngressIndex] = None
+_INDEX_LOCK = threading.Lock()
+
+
+def _index_path() -> Optional[Path]:
+    if not settings.MOON_INGRESS_INDEX_PATH:
+        return None
+    path = Path(settings.MOON_INGRESS_INDEX_PATH)
+    if not path.is_absolute():
+        path = Path(__file__).parent.parent / path
+    return path
+
+
+def get_moon_ingress_index() -> MoonIngressIndex:
+    """Index partagé du process (rechargé depuis le fichier au premier appel)"""
+    global _INDEX
+    if _INDEX is not None:
+        return _INDEX
+
+    with _INDEX_LOCK:
+        if _INDEX is None:
+            _INDEX = load_moon_ingress_index()
+    return _INDEX
+
+
+def load_moon_ingress_index() -> MoonIngressIndex:
+    """Charge l'index persisté, ou un index vide si absent / illisible"""
+    path = _index_path()
+    if path is None or not path.exists():
+        return MoonIngressIndex()
+
+    try:
+        index = MoonIngressIndex.from_dict(json.loads(path.read_text(encoding="utf-8")))
+        logger.info(f"[IngressIndex] ✅ {len(index)} ingress chargés ({path})")
+        return index
+    except Exception as e:
+        logger.warning(f"[IngressIndex] ⚠️ Index illisible ({path}): {e}")
+        return MoonIngressIndex()
+
+
+def save_moon_ingress_index() -> bool:
+    """
+    Persiste l'index partagé (écriture atomique, plusieurs workers possibles)
+
+    Returns:
+        True si le fichier a été écrit
+    """
+    path = _index_path()
+    if path is None or _INDEX is None or not len(_INDEX):
+        return False
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_suffix(f".{os.getpid()}.tmp")
+    tmp_path.write_text(json.dumps(_INDEX.to_dict()), encoding="utf-8")
+    os.replace(tmp_path, path)
+
+    logger.info(f"[IngressIndex] 💾 {len(_INDEX)} ingress sauvegardés ({path})")
+    return True
+
+
+def set_moon_ingress_index(index: Optional[MoonIngressIndex]) -> None:
+    """Remplace l'index partagé (tests). None = rechargement au prochain accès"""
+    global _INDEX
+    _INDEX = index
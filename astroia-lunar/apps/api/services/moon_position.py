@@ -11,11 +11,13 @@ except ImportError:
     swe = None
 
 from datetime import datetime, timezone
-from typing import Dict, Any
+from typing import Awaitable, Callable, Dict, Any, Optional
 import logging
 from functools import lru_cache
 import time
 
+from services.single_flight import SingleFlight, get_cached
+
 logger = logging.getLogger(__name__)
 
 # Cache global avec timestamp
@@ -25,6 +27,12 @@ _CACHE: Dict[str, Any] = {
     "ttl": 300  # 5 minutes en secondes
 }
 
+# Position expirée encore servie pendant le recalcul (la Lune avance de ~0.05°/min)
+MOON_POSITION_STALE_TTL = 120
+
+# Un seul calcul de position en cours (voir ephemeris_executor.get_current_moon_position_async)
+MOON_POSITION_FLIGHT = SingleFlight("moon_position")
+
 
 def degree_to_sign(degree: float) -> str:
     """
@@ -110,8 +118,50 @@ def get_current_moon_position() -> Dict[str, Any]:
     Raises:
         Exception: Si le calcul Swiss Ephemeris échoue
     """
-    global _CACHE
+    cached = get_cached_moon_position()
+    if cached is not None:
+        return cached
+
+    result = compute_current_moon_position()
+    if SWISS_EPHEMERIS_AVAILABLE:
+        store_moon_position(result)
+    return result
+
+
+def get_cached_moon_position() -> Optional[Dict[str, Any]]:
+    """Position en cache si elle a moins de 5 minutes, None sinon"""
+    current_time = time.time()
+    if _CACHE["data"] is not None and (current_time - _CACHE["timestamp"]) < _CACHE["ttl"]:
+        logger.info(f"[MoonPosition] Cache hit (age: {int(current_time - _CACHE['timestamp'])}s)")
+        return _CACHE["data"]
+    return None
+
+
+async def get_current_moon_position_cached(compute: Callable[[], Awaitable[Dict[str, Any]]]) -> Dict[str, Any]:
+    """
+    Position via le cache 5 min, compute() au miss (doit appeler store_moon_position)
+
+    Un seul calcul à la fois ; passé le TTL, la position précédente reste servie
+    MOON_POSITION_STALE_TTL secondes pendant le recalcul. Cache partagé entre workers.
+    """
+    return await get_cached(_CACHE, MOON_POSITION_FLIGHT, compute, stale_ttl=MOON_POSITION_STALE_TTL, shared=True)
+
 
+def store_moon_position(result: Dict[str, Any]) -> None:
+    """Met à jour le cache (utilisé aussi quand le calcul tourne dans le pool d'éphémérides)"""
+    _CACHE["data"] = result
+    _CACHE["timestamp"] = time.time()
+
+
+def compute_current_moon_position() -> Dict[str, Any]:
+    """
+    Calcul Swiss Ephemeris de la position actuelle, sans cache
+
+    Fonction de module (picklable) : exécutable dans le pool d'éphémérides.
+
+    Raises:
+        Exception: Si le calcul Swiss Ephemeris échoue
+    """
     if not SWISS_EPHEMERIS_AVAILABLE:
         logger.warning("[MoonPosition] ⚠️ Swiss Ephemeris non disponible - retour données mock")
         # Retourner des données mock minimales
@@ -121,12 +171,6 @@ def get_current_moon_position() -> Dict[str, Any]:
             "phase": "Premier Quartier"
         }
 
-    # Vérifier le cache
-    current_time = time.time()
-    if _CACHE["data"] is not None and (current_time - _CACHE["timestamp"]) < _CACHE["ttl"]:
-        logger.info(f"[MoonPosition] Cache hit (age: {int(current_time - _CACHE['timestamp'])}s)")
-        return _CACHE["data"]
-
     try:
         # Date/heure actuelle en UTC
         now = datetime.now(timezone.utc)
@@ -162,18 +206,12 @@ def get_current_moon_position() -> Dict[str, Any]:
         )
 
         # Construire la réponse
-        result = {
+        return {
             "sign": sign,
             "degree": round(moon_longitude, 2),
             "phase": phase
         }
 
-        # Mettre à jour le cache
-        _CACHE["data"] = result
-        _CACHE["timestamp"] = current_time
-
-        return result
-
     except Exception as e:
         logger.error(f"[MoonPosition] ❌ Erreur calcul Swiss Ephemeris: {e}", exc_info=True)
         raise Exception(f"Failed to calculate moon position: {str(e)}")
@@ -184,4 +222,7 @@ def clear_cache():
     global _CACHE
     _CACHE["data"] = None
     _CACHE["timestamp"] = 0
+
+    from services.cache_backend import get_cache_backend
+    get_cache_backend().delete_namespace(MOON_POSITION_FLIGHT.name)
     logger.info("[MoonPosition] Cache cleared")
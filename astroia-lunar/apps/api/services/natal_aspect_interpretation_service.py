@@ -8,6 +8,9 @@ from typing import Optional, Tuple
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
 
+from services import interpretation_store
+from services.interpretation_store import ASPECTS
+
 logger = logging.getLogger(__name__)
 
 # Planetes supportees pour les aspects (ordre alphabetique)
@@ -80,7 +83,7 @@ async def load_pregenerated_aspect_from_db(
     lang: str = 'fr'
 ) -> Optional[str]:
     """
-    Charge une interpretation d'aspect pre-generee depuis la base de donnees
+    Charge une interpretation d'aspect pre-generee (store en memoire, sinon base de donnees)
 
     Args:
         db: Session async SQLAlchemy
@@ -99,7 +102,7 @@ async def load_pregenerated_aspect_from_db(
     p1_norm, p2_norm = normalize_planet_pair(planet1, planet2)
     aspect_norm = aspect_type.lower().strip()
 
-    try:
+    async def fetch():
         result = await db.execute(
             select(PregeneratedNatalAspect).where(
                 PregeneratedNatalAspect.planet1 == p1_norm,
@@ -110,10 +113,16 @@ async def load_pregenerated_aspect_from_db(
             )
         )
         interpretation = result.scalar_one_or_none()
+        return interpretation.content if interpretation else None
+
+    try:
+        content = await interpretation_store.lookup(
+            ASPECTS, (p1_norm, p2_norm, aspect_norm, version, lang), lang, fetch
+        )
 
-        if interpretation:
-            logger.info(f"Interpretation aspect chargee depuis DB: {p1_norm}-{p2_norm} {aspect_norm} ({interpretation.length} chars)")
-            return interpretation.content
+        if content:
+            logger.info(f"Interpretation aspect chargee: {p1_norm}-{p2_norm} {aspect_norm} ({len(content)} chars)")
+            return content
 
         logger.warning(f"Interpretation aspect introuvable en DB: {p1_norm}-{p2_norm} {aspect_norm} v{version} lang={lang}")
         return None
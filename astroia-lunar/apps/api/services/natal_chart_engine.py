@@ -0,0 +1,197 @@
+"""
+Thème natal calculé localement (Swiss Ephemeris)
+
+Produit la même réponse que RapidAPI /api/v3/charts/natal :
+{"subject_data": {...}, "chart_data": {"planetary_positions", "house_cusps", "aspects"}}
+pour que parse_positions_from_natal_chart / parse_aspects_from_natal_chart et
+routes/natal.py fonctionnent à l'identique. Aucun appel réseau : le calcul
+tourne dans le pool d'éphémérides (compute_natal_chart_async) en quelques ms.
+
+La parité avec une réponse RapidAPI enregistrée est vérifiée par
+tests/test_natal_chart_engine.py (fixture tests/fixtures/natal_chart_sample.json).
+"""
+
+import logging
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+
+from config import settings
+from services.swiss_ephemeris import (
+    SWISS_EPHEMERIS_AVAILABLE,
+    calc_positions_batch,
+    calculate_all_aspects,
+    calculate_houses,
+    datetime_to_julian_day,
+    get_planet_house,
+    swe,
+)
+
+logger = logging.getLogger(__name__)
+
+# Points du thème, dans l'ordre et avec les noms de la réponse RapidAPI
+NATAL_CHART_BODIES = [
+    (swe.SUN, "Sun"),
+    (swe.MOON, "Moon"),
+    (swe.MERCURY, "Mercury"),
+    (swe.VENUS, "Venus"),
+    (swe.MARS, "Mars"),
+    (swe.JUPITER, "Jupiter"),
+    (swe.SATURN, "Saturn"),
+    (swe.URANUS, "Uranus"),
+    (swe.NEPTUNE, "Neptune"),
+    (swe.PLUTO, "Pluto"),
+    (swe.MEAN_NODE, "Mean_Node"),
+] if SWISS_EPHEMERIS_AVAILABLE else []
+
+# Aspects majeurs calculés entre les 10 planètes (options RapidAPI "major" / "standard")
+NATAL_ASPECT_POINTS = ["Sun", "Moon", "Mercury", "Venus", "Mars", "Jupiter", "Saturn", "Uranus", "Neptune", "Pluto"]
+
+# Orbes maximales par type d'aspect (orb_system "standard")
+NATAL_ASPECT_ORBS = {
+    "conjunction": 8.0,
+    "opposition": 8.0,
+    "trine": 7.0,
+    "square": 6.0,
+    "sextile": 5.0,
+}
+
+# Abréviations de signes de la réponse RapidAPI ('Ari', 'Tau', ...)
+SIGN_ABBREVIATIONS = ['Ari', 'Tau', 'Gem', 'Can', 'Leo', 'Vir', 'Lib', 'Sco', 'Sag', 'Cap', 'Aqu', 'Pis']
+
+
+def birth_data_to_utc(birth_data: Dict[str, Any]) -> datetime:
+    """
+    Instant de naissance en UTC depuis le birth_data RapidAPI (heure locale + timezone IANA)
+
+    Timezone absente ou inconnue → l'heure est considérée comme UTC.
+    """
+    local = datetime(
+        birth_data['year'], birth_data['month'], birth_data['day'],
+        birth_data.get('hour', 12), birth_data.get('minute', 0), birth_data.get('second', 0)
+    )
+    tz_name = birth_data.get('timezone') or 'UTC'
+    try:
+        tz = ZoneInfo(tz_name)
+    except (ZoneInfoNotFoundError, ValueError):
+        logger.warning(f"[NatalChartEngine] ⚠️ Timezone inconnue '{tz_name}' → heure considérée UTC")
+        tz = timezone.utc
+    return local.replace(tzinfo=tz).astimezone(timezone.utc)
+
+
+def _position_entry(name: str, longitude: float, speed: float, house: int) -> Dict[str, Any]:
+    """Entrée de planetary_positions au format RapidAPI"""
+    longitude = longitude % 360
+    return {
+        "name": name,
+        "sign": SIGN_ABBREVIATIONS[int(longitude // 30) % 12],
+        "degree": round(longitude % 30, 4),
+        "absolute_longitude": round(longitude, 6),
+        "house": house,
+        "is_retrograde": speed < 0,
+        "speed": round(speed, 4),
+    }
+
+
+def _chiron_longitude_and_speed(jd: float) -> Optional[tuple]:
+    """Chiron (fichier seas_*.se1 requis) ; None si désactivé ou indisponible"""
+    if settings.DISABLE_CHIRON:
+        return None
+    try:
+        result = swe.calc_ut(jd, swe.CHIRON, swe.FLG_SWIEPH | swe.FLG_SPEED)
+        return result[0][0], result[0][3]
+    except Exception as e:
+        logger.debug(f"[NatalChartEngine] Chiron non calculé: {e}")
+        return None
+
+
+def compute_natal_chart(birth_data: Dict[str, Any], house_system: str = 'P') -> Dict[str, Any]:
+    """
+    Thème natal au format de la réponse RapidAPI /api/v3/charts/natal
+
+    Args:
+        birth_data: {year, month, day, hour, minute, second, city, latitude, longitude, timezone}
+        house_system: Système de maisons Swiss Ephemeris ('P' = Placidus, comme l'appel RapidAPI)
+
+    Returns:
+        {
+            "subject_data": {"name": "Paris", "birth_data": {...}, "utc_datetime": "..."},
+            "chart_data": {
+                "planetary_positions": [{"name": "Sun", "sign": "Sco", "degree": 9.27,
+                                         "absolute_longitude": 219.27, "house": 9,
+                                         "is_retrograde": False, "speed": 0.99}, ...],
+                "house_cusps": [{"house": 1, "sign": "Aqu", "degree": 29.48, "absolute_longitude": 329.48}, ...],
+                "aspects": [{"point1": "Sun", "point2": "Jupiter", "aspect_type": "trine", "orb": 1.59}, ...]
+            }
+        }
+        Ascendant, Medium_Coeli, maisons et cuspides sont absents si le calcul des maisons échoue.
+
+    Raises:
+        ImportError: Si Swiss Ephemeris n'est pas installé
+    """
+    if not SWISS_EPHEMERIS_AVAILABLE:
+        raise ImportError("Swiss Ephemeris (pyswisseph) n'est pas installé. Installez-le avec: pip install pyswisseph")
+
+    birth_dt = birth_data_to_utc(birth_data)
+    jd = datetime_to_julian_day(birth_dt)
+    latitude = float(birth_data['latitude'])
+    longitude = float(birth_data['longitude'])
+
+    batch = calc_positions_batch([jd], [body for body, _ in NATAL_CHART_BODIES])[0].tolist()
+    bodies = {name: (lon, speed) for (_, name), (lon, speed) in zip(NATAL_CHART_BODIES, batch)}
+    chiron = _chiron_longitude_and_speed(jd)
+    if chiron:
+        bodies["Chiron"] = chiron
+
+    houses_data = calculate_houses(birth_dt, latitude, longitude, house_system)
+    cusps: List[float] = houses_data.cusps if houses_data else []
+    if not houses_data:
+        logger.warning(f"[NatalChartEngine] ⚠️ Maisons non calculées pour {birth_dt.isoformat()} (lat={latitude})")
+
+    positions = [
+        _position_entry(name, lon, speed, get_planet_house(lon, cusps) if cusps else 0)
+        for name, (lon, speed) in bodies.items()
+    ]
+    if houses_data:
+        # Même ordre que RapidAPI : angles après les planètes, avant le nœud
+        angles = [
+            _position_entry("Ascendant", houses_data.ascendant, 0.0, 1),
+            _position_entry("Medium_Coeli", houses_data.mc, 0.0, 10),
+        ]
+        positions[len(NATAL_ASPECT_POINTS):len(NATAL_ASPECT_POINTS)] = angles
+
+    house_cusps = [
+        {
+            "house": i + 1,
+            "sign": SIGN_ABBREVIATIONS[int((cusp % 360) // 30)],
+            "degree": round(cusp % 30, 4),
+            "absolute_longitude": round(cusp % 360, 6),
+        }
+        for i, cusp in enumerate(cusps)
+    ]
+
+    aspects = [
+        {
+            "point1": aspect["planet1"],
+            "point2": aspect["planet2"],
+            "aspect_type": aspect["type"],
+            "orb": aspect["orb"],
+        }
+        for aspect in calculate_all_aspects(
+            {name: bodies[name][0] for name in NATAL_ASPECT_POINTS},
+            orbs=NATAL_ASPECT_ORBS
+        )
+    ]
+
+    return {
+        "subject_data": {
+            "name": birth_data.get('city', 'User'),
+            "birth_data": birth_data,
+            "utc_datetime": birth_dt.isoformat(),
+        },
+        "chart_data": {
+            "planetary_positions": positions,
+            "house_cusps": house_cusps,
+            "aspects": aspects,
+        }
+    }
@@ -4,10 +4,14 @@ Version 2 - Prompt refondé, Sonnet + fallback Haiku
 """
 
 import logging
-from typing import Dict, Any, Optional, List, Tuple
-from anthropic import Anthropic, APIError, APIConnectionError, RateLimitError
+from datetime import datetime, timezone
+from typing import Dict, Any, Iterable, Optional, List, Tuple
+from anthropic import APIError, APIConnectionError, RateLimitError
+from models.natal_interpretation import NatalInterpretation
 from schemas.natal_interpretation import ChartPayload
 from config import settings
+from services import llm_gateway
+from services.llm_gateway import LLMTimeoutError
 from pathlib import Path
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
@@ -20,6 +24,9 @@ logger = logging.getLogger(__name__)
 # Configurable via .env: NATAL_INTERPRETATION_VERSION=3
 PROMPT_VERSION = settings.NATAL_INTERPRETATION_VERSION
 
+# model_used d'un placeholder servi en attendant la génération par la file de jobs
+DEFERRED_MODEL = "placeholder-pending"
+
 # Mapping emoji par sujet
 SUBJECT_EMOJI = {
     'sun': '☀️',
@@ -116,6 +123,138 @@ async def load_pregenerated_interpretation_from_db(
         return None
 
 
+async def load_pregenerated_interpretations_batch(
+    db: AsyncSession,
+    placements: Iterable[Tuple[str, str, int]],
+    version: int = 2,
+    lang: str = 'fr'
+) -> Dict[Tuple[str, str, int], str]:
+    """
+    Charge les interprétations pré-générées de plusieurs placements en une requête
+
+    Store en mémoire d'abord ; les clés manquantes sont lues en un seul
+    SELECT ... WHERE (subject, sign, house) IN (...) (voir interpretation_store.lookup_many).
+
+    Args:
+        db: Session async SQLAlchemy
+        placements: (subject, signe en français, maison) à charger
+        version: Version du prompt
+        lang: Langue
+
+    Returns:
+        {(subject, signe tel que fourni, maison): markdown} pour les placements trouvés
+    """
+    from models.pregenerated_natal_interpretation import PregeneratedNatalInterpretation
+    from services import interpretation_store
+    from services.interpretation_store import NATAL
+    from sqlalchemy import tuple_
+
+    placements = list(dict.fromkeys(placements))
+    store_keys = {
+        (subject, _sign_fr_to_en(sign), house, version, lang): (subject, sign, house)
+        for subject, sign, house in placements
+    }
+    if not store_keys:
+        return {}
+
+    async def fetch_many(missing):
+        result = await db.execute(
+            select(
+                PregeneratedNatalInterpretation.subject,
+                PregeneratedNatalInterpretation.sign,
+                PregeneratedNatalInterpretation.house,
+                PregeneratedNatalInterpretation.content
+            ).where(
+                tuple_(
+                    PregeneratedNatalInterpretation.subject,
+                    PregeneratedNatalInterpretation.sign,
+                    PregeneratedNatalInterpretation.house
+                ).in_([key[:3] for key in missing]),
+                PregeneratedNatalInterpretation.version == version,
+                PregeneratedNatalInterpretation.lang == lang
+            )
+        )
+        return {(subject, sign, house, version, lang): content for subject, sign, house, content in result.all()}
+
+    try:
+        found = await interpretation_store.lookup_many(NATAL, list(store_keys), lang, fetch_many)
+    except Exception as e:
+        logger.error(f"❌ Erreur chargement groupé pré-générés ({len(store_keys)} placements): {e}")
+        return {}
+
+    logger.info(f"✅ Pré-générés chargés en lot: {len(found)}/{len(store_keys)} placements")
+    return {store_keys[key]: content for key, content in found.items() if key in store_keys}
+
+
+def upsert_natal_interpretation(
+    db: AsyncSession,
+    existing: Optional[NatalInterpretation],
+    *,
+    user_id: int,
+    chart_id: str,
+    subject: str,
+    lang: str,
+    version: int,
+    input_json: Dict[str, Any],
+    text: str
+) -> NatalInterpretation:
+    """Met à jour la ligne existante ou en ajoute une (commit à la charge de l'appelant)"""
+    if existing is not None:
+        existing.input_json = input_json
+        existing.output_text = text
+        return existing
+
+    interpretation = NatalInterpretation(
+        user_id=user_id,
+        chart_id=chart_id,
+        subject=subject,
+        lang=lang,
+        version=version,
+        input_json=input_json,
+        output_text=text,
+        created_at=datetime.now(timezone.utc)
+    )
+    db.add(interpretation)
+    return interpretation
+
+
+async def save_natal_interpretation(
+    db: AsyncSession,
+    *,
+    user_id: int,
+    chart_id: str,
+    subject: str,
+    lang: str,
+    version: int,
+    input_json: Dict[str, Any],
+    text: str
+) -> NatalInterpretation:
+    """Enregistre (insert ou update) l'interprétation de (user, chart, sujet, langue, version) et commit"""
+    result = await db.execute(
+        select(NatalInterpretation).where(
+            NatalInterpretation.user_id == user_id,
+            NatalInterpretation.chart_id == chart_id,
+            NatalInterpretation.subject == subject,
+            NatalInterpretation.lang == lang,
+            NatalInterpretation.version == version
+        )
+    )
+    interpretation = upsert_natal_interpretation(
+        db, result.scalar_one_or_none(),
+        user_id=user_id, chart_id=chart_id, subject=subject, lang=lang,
+        version=version, input_json=input_json, text=text
+    )
+    await db.commit()
+    return interpretation
+
+
+def _sign_fr_to_en(sign: str) -> str:
+    """Signe français → clé anglaise des tables pré-générées ('Bélier' → 'aries')"""
+    sign_normalized = sign.lower().strip()
+    sign_no_accents = sign_normalized.replace('é', 'e').replace('è', 'e').replace('ê', 'e')
+    return SIGN_FR_TO_EN.get(sign_normalized) or SIGN_FR_TO_EN.get(sign_no_accents) or sign_no_accents
+
+
 def load_pregenerated_interpretation(
     subject: str,
     sign: str,
@@ -178,16 +317,6 @@ def load_pregenerated_interpretation(
         return None
 
 
-def get_anthropic_client() -> Anthropic:
-    """
-    Crée un client Anthropic avec la clé API depuis settings
-    """
-    if not settings.ANTHROPIC_API_KEY:
-        raise ValueError("ANTHROPIC_API_KEY non défini dans .env")
-
-    return Anthropic(api_key=settings.ANTHROPIC_API_KEY)
-
-
 def generate_placeholder_interpretation(subject: str, chart_payload: ChartPayload, version: int = 2) -> str:
     """
     Génère une interprétation placeholder propre quand le mode LLM est désactivé
@@ -889,7 +1018,9 @@ async def generate_with_sonnet_fallback_haiku(
     subject: str,
     chart_payload: Dict[str, Any] | ChartPayload,
     version: int = None,
-    db: Optional[AsyncSession] = None
+    db: Optional[AsyncSession] = None,
+    skip_pregenerated: bool = False,
+    defer_llm: bool = False
 ) -> Tuple[str, str]:
     """
     Génère une interprétation avec Claude Sonnet, fallback sur Haiku si erreur
@@ -905,6 +1036,10 @@ async def generate_with_sonnet_fallback_haiku(
         chart_payload: Données du chart
         version: Version du prompt (2, 3, ou 4). Si None, utilise PROMPT_VERSION global.
         db: Session async SQLAlchemy (pour charger interprétations pré-générées)
+        skip_pregenerated: True si l'appelant a déjà cherché le pré-généré
+            (load_pregenerated_interpretations_batch) : passe directement à l'étape 2
+        defer_llm: True si l'appel Claude est confié à la file de jobs (LLM_JOB_QUEUE_ENABLED) :
+            retourne le placeholder avec le modèle DEFERRED_MODEL, à enfiler par l'appelant
 
     Returns:
         tuple: (interpretation_text, model_used)
@@ -925,12 +1060,15 @@ async def generate_with_sonnet_fallback_haiku(
     # ========================================
     # ÉTAPE 1: TOUJOURS chercher dans le cache pré-généré d'abord
     # ========================================
-    logger.info(f"🔍 Recherche interprétation pré-générée pour {subject} en {payload.sign} M{payload.house}")
+    if not skip_pregenerated:
+        logger.info(f"🔍 Recherche interprétation pré-générée pour {subject} en {payload.sign} M{payload.house}")
 
     pregenerated_text = None
 
     # Essayer de charger depuis DB si session fournie
-    if db is not None:
+    if skip_pregenerated:
+        pass  # Déjà cherché par l'appelant (chargement groupé)
+    elif db is not None:
         pregenerated_text = await load_pregenerated_interpretation_from_db(
             db=db,
             subject=subject,
@@ -963,6 +1101,11 @@ async def generate_with_sonnet_fallback_haiku(
         placeholder_text = generate_placeholder_interpretation(subject, payload, version)
         return placeholder_text, "placeholder"
 
+    if defer_llm:
+        # Génération hors requête (services/llm_job_queue) : placeholder en attendant
+        logger.info(f"⏳ NATAL_LLM_MODE=anthropic - Génération {subject} différée (file de jobs)")
+        return generate_placeholder_interpretation(subject, payload, version), DEFERRED_MODEL
+
     # Mode anthropic : continuer vers appel Claude
     logger.info(f"🤖 NATAL_LLM_MODE=anthropic - Appel Claude pour génération")
     # #region agent log
@@ -1043,7 +1186,8 @@ async def generate_with_sonnet_fallback_haiku(
         # #endregion
         raise
 
-    client = get_anthropic_client()
+    if not settings.ANTHROPIC_API_KEY:
+        raise ValueError("ANTHROPIC_API_KEY non défini dans .env")
 
     # Liste des modèles à essayer
     models_to_try = [
@@ -1079,7 +1223,7 @@ async def generate_with_sonnet_fallback_haiku(
                 logger.warning(f"Erreur écriture log debug: {log_err}")
             # #endregion
 
-            message = client.messages.create(
+            message = await llm_gateway.create_message(
                 model=model_id,
                 max_tokens=2048,
                 temperature=0.7,
@@ -1183,7 +1327,7 @@ async def generate_with_sonnet_fallback_haiku(
                 logger.warning(f"⚠️ Texte trop court ({length} chars), retry avec expansion")
                 adjust_prompt = f"{prompt}\n\nATTENTION: Le texte précédent était trop court ({length} chars). Développe davantage en gardant le même template, vise {target_range} caractères."
 
-                message = client.messages.create(
+                message = await llm_gateway.create_message(
                     model=model_id,
                     max_tokens=2048,
                     temperature=0.7,
@@ -1199,7 +1343,7 @@ async def generate_with_sonnet_fallback_haiku(
                 logger.warning(f"⚠️ Texte trop long ({length} chars), retry avec réduction")
                 adjust_prompt = f"{prompt}\n\nATTENTION: Le texte précédent était trop long ({length} chars). Réduis-le à {target_range} caractères en retirant les répétitions et en gardant l'essentiel."
 
-                message = client.messages.create(
+                message = await llm_gateway.create_message(
                     model=model_id,
                     max_tokens=2048,
                     temperature=0.7,
@@ -1268,7 +1412,7 @@ async def generate_with_sonnet_fallback_haiku(
 
             return text_content, model_name
 
-        except (RateLimitError, APIConnectionError) as e:
+        except (RateLimitError, APIConnectionError, LLMTimeoutError) as e:
             logger.warning(f"⚠️ {model_name} échec ({type(e).__name__}): {str(e)[:100]}")
             # #region agent log
             try:
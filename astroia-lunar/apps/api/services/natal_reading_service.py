@@ -3,17 +3,30 @@ Service de lecture de thème natal - VERSION PROPRE
 Utilise UNIQUEMENT l'endpoint /api/v3/charts/natal
 """
 
+import asyncio
 import httpx
 import hashlib
 import logging
-from typing import Dict, Any, List
+import time
+from typing import Any, Awaitable, Dict, List, Optional, Tuple
+
+from prometheus_client import Histogram
 
 from config import settings
+from services import http_client
+from services.http_client import CircuitOpenError
 
 logger = logging.getLogger(__name__)
 
-# Client HTTP réutilisable
-client = httpx.AsyncClient(timeout=60.0)
+# Timeout des appels RapidAPI de ce module (calculs de thème et rapports, plus lents)
+NATAL_API_TIMEOUT = 60.0
+
+natal_reading_leg_seconds = Histogram(
+    'natal_reading_leg_seconds',
+    'Duration of each leg of natal reading generation',
+    ['leg', 'status'],  # leg: 'chart' | 'report' ; status: 'ok' | 'timeout' | 'error'
+    buckets=(0.01, 0.05, 0.1, 0.5, 1, 2, 5, 10, 20, 30, 60)
+)
 
 
 def generate_cache_key(birth_data: Dict[str, Any]) -> str:
@@ -65,7 +78,10 @@ async def call_rapidapi_natal_chart(birth_data: Dict[str, Any]) -> Dict[str, Any
     logger.info(f"🌐 Appel RapidAPI: /api/v3/charts/natal pour {birth_data.get('city')}")
     
     try:
-        response = await client.post(url, json=payload, headers=headers)
+        response = await http_client.post(
+            "rapidapi", url, endpoint="/api/v3/charts/natal",
+            json=payload, headers=headers, timeout=NATAL_API_TIMEOUT
+        )
         response.raise_for_status()
         data = response.json()
         
@@ -120,6 +136,41 @@ async def call_rapidapi_natal_chart(birth_data: Dict[str, Any]) -> Dict[str, Any
         raise
 
 
+def uses_local_natal_chart() -> bool:
+    """Vrai si le thème natal est calculé localement (NATAL_CHART_ENGINE='local' et Swiss Ephemeris installé)"""
+    from services.swiss_ephemeris import SWISS_EPHEMERIS_AVAILABLE
+
+    return settings.NATAL_CHART_ENGINE == "local" and SWISS_EPHEMERIS_AVAILABLE
+
+
+async def get_natal_chart(birth_data: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Thème natal au format /api/v3/charts/natal : { "subject_data": {...}, "chart_data": {...} }
+
+    Calcul local Swiss Ephemeris (pool d'éphémérides) par défaut,
+    appel RapidAPI si NATAL_CHART_ENGINE='rapidapi' ou pyswisseph absent
+    (circuit RapidAPI ouvert → calcul local si possible).
+    """
+    from services.swiss_ephemeris import SWISS_EPHEMERIS_AVAILABLE
+
+    if not uses_local_natal_chart():
+        try:
+            return await call_rapidapi_natal_chart(birth_data)
+        except CircuitOpenError as e:
+            if not SWISS_EPHEMERIS_AVAILABLE:
+                raise
+            logger.warning(f"⚠️ {e} → thème natal calculé localement")
+
+    from services.ephemeris_executor import compute_natal_chart_async
+
+    data = await compute_natal_chart_async(birth_data)
+    logger.info(
+        f"✅ Thème natal local: {len(data['chart_data']['planetary_positions'])} positions, "
+        f"{len(data['chart_data']['aspects'])} aspects ({birth_data.get('city')})"
+    )
+    return data
+
+
 def parse_positions_from_natal_chart(chart_response: Dict[str, Any]) -> List[Dict[str, Any]]:
     """
     Parse les positions depuis la réponse de /api/v3/charts/natal
@@ -486,7 +537,10 @@ async def call_rapidapi_natal_report(birth_data: Dict[str, Any], language: str =
     logger.info(f"🌐 Appel RapidAPI: /api/v3/analysis/natal-report pour {birth_data.get('city')}")
     
     try:
-        response = await client.post(url, json=payload, headers=headers)
+        response = await http_client.post(
+            "rapidapi", url, endpoint="/api/v3/analysis/natal-report",
+            json=payload, headers=headers, timeout=NATAL_API_TIMEOUT
+        )
         response.raise_for_status()
         data = response.json()
         logger.info(f"✅ Interprétations reçues")
@@ -562,6 +616,51 @@ def parse_interpretations_from_report(report_data: Dict[str, Any]) -> Dict[str,
     }
 
 
+async def _timed_leg(leg: str, call: Awaitable[Any], timeout: float) -> Tuple[Any, Dict[str, Any]]:
+    """
+    Exécute un appel de la génération avec son propre timeout
+
+    Returns:
+        (résultat, {"status": "ok", "duration_ms": 12.3}) ; lève l'exception de l'appel
+        (asyncio.TimeoutError au-delà de timeout) après l'avoir chronométrée
+    """
+    started = time.perf_counter()
+    status = "error"
+    try:
+        result = await asyncio.wait_for(call, timeout=timeout)
+        status = "ok"
+        return result, {"status": status, "duration_ms": round((time.perf_counter() - started) * 1000, 1)}
+    except asyncio.TimeoutError:
+        status = "timeout"
+        raise
+    finally:
+        natal_reading_leg_seconds.labels(leg=leg, status=status).observe(time.perf_counter() - started)
+
+
+def _failed_leg(error: BaseException, started: float) -> Dict[str, Any]:
+    return {
+        "status": "timeout" if isinstance(error, asyncio.TimeoutError) else "error",
+        "duration_ms": round((time.perf_counter() - started) * 1000, 1),
+    }
+
+
+async def _settled_leg(
+    leg: str, call: Awaitable[Any], timeout: float
+) -> Tuple[Any, Dict[str, Any], Optional[Exception]]:
+    """
+    _timed_leg non bloquant : l'échec est retourné, chronométré à l'instant où il survient
+
+    Returns:
+        (résultat ou None, {"status", "duration_ms"}, exception ou None)
+    """
+    started = time.perf_counter()
+    try:
+        result, timing = await _timed_leg(leg, call, timeout)
+        return result, timing, None
+    except Exception as e:
+        return None, _failed_leg(e, started), e
+
+
 async def generate_natal_reading(
     birth_data: Dict[str, Any],
     options: Dict[str, Any] = None
@@ -569,14 +668,18 @@ async def generate_natal_reading(
     """
     Génère une lecture complète de thème natal
     
-    Appels API (2 total):
-    1. /api/v3/charts/natal → données brutes (positions, aspects)
-    2. /api/v3/analysis/natal-report → interprétations textuelles
+    Deux appels lancés ensemble (2 appels API max) :
+    1. Données brutes (positions, aspects) : calcul local, ou /api/v3/charts/natal
+       si NATAL_CHART_ENGINE='rapidapi' — bloquant (NATAL_READING_CHART_TIMEOUT)
+    2. /api/v3/analysis/natal-report → interprétations textuelles, parsées après
+       le thème ; en échec ou au-delà de NATAL_READING_REPORT_TIMEOUT, la lecture
+       est servie sans interprétations (metadata.degraded = ["report"])
     
     Returns:
         {
             'reading': { positions, aspects, interpretations, summary },
-            'api_calls_count': 2
+            'api_calls_count': 2,
+            'metadata': { 'total_ms', 'legs': {'chart': {...}, 'report': {...}}, 'degraded': [] }
         }
     """
     options = options or {}
@@ -585,33 +688,57 @@ async def generate_natal_reading(
     
     logger.info(f"🌟 Génération lecture natal pour {birth_data.get('city')}")
     
+    started = time.perf_counter()
     api_calls_count = 0
+    legs: Dict[str, Dict[str, Any]] = {"report": {"status": "skipped", "duration_ms": None}}
+    degraded: List[str] = []
+    
+    # APPEL 2 lancé d'abord : il tourne pendant le calcul et le parsing du thème
+    report_task: Optional[asyncio.Task] = None
+    if include_interpretations:
+        report_task = asyncio.create_task(_settled_leg(
+            "report", call_rapidapi_natal_report(birth_data, language), settings.NATAL_READING_REPORT_TIMEOUT
+        ))
     
     # APPEL 1: Données brutes (positions + aspects)
-    chart_response = await call_rapidapi_natal_chart(birth_data)
-    api_calls_count += 1
+    try:
+        chart_response, legs["chart"] = await _timed_leg(
+            "chart", get_natal_chart(birth_data), settings.NATAL_READING_CHART_TIMEOUT
+        )
+    except BaseException:
+        if report_task:
+            report_task.cancel()
+            # Récupérer l'issue du rapport (sinon "Task exception was never retrieved")
+            await asyncio.gather(report_task, return_exceptions=True)
+        raise
+    if not uses_local_natal_chart():
+        api_calls_count += 1
     
-    # Parser positions et aspects
+    # Parser positions et aspects (rapport toujours en vol)
     positions = parse_positions_from_natal_chart(chart_response)
     aspects = parse_aspects_from_natal_chart(chart_response)
     
     # Construire le résumé
     summary = build_summary(positions)
     
-    # APPEL 2: Interprétations (si demandé)
     interpretations = {
         'positions_interpretations': {},
         'aspects_interpretations': {},
         'general_summary': None
     }
     
-    if include_interpretations:
-        try:
-            report_response = await call_rapidapi_natal_report(birth_data, language)
+    if report_task:
+        report_response, legs["report"], report_error = await report_task
+        if report_error is None:
             api_calls_count += 1
-            interpretations = parse_interpretations_from_report(report_response)
-        except Exception as e:
-            logger.warning(f"⚠️ Interprétations non disponibles (non bloquant): {e}")
+            try:
+                interpretations = parse_interpretations_from_report(report_response)
+            except Exception as e:
+                legs["report"]["status"] = "error"
+                report_error = e
+        if report_error is not None:
+            degraded.append("report")
+            logger.warning(f"⚠️ Interprétations non disponibles (non bloquant): {type(report_error).__name__} {report_error}")
     
     # Informations lunaires basiques
     lunar = {
@@ -632,15 +759,16 @@ async def generate_natal_reading(
         'summary': summary,
     }
     
-    logger.info(f"✅ Lecture générée: {len(positions)} positions, {len(aspects)} aspects, interprétations={include_interpretations} ({api_calls_count} appel{'s' if api_calls_count > 1 else ''} API)")
+    metadata = {
+        'total_ms': round((time.perf_counter() - started) * 1000, 1),
+        'legs': legs,
+        'degraded': degraded,
+    }
+    
+    logger.info(f"✅ Lecture générée: {len(positions)} positions, {len(aspects)} aspects, interprétations={include_interpretations} ({api_calls_count} appel{'s' if api_calls_count > 1 else ''} API, {metadata['total_ms']} ms)")
     
     return {
         'reading': reading,
-        'api_calls_count': api_calls_count
+        'api_calls_count': api_calls_count,
+        'metadata': metadata
     }
-
-
-async def close_client():
-    """Ferme le client HTTP (à appeler au shutdown)"""
-    await client.aclose()
-
@@ -0,0 +1,212 @@
+"""
+Cache des réponses RapidAPI (rapidapi_client.post_json)
+
+Clé = endpoint + sha256 du payload canonique (JSON à clés triées) : deux appels
+identiques, y compris ceux du cron, ne coûtent qu'une requête au fournisseur.
+Les réponses dépendent uniquement du payload (dates et lieux explicites),
+d'où des TTL longs par endpoint (RAPIDAPI_CACHE_POLICIES).
+
+Après le TTL, l'entrée reste stockée stale_ttl secondes : si le fournisseur
+échoue (429, 5xx, timeout), la dernière réponse est servie (stale-if-error).
+
+Stockage persistant : fichier SQLite (RAPIDAPI_CACHE_PATH) partagé par les
+workers et conservé au redémarrage ; vide = backend partagé (services/cache_backend).
+"""
+
+import hashlib
+import json
+import logging
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, NamedTuple, Optional
+
+from prometheus_client import Counter
+
+from config import settings
+from services.cache_backend import CacheBackend, SQLiteCacheBackend, get_cache_backend
+
+logger = logging.getLogger(__name__)
+
+CACHE_NAMESPACE = "rapidapi"
+
+HOUR = 3600
+DAY = 24 * HOUR
+
+
+class CachePolicy(NamedTuple):
+    ttl: float        # Fraîcheur (secondes)
+    stale_ttl: float  # Conservation supplémentaire pour stale-if-error (secondes)
+
+
+# Politiques par chemin d'endpoint (settings.*_PATH)
+RAPIDAPI_CACHE_POLICIES: Dict[str, CachePolicy] = {
+    settings.LUNAR_RETURN_REPORT_PATH: CachePolicy(ttl=30 * DAY, stale_ttl=30 * DAY),
+    settings.LUNAR_MANSIONS_PATH: CachePolicy(ttl=7 * DAY, stale_ttl=7 * DAY),
+    settings.VOID_OF_COURSE_PATH: CachePolicy(ttl=DAY, stale_ttl=7 * DAY),
+    settings.NATAL_TRANSITS_PATH: CachePolicy(ttl=7 * DAY, stale_ttl=7 * DAY),
+    settings.LUNAR_RETURN_TRANSITS_PATH: CachePolicy(ttl=7 * DAY, stale_ttl=7 * DAY),
+    settings.LUNAR_PHASES_PATH: CachePolicy(ttl=30 * DAY, stale_ttl=30 * DAY),
+    settings.LUNAR_EVENTS_PATH: CachePolicy(ttl=30 * DAY, stale_ttl=30 * DAY),
+    settings.LUNAR_CALENDAR_YEAR_PATH: CachePolicy(ttl=30 * DAY, stale_ttl=30 * DAY),
+}
+
+# Endpoints non listés
+DEFAULT_CACHE_POLICY = CachePolicy(ttl=DAY, stale_ttl=7 * DAY)
+
+# === MÉTRIQUES PROMETHEUS - CACHE RAPIDAPI ===
+
+rapidapi_cache_requests_total = Counter(
+    'rapidapi_cache_requests_total',
+    'RapidAPI response cache lookups',
+    ['endpoint', 'result']  # result: 'hit' | 'miss' | 'stale' (servi après erreur fournisseur)
+)
+
+rapidapi_cache_saved_calls_total = Counter(
+    'rapidapi_cache_saved_calls_total',
+    'RapidAPI calls (quota) saved by the response cache',
+    ['endpoint']
+)
+
+rapidapi_cache_saved_usd_total = Counter(
+    'rapidapi_cache_saved_usd_total',
+    'Estimated RapidAPI spend saved by the response cache (USD, RAPIDAPI_COST_PER_CALL_USD)',
+    ['endpoint']
+)
+
+# Compteurs du process pour get_cache_stats() : {endpoint: {"hit": n, "miss": n, "stale": n}}
+_STATS: Dict[str, Dict[str, int]] = {}
+_STATS_LOCK = threading.Lock()
+
+_BACKEND: Optional[CacheBackend] = None
+_BACKEND_LOCK = threading.Lock()
+
+
+def get_policy(path: str) -> CachePolicy:
+    return RAPIDAPI_CACHE_POLICIES.get(path, DEFAULT_CACHE_POLICY)
+
+
+def cache_key(path: str, payload: Dict[str, Any]) -> str:
+    """Clé "rapidapi:<path>:<sha256 du payload canonique>" (ordre des clés indifférent)"""
+    canonical = json.dumps(payload, sort_keys=True, separators=(",", ":"), ensure_ascii=False, default=str)
+    digest = hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+    return f"{CACHE_NAMESPACE}:{path}:{digest}"
+
+
+def _cache_path() -> str:
+    path = Path(settings.RAPIDAPI_CACHE_PATH)
+    if not path.is_absolute():
+        path = Path(__file__).parent.parent / path
+    return str(path)
+
+
+def get_response_cache() -> CacheBackend:
+    """Stockage des réponses : fichier SQLite dédié, ou backend partagé si RAPIDAPI_CACHE_PATH est vide"""
+    global _BACKEND
+    if _BACKEND is not None:
+        return _BACKEND
+
+    with _BACKEND_LOCK:
+        if _BACKEND is None:
+            if settings.RAPIDAPI_CACHE_PATH:
+                try:
+                    _BACKEND = SQLiteCacheBackend(_cache_path())
+                except Exception as e:
+                    logger.warning(f"[RapidAPICache] ⚠️ Fichier {settings.RAPIDAPI_CACHE_PATH} inutilisable ({e}) - backend partagé")
+            if _BACKEND is None:
+                _BACKEND = get_cache_backend()
+            logger.info(f"[RapidAPICache] ✅ Stockage {_BACKEND.name}")
+    return _BACKEND
+
+
+def set_response_cache(backend: Optional[CacheBackend]) -> None:
+    """Remplace le stockage (tests). None = recréé au prochain accès"""
+    global _BACKEND
+    if _BACKEND is not None and _BACKEND is not backend and _BACKEND is not get_cache_backend():
+        _BACKEND.close()
+    _BACKEND = backend
+
+
+def _record(path: str, result: str) -> None:
+    rapidapi_cache_requests_total.labels(endpoint=path, result=result).inc()
+    # Une réponse stale n'économise rien : le fournisseur a été appelé (et a échoué)
+    if result == "hit":
+        rapidapi_cache_saved_calls_total.labels(endpoint=path).inc()
+        rapidapi_cache_saved_usd_total.labels(endpoint=path).inc(settings.RAPIDAPI_COST_PER_CALL_USD)
+    with _STATS_LOCK:
+        counts = _STATS.setdefault(path, {})
+        counts[result] = counts.get(result, 0) + 1
+
+
+async def lookup(path: str, payload: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """
+    Entrée en cache pour cet appel
+
+    Returns:
+        {"value": réponse, "fresh": bool, "age": secondes} ou None
+    """
+    entry = await get_response_cache().aget(cache_key(path, payload))
+    if entry is None:
+        return None
+    age = time.time() - entry.stored_at
+    return {"value": entry.value, "fresh": age < get_policy(path).ttl, "age": age}
+
+
+def record_hit(path: str) -> None:
+    _record(path, "hit")
+
+
+def record_miss(path: str) -> None:
+    _record(path, "miss")
+
+
+def record_stale(path: str) -> None:
+    _record(path, "stale")
+
+
+async def store(path: str, payload: Dict[str, Any], response: Dict[str, Any]) -> None:
+    """Enregistre la réponse du fournisseur (conservée ttl + stale_ttl)"""
+    policy = get_policy(path)
+    await get_response_cache().aset(cache_key(path, payload), response, ttl=policy.ttl + policy.stale_ttl)
+
+
+def get_cache_stats() -> Dict[str, Any]:
+    """
+    Statistiques du process par endpoint
+
+    Returns:
+        {"endpoints": {path: {"hits", "misses", "stale", "hit_rate", "saved_calls", "saved_usd"}},
+         "saved_calls": int, "saved_usd": float, "stale_served": int}
+
+    Seuls les hits comptent comme appels économisés ; les réponses stale
+    (servies après échec du fournisseur) sont comptées à part.
+    """
+    with _STATS_LOCK:
+        snapshot = {path: dict(counts) for path, counts in _STATS.items()}
+
+    endpoints = {}
+    for path, counts in sorted(snapshot.items()):
+        hits, misses, stale = counts.get("hit", 0), counts.get("miss", 0), counts.get("stale", 0)
+        lookups = hits + misses
+        endpoints[path] = {
+            "hits": hits,
+            "misses": misses,
+            "stale": stale,
+            "hit_rate": round(hits / lookups, 3) if lookups else None,
+            "saved_calls": hits,
+            "saved_usd": round(hits * settings.RAPIDAPI_COST_PER_CALL_USD, 4),
+        }
+    saved_calls = sum(e["saved_calls"] for e in endpoints.values())
+    return {
+        "endpoints": endpoints,
+        "saved_calls": saved_calls,
+        "saved_usd": round(saved_calls * settings.RAPIDAPI_COST_PER_CALL_USD, 4),
+        "stale_served": sum(e["stale"] for e in endpoints.values()),
+    }
+
+
+def clear_cache() -> None:
+    """Vide les réponses en cache et les compteurs du process"""
+    get_response_cache().delete_namespace(CACHE_NAMESPACE)
+    with _STATS_LOCK:
+        _STATS.clear()
@@ -6,6 +6,14 @@ Avec retries, exponential backoff, timeouts, et gestion robuste des erreurs
 Mode DEV_MOCK_RAPIDAPI:
 - Si DEV_MOCK_RAPIDAPI=true OU si RapidAPI retourne 403 "not subscribed"
 - Utilise des mocks déterministes au lieu d'appeler l'API
+
+Cache des réponses (RAPIDAPI_CACHE_ENABLED, services/rapidapi_cache.py):
+- Un payload identique sur le même endpoint est servi depuis le cache persistant
+- Si le fournisseur échoue, la dernière réponse connue est servie (stale-if-error)
+
+Transport (services/http_client.py): client partagé du fournisseur "rapidapi"
+(keep-alive, concurrence et débit bornés, circuit breaker). Circuit ouvert →
+cache périmé, sinon mock, sinon 503.
 """
 
 import httpx
@@ -16,10 +24,10 @@ import asyncio
 import random
 from fastapi import HTTPException
 
-logger = logging.getLogger(__name__)
+from services import http_client, rapidapi_cache
+from services.http_client import CircuitOpenError
 
-# Client HTTP asynchrone avec timeout pour les calculs lourds
-client = httpx.AsyncClient(timeout=10.0)  # Timeout standard 10s
+logger = logging.getLogger(__name__)
 
 # Configuration retries
 MAX_RETRIES = 3
@@ -38,14 +46,26 @@ LUNAR_EVENTS_PATH = settings.LUNAR_EVENTS_PATH
 LUNAR_CALENDAR_YEAR_PATH = settings.LUNAR_CALENDAR_YEAR_PATH
 
 
+# Erreurs après lesquelles une réponse en cache périmée est servie (quota, fournisseur, timeout)
+STALE_IF_ERROR_STATUSES = {429, 502, 503, 504}
+
+
+class ProviderNotSubscribed(Exception):
+    """RapidAPI a répondu 403 "not subscribed" : repli sur mock (jamais mis en cache)"""
+
+
 async def post_json(path: str, payload: Dict[str, Any]) -> Dict[str, Any]:
     """
-    Effectue un POST JSON sur un endpoint RapidAPI avec retries et exponential backoff.
+    Effectue un POST JSON sur un endpoint RapidAPI, via le cache de réponses.
 
     Mode DEV_MOCK_RAPIDAPI:
     - Si settings.DEV_MOCK_RAPIDAPI=true, retourne directement un mock
     - Si RapidAPI retourne 403 "not subscribed", fallback sur mock
 
+    Cache (RAPIDAPI_CACHE_ENABLED):
+    - Entrée fraîche pour (path, payload) → retournée sans appel
+    - Erreur fournisseur (429, 5xx, timeout) et entrée périmée → entrée retournée
+
     Args:
         path: Chemin de l'endpoint (ex: /api/v3/charts/lunar_return)
         payload: Données JSON à envoyer
@@ -66,6 +86,62 @@ async def post_json(path: str, payload: Dict[str, Any]) -> Dict[str, Any]:
         logger.warning(f"🎭 DEV_MOCK_RAPIDAPI enabled -> using mock for {path}")
         return _get_mock_response(path, payload)
 
+    cached = None
+    if settings.RAPIDAPI_CACHE_ENABLED:
+        cached = await rapidapi_cache.lookup(path, payload)
+        if cached and cached["fresh"]:
+            rapidapi_cache.record_hit(path)
+            logger.info(f"✅ Cache RapidAPI: {path} (âge {cached['age']:.0f}s)")
+            return cached["value"]
+        rapidapi_cache.record_miss(path)
+
+    try:
+        data = await _post_json_with_retries(path, payload)
+    except (ProviderNotSubscribed, CircuitOpenError) as e:
+        if cached:
+            rapidapi_cache.record_stale(path)
+            logger.warning(f"⚠️  RapidAPI {path} indisponible ({e}) -> réponse en cache servie (âge {cached['age']:.0f}s)")
+            return cached["value"]
+        if isinstance(e, CircuitOpenError):
+            return _get_circuit_open_fallback(path, payload, e)
+        return _get_mock_response(path, payload)
+    except HTTPException as e:
+        if cached and e.status_code in STALE_IF_ERROR_STATUSES:
+            rapidapi_cache.record_stale(path)
+            logger.warning(f"⚠️  RapidAPI {path} en erreur ({e.status_code}) -> réponse en cache servie (âge {cached['age']:.0f}s)")
+            return cached["value"]
+        raise
+
+    if settings.RAPIDAPI_CACHE_ENABLED:
+        await rapidapi_cache.store(path, payload, data)
+    return data
+
+
+def _get_circuit_open_fallback(path: str, payload: Dict[str, Any], error: CircuitOpenError) -> Dict[str, Any]:
+    """Circuit ouvert sans réponse en cache : mock si l'endpoint en a un, sinon 503"""
+    try:
+        mock = _get_mock_response(path, payload)
+    except HTTPException:
+        raise HTTPException(
+            status_code=503,
+            detail={
+                "code": "PROVIDER_CIRCUIT_OPEN",
+                "message": "Service astrologique temporairement indisponible, réessayez dans quelques instants",
+                "retry_in_seconds": round(error.retry_in)
+            }
+        )
+    logger.warning(f"⚠️  Circuit RapidAPI ouvert sur {path} -> fallback sur mock")
+    return mock
+
+
+async def _post_json_with_retries(path: str, payload: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    POST JSON sur RapidAPI avec retries et exponential backoff (sans cache).
+
+    Raises:
+        ProviderNotSubscribed: 403 "not subscribed" (post_json replie sur un mock)
+        HTTPException: voir post_json
+    """
     # Construction de l'URL complète
     url = f"{settings.BASE_RAPID_URL}{path}"
 
@@ -88,7 +164,7 @@ async def post_json(path: str, payload: Dict[str, Any]) -> Dict[str, Any]:
     # Tentatives avec exponential backoff + jitter
     for attempt in range(MAX_RETRIES):
         try:
-            response = await client.post(url, json=payload, headers=headers)
+            response = await http_client.post("rapidapi", url, endpoint=path, json=payload, headers=headers)
             response.raise_for_status()
 
             data = response.json()
@@ -141,7 +217,7 @@ async def post_json(path: str, payload: Dict[str, Any]) -> Dict[str, Any]:
                 if is_not_subscribed:
                     # Not subscribed - fallback sur mock pour éviter de bloquer l'app en dev
                     logger.warning(f"⚠️  RapidAPI not subscribed (403) sur {path} -> fallback sur mock")
-                    return _get_mock_response(path, payload)
+                    raise ProviderNotSubscribed(path)
                 else:
                     # Autre erreur 403 (quota, permissions, etc.)
                     logger.error(f"❌ Forbidden (403) de RapidAPI sur {path}: {error_details}")
@@ -245,6 +321,10 @@ async def post_json(path: str, payload: Dict[str, Any]) -> Dict[str, Any]:
                     detail=f"Timeout provider après {MAX_RETRIES} tentatives"
                 )
                 
+        except CircuitOpenError:
+            # Circuit ouvert (éventuellement pendant les retries) : géré par post_json
+            raise
+
         except httpx.RequestError as e:
             # Erreur réseau/connectivité
             logger.error(f"❌ Erreur de requête RapidAPI sur {path}: {str(e)}")
@@ -308,10 +388,3 @@ def _get_mock_response(path: str, payload: Dict[str, Any]) -> Dict[str, Any]:
                 "hint": "Contactez l'équipe dev ou activez RapidAPI subscription"
             }
         )
-
-
-async def close_client():
-    """Ferme proprement le client HTTP (à appeler au shutdown de l'app)"""
-    logger.info("Fermeture du client RapidAPI")
-    await client.aclose()
-
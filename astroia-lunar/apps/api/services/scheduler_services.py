@@ -4,11 +4,10 @@ Utilise APScheduler pour rafraîchir les données VoC et autres tâches récurre
 """
 
 from apscheduler.schedulers.asyncio import AsyncIOScheduler
-from datetime import datetime, timedelta
+from datetime import datetime
 import logging
 import time
 
-from services import lunar_services
 from database import get_db
 from models.lunar_pack import LunarVocWindow
 from prometheus_client import Counter, Histogram, Gauge
@@ -21,7 +20,7 @@ logger = logging.getLogger(__name__)
 lunar_returns_refresh_total = Counter(
     'lunar_returns_refresh_total',
     'Total users processed during lunar returns refresh',
-    ['status']  # 'success' | 'failed'
+    ['status']  # 'success' | 'failed' | 'skipped' (repris depuis un checkpoint)
 )
 
 # Métrique 2 : Durée totale du refresh complet
@@ -43,6 +42,32 @@ lunar_returns_refresh_users_total = Gauge(
     'Total users processed in last refresh cycle'
 )
 
+# Métrique 5 : Durée de rafraîchissement par user (p95 via histogram_quantile)
+lunar_returns_refresh_user_duration_seconds = Histogram(
+    'lunar_returns_refresh_user_duration_seconds',
+    'Duration of lunar returns refresh for a single user',
+    buckets=(0.5, 1, 2, 5, 10, 30, 60, 120)
+)
+
+# Métrique 6 : Débit du dernier refresh (users/s)
+lunar_returns_refresh_throughput_users_per_second = Gauge(
+    'lunar_returns_refresh_throughput_users_per_second',
+    'Users refreshed per second in last refresh cycle'
+)
+
+# Métrique 7 : p95 de la durée par user du dernier refresh
+lunar_returns_refresh_user_p95_seconds = Gauge(
+    'lunar_returns_refresh_user_p95_seconds',
+    'p95 of per-user refresh duration in last refresh cycle'
+)
+
+# Métrique 8 : Précalculs des instantanés du ciel
+sky_snapshots_refresh_total = Counter(
+    'sky_snapshots_refresh_total',
+    'Sky snapshot precompute runs',
+    ['status']  # 'success' | 'failed'
+)
+
 # Instance du scheduler (singleton)
 scheduler = AsyncIOScheduler()
 
@@ -50,43 +75,65 @@ scheduler = AsyncIOScheduler()
 async def refresh_voc_windows():
     """
     Tâche périodique pour rafraîchir les fenêtres Void of Course.
-    
+
     Appelée toutes les 2 heures pour maintenir les données VoC à jour.
-    En production, cette tâche devrait être déplacée vers un worker séparé.
+    Les fenêtres sont calculées localement (Swiss Ephemeris, aspects exacts)
+    sur VOC_PRECOMPUTE_DAYS jours, sans appel RapidAPI.
     """
     logger.info("🔄 Rafraîchissement automatique des fenêtres VoC...")
-    
+
     try:
-        # Calculer les fenêtres VoC pour les 7 prochains jours
-        # (logique simplifiée, à adapter selon les besoins réels)
-        now = datetime.now()
-        end_date = now + timedelta(days=7)
-        
-        # Payload générique (Paris par défaut)
-        payload = {
-            "start_date": now.strftime("%Y-%m-%d"),
-            "end_date": end_date.strftime("%Y-%m-%d"),
-            "latitude": 48.8566,
-            "longitude": 2.3522,
-            "timezone": "Europe/Paris"
-        }
-        
-        # Appel au service (si l'API provider le supporte)
-        # result = await lunar_services.get_void_of_course_status(payload)
-        
-        # Pour l'instant, log uniquement
-        logger.info("✅ Rafraîchissement VoC terminé (placeholder)")
-        
+        async for db in get_db():
+            from services.voc_cache_service import populate_voc_windows_from_ephemeris
+            from config import settings
+
+            count = await populate_voc_windows_from_ephemeris(
+                db=db,
+                days=settings.VOC_PRECOMPUTE_DAYS
+            )
+            logger.info(f"✅ Rafraîchissement VoC terminé ({count} fenêtres)")
+
+            # Le précalcul a étendu l'index des ingress : le persister pour les autres workers
+            from services.moon_ingress_index import save_moon_ingress_index
+            save_moon_ingress_index()
+
+            break  # Important : sortir après première DB session
+
     except Exception as e:
         logger.error(f"❌ Erreur lors du rafraîchissement VoC: {str(e)}")
 
 
+async def refresh_sky_snapshots_job():
+    """
+    Tâche quotidienne : instantanés du ciel (horaires + quotidiens) sur
+    SKY_SNAPSHOT_DAYS jours, lus par /api/lunar/current, /daily-climate,
+    /mansion/today et /sky.
+    """
+    logger.info("🌌 Précalcul des instantanés du ciel...")
+
+    try:
+        async for db in get_db():
+            from services.sky_snapshot_service import refresh_sky_snapshots
+
+            count = await refresh_sky_snapshots(db)
+            sky_snapshots_refresh_total.labels(status='success').inc()
+            logger.info(f"✅ Instantanés du ciel à jour ({count} lignes)")
+
+            break  # Important : sortir après première DB session
+
+    except Exception as e:
+        sky_snapshots_refresh_total.labels(status='failed').inc()
+        logger.error(f"❌ Erreur lors du précalcul des instantanés du ciel: {str(e)}")
+
+
 async def refresh_lunar_returns_cron():
     """
     Tâche cron : Rafraîchir lunar returns (batching intelligent).
     Exécuté CHAQUE JOUR à 3h (UTC).
 
     Cible : Users dont la prochaine révolution lunaire tombe entre J+7 et J+14.
+    Users traités en parallèle (LUNAR_REFRESH_CONCURRENCY), checkpointés :
+    relancé le même jour après un crash, le run reprend où il s'était arrêté.
     """
     logger.info("🌙 [CRON] Démarrage rafraîchissement lunar returns (batch quotidien)...")
 
@@ -109,8 +156,11 @@ async def refresh_lunar_returns_cron():
             # === MÉTRIQUES PROMETHEUS ===
             lunar_returns_refresh_total.labels(status='success').inc(result['successful'])
             lunar_returns_refresh_total.labels(status='failed').inc(result['failed'])
+            lunar_returns_refresh_total.labels(status='skipped').inc(result.get('skipped', 0))
             lunar_returns_refresh_duration_seconds.observe(duration)
             lunar_returns_refresh_users_total.set(result['total_users'])
+            lunar_returns_refresh_throughput_users_per_second.set(result.get('users_per_second', 0.0))
+            lunar_returns_refresh_user_p95_seconds.set(result.get('p95_user_seconds', 0.0))
 
             # Calculer taux d'échec (éviter division par zéro)
             failure_rate = 0.0
@@ -127,6 +177,9 @@ async def refresh_lunar_returns_cron():
                 f"success={result['successful']}, "
                 f"failed={result['failed']}, "
                 f"failure_rate={failure_rate:.1%}, "
+                f"skipped={result.get('skipped', 0)}, "
+                f"throughput={result.get('users_per_second', 0.0):.2f} users/s, "
+                f"p95_user={result.get('p95_user_seconds', 0.0):.1f}s, "
                 f"duration={duration:.1f}s"
             )
 
@@ -224,6 +277,19 @@ def start_scheduler():
             replace_existing=True
         )
 
+        # Tâche: Instantanés du ciel CHAQUE JOUR à 0h05 UTC (et au démarrage)
+        scheduler.add_job(
+            refresh_sky_snapshots_job,
+            trigger='cron',
+            hour=0,
+            minute=5,
+            timezone='UTC',
+            next_run_time=datetime.now(),
+            id='refresh_sky_snapshots',
+            name='Précalculer les instantanés du ciel',
+            replace_existing=True
+        )
+
         # Tâche: Rafraîchir lunar returns CHAQUE JOUR à 3h UTC
         scheduler.add_job(
             refresh_lunar_returns_cron,
@@ -237,7 +303,7 @@ def start_scheduler():
         )
 
         scheduler.start()
-        logger.info("✅ Scheduler démarré (VoC + Lunar Returns)")
+        logger.info("✅ Scheduler démarré (VoC + Sky Snapshots + Lunar Returns)")
     else:
         logger.info("ℹ️  Scheduler déjà en cours d'exécution")
 
@@ -0,0 +1,180 @@
+"""
+Coalescence des calculs partagés (single-flight)
+
+Sur un cache froid ou expiré, chaque requête concurrente relançait son propre
+calcul (Swiss Ephemeris, requêtes DB) pour un résultat identique. Ici :
+
+- SingleFlight.do(key, fn) : un seul calcul par clé en cours, les appelants
+  concurrents attendent le même résultat (ou la même exception)
+- get_cached(...) : lecture d'un cache {"data", "timestamp", "ttl"} avec
+  stale-while-revalidate : passé le TTL, la valeur reste servie pendant
+  stale_ttl secondes et un seul rafraîchissement tourne en arrière-plan
+- get_cached(..., shared=True) : le cache dict reste le premier niveau ;
+  sur un miss, la valeur calculée par un autre worker est reprise depuis
+  le cache partagé (services/cache_backend) avant de recalculer
+"""
+
+import asyncio
+import logging
+import time
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional
+
+from prometheus_client import Counter
+
+logger = logging.getLogger(__name__)
+
+# === MÉTRIQUES PROMETHEUS - SINGLE FLIGHT ===
+
+single_flight_calls_total = Counter(
+    'single_flight_calls_total',
+    'Shared computations by outcome',
+    ['name', 'result']  # result: 'hit' | 'stale' | 'leader' | 'coalesced' | 'refresh' | 'refresh_error'
+)
+
+
+class SingleFlight:
+    """Au plus un calcul en cours par clé ; les appelants suivants attendent son résultat"""
+
+    def __init__(self, name: str):
+        self.name = name
+        self._calls: Dict[Hashable, asyncio.Task] = {}
+
+    def in_flight(self, key: Hashable) -> bool:
+        return self._current(key) is not None
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        Exécute fn() une seule fois pour tous les appelants concurrents de key
+
+        Le calcul est protégé (shield) : l'annulation d'un appelant ne l'annule
+        pas pour les autres.
+        """
+        task = self._current(key)
+        if task is not None:
+            single_flight_calls_total.labels(name=self.name, result='coalesced').inc()
+            logger.debug(f"[SingleFlight:{self.name}] ⏳ Attente du calcul en cours ({key})")
+        else:
+            single_flight_calls_total.labels(name=self.name, result='leader').inc()
+            task = self._start(key, fn, background=False)
+        return await asyncio.shield(task)
+
+    def refresh_in_background(self, key: Hashable, fn: Callable[[], Awaitable[Any]]) -> bool:
+        """
+        Lance fn() en arrière-plan si aucun calcul n'est déjà en cours pour key
+
+        Returns:
+            True si un rafraîchissement a été lancé
+        """
+        if self._current(key) is not None:
+            return False
+        single_flight_calls_total.labels(name=self.name, result='refresh').inc()
+        self._start(key, fn, background=True)
+        return True
+
+    def _current(self, key: Hashable) -> Optional[asyncio.Task]:
+        task = self._calls.get(key)
+        # Une tâche d'une autre event loop (tests, reload) n'est jamais réutilisée
+        if task is None or task.done() or task.get_loop() is not asyncio.get_running_loop():
+            return None
+        return task
+
+    def _start(self, key: Hashable, fn: Callable[[], Awaitable[Any]], background: bool) -> asyncio.Task:
+        task = asyncio.get_running_loop().create_task(fn())
+        self._calls[key] = task
+
+        def _done(finished: asyncio.Task) -> None:
+            if self._calls.get(key) is finished:
+                del self._calls[key]
+            if finished.cancelled():
+                return
+            # Toujours récupérer l'exception (sinon "Task exception was never retrieved")
+            error = finished.exception()
+            if error is not None and background:
+                single_flight_calls_total.labels(name=self.name, result='refresh_error').inc()
+                logger.warning(f"[SingleFlight:{self.name}] ⚠️ Rafraîchissement échoué ({key}): {error}")
+
+        task.add_done_callback(_done)
+        return task
+
+
+async def get_cached(
+    cache: Dict[str, Any],
+    flight: SingleFlight,
+    compute: Callable[[], Awaitable[Any]],
+    key: Hashable = "default",
+    stale_ttl: float = 0.0,
+    refresh: Optional[Callable[[], Awaitable[Any]]] = None,
+    shared: bool = False
+) -> Any:
+    """
+    Lecture d'un cache {"data", "timestamp", "ttl"} avec coalescence des misses
+
+    compute() doit mettre le cache à jour (comme les fonctions de cache existantes).
+
+    Args:
+        cache: Cache global du service
+        flight: SingleFlight du service
+        compute: Calcul au premier plan (peut utiliser la session de la requête)
+        stale_ttl: Durée pendant laquelle une valeur expirée est encore servie
+        refresh: Calcul d'arrière-plan, sans ressource liée à la requête
+            (défaut: compute)
+        shared: Consulte/alimente le cache partagé entre workers
+            (clé "<flight.name>:<key>")
+
+    Returns:
+        La valeur fraîche, la valeur expirée (stale) ou le résultat du calcul
+    """
+    now = time.time()
+    if cache["data"] is not None and now - cache["timestamp"] < cache["ttl"]:
+        single_flight_calls_total.labels(name=flight.name, result='hit').inc()
+        return cache["data"]
+
+    refresh = refresh or compute
+    if shared:
+        shared_key = f"{flight.name}:{key}"
+        await _adopt_shared(cache, shared_key)
+        compute = _publishing(cache, compute, shared_key, cache["ttl"] + stale_ttl)
+        refresh = _publishing(cache, refresh, shared_key, cache["ttl"] + stale_ttl)
+
+    data = cache["data"]
+    if data is not None:
+        age = now - cache["timestamp"]
+        if age < cache["ttl"]:
+            single_flight_calls_total.labels(name=flight.name, result='hit').inc()
+            return data
+        if age < cache["ttl"] + stale_ttl:
+            single_flight_calls_total.labels(name=flight.name, result='stale').inc()
+            flight.refresh_in_background(key, refresh)
+            return data
+
+    return await flight.do(key, compute)
+
+
+async def _adopt_shared(cache: Dict[str, Any], shared_key: str) -> None:
+    """Reprend la valeur du cache partagé si elle est plus récente que celle du process"""
+    from services.cache_backend import get_cache_backend
+
+    entry = await get_cache_backend().aget(shared_key)
+    if entry is not None and entry.stored_at > cache["timestamp"]:
+        cache["data"] = entry.value
+        cache["timestamp"] = entry.stored_at
+
+
+def _publishing(
+    cache: Dict[str, Any],
+    fn: Callable[[], Awaitable[Any]],
+    shared_key: str,
+    ttl: float
+) -> Callable[[], Awaitable[Any]]:
+    """fn() puis publication dans le cache partagé si fn a mis le cache à jour"""
+    from services.cache_backend import get_cache_backend
+
+    async def wrapper() -> Any:
+        previous = cache["timestamp"]
+        result = await fn()
+        # Rien n'est publié si fn a échoué ou n'a pas mis le cache à jour (mode dégradé)
+        if cache["timestamp"] > previous and cache["data"] is not None:
+            await get_cache_backend().aset(shared_key, cache["data"], ttl, stored_at=cache["timestamp"])
+        return result
+
+    return wrapper
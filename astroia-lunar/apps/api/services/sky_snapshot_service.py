@@ -0,0 +1,410 @@
+"""
+Instantanés du ciel précalculés (table sky_snapshots)
+
+Position de la Lune, phase, mansion, ingress, fenêtres VoC et événements de
+phase sont les mêmes pour tous les utilisateurs : le scheduler les calcule une
+fois par jour sur SKY_SNAPSHOT_DAYS jours (une ligne par heure + une par jour,
+UTC) et les endpoints les lisent par (granularity, at).
+
+- compute_sky_snapshots : calcul pur (pool d'éphémérides), un seul passage
+  vectorisé pour les positions horaires
+- refresh_sky_snapshots : remplace la fenêtre en DB (insertion groupée), un
+  seul worker à la fois (advisory lock PostgreSQL)
+- get_current_moon_position / get_day_sky : lectures, avec repli sur le
+  calcul direct si la table ne couvre pas l'instant demandé
+"""
+
+import logging
+from bisect import bisect_right
+from datetime import date, datetime, time as dt_time, timedelta, timezone
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+from prometheus_client import Counter
+from sqlalchemy import and_, delete, insert, or_, select, text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from config import settings
+from models.sky_snapshot import SkySnapshot
+from services import moon_position
+
+logger = logging.getLogger(__name__)
+
+# Jours passés conservés en DB (consultation du journal, fuseaux en avance sur UTC)
+SKY_SNAPSHOT_KEEP_PAST_DAYS = 7
+
+# Clé d'advisory lock du rafraîchissement (tous les workers lancent le job au démarrage)
+SKY_SNAPSHOT_REFRESH_LOCK_KEY = 0x534B59  # "SKY"
+
+# Instantanés lus gardés en mémoire par process (une heure / un jour par clé)
+SKY_SNAPSHOT_CACHE_MAX_ENTRIES = 64
+
+_SNAPSHOT_CACHE: Dict[Tuple[str, datetime], Dict[str, Any]] = {}
+
+# === MÉTRIQUES PROMETHEUS - SKY SNAPSHOTS ===
+
+sky_snapshot_reads_total = Counter(
+    'sky_snapshot_reads_total',
+    'Sky snapshot reads by outcome',
+    ['granularity', 'result']  # result: 'cache' | 'db' | 'missing' | 'error'
+)
+
+
+def _as_utc(dt: datetime) -> datetime:
+    return dt.replace(tzinfo=timezone.utc) if dt.tzinfo is None else dt.astimezone(timezone.utc)
+
+
+def _day_start(value: Any) -> datetime:
+    """Minuit UTC du jour de value (date ou datetime)"""
+    if isinstance(value, datetime):
+        value = _as_utc(value).date()
+    return datetime.combine(value, dt_time.min, tzinfo=timezone.utc)
+
+
+def _hour_start(dt: datetime) -> datetime:
+    return _as_utc(dt).replace(minute=0, second=0, microsecond=0)
+
+
+# === CALCUL (pool d'éphémérides) ===
+
+def _sky_row(granularity: str, at: datetime, moon: np.ndarray, sun: np.ndarray, data: Dict[str, Any]) -> Dict[str, Any]:
+    from services.swiss_ephemeris import get_lunar_mansion
+
+    moon_longitude = float(moon[0]) % 360
+    sun_longitude = float(sun[0]) % 360
+    mansion = get_lunar_mansion(moon_longitude)
+    return {
+        "granularity": granularity,
+        "at": at,
+        "moon_longitude": round(moon_longitude, 6),
+        "moon_speed": round(float(moon[1]), 6),
+        "sun_longitude": round(sun_longitude, 6),
+        "sun_speed": round(float(sun[1]), 6),
+        "moon_sign": moon_position.degree_to_sign(moon_longitude),
+        "moon_phase": moon_position.calculate_moon_phase(moon_longitude, sun_longitude),
+        "mansion_id": mansion["number"],
+        "data": {"mansion": mansion, **data},
+    }
+
+
+def compute_sky_snapshots(start_day: datetime, days: int) -> List[Dict[str, Any]]:
+    """
+    Instantanés horaires et quotidiens de [start_day, start_day + days[
+
+    Fonction de module (picklable) : exécutée dans le pool d'éphémérides.
+    Positions horaires et de midi en un appel calc_positions_batch ; ingress
+    (index partagé), fenêtres VoC et événements de phase résolus une fois pour
+    toute la plage puis répartis par jour.
+
+    Args:
+        start_day: Premier jour (ramené à minuit UTC)
+        days: Nombre de jours
+
+    Returns:
+        Lignes prêtes pour insert(SkySnapshot) : days × 24 lignes 'hour'
+        (position à l'heure pile) puis days lignes 'day' (position à midi UTC)
+    """
+    from services.moon_ingress_index import get_moon_ingress_index
+    from services.swiss_ephemeris import (
+        SWISS_EPHEMERIS_AVAILABLE,
+        ZODIAC_SIGNS,
+        datetime_to_julian_day,
+        find_void_of_course_windows,
+        iter_lunar_phase_events,
+        julian_day_to_datetime,
+        swe,
+        calc_positions_batch,
+    )
+
+    if not SWISS_EPHEMERIS_AVAILABLE:
+        raise ImportError("Swiss Ephemeris (pyswisseph) n'est pas installé. Installez-le avec: pip install pyswisseph")
+
+    start = _day_start(start_day)
+    end = start + timedelta(days=days)
+    start_jd = datetime_to_julian_day(start)
+    end_jd = datetime_to_julian_day(end)
+
+    hour_jds = start_jd + np.arange(days * 24, dtype=np.float64) / 24.0
+    noon_jds = start_jd + 0.5 + np.arange(days, dtype=np.float64)
+    positions = calc_positions_batch(np.concatenate([hour_jds, noon_jds]), [swe.MOON, swe.SUN])
+
+    ingresses = [
+        (julian_day_to_datetime(jd), ZODIAC_SIGNS[sign])
+        for jd, sign in get_moon_ingress_index().ingresses_between(start_jd, end_jd)
+    ]
+    voc_windows = find_void_of_course_windows(start, end)
+    voc_starts = [window.start_time for window in voc_windows]
+    phase_events = list(iter_lunar_phase_events(start, end))
+
+    rows = []
+    for i in range(days * 24):
+        at = start + timedelta(hours=i)
+        index = bisect_right(voc_starts, at) - 1
+        is_voc = index >= 0 and at < voc_windows[index].end_time
+        rows.append(_sky_row("hour", at, positions[i, 0], positions[i, 1], {"is_voc": is_voc}))
+
+    for d in range(days):
+        day = start + timedelta(days=d)
+        next_day = day + timedelta(days=1)
+        noon = positions[days * 24 + d]
+        rows.append(_sky_row("day", day, noon[0], noon[1], {
+            "ingresses": [
+                {"time": at.isoformat(), "sign": sign}
+                for at, sign in ingresses if day <= at < next_day
+            ],
+            "voc_windows": [
+                {
+                    "start_at": window.start_time.isoformat(),
+                    "end_at": window.end_time.isoformat(),
+                    "from_sign": window.from_sign,
+                    "to_sign": window.to_sign,
+                    "last_aspect": window.last_aspect,
+                }
+                for window in voc_windows if window.start_time < next_day and window.end_time > day
+            ],
+            "phase_events": [
+                {"time": event.time.isoformat(), "kind": event.kind, "phase": event.phase, "moon_sign": event.moon_sign}
+                for event in phase_events if day <= event.time < next_day
+            ],
+        }))
+
+    return rows
+
+
+async def refresh_sky_snapshots(
+    db: AsyncSession,
+    start: Optional[datetime] = None,
+    days: Optional[int] = None
+) -> int:
+    """
+    Recalcule la fenêtre [start, start + days[ et remplace ses lignes en DB
+
+    Une seule transaction : suppression de la fenêtre (et des jours antérieurs
+    à SKY_SNAPSHOT_KEEP_PAST_DAYS) puis insertion groupée ; les lecteurs voient
+    l'ancienne ou la nouvelle fenêtre, jamais un trou.
+
+    Sur PostgreSQL, la transaction prend un advisory lock : si un autre worker
+    rafraîchit déjà, rien n'est fait (pas de course sur la contrainte unique).
+
+    Args:
+        db: Session DB async
+        start: Premier jour (défaut: aujourd'hui UTC)
+        days: Nombre de jours (défaut: settings.SKY_SNAPSHOT_DAYS)
+
+    Returns:
+        Nombre de lignes écrites (0 si un autre worker rafraîchit déjà)
+    """
+    from services.ephemeris_executor import run_ephemeris
+
+    if db.get_bind().dialect.name == "postgresql":
+        # Verrou de transaction : libéré au commit / rollback
+        locked = await db.execute(
+            text("SELECT pg_try_advisory_xact_lock(:key)").bindparams(key=SKY_SNAPSHOT_REFRESH_LOCK_KEY)
+        )
+        if not locked.scalar():
+            await db.rollback()
+            logger.info("[SkySnapshot] ℹ️ Rafraîchissement déjà en cours dans un autre worker → skip")
+            return 0
+
+    start_day = _day_start(start or datetime.now(timezone.utc))
+    days = days or settings.SKY_SNAPSHOT_DAYS
+    end_day = start_day + timedelta(days=days)
+
+    rows = await run_ephemeris(compute_sky_snapshots, start_day, days)
+
+    await db.execute(
+        delete(SkySnapshot).where(or_(
+            SkySnapshot.at < start_day - timedelta(days=SKY_SNAPSHOT_KEEP_PAST_DAYS),
+            and_(SkySnapshot.at >= start_day, SkySnapshot.at < end_day)
+        ))
+    )
+    await db.execute(insert(SkySnapshot), rows)
+    await db.commit()
+    clear_cache()
+
+    logger.info(
+        f"[SkySnapshot] 🌌 {len(rows)} instantanés écrits "
+        f"({start_day.date()} → {end_day.date()}, {days} jours)"
+    )
+    return len(rows)
+
+
+# === LECTURE ===
+
+def snapshot_to_dict(snapshot: SkySnapshot) -> Dict[str, Any]:
+    return {
+        "granularity": snapshot.granularity,
+        "at": _as_utc(snapshot.at),
+        "moon_longitude": snapshot.moon_longitude,
+        "moon_speed": snapshot.moon_speed,
+        "sun_longitude": snapshot.sun_longitude,
+        "sun_speed": snapshot.sun_speed,
+        "moon_sign": snapshot.moon_sign,
+        "moon_phase": snapshot.moon_phase,
+        "mansion_id": snapshot.mansion_id,
+        "data": snapshot.data,
+    }
+
+
+async def get_sky_snapshot(db: AsyncSession, granularity: str, at: datetime) -> Optional[Dict[str, Any]]:
+    """
+    Instantané ('hour' ou 'day') débutant à `at`, None si absent de la table
+
+    Lecture indexée (granularity, at), gardée en mémoire du process.
+    """
+    key = (granularity, at)
+    cached = _SNAPSHOT_CACHE.get(key)
+    if cached is not None:
+        sky_snapshot_reads_total.labels(granularity=granularity, result='cache').inc()
+        return cached
+
+    result = await db.execute(
+        select(SkySnapshot).where(SkySnapshot.granularity == granularity, SkySnapshot.at == at)
+    )
+    snapshot = result.scalar_one_or_none()
+    if snapshot is None:
+        sky_snapshot_reads_total.labels(granularity=granularity, result='missing').inc()
+        return None
+
+    sky_snapshot_reads_total.labels(granularity=granularity, result='db').inc()
+    if len(_SNAPSHOT_CACHE) >= SKY_SNAPSHOT_CACHE_MAX_ENTRIES:
+        _SNAPSHOT_CACHE.clear()
+    _SNAPSHOT_CACHE[key] = snapshot_to_dict(snapshot)
+    return _SNAPSHOT_CACHE[key]
+
+
+def moon_position_at(snapshot: Dict[str, Any], at: datetime) -> Dict[str, Any]:
+    """
+    Position de la Lune à `at` extrapolée depuis un instantané horaire
+
+    Lune et Soleil avancent linéairement sur l'heure (vitesses stockées) :
+    écart < 0.01° avec le calcul Swiss Ephemeris direct.
+
+    Returns:
+        Même format que moon_position.get_current_moon_position
+    """
+    elapsed_days = (_as_utc(at) - snapshot["at"]).total_seconds() / 86400
+    moon_longitude = (snapshot["moon_longitude"] + snapshot["moon_speed"] * elapsed_days) % 360
+    sun_longitude = (snapshot["sun_longitude"] + snapshot["sun_speed"] * elapsed_days) % 360
+    return {
+        "sign": moon_position.degree_to_sign(moon_longitude),
+        "degree": round(moon_longitude, 2),
+        "phase": moon_position.calculate_moon_phase(moon_longitude, sun_longitude),
+    }
+
+
+def _stored_moon(snapshot: Dict[str, Any]) -> Dict[str, Any]:
+    """Position de la Lune à l'instant de calcul de l'instantané (jour : midi UTC)"""
+    return {
+        "sign": snapshot["moon_sign"],
+        "degree": round(snapshot["moon_longitude"], 2),
+        "phase": snapshot["moon_phase"],
+    }
+
+
+async def get_current_moon_position(db: AsyncSession) -> Dict[str, Any]:
+    """
+    Position actuelle de la Lune depuis l'instantané de l'heure courante
+
+    Repli sur ephemeris_executor.get_current_moon_position_async (calcul
+    Swiss Ephemeris en cache 5 min) si la table ne couvre pas l'heure ou si
+    la DB est indisponible.
+    """
+    now = datetime.now(timezone.utc)
+    try:
+        snapshot = await get_sky_snapshot(db, "hour", _hour_start(now))
+    except Exception as e:
+        sky_snapshot_reads_total.labels(granularity="hour", result='error').inc()
+        logger.warning(f"[SkySnapshot] ⚠️ Lecture impossible, calcul direct: {e}")
+        snapshot = None
+
+    if snapshot is not None:
+        return moon_position_at(snapshot, now)
+
+    from services.ephemeris_executor import get_current_moon_position_async
+    return await get_current_moon_position_async()
+
+
+async def get_day_sky(db: AsyncSession, day: date, include_hours: bool = False) -> Optional[Dict[str, Any]]:
+    """
+    Ciel d'un jour UTC : Lune à midi, mansion, ingress, fenêtres VoC, phases
+
+    Args:
+        db: Session DB async
+        day: Jour UTC
+        include_hours: Ajoute les 24 instantanés horaires (une requête de plus)
+
+    Returns:
+        {
+            "date": "YYYY-MM-DD",
+            "moon": {"sign", "degree", "phase"},
+            "mansion": {"number", "name", "degree_start", "degree_end"},
+            "ingresses": [...], "voc_windows": [...], "phase_events": [...],
+            "hours": [{"at", "moon": {...}, "mansion_id", "is_voc"}]  # si include_hours
+        }
+        None si le jour n'est pas précalculé
+    """
+    day_start = _day_start(day)
+    snapshot = await get_sky_snapshot(db, "day", day_start)
+    if snapshot is None:
+        return None
+
+    data = snapshot["data"]
+    result = {
+        "date": day_start.date().isoformat(),
+        "moon": _stored_moon(snapshot),
+        "mansion": data["mansion"],
+        "ingresses": data["ingresses"],
+        "voc_windows": data["voc_windows"],
+        "phase_events": data["phase_events"],
+    }
+
+    if include_hours:
+        rows = await db.execute(
+            select(SkySnapshot)
+            .where(
+                SkySnapshot.granularity == "hour",
+                SkySnapshot.at >= day_start,
+                SkySnapshot.at < day_start + timedelta(days=1)
+            )
+            .order_by(SkySnapshot.at)
+        )
+        result["hours"] = [
+            {
+                "at": _as_utc(hour.at).isoformat(),
+                "moon": _stored_moon(snapshot_to_dict(hour)),
+                "mansion_id": hour.mansion_id,
+                "is_voc": hour.data.get("is_voc", False),
+            }
+            for hour in rows.scalars()
+        ]
+
+    return result
+
+
+async def get_next_sky_change(db: AsyncSession, now: Optional[datetime] = None) -> Optional[datetime]:
+    """
+    Prochain changement du ciel après now : ingress, début/fin de VoC ou
+    événement de phase (instantanés du jour et du lendemain)
+
+    Returns:
+        datetime UTC, None si les jours ne sont pas précalculés
+    """
+    now = _as_utc(now or datetime.now(timezone.utc))
+    times = []
+    for offset in (0, 1):
+        snapshot = await get_sky_snapshot(db, "day", _day_start(now) + timedelta(days=offset))
+        if snapshot is None:
+            continue
+        data = snapshot["data"]
+        times += [ingress["time"] for ingress in data["ingresses"]]
+        times += [event["time"] for event in data["phase_events"]]
+        times += [t for window in data["voc_windows"] for t in (window["start_at"], window["end_at"])]
+
+    upcoming = [at for at in (datetime.fromisoformat(t) for t in times) if _as_utc(at) > now]
+    return min(upcoming) if upcoming else None
+
+
+def clear_cache() -> None:
+    """Vide les instantanés gardés en mémoire (après un refresh, tests)"""
+    _SNAPSHOT_CACHE.clear()
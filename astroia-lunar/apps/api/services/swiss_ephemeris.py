@@ -23,9 +23,15 @@ except ImportError:
     logger.warning("⚠️ Swiss Ephemeris (pyswisseph) non disponible - certaines fonctions seront limitées")
 
 import logging
-from typing import Dict, Any, List, Optional, Tuple
+from bisect import bisect_left, bisect_right
+from typing import Dict, Any, Iterator, List, Optional, Sequence, Tuple
 from datetime import datetime, timedelta, timezone
 from collections import namedtuple
+from itertools import islice
+
+import numpy as np
+
+from services import ephemeris_tables
 
 if 'logger' not in locals():
     logger = logging.getLogger(__name__)
@@ -59,10 +65,54 @@ MAJOR_ASPECTS = {
 # Orbs for aspects (in degrees)
 ASPECT_ORB = 1.0  # Tight orb for VOC calculations
 
+# Newton solver for exact Moon crossings (returns, ingresses, aspects)
+LUNAR_RETURN_MAX_ITERATIONS = 10
+MOON_CROSSING_TOLERANCE_DAYS = 1 / 86400  # 1 second
+
+# Lunar return series: the next return is predicted one sidereal month later
+SIDEREAL_MONTH_DAYS = 27.321661
+LUNAR_RETURN_SERIES_MARGIN_DAYS = 2.0  # Sidereal month varies by well under a day
+
+# Planets checked for Void of Course (traditional planets)
+VOC_PLANETS = ['Sun', 'Mercury', 'Venus', 'Mars', 'Jupiter', 'Saturn']
+
+# Moon - planet separations (0-360) where a major aspect is exact.
+# Sextile, square and trine occur twice per synodic cycle (waxing/waning).
+ASPECT_SEPARATIONS = [
+    (0, 'conjunction'),
+    (60, 'sextile'),
+    (90, 'square'),
+    (120, 'trine'),
+    (180, 'opposition'),
+    (240, 'trine'),
+    (270, 'square'),
+    (300, 'sextile'),
+]
+
+# A Moon sign stay never exceeds ~2.7 days
+MAX_MOON_SIGN_STAY_DAYS = 3.0
+
+# Sun-Moon elongations where a new phase starts (boundary k enters LUNAR_PHASES[k + 1])
+PHASE_BOUNDARY_ELONGATIONS = [22.5 + 45 * k for k in range(8)]
+
+# Exact principal phases (Sun-Moon elongation)
+PRINCIPAL_PHASE_ELONGATIONS = {
+    0: 'Nouvelle Lune',
+    90: 'Premier Quartier',
+    180: 'Pleine Lune',
+    270: 'Dernier Quartier',
+}
+
+# Julian Day of the Unix epoch (1970-01-01T00:00:00Z)
+UNIX_EPOCH_JD = 2440587.5
+
 # Named tuple for cleaner returns
 MoonPosition = namedtuple('MoonPosition', ['longitude', 'sign', 'degree', 'phase'])
 SunPosition = namedtuple('SunPosition', ['longitude', 'sign', 'degree'])
-VocWindow = namedtuple('VocWindow', ['start_time', 'end_time', 'from_sign', 'to_sign'])
+VocWindow = namedtuple('VocWindow', ['start_time', 'end_time', 'from_sign', 'to_sign', 'last_aspect'])
+LunarPhaseEvent = namedtuple(
+    'LunarPhaseEvent', ['time', 'kind', 'phase', 'elongation', 'moon_longitude', 'moon_sign']
+)
 
 
 def datetime_to_julian_day(dt: datetime) -> float:
@@ -162,6 +212,107 @@ def calculate_phase_from_elongation(elongation: float) -> str:
         return 'Dernier Croissant'
 
 
+def datetimes_to_julian_days(dts: Sequence[datetime]) -> np.ndarray:
+    """
+    Convert datetimes to Julian Days (UT) in one vectorized operation
+
+    Args:
+        dts: datetimes (assumed UTC if naive)
+
+    Returns:
+        1-D float64 array of Julian Days
+    """
+    timestamps = np.fromiter(
+        (
+            (dt if dt.tzinfo is not None else dt.replace(tzinfo=timezone.utc)).timestamp()
+            for dt in dts
+        ),
+        dtype=np.float64
+    )
+    return timestamps / 86400.0 + UNIX_EPOCH_JD
+
+
+def julian_day_grid(start_dt: datetime, end_dt: datetime, step: timedelta) -> np.ndarray:
+    """
+    Regular grid of Julian Days from start_dt to end_dt (inclusive)
+
+    Args:
+        start_dt: First sample (UTC)
+        end_dt: Last sample bound (UTC)
+        step: Sampling step
+
+    Returns:
+        1-D float64 array [start, start + step, ...] with every sample <= end_dt
+    """
+    start_jd = datetime_to_julian_day(start_dt)
+    count = int((end_dt - start_dt) / step) + 1 if end_dt >= start_dt else 0
+    return start_jd + np.arange(count, dtype=np.float64) * (step.total_seconds() / 86400.0)
+
+
+def calc_positions_batch(jds: Sequence[float], bodies: Sequence[int]) -> np.ndarray:
+    """
+    Batch ephemeris kernel: positions of several bodies over an array of Julian Days
+
+    Single entry point for multi-sample scans: no datetime conversion and no
+    per-sample Python helper call, results land in one dense array.
+    Served from the precomputed table (services.ephemeris_tables) when it
+    covers the request, from pyswisseph otherwise.
+
+    Args:
+        jds: Julian Days (UT), 1-D array-like
+        bodies: Swiss Ephemeris planet constants (swe.MOON, swe.SUN, ...)
+
+    Returns:
+        float64 array of shape (n_times, n_bodies, 2): [..., 0] = longitude (0-360),
+        [..., 1] = speed (degrees/day)
+    """
+    if not SWISS_EPHEMERIS_AVAILABLE:
+        raise ImportError("Swiss Ephemeris (pyswisseph) n'est pas installé. Installez-le avec: pip install pyswisseph")
+
+    jd_array = np.asarray(jds, dtype=np.float64).ravel()
+    if not len(jd_array) or not bodies:
+        return np.empty((len(jd_array), len(bodies), 2), dtype=np.float64)
+
+    table = ephemeris_tables.get_default_table()
+    if table is not None and table.can_serve(jd_array.min(), jd_array.max(), bodies):
+        return table.positions(jd_array, bodies)
+
+    jd_list = jd_array.tolist()
+
+    calc_ut = swe.calc_ut
+    flags = swe.FLG_SWIEPH | swe.FLG_SPEED
+
+    # Parcours date par date : pyswisseph réutilise ses calculs internes
+    # (nutation, position de la Terre) entre corps d'une même date
+    samples = [[calc_ut(jd, body, flags)[0] for body in bodies] for jd in jd_list]
+    return np.array(samples, dtype=np.float64)[:, :, [0, 3]]
+
+
+def get_body_longitude_and_speed(jd_ut: float, body: int) -> Tuple[float, float]:
+    """
+    Get a body's ecliptic longitude and daily speed at Julian Day
+
+    Single-sample path of calc_positions_batch (same flags and same table),
+    used by the Newton solvers where each sample depends on the previous one.
+
+    Args:
+        jd_ut: Julian Day (UT)
+        body: Swiss Ephemeris planet constant (swe.MOON, swe.SUN, etc.)
+
+    Returns:
+        (longitude 0-360, speed in degrees/day)
+    """
+    if not SWISS_EPHEMERIS_AVAILABLE:
+        raise ImportError("Swiss Ephemeris (pyswisseph) n'est pas installé. Installez-le avec: pip install pyswisseph")
+
+    table = ephemeris_tables.get_default_table()
+    if table is not None and table.can_serve(jd_ut, jd_ut, (body,)):
+        return table.position(jd_ut, body)
+
+    result = swe.calc_ut(jd_ut, body, swe.FLG_SWIEPH | swe.FLG_SPEED)
+    return result[0][0], result[0][3]
+
+
 def get_moon_longitude(jd_ut: float) -> float:
     """
     Get Moon's ecliptic longitude at Julian Day
@@ -174,10 +325,8 @@ def get_moon_longitude(jd_ut: float) -> float:
     """
     if not SWISS_EPHEMERIS_AVAILABLE:
         raise ImportError("Swiss Ephemeris (pyswisseph) n'est pas installé. Installez-le avec: pip install pyswisseph")
-    
-    result = swe.calc_ut(jd_ut, swe.MOON, swe.FLG_SWIEPH)
-    moon_longitude = result[0][0]
-    return moon_longitude
+
+    return get_body_longitude_and_speed(jd_ut, swe.MOON)[0]
 
 
 def get_sun_longitude(jd_ut: float) -> float:
@@ -190,9 +339,7 @@ def get_sun_longitude(jd_ut: float) -> float:
     Returns:
         Ecliptic longitude (0-360)
     """
-    result = swe.calc_ut(jd_ut, swe.SUN, swe.FLG_SWIEPH)
-    sun_longitude = result[0][0]
-    return sun_longitude
+    return get_body_longitude_and_speed(jd_ut, swe.SUN)[0]
 
 
 def get_planet_longitude(jd_ut: float, planet: int) -> float:
@@ -206,8 +353,23 @@ def get_planet_longitude(jd_ut: float, planet: int) -> float:
     Returns:
         Ecliptic longitude (0-360)
     """
-    result = swe.calc_ut(jd_ut, planet, swe.FLG_SWIEPH)
-    return result[0][0]
+    return get_body_longitude_and_speed(jd_ut, planet)[0]
+
+
+def get_moon_longitude_and_speed(jd_ut: float) -> Tuple[float, float]:
+    """
+    Get Moon's ecliptic longitude and daily speed at Julian Day
+
+    Args:
+        jd_ut: Julian Day (UT)
+
+    Returns:
+        (longitude 0-360, speed in degrees/day)
+    """
+    if not SWISS_EPHEMERIS_AVAILABLE:
+        raise ImportError("Swiss Ephemeris (pyswisseph) n'est pas installé. Installez-le avec: pip install pyswisseph")
+
+    return get_body_longitude_and_speed(jd_ut, swe.MOON)
 
 
 def get_moon_position(dt: datetime) -> MoonPosition:
@@ -222,8 +384,9 @@ def get_moon_position(dt: datetime) -> MoonPosition:
     """
     jd = datetime_to_julian_day(dt)
 
-    moon_lon = get_moon_longitude(jd)
-    sun_lon = get_sun_longitude(jd)
+    positions = calc_positions_batch([jd], [swe.MOON, swe.SUN])[0]
+    moon_lon = float(positions[0, 0])
+    sun_lon = float(positions[1, 0])
 
     sign = degree_to_sign(moon_lon)
     degree_in_sign = moon_lon % 30
@@ -299,10 +462,75 @@ def angle_diff_signed(a: float, b: float) -> float:
         diff -= 360
     elif diff < -180:
         diff += 360
-    
+
     return diff
 
 
+def angle_diff_signed_batch(a: np.ndarray, b: float) -> np.ndarray:
+    """
+    Version vectorisée de angle_diff_signed (tableau d'angles vs angle de référence)
+
+    Args:
+        a: Tableau d'angles en degrés
+        b: Angle de référence en degrés
+
+    Returns:
+        Différences signées dans [-180, 180[
+    """
+    return (np.asarray(a, dtype=np.float64) - b + 180.0) % 360.0 - 180.0
+
+
+def _moon_separation_and_speed(jd_ut: float, body: Optional[int] = None) -> Tuple[float, float]:
+    """
+    Séparation Lune - corps (0-360°) et sa vitesse (°/jour).
+
+    Sans corps, retourne la longitude de la Lune et sa vitesse.
+    """
+    moon_lon, moon_speed = get_moon_longitude_and_speed(jd_ut)
+    if body is None:
+        return moon_lon, moon_speed
+
+    body_lon, body_speed = get_body_longitude_and_speed(jd_ut, body)
+    return (moon_lon - body_lon) % 360, moon_speed - body_speed
+
+
+def solve_moon_crossing(
+    start_jd: float,
+    target: float,
+    body: Optional[int] = None,
+    tolerance_days: float = MOON_CROSSING_TOLERANCE_DAYS
+) -> Optional[float]:
+    """
+    Trouve le premier instant >= start_jd où la Lune atteint une longitude cible
+    (ou une séparation cible avec un corps).
+
+    La Lune ne rétrograde jamais et va plus vite que toutes les planètes, donc
+    la séparation croît de façon monotone:
+    1. Prédiction: arc restant jusqu'à la cible / vitesse (FLG_SPEED)
+    2. Newton: t ← t - Δ(t) / v(t), avec Δ signé dans [-180°, 180°]
+
+    Args:
+        start_jd: Julian Day (UT) de départ
+        target: Longitude (ou séparation Lune - corps) cible (0-360°)
+        body: Constante Swiss Ephemeris du corps aspecté, None pour la longitude de la Lune
+        tolerance_days: Arrêt quand le pas de Newton est inférieur (jours)
+
+    Returns:
+        Julian Day du passage exact, ou None si Newton ne converge pas
+    """
+    separation, speed = _moon_separation_and_speed(start_jd, body)
+    jd = start_jd + ((target - separation) % 360) / speed
+
+    for _ in range(LUNAR_RETURN_MAX_ITERATIONS):
+        separation, speed = _moon_separation_and_speed(jd, body)
+        step_days = angle_diff_signed(separation, target) / speed
+        jd -= step_days
+        if abs(step_days) < tolerance_days:
+            return jd
+
+    return None
+
+
 def find_lunar_return(
     natal_moon_longitude: float,
     start_dt: datetime,
@@ -311,7 +539,142 @@ def find_lunar_return(
 ) -> Optional[datetime]:
     """
     Trouve le moment exact où la Lune revient à sa position natale (Lunar Return)
-    
+
+    Algorithme (solve_moon_crossing):
+    1. Prédiction: arc restant jusqu'à la position natale / vitesse de la Lune (FLG_SPEED)
+    2. Raffinement Newton: t ← t - Δλ(t) / v(t), avec Δλ signé dans [-180°, 180°]
+    3. Arrêt quand le pas est inférieur à la tolérance (60s par défaut)
+
+    Converge en 3-5 appels calc_ut, contre ~1500 pour le scan à pas de 30 min
+    (_find_lunar_return_scan, conservé comme repli si Newton ne converge pas).
+
+    Args:
+        natal_moon_longitude: Longitude écliptique natale de la Lune (0-360°)
+        start_dt: Date de départ pour la recherche (UTC)
+        search_window_hours: Fenêtre de recherche en heures (défaut: 48h)
+        tolerance_seconds: Tolérance en secondes pour le raffinement (défaut: 60s)
+
+    Returns:
+        datetime du premier Lunar Return dans la fenêtre (UTC) ou None si non trouvé
+    """
+    if not SWISS_EPHEMERIS_AVAILABLE:
+        logger.warning("[LunarReturn] ⚠️ Swiss Ephemeris non disponible - impossible de calculer le Lunar Return")
+        return None
+
+    logger.info(
+        f"[LunarReturn] Recherche Lunar Return - "
+        f"λ_natal={natal_moon_longitude:.2f}°, "
+        f"start={start_dt.isoformat()}, "
+        f"window={search_window_hours}h"
+    )
+
+    natal_lon = normalize_angle_360(natal_moon_longitude)
+    start_jd = datetime_to_julian_day(start_dt)
+    end_jd = start_jd + search_window_hours / 24.0
+    tolerance_days = tolerance_seconds / 86400.0
+
+    jd = solve_moon_crossing(start_jd, natal_lon, tolerance_days=tolerance_days)
+
+    if jd is None:
+        logger.warning("[LunarReturn] ⚠️ Newton non convergé, repli sur le scan")
+        return _find_lunar_return_scan(
+            natal_moon_longitude, start_dt, search_window_hours, tolerance_seconds
+        )
+
+    if jd < start_jd - tolerance_days or jd > end_jd:
+        logger.warning(
+            f"[LunarReturn] ❌ Aucun Lunar Return dans la fenêtre de recherche "
+            f"(prochain passage: {julian_day_to_datetime(jd).isoformat()})"
+        )
+        return None
+
+    result_dt = julian_day_to_datetime(max(jd, start_jd))
+
+    logger.info(f"[LunarReturn] ✅ Lunar Return trouvé: {result_dt.isoformat()}")
+
+    return result_dt
+
+
+def iter_lunar_returns(
+    natal_moon_longitude: float,
+    start_dt: datetime,
+    end_dt: Optional[datetime] = None,
+    tolerance_seconds: int = 60
+) -> Iterator[datetime]:
+    """
+    Génère les Lunar Returns consécutifs à partir de start_dt, en un seul passage
+
+    Chaque retour est résolu par solve_moon_crossing ; le suivant part d'une
+    prédiction à un mois sidéral (SIDEREAL_MONTH_DAYS) moins une marge, donc
+    Newton n'a que quelques degrés à rattraper au lieu de rebalayer le ciel.
+
+    Générateur paresseux: sans end_dt, la séquence est infinie (itertools.islice).
+
+    Args:
+        natal_moon_longitude: Longitude écliptique natale de la Lune (0-360°)
+        start_dt: Début de la série (UTC)
+        end_dt: Fin (UTC, incluse), None pour ne pas borner
+        tolerance_seconds: Tolérance de Newton en secondes
+
+    Yields:
+        datetime UTC de chaque Lunar Return, dans l'ordre chronologique
+    """
+    if not SWISS_EPHEMERIS_AVAILABLE:
+        logger.warning("[LunarReturn] ⚠️ Swiss Ephemeris non disponible - impossible de calculer les Lunar Returns")
+        return
+
+    natal_lon = normalize_angle_360(natal_moon_longitude)
+    start_jd = datetime_to_julian_day(start_dt)
+    end_jd = datetime_to_julian_day(end_dt) if end_dt is not None else None
+    tolerance_days = tolerance_seconds / 86400.0
+    jd = start_jd
+
+    while True:
+        return_jd = solve_moon_crossing(jd, natal_lon, tolerance_days=tolerance_days)
+        if return_jd is None:
+            logger.warning(f"[LunarReturn] ⚠️ Newton n'a pas convergé (jd={jd:.5f}), série interrompue")
+            return
+
+        return_jd = max(return_jd, start_jd)
+        if end_jd is not None and return_jd > end_jd:
+            return
+
+        yield julian_day_to_datetime(return_jd)
+        jd = return_jd + SIDEREAL_MONTH_DAYS - LUNAR_RETURN_SERIES_MARGIN_DAYS
+
+
+def find_lunar_return_series(
+    natal_moon_longitude: float,
+    start_dt: datetime,
+    count: Optional[int] = None,
+    end_dt: Optional[datetime] = None,
+    tolerance_seconds: int = 60
+) -> List[datetime]:
+    """
+    N Lunar Returns consécutifs (count) et/ou tous ceux jusqu'à end_dt
+
+    Returns:
+        Liste de datetimes UTC triés (vide si Swiss Ephemeris indisponible)
+    """
+    if count is None and end_dt is None:
+        raise ValueError("find_lunar_return_series: count ou end_dt requis")
+
+    returns = iter_lunar_returns(natal_moon_longitude, start_dt, end_dt, tolerance_seconds)
+    return list(islice(returns, count))
+
+
+def _find_lunar_return_scan(
+    natal_moon_longitude: float,
+    start_dt: datetime,
+    search_window_hours: int = 48,
+    tolerance_seconds: int = 60
+) -> Optional[datetime]:
+    """
+    Recherche historique du Lunar Return par scan + bisection.
+
+    Conservée comme repli de find_lunar_return et comme référence pour
+    scripts/benchmark_lunar_return.py.
+
     Algorithme:
     1. Approximation: utiliser le mois sidéral (~27.32 jours) pour estimer la date
     2. Bracket: scanner autour de l'approx avec un pas de 30 min pour trouver un changement de signe
@@ -345,44 +708,37 @@ def find_lunar_return(
     search_start = start_dt
     search_end = start_dt + timedelta(hours=search_window_hours)
     
-    # Étape 2: Bracket - scanner avec un pas de 30 minutes
-    step_minutes = 30
-    current_dt = search_start
-    prev_diff = None
+    # Étape 2: Bracket - scanner avec un pas de 30 minutes (grille calculée en un lot)
+    step = timedelta(minutes=30)
     bracket_start = None
     bracket_end = None
-    
-    while current_dt <= search_end:
-        jd = datetime_to_julian_day(current_dt)
-        moon_lon = get_moon_longitude(jd)
-        diff = angle_diff_signed(moon_lon, natal_lon)
-
-        # Chercher un changement de signe (passage par 0) avec diff < 30°
-        # Éviter les faux positifs quand on traverse ±180°
-        if prev_diff is not None:
-            # Crossing bidirectionnel : la Lune peut traverser la position natale
-            # dans les deux sens selon sa vitesse et direction
-            # - prev_diff < 0 <= diff : passage de négatif à positif (approche depuis "avant")
-            # - prev_diff > 0 >= diff : passage de positif à négatif (approche depuis "après")
-            # Guard : abs(diff) < 30 pour éviter les faux positifs du saut ±180°
-            crossing_up = (prev_diff < 0 and diff >= 0)
-            crossing_down = (prev_diff > 0 and diff <= 0)
-            small_diffs = abs(prev_diff) < 30 and abs(diff) < 30
-
-            if (crossing_up or crossing_down) and small_diffs:
-                bracket_start = current_dt - timedelta(minutes=step_minutes)
-                bracket_end = current_dt
-                direction = "↑" if crossing_up else "↓"
-                logger.info(
-                    f"[LunarReturn] Bracket trouvé {direction}: "
-                    f"{bracket_start.isoformat()} (diff={prev_diff:.4f}°) → "
-                    f"{bracket_end.isoformat()} (diff={diff:.4f}°)"
-                )
-                break
 
-        prev_diff = diff
-        current_dt += timedelta(minutes=step_minutes)
-    
+    jds = julian_day_grid(search_start, search_end, step)
+    moon_lons = calc_positions_batch(jds, [swe.MOON])[:, 0, 0]
+    diffs = angle_diff_signed_batch(moon_lons, natal_lon)
+
+    # Crossing bidirectionnel : la Lune peut traverser la position natale
+    # dans les deux sens selon sa vitesse et direction
+    # - prev_diff < 0 <= diff : passage de négatif à positif (approche depuis "avant")
+    # - prev_diff > 0 >= diff : passage de positif à négatif (approche depuis "après")
+    # Guard : abs(diff) < 30 pour éviter les faux positifs du saut ±180°
+    prev_diffs, next_diffs = diffs[:-1], diffs[1:]
+    crossing_up = (prev_diffs < 0) & (next_diffs >= 0)
+    crossing_down = (prev_diffs > 0) & (next_diffs <= 0)
+    small_diffs = (np.abs(prev_diffs) < 30) & (np.abs(next_diffs) < 30)
+    crossings = np.flatnonzero((crossing_up | crossing_down) & small_diffs)
+
+    if crossings.size:
+        i = int(crossings[0])
+        bracket_start = search_start + step * i
+        bracket_end = bracket_start + step
+        direction = "↑" if crossing_up[i] else "↓"
+        logger.info(
+            f"[LunarReturn] Bracket trouvé {direction}: "
+            f"{bracket_start.isoformat()} (diff={prev_diffs[i]:.4f}°) → "
+            f"{bracket_end.isoformat()} (diff={next_diffs[i]:.4f}°)"
+        )
+
     if bracket_start is None or bracket_end is None:
         logger.warning(
             f"[LunarReturn] ❌ Aucun bracket trouvé dans la fenêtre de recherche"
@@ -435,6 +791,181 @@ def find_lunar_return(
     return result_dt
 
 
+def _moon_ingresses(start_jd: float, end_jd: float) -> List[Tuple[float, int]]:
+    """
+    Instants exacts des changements de signe de la Lune dans [start_jd, end_jd].
+
+    Résolution Newton brute : les appelants passent par l'index partagé
+    (services.moon_ingress_index), qui n'appelle cette fonction qu'à l'extension.
+
+    Returns:
+        [(jd, index du nouveau signe 0-11), ...] triés
+    """
+    ingresses = []
+    sign_index = (int(get_moon_longitude(start_jd) // 30) + 1) % 12
+    jd = start_jd
+
+    while True:
+        ingress_jd = solve_moon_crossing(jd, sign_index * 30)
+        if ingress_jd is None:
+            logger.warning(f"[Ingress] Newton non convergé vers {ZODIAC_SIGNS[sign_index]}")
+            break
+        if ingress_jd > end_jd:
+            break
+        ingresses.append((ingress_jd, sign_index))
+        jd = ingress_jd
+        sign_index = (sign_index + 1) % 12
+
+    return ingresses
+
+
+def _moon_aspect_events(start_jd: float, end_jd: float) -> List[Tuple[float, str, str]]:
+    """
+    Instants exacts des aspects majeurs Lune - planètes VoC dans [start_jd, end_jd].
+
+    Chaque aspect est résolu par Newton sur la séparation Lune - planète,
+    les aspects suivants sont enchaînés dans l'ordre de ASPECT_SEPARATIONS.
+
+    Returns:
+        [(jd, aspect_name, planet_name), ...] triés par jd
+    """
+    events = []
+
+    for planet_name in VOC_PLANETS:
+        body = getattr(swe, planet_name.upper())
+        separation, _ = _moon_separation_and_speed(start_jd, body)
+
+        # Prochaine séparation d'aspect devant la Lune
+        index = next(
+            (i for i, (angle, _) in enumerate(ASPECT_SEPARATIONS) if angle > separation),
+            0
+        )
+        jd = start_jd
+
+        while True:
+            angle, aspect_name = ASPECT_SEPARATIONS[index]
+            exact_jd = solve_moon_crossing(jd, angle, body)
+            if exact_jd is None:
+                logger.warning(f"[VOC] Newton non convergé: {aspect_name} {planet_name}")
+                break
+            if exact_jd > end_jd:
+                break
+            events.append((exact_jd, aspect_name, planet_name))
+            jd = exact_jd
+            index = (index + 1) % len(ASPECT_SEPARATIONS)
+
+    events.sort()
+    return events
+
+
+def _moon_sign_stays(start_jd: float, end_jd: float) -> List[Dict[str, Any]]:
+    """
+    Séjours de la Lune dans un signe qui chevauchent [start_jd, end_jd],
+    avec le dernier aspect majeur exact de chaque séjour.
+
+    Returns:
+        [
+            {
+                "ingress_jd": float,     # entrée dans le signe
+                "egress_jd": float,      # sortie du signe (fin du VoC)
+                "void_start_jd": float,  # dernier aspect exact (ou ingress si aucun)
+                "sign": int,
+                "next_sign": int,
+                "last_aspect": (jd, aspect_name, planet_name) | None
+            },
+            ...
+        ]
+    """
+    from services.moon_ingress_index import get_moon_ingress_index
+
+    ingresses = get_moon_ingress_index().ingresses_between(
+        start_jd - MAX_MOON_SIGN_STAY_DAYS,
+        end_jd + MAX_MOON_SIGN_STAY_DAYS
+    )
+    if len(ingresses) < 2:
+        return []
+
+    aspects = _moon_aspect_events(ingresses[0][0], ingresses[-1][0])
+    aspect_jds = [event[0] for event in aspects]
+
+    stays = []
+    for (ingress_jd, sign), (egress_jd, next_sign) in zip(ingresses, ingresses[1:]):
+        if egress_jd <= start_jd or ingress_jd >= end_jd:
+            continue
+
+        last_index = bisect_left(aspect_jds, egress_jd) - 1
+        last_aspect = None
+        if last_index >= 0 and aspect_jds[last_index] >= ingress_jd:
+            last_aspect = aspects[last_index]
+
+        stays.append({
+            "ingress_jd": ingress_jd,
+            "egress_jd": egress_jd,
+            "void_start_jd": last_aspect[0] if last_aspect else ingress_jd,
+            "sign": sign,
+            "next_sign": next_sign,
+            "last_aspect": last_aspect,
+        })
+
+    return stays
+
+
+def _format_last_aspect(last_aspect: Optional[Tuple[float, str, str]]) -> Optional[Dict[str, Any]]:
+    """Format API du dernier aspect: {"time": iso, "type": str, "with": str}"""
+    if not last_aspect:
+        return None
+
+    aspect_jd, aspect_name, planet_name = last_aspect
+    return {
+        "time": julian_day_to_datetime(aspect_jd).isoformat(),
+        "type": aspect_name,
+        "with": planet_name
+    }
+
+
+def find_void_of_course_windows(start_dt: datetime, end_dt: datetime) -> List[VocWindow]:
+    """
+    Find all exact Void of Course windows overlapping a date range, in one pass.
+
+    Each window starts at the exact time of the Moon's last major aspect
+    (conjunction, sextile, square, trine, opposition) to the Sun..Saturn
+    before leaving its sign, and ends at the exact sign ingress.
+
+    Args:
+        start_dt: Start datetime (UTC)
+        end_dt: End datetime (UTC)
+
+    Returns:
+        List of VocWindow(start_time, end_time, from_sign, to_sign, last_aspect)
+        sorted by start_time
+    """
+    start_jd = datetime_to_julian_day(start_dt)
+    end_jd = datetime_to_julian_day(end_dt)
+
+    windows = []
+    for stay in _moon_sign_stays(start_jd, end_jd):
+        if stay["void_start_jd"] >= end_jd:
+            continue
+        windows.append(VocWindow(
+            start_time=julian_day_to_datetime(stay["void_start_jd"]),
+            end_time=julian_day_to_datetime(stay["egress_jd"]),
+            from_sign=ZODIAC_SIGNS[stay["sign"]],
+            to_sign=ZODIAC_SIGNS[stay["next_sign"]],
+            last_aspect=_format_last_aspect(stay["last_aspect"])
+        ))
+
+    return windows
+
+
+def _current_sign_stay(dt: datetime) -> Optional[Dict[str, Any]]:
+    """Séjour de la Lune dans son signe à l'instant dt (voir _moon_sign_stays)"""
+    jd = datetime_to_julian_day(dt)
+    for stay in _moon_sign_stays(jd, jd):
+        if stay["ingress_jd"] <= jd < stay["egress_jd"]:
+            return stay
+    return None
+
+
 def find_next_moon_sign_change(start_dt: datetime, max_hours: int = 72) -> Optional[datetime]:
     """
     Find when Moon changes to next zodiac sign
@@ -446,31 +977,14 @@ def find_next_moon_sign_change(start_dt: datetime, max_hours: int = 72) -> Optio
     Returns:
         datetime of sign change, or None if not found
     """
-    start_jd = datetime_to_julian_day(start_dt)
-    start_sign = degree_to_sign(get_moon_longitude(start_jd))
+    from services.moon_ingress_index import get_moon_ingress_index
 
-    # Binary search for sign change
-    low_jd = start_jd
-    high_jd = start_jd + (max_hours / 24.0)
-
-    # Check if sign changes in window
-    end_sign = degree_to_sign(get_moon_longitude(high_jd))
-    if start_sign == end_sign:
+    start_jd = datetime_to_julian_day(start_dt)
+    ingress = get_moon_ingress_index().next_ingress(start_jd)
+    if ingress is None or ingress[0] > start_jd + (max_hours / 24.0):
         return None
 
-    # Binary search with 1-minute precision
-    precision_days = 1 / (24 * 60)  # 1 minute
-
-    while (high_jd - low_jd) > precision_days:
-        mid_jd = (low_jd + high_jd) / 2
-        mid_sign = degree_to_sign(get_moon_longitude(mid_jd))
-
-        if mid_sign == start_sign:
-            low_jd = mid_jd
-        else:
-            high_jd = mid_jd
-
-    return julian_day_to_datetime(high_jd)
+    return julian_day_to_datetime(ingress[0])
 
 
 def calculate_aspect_angle(lon1: float, lon2: float) -> Tuple[Optional[str], float]:
@@ -504,51 +1018,18 @@ def find_last_major_aspect_before_sign_change(start_dt: datetime) -> Optional[Tu
         start_dt: Starting datetime (UTC)
 
     Returns:
-        (aspect_time, aspect_name, planet_name) or None if no aspect found
+        (aspect_time, aspect_name, planet_name) or None if no aspect is left
+        between start_dt and the sign change
     """
-    # Find next sign change
-    sign_change_dt = find_next_moon_sign_change(start_dt)
-    if not sign_change_dt:
+    stay = _current_sign_stay(start_dt)
+    if not stay or not stay["last_aspect"]:
         return None
 
-    # Planets to check
-    planets = [
-        (swe.SUN, 'Sun'),
-        (swe.MERCURY, 'Mercury'),
-        (swe.VENUS, 'Venus'),
-        (swe.MARS, 'Mars'),
-        (swe.JUPITER, 'Jupiter'),
-        (swe.SATURN, 'Saturn'),
-    ]
-
-    last_aspect_time = None
-    last_aspect_name = None
-    last_planet_name = None
-
-    # Check each planet for aspects
-    current_dt = start_dt
-    step = timedelta(minutes=10)
-
-    while current_dt < sign_change_dt:
-        jd = datetime_to_julian_day(current_dt)
-        moon_lon = get_moon_longitude(jd)
-
-        for planet_id, planet_name in planets:
-            planet_lon = get_planet_longitude(jd, planet_id)
-            aspect_name, _ = calculate_aspect_angle(moon_lon, planet_lon)
-
-            if aspect_name:
-                # Found an aspect - record it
-                last_aspect_time = current_dt
-                last_aspect_name = aspect_name
-                last_planet_name = planet_name
-
-        current_dt += step
+    aspect_jd, aspect_name, planet_name = stay["last_aspect"]
+    if aspect_jd < datetime_to_julian_day(start_dt):
+        return None
 
-    if last_aspect_time:
-        return (last_aspect_time, last_aspect_name, last_planet_name)
-
-    return None
+    return (julian_day_to_datetime(aspect_jd), aspect_name, planet_name)
 
 
 def calculate_void_of_course(dt: datetime) -> Dict[str, Any]:
@@ -565,71 +1046,121 @@ def calculate_void_of_course(dt: datetime) -> Dict[str, Any]:
             "void_end": datetime or None,
             "current_sign": str,
             "next_sign": str or None,
-            "last_aspect": {"time": datetime, "type": str, "with": str} or None
+            "last_aspect": {"time": str, "type": str, "with": str} or None
         }
     """
-    jd = datetime_to_julian_day(dt)
-    moon_lon = get_moon_longitude(jd)
-    current_sign = degree_to_sign(moon_lon)
-
-    # Find next sign change
-    next_sign_change = find_next_moon_sign_change(dt)
-    if not next_sign_change:
+    stay = _current_sign_stay(dt)
+    if not stay:
         logger.warning("[VOC] Could not find next sign change")
         return {
             "is_void": False,
             "void_start": None,
             "void_end": None,
-            "current_sign": current_sign,
+            "current_sign": degree_to_sign(get_moon_longitude(datetime_to_julian_day(dt))),
             "next_sign": None,
             "last_aspect": None
         }
 
-    next_sign = degree_to_sign(get_moon_longitude(datetime_to_julian_day(next_sign_change)))
+    is_void = datetime_to_julian_day(dt) >= stay["void_start_jd"]
+
+    return {
+        "is_void": is_void,
+        "void_start": julian_day_to_datetime(stay["void_start_jd"]) if is_void else None,
+        "void_end": julian_day_to_datetime(stay["egress_jd"]) if is_void else None,
+        "current_sign": ZODIAC_SIGNS[stay["sign"]],
+        "next_sign": ZODIAC_SIGNS[stay["next_sign"]],
+        "last_aspect": _format_last_aspect(stay["last_aspect"])
+    }
 
-    # Find last major aspect
-    last_aspect_info = find_last_major_aspect_before_sign_change(dt)
 
-    if not last_aspect_info:
-        # No aspect found - Moon is void from now until sign change
-        return {
-            "is_void": True,
-            "void_start": dt,
-            "void_end": next_sign_change,
-            "current_sign": current_sign,
-            "next_sign": next_sign,
-            "last_aspect": None
-        }
+def _lunar_phase_targets(include_boundaries: bool, include_principal: bool) -> List[Tuple[float, str, str]]:
+    """Élongations cibles triées: (élongation, kind, phase)"""
+    targets = []
+    if include_boundaries:
+        targets += [
+            (elongation, 'phase_boundary', LUNAR_PHASES[(k + 1) % 8])
+            for k, elongation in enumerate(PHASE_BOUNDARY_ELONGATIONS)
+        ]
+    if include_principal:
+        targets += [
+            (float(elongation), 'principal_phase', phase)
+            for elongation, phase in PRINCIPAL_PHASE_ELONGATIONS.items()
+        ]
+    return sorted(targets)
 
-    aspect_time, aspect_name, planet_name = last_aspect_info
 
-    # Check if we're past the last aspect (VOC period)
-    is_void = dt >= aspect_time
+def iter_lunar_phase_events(
+    start_dt: datetime,
+    end_dt: Optional[datetime] = None,
+    include_boundaries: bool = True,
+    include_principal: bool = True
+) -> Iterator[LunarPhaseEvent]:
+    """
+    Génère les événements de phase exacts, dans l'ordre chronologique
 
-    return {
-        "is_void": is_void,
-        "void_start": aspect_time if is_void else None,
-        "void_end": next_sign_change if is_void else None,
-        "current_sign": current_sign,
-        "next_sign": next_sign,
-        "last_aspect": {
-            "time": aspect_time.isoformat(),
-            "type": aspect_name,
-            "with": planet_name
-        }
-    }
+    L'élongation Lune - Soleil croît de façon monotone (~12°/jour): chaque
+    événement est un passage de l'élongation par une valeur cible, résolu
+    par solve_moon_crossing (Newton sur la vitesse d'élongation). Les cibles
+    sont parcourues en cycle, sans échantillonnage de la plage.
+
+    Générateur paresseux: sans end_dt, la séquence est infinie (itertools.islice).
+
+    Args:
+        start_dt: Début (UTC), exclu si un événement tombe exactement dessus
+        end_dt: Fin (UTC, incluse), None pour ne pas borner
+        include_boundaries: Frontières des 8 phases (22.5° + 45°k)
+        include_principal: Phases principales exactes (0°, 90°, 180°, 270°)
+
+    Yields:
+        LunarPhaseEvent(time, kind, phase, elongation, moon_longitude, moon_sign)
+        kind = 'phase_boundary' (entrée dans `phase`) ou 'principal_phase'
+    """
+    targets = _lunar_phase_targets(include_boundaries, include_principal)
+    if not targets:
+        return
+
+    start_jd = datetime_to_julian_day(start_dt)
+    end_jd = datetime_to_julian_day(end_dt) if end_dt is not None else None
+
+    elongation, _ = _moon_separation_and_speed(start_jd, swe.SUN)
+    index = bisect_right([target[0] for target in targets], elongation) % len(targets)
+    jd = start_jd
+
+    while True:
+        target, kind, phase = targets[index]
+        event_jd = solve_moon_crossing(jd, target, swe.SUN)
+        if event_jd is None:
+            logger.warning(f"[LunarPhases] ⚠️ Newton n'a pas convergé (élongation {target}°, jd={jd:.5f})")
+            return
+        if end_jd is not None and event_jd > end_jd:
+            return
+
+        index = (index + 1) % len(targets)
+        if event_jd <= start_jd:
+            continue
+        jd = event_jd
+
+        moon_lon = get_moon_longitude(event_jd)
+        yield LunarPhaseEvent(
+            time=julian_day_to_datetime(event_jd),
+            kind=kind,
+            phase=phase,
+            elongation=target,
+            moon_longitude=round(moon_lon, 2),
+            moon_sign=degree_to_sign(moon_lon)
+        )
 
 
 def find_lunar_phase_changes(start_date: datetime, end_date: datetime) -> List[Dict[str, Any]]:
     """
-    Find all lunar phase changes in date range
+    Find all lunar phase changes in date range (exact boundary times)
 
     Args:
         start_date: Start datetime (UTC)
         end_date: End datetime (UTC)
 
     Returns:
-        List of phase change events:
+        List of phase change events (moment the Moon enters the phase):
         [
             {
                 "datetime": "2025-01-29T12:00:00Z",
@@ -640,28 +1171,29 @@ def find_lunar_phase_changes(start_date: datetime, end_date: datetime) -> List[D
             ...
         ]
     """
-    phase_changes = []
-    current_dt = start_date
-    step = timedelta(hours=1)
-
-    prev_phase = None
+    return [
+        {
+            "datetime": event.time.isoformat(),
+            "phase": event.phase,
+            "moon_longitude": event.moon_longitude,
+            "moon_sign": event.moon_sign
+        }
+        for event in iter_lunar_phase_events(start_date, end_date, include_principal=False)
+    ]
 
-    while current_dt <= end_date:
-        moon_pos = get_moon_position(current_dt)
 
-        if prev_phase and moon_pos.phase != prev_phase:
-            # Phase changed - record it
-            phase_changes.append({
-                "datetime": current_dt.isoformat(),
-                "phase": moon_pos.phase,
-                "moon_longitude": moon_pos.longitude,
-                "moon_sign": moon_pos.sign
-            })
+def find_principal_lunar_phases(start_date: datetime, end_date: datetime) -> List[LunarPhaseEvent]:
+    """
+    Exact New Moons, First Quarters, Full Moons and Last Quarters in date range
 
-        prev_phase = moon_pos.phase
-        current_dt += step
+    Args:
+        start_date: Start datetime (UTC)
+        end_date: End datetime (UTC)
 
-    return phase_changes
+    Returns:
+        List of LunarPhaseEvent (kind = 'principal_phase')
+    """
+    return list(iter_lunar_phase_events(start_date, end_date, include_boundaries=False))
 
 
 def get_lunar_mansion(moon_longitude: float) -> Dict[str, Any]:
@@ -823,7 +1355,8 @@ def get_planet_house(planet_longitude: float, house_cusps: List[float]) -> int:
 
 def calculate_all_aspects(
     planet_positions: Dict[str, float],
-    orb: float = 8.0
+    orb: float = 8.0,
+    orbs: Optional[Dict[str, float]] = None
 ) -> List[Dict[str, Any]]:
     """
     Calculate all aspects between planets.
@@ -832,6 +1365,8 @@ def calculate_all_aspects(
         planet_positions: Dict of planet name -> ecliptic longitude
             e.g., {"Moon": 45.5, "Sun": 120.3, "Mercury": 100.2}
         orb: Maximum orb for aspects (default 8°)
+        orbs: Maximum orb per aspect type, e.g. {"sextile": 6.0};
+            types not listed use orb
 
     Returns:
         List of aspects:
@@ -872,7 +1407,8 @@ def calculate_all_aspects(
             # Check against each aspect type
             for aspect_name, aspect_angle in aspect_types.items():
                 aspect_orb = abs(diff - aspect_angle)
-                if aspect_orb <= orb:
+                max_orb = orbs.get(aspect_name, orb) if orbs else orb
+                if aspect_orb <= max_orb:
                     aspects.append({
                         "planet1": p1,
                         "planet2": p2,
@@ -917,21 +1453,19 @@ def get_all_planet_positions(dt: datetime) -> Dict[str, Dict[str, Any]]:
         (swe.PLUTO, "Pluto"),
     ]
 
+    try:
+        batch = calc_positions_batch([jd], [planet_id for planet_id, _ in planets])[0]
+    except Exception as e:
+        logger.warning(f"[Planets] Erreur calcul positions: {e}")
+        return {}
+
     positions = {}
-    for planet_id, planet_name in planets:
-        try:
-            result = swe.calc_ut(jd, planet_id, swe.FLG_SWIEPH)
-            lon = result[0][0]
-            sign = degree_to_sign(lon)
-            degree_in_sign = lon % 30
-
-            positions[planet_name] = {
-                "longitude": round(lon, 2),
-                "sign": sign,
-                "degree": round(degree_in_sign, 2)
-            }
-        except Exception as e:
-            logger.warning(f"[Planets] Erreur calcul {planet_name}: {e}")
+    for (_, planet_name), (lon, _speed) in zip(planets, batch.tolist()):
+        positions[planet_name] = {
+            "longitude": round(lon, 2),
+            "sign": degree_to_sign(lon),
+            "degree": round(lon % 30, 2)
+        }
 
     return positions
 
@@ -1,6 +1,7 @@
 """
 Service de cache optimisé pour Void of Course (VoC) Status
-- Cache en mémoire avec TTL configurable
+- Cache en mémoire avec TTL configurable, un seul chargement DB à la fois
+  (single-flight) et stale-while-revalidate pour le status
 - Retry logic pour requêtes DB
 - Prévention des doublons
 - Performance optimisée pour requêtes fréquentes
@@ -10,19 +11,24 @@ import logging
 import time
 import asyncio
 from datetime import datetime, timedelta, timezone
-from typing import Dict, Any, Optional, List
+from typing import Dict, Any, Optional, List, Awaitable, Callable
 from functools import wraps
 
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select, and_
 from sqlalchemy.exc import SQLAlchemyError
 
+from database import detached_session
 from models.lunar_pack import LunarVocWindow
+from services.cache_backend import get_cache_backend
+from services.single_flight import SingleFlight, get_cached
+from services.swiss_ephemeris import find_void_of_course_windows
 
 logger = logging.getLogger(__name__)
 
 # Configuration cache
 VOC_STATUS_CACHE_TTL = 120  # 2 minutes (VoC change peu fréquemment)
+VOC_STATUS_STALE_TTL = 60   # status expiré encore servi pendant le rafraîchissement
 VOC_CURRENT_CACHE_TTL = 60   # 1 minute
 
 # Configuration retry logic
@@ -43,6 +49,10 @@ _VOC_CURRENT_CACHE: Dict[str, Any] = {
     "ttl": VOC_CURRENT_CACHE_TTL
 }
 
+# Un seul chargement DB en cours par cache (les requêtes concurrentes l'attendent)
+_VOC_STATUS_FLIGHT = SingleFlight("voc_status")
+_VOC_CURRENT_FLIGHT = SingleFlight("voc_current")
+
 
 def _with_db_retry(max_retries: int = MAX_DB_RETRIES):
     """
@@ -185,7 +195,9 @@ async def get_voc_status_cached(db: AsyncSession) -> Dict[str, Any]:
     """
     Récupère le VoC status complet (current, next, upcoming) avec cache.
 
-    Cache TTL: 2 minutes (VoC change peu fréquemment)
+    Cache TTL: 2 minutes (VoC change peu fréquemment), puis status expiré servi
+    VOC_STATUS_STALE_TTL secondes pendant un rafraîchissement en arrière-plan.
+    Les requêtes concurrentes d'un cache froid attendent la même lecture DB.
 
     Args:
         db: Session DB async
@@ -200,19 +212,32 @@ async def get_voc_status_cached(db: AsyncSession) -> Dict[str, Any]:
     Raises:
         Exception: Si erreur DB après retries
     """
-    global _VOC_STATUS_CACHE
+    return await get_cached(
+        _VOC_STATUS_CACHE,
+        _VOC_STATUS_FLIGHT,
+        lambda: _in_own_session(db, _load_voc_status),
+        stale_ttl=VOC_STATUS_STALE_TTL,
+        refresh=_refresh_voc_status,
+        shared=True
+    )
 
-    # Vérifier le cache
-    current_time = time.time()
-    if (
-        _VOC_STATUS_CACHE["data"] is not None
-        and (current_time - _VOC_STATUS_CACHE["timestamp"]) < _VOC_STATUS_CACHE["ttl"]
-    ):
-        cache_age = int(current_time - _VOC_STATUS_CACHE["timestamp"])
-        logger.info(f"[VoCStatus] ✅ Cache hit (age: {cache_age}s)")
-        return _VOC_STATUS_CACHE["data"]
-
-    # Cache miss - fetch from DB
+
+async def _in_own_session(db: AsyncSession, load: Callable[[AsyncSession], Awaitable[Any]]) -> Any:
+    """Calcul partagé dans sa propre session : il survit à l'annulation de la requête leader"""
+    async with detached_session(db) as session:
+        return await load(session)
+
+
+async def _refresh_voc_status() -> Dict[str, Any]:
+    """Rafraîchissement d'arrière-plan : session propre (celle de la requête est fermée)"""
+    from database import AsyncSessionLocal
+
+    async with AsyncSessionLocal() as db:
+        return await _load_voc_status(db)
+
+
+async def _load_voc_status(db: AsyncSession) -> Dict[str, Any]:
+    """Lit le VoC status en DB et met le cache à jour (un seul appel à la fois)"""
     logger.info("[VoCStatus] 🔄 Cache miss, fetching from DB")
 
     try:
@@ -270,7 +295,7 @@ async def get_voc_status_cached(db: AsyncSession) -> Dict[str, Any]:
 
         # Mettre à jour le cache
         _VOC_STATUS_CACHE["data"] = result
-        _VOC_STATUS_CACHE["timestamp"] = current_time
+        _VOC_STATUS_CACHE["timestamp"] = time.time()
 
         logger.info(f"[VoCStatus] 💾 Cache updated (current: {current_window is not None}, next: {next_window is not None})")
 
@@ -303,19 +328,13 @@ async def get_current_voc_cached(db: AsyncSession) -> Dict[str, Any]:
     Raises:
         Exception: Si erreur DB après retries
     """
-    global _VOC_CURRENT_CACHE
+    return await get_cached(
+        _VOC_CURRENT_CACHE, _VOC_CURRENT_FLIGHT, lambda: _in_own_session(db, _load_current_voc), shared=True
+    )
 
-    # Vérifier le cache
-    current_time = time.time()
-    if (
-        _VOC_CURRENT_CACHE["data"] is not None
-        and (current_time - _VOC_CURRENT_CACHE["timestamp"]) < _VOC_CURRENT_CACHE["ttl"]
-    ):
-        cache_age = int(current_time - _VOC_CURRENT_CACHE["timestamp"])
-        logger.info(f"[VoCCurrent] ✅ Cache hit (age: {cache_age}s)")
-        return _VOC_CURRENT_CACHE["data"]
-
-    # Cache miss - fetch from DB
+
+async def _load_current_voc(db: AsyncSession) -> Dict[str, Any]:
+    """Lit le VoC actuel en DB et met le cache à jour (un seul appel à la fois)"""
     logger.info("[VoCCurrent] 🔄 Cache miss, fetching from DB")
 
     try:
@@ -338,7 +357,7 @@ async def get_current_voc_cached(db: AsyncSession) -> Dict[str, Any]:
 
         # Mettre à jour le cache
         _VOC_CURRENT_CACHE["data"] = result
-        _VOC_CURRENT_CACHE["timestamp"] = current_time
+        _VOC_CURRENT_CACHE["timestamp"] = time.time()
 
         logger.info(f"[VoCCurrent] 💾 Cache updated (is_active: {result['is_active']})")
 
@@ -413,7 +432,7 @@ async def save_voc_window_safe(
             logger.info(f"💾 New VoC window saved: {start_at} -> {end_at}")
 
             # Invalider le cache après insertion
-            clear_cache()
+            await invalidate_cache()
 
             return voc_window
 
@@ -426,8 +445,73 @@ async def save_voc_window_safe(
         raise
 
 
+async def populate_voc_windows_from_ephemeris(
+    db: AsyncSession,
+    start_at: Optional[datetime] = None,
+    days: int = 90
+) -> int:
+    """
+    Calcule les fenêtres VoC exactes avec Swiss Ephemeris et les sauvegarde en DB.
+
+    Pas d'appel RapidAPI: les fenêtres viennent de find_void_of_course_windows
+    (dernier aspect exact → ingress exact), dédupliquées par save_voc_window_safe.
+
+    Args:
+        db: Session DB async
+        start_at: Début de la plage (défaut: maintenant UTC)
+        days: Nombre de jours à couvrir
+
+    Returns:
+        Nombre de fenêtres calculées
+    """
+    start_at = start_at or datetime.now(timezone.utc)
+    end_at = start_at + timedelta(days=days)
+
+    windows = find_void_of_course_windows(start_at, end_at)
+
+    for window in windows:
+        await save_voc_window_safe(
+            db=db,
+            start_at=window.start_time,
+            end_at=window.end_time,
+            source={
+                "provider": "swiss_ephemeris",
+                "from_sign": window.from_sign,
+                "to_sign": window.to_sign,
+                "last_aspect": window.last_aspect
+            }
+        )
+
+    logger.info(
+        f"[VoCPopulate] 🌑 {len(windows)} fenêtres VoC calculées "
+        f"({start_at.date()} → {end_at.date()})"
+    )
+    return len(windows)
+
+
 def clear_cache():
     """Invalide tous les caches VoC (utile après mise à jour DB ou pour tests)"""
+    _clear_process_caches()
+
+    backend = get_cache_backend()
+    backend.delete_namespace(_VOC_STATUS_FLIGHT.name)
+    backend.delete_namespace(_VOC_CURRENT_FLIGHT.name)
+
+    logger.info("[VoCCache] 🗑️  All caches cleared")
+
+
+async def invalidate_cache():
+    """clear_cache depuis l'event loop (cache partagé interrogé hors de la loop)"""
+    _clear_process_caches()
+
+    backend = get_cache_backend()
+    await backend.adelete_namespace(_VOC_STATUS_FLIGHT.name)
+    await backend.adelete_namespace(_VOC_CURRENT_FLIGHT.name)
+
+    logger.info("[VoCCache] 🗑️  All caches cleared")
+
+
+def _clear_process_caches():
     global _VOC_STATUS_CACHE, _VOC_CURRENT_CACHE
 
     _VOC_STATUS_CACHE["data"] = None
@@ -436,17 +520,16 @@ def clear_cache():
     _VOC_CURRENT_CACHE["data"] = None
     _VOC_CURRENT_CACHE["timestamp"] = 0
 
-    logger.info("[VoCCache] 🗑️  All caches cleared")
-
 
-def get_cache_stats() -> Dict[str, Any]:
+async def get_cache_stats() -> Dict[str, Any]:
     """
     Retourne les statistiques des caches VoC (pour monitoring).
 
     Returns:
         {
             "voc_status": {"has_data": bool, "age_seconds": int, "ttl": int},
-            "voc_current": {"has_data": bool, "age_seconds": int, "ttl": int}
+            "voc_current": {"has_data": bool, "age_seconds": int, "ttl": int},
+            "shared": {"backend": str, "entries": int, "namespaces": {...}}  # tous workers
         }
     """
     current_time = time.time()
@@ -463,5 +546,6 @@ def get_cache_stats() -> Dict[str, Any]:
             "age_seconds": int(current_time - _VOC_CURRENT_CACHE["timestamp"])
                 if _VOC_CURRENT_CACHE["timestamp"] > 0 else None,
             "ttl": _VOC_CURRENT_CACHE["ttl"]
-        }
+        },
+        "shared": await get_cache_backend().astats()
     }
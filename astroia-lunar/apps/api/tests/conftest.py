@@ -279,6 +279,10 @@ class FakeAsyncSession:
             # Générer un id simple basé sur l'index
             obj.id = len(self._added_objects) + 1
         self._added_objects.append(obj)
+
+    def add_all(self, objs):
+        for obj in objs:
+            self.add(obj)
     
     def refresh(self, obj):
         pass  # No-op pour les tests
@@ -298,6 +302,10 @@ class FakeAsyncSession:
             async def commit(self):
                 """No-op pour les tests"""
                 pass
+
+            async def rollback(self):
+                """No-op pour les tests"""
+                pass
         
         return FakeNestedTransaction()
     
@@ -520,3 +528,96 @@ def clear_interpretation_cache_between_tests():
     except ImportError:
         pass
 
+
+@pytest.fixture(autouse=True, scope="function")
+def fresh_shared_cache_backend():
+    """
+    Cache partagé entre workers (services/cache_backend) neuf pour chaque test :
+    les tests qui remettent un cache dict à zéro ne reprennent pas la valeur
+    publiée par un test précédent.
+    """
+    from services.cache_backend import set_cache_backend
+
+    set_cache_backend(None)
+    yield
+    set_cache_backend(None)
+
+
+@pytest.fixture(autouse=True)
+def fresh_rapidapi_response_cache():
+    """
+    Cache des réponses RapidAPI en mémoire et vide pour chaque test
+    (jamais le fichier SQLite persistant de data/cache)
+    """
+    from services import rapidapi_cache
+    from services.cache_backend import MemoryCacheBackend
+
+    rapidapi_cache.set_response_cache(MemoryCacheBackend())
+    rapidapi_cache.clear_cache()
+    yield
+    rapidapi_cache.set_response_cache(None)
+
+
+@pytest.fixture(autouse=True)
+def fresh_lunar_generation_cache():
+    """Générations lunaires partagées et compteurs vidés : aucun texte réutilisé d'un test à l'autre"""
+    from services import lunar_generation_cache
+
+    lunar_generation_cache.clear_cache()
+    yield
+    lunar_generation_cache.clear_cache()
+
+
+@pytest.fixture(autouse=True)
+def fresh_http_provider_state():
+    """
+    Circuits refermés et débit remis à zéro : les échecs et appels simulés
+    d'un test n'ouvrent pas le circuit ni ne ralentissent le suivant
+    """
+    from services import http_client
+
+    http_client.reset_provider_state()
+    yield
+    http_client.reset_provider_state()
+
+
+@pytest.fixture(autouse=True)
+def fresh_llm_gateway_state():
+    """Débit LLM remis à zéro et client Anthropic partagé oublié entre les tests"""
+    from services import llm_gateway
+
+    llm_gateway.reset_gateway_state()
+    yield
+    llm_gateway.reset_gateway_state()
+    llm_gateway.set_client(None)
+
+
+@pytest.fixture(autouse=True)
+def fresh_auth_principal_cache():
+    """Principals authentifiés vidés : chaque test recrée ses users (mêmes ids)"""
+    from services import auth_principal
+
+    auth_principal.clear_cache()
+    yield
+    auth_principal.clear_cache()
+
+
+# ============================================================================
+# POOL SWISS EPHEMERIS
+# ============================================================================
+
+@pytest.fixture(autouse=True, scope="session")
+def inline_ephemeris_executor():
+    """
+    Les tests exécutent les calculs Swiss Ephemeris via asyncio.to_thread
+    (pas de pool de processus spawn à chaque session de test).
+    tests/test_ephemeris_executor.py démarre explicitement un vrai pool.
+    """
+    from config import settings
+    from services.ephemeris_executor import shutdown_ephemeris_executor
+
+    pool_size = settings.EPHEMERIS_POOL_SIZE
+    settings.EPHEMERIS_POOL_SIZE = 0
+    yield
+    shutdown_ephemeris_executor()
+    settings.EPHEMERIS_POOL_SIZE = pool_size
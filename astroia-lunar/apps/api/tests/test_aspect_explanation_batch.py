@@ -0,0 +1,111 @@
+"""
+Tests du chargement groupé des interprétations d'aspects (enrich_aspects_v4_async)
+"""
+
+import uuid
+from unittest.mock import patch
+
+import pytest
+
+from models.pregenerated_natal_aspect import PregeneratedNatalAspect
+from services import aspect_explanation_service
+from services.aspect_explanation_service import (
+    enrich_aspects_v4_async,
+    load_pregenerated_aspect_interpretations_batch,
+    parse_markdown_to_copy,
+)
+
+MARKDOWN_V5 = """# ☌ Conjonction Soleil - Vénus
+**En une phrase :** Charme solaire.
+
+## L'énergie de cet aspect
+Tu rayonnes. Les autres le sentent.
+
+## Conseil pratique
+Assume ton goût.
+"""
+
+MARKDOWN_V2 = """# △ Trigone Lune - Mars
+**En une phrase :** Émotions vives.
+
+## Ton potentiel
+Réactivité.
+"""
+
+PLANETS = {
+    'sun': {'sign': 'Aries', 'house': 1, 'longitude': 15.5},
+    'venus': {'sign': 'Aries', 'house': 1, 'longitude': 18.0},
+    'moon': {'sign': 'Leo', 'house': 5, 'longitude': 130.0},
+    'mars': {'sign': 'Sagittarius', 'house': 9, 'longitude': 251.0},
+    'jupiter': {'sign': 'Libra', 'house': 7, 'longitude': 195.0},
+    'saturn': {'sign': 'Capricorn', 'house': 10, 'longitude': 285.0},
+}
+
+ASPECTS = [
+    {'planet1': 'venus', 'planet2': 'sun', 'type': 'conjunction', 'orb': 2.5},
+    {'planet1': 'moon', 'planet2': 'mars', 'type': 'trine', 'orb': 1.0},
+    {'planet1': 'jupiter', 'planet2': 'saturn', 'type': 'square', 'orb': 0.5},
+]
+
+
+def _aspect_row(planet1, planet2, aspect_type, version, content):
+    return PregeneratedNatalAspect(
+        id=str(uuid.uuid4()), planet1=planet1, planet2=planet2, aspect_type=aspect_type,
+        version=version, lang='fr', content=content, length=len(content)
+    )
+
+
+@pytest.fixture
+async def seeded_db(test_db):
+    test_db.add_all([
+        _aspect_row("sun", "venus", "conjunction", 5, MARKDOWN_V5),
+        _aspect_row("sun", "venus", "conjunction", 2, "ancienne version"),
+        _aspect_row("mars", "moon", "trine", 2, MARKDOWN_V2),
+    ])
+    await test_db.commit()
+    return test_db
+
+
+@pytest.mark.asyncio
+async def test_enrich_issues_a_single_query(seeded_db):
+    with patch.object(seeded_db, 'execute', wraps=seeded_db.execute) as spy:
+        enriched = await enrich_aspects_v4_async(ASPECTS, PLANETS, seeded_db, limit=100, version=5)
+
+    assert spy.call_count == 1
+    copies = {(a['planet1'], a['planet2']): a['copy'] for a in enriched}
+    # v5 trouvé, fallback v4, puis templates
+    assert copies[('venus', 'sun')]['summary'] == "Charme solaire."
+    assert copies[('moon', 'mars')]['summary'] == "Émotions vives."
+    assert copies[('jupiter', 'saturn')]['summary'] != ""
+
+
+@pytest.mark.asyncio
+async def test_batch_results_are_kept_in_store(seeded_db):
+    keys = [("sun", "venus", "conjunction"), ("mars", "moon", "trine")]
+
+    first = await load_pregenerated_aspect_interpretations_batch(keys, seeded_db, versions=(5, 2))
+    with patch.object(seeded_db, 'execute', wraps=seeded_db.execute) as spy:
+        second = await load_pregenerated_aspect_interpretations_batch(keys[:1], seeded_db, versions=(5, 2))
+
+    assert first == {
+        ("sun", "venus", "conjunction", 5): MARKDOWN_V5,
+        ("sun", "venus", "conjunction", 2): "ancienne version",
+        ("mars", "moon", "trine", 2): MARKDOWN_V2,
+    }
+    assert second == {
+        ("sun", "venus", "conjunction", 5): MARKDOWN_V5,
+        ("sun", "venus", "conjunction", 2): "ancienne version",
+    }
+    spy.assert_not_called()
+
+
+def test_parse_markdown_is_memoized_and_returns_fresh_dicts():
+    aspect_explanation_service._parse_markdown_to_copy.cache_clear()
+
+    first = parse_markdown_to_copy(MARKDOWN_V5)
+    first['why'].append("modifié par l'appelant")
+    second = parse_markdown_to_copy(MARKDOWN_V5)
+
+    assert aspect_explanation_service._parse_markdown_to_copy.cache_info().hits == 1
+    assert second['why'] == ["Tu rayonnes.", "Les autres le sentent."]
+    assert first is not second
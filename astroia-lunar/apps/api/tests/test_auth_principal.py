@@ -0,0 +1,132 @@
+"""
+Tests du principal authentifié (services/auth_principal, routes/auth.get_current_user)
+"""
+
+from datetime import date, time as dtime
+from unittest.mock import patch
+
+import pytest
+from sqlalchemy import select
+
+from conftest import TestSessionLocal
+from models.natal_chart import NatalChart
+from models.user import User
+from routes.auth import create_access_token
+from services import auth_principal
+from services.auth_principal import UserPrincipal, natal_moon_longitude, resolve_principal
+
+
+def _auth(user_id: int) -> dict:
+    return {"Authorization": f"Bearer {create_access_token({'sub': str(user_id)})}"}
+
+
+async def _add_natal_chart(user_id: int, moon_sign: str = "Taurus", moon_degree: float = 12.5) -> NatalChart:
+    async with TestSessionLocal() as session:
+        chart = NatalChart(
+            id="00000000-0000-0000-0000-000000000001",
+            user_id=user_id,
+            birth_date=date(1990, 1, 1),
+            birth_time=dtime(12, 0),
+            birth_place="Paris",
+            latitude=48.8566,
+            longitude=2.3522,
+            timezone="Europe/Paris",
+            positions={"moon": {"sign": moon_sign, "degree": moon_degree, "house": 4}, "planets": {}},
+        )
+        session.add(chart)
+        await session.commit()
+        return chart
+
+
+def test_natal_moon_longitude_from_positions():
+    assert natal_moon_longitude({"sign": "Taurus", "degree": 12.5}) == 42.5
+    assert natal_moon_longitude({"sign": "Taurus"}) is None
+    assert natal_moon_longitude({"sign": "Nowhere", "degree": 1}) is None
+    assert natal_moon_longitude(None) is None
+
+
+@pytest.mark.asyncio
+async def test_principal_is_slim_and_includes_natal_moon(setup_test_db):
+    await _add_natal_chart(1)
+
+    async with TestSessionLocal() as session:
+        principal = await resolve_principal(session, 1)
+
+    assert principal == UserPrincipal(
+        id=1,
+        email="test1@test.com",
+        natal_chart_id="00000000-0000-0000-0000-000000000001",
+        natal_moon_longitude=42.5,
+    )
+    assert principal.has_natal_chart
+
+
+@pytest.mark.asyncio
+async def test_principal_is_cached_until_ttl(setup_test_db):
+    async with TestSessionLocal() as session:
+        first = await resolve_principal(session, 2)
+        with patch('services.auth_principal.load_principal') as load:
+            second = await resolve_principal(session, 2)
+
+    load.assert_not_called()
+    assert second is first
+    assert auth_principal.get_cache_stats()["hits"] == 1
+
+    with patch('services.auth_principal.settings.AUTH_PRINCIPAL_CACHE_TTL_SECONDS', 0):
+        auth_principal.clear_cache()
+        async with TestSessionLocal() as session:
+            await resolve_principal(session, 2)
+    assert auth_principal.get_cache_stats()["size"] == 0
+
+
+@pytest.mark.asyncio
+async def test_cache_is_size_bounded(setup_test_db):
+    with patch('services.auth_principal.settings.AUTH_PRINCIPAL_CACHE_MAX_ENTRIES', 2):
+        async with TestSessionLocal() as session:
+            for user_id in (1, 2, 3):
+                await resolve_principal(session, user_id)
+
+    assert auth_principal.get_cached_principal(1) is None
+    assert auth_principal.get_cached_principal(3) is not None
+
+
+@pytest.mark.asyncio
+async def test_user_and_natal_chart_writes_invalidate_principal(setup_test_db):
+    async with TestSessionLocal() as session:
+        assert (await resolve_principal(session, 3)).natal_chart_id is None
+
+    await _add_natal_chart(3)
+    assert auth_principal.get_cached_principal(3) is None
+
+    async with TestSessionLocal() as session:
+        assert (await resolve_principal(session, 3)).natal_moon_longitude == 42.5
+
+        user = (await session.execute(select(User).where(User.id == 3))).scalar_one()
+        user.is_premium = True
+        await session.commit()
+
+    assert auth_principal.get_cached_principal(3) is None
+    async with TestSessionLocal() as session:
+        assert (await resolve_principal(session, 3)).is_premium is True
+
+
+@pytest.mark.asyncio
+async def test_get_current_user_uses_cached_principal(test_client):
+    response = await test_client.get("/api/auth/me", headers=_auth(4))
+    assert response.status_code == 200
+    assert response.json()["email"] == "test4@test.com"
+    assert response.json()["birth_place_name"] == "Paris, France"
+
+    with patch('services.auth_principal.load_principal') as load:
+        response = await test_client.get("/api/auth/me", headers=_auth(4))
+
+    load.assert_not_called()
+    assert response.status_code == 200
+
+
+@pytest.mark.asyncio
+async def test_unknown_user_is_rejected_and_not_cached(test_client):
+    response = await test_client.get("/api/auth/me", headers=_auth(999))
+
+    assert response.status_code == 401
+    assert auth_principal.get_cached_principal(999) is None
@@ -0,0 +1,152 @@
+"""
+Tests pour services/cache_backend (cache partagé entre workers)
+"""
+
+import threading
+import time
+
+import pytest
+
+from services import daily_climate
+from services.cache_backend import (
+    CacheBackend,
+    MemoryCacheBackend,
+    SQLiteCacheBackend,
+    create_cache_backend,
+    set_cache_backend,
+)
+from services.single_flight import SingleFlight, get_cached
+
+
+def test_memory_backend_evicts_least_recently_used():
+    backend = MemoryCacheBackend(max_entries=2)
+    backend.set("ns:a", {"v": 1}, ttl=60)
+    backend.set("ns:b", {"v": 2}, ttl=60)
+    assert backend.get("ns:a").value == {"v": 1}  # a devient le plus récent
+
+    backend.set("ns:c", {"v": 3}, ttl=60)
+
+    assert backend.get("ns:b") is None
+    assert backend.get("ns:a").value == {"v": 1}
+    assert backend.get("ns:c").value == {"v": 3}
+
+
+def test_memory_backend_expires_entries_and_returns_copies():
+    backend = MemoryCacheBackend()
+    backend.set("ns:old", {"v": 1}, ttl=10, stored_at=time.time() - 20)
+    backend.set("ns:new", {"items": [1]}, ttl=10)
+
+    assert backend.get("ns:old") is None
+    backend.get("ns:new").value["items"].append(2)
+    assert backend.get("ns:new").value == {"items": [1]}
+
+
+def test_sqlite_backend_is_shared_and_aggregates_stats(tmp_path):
+    path = str(tmp_path / "cache.sqlite3")
+    worker_a = SQLiteCacheBackend(path)
+    worker_b = SQLiteCacheBackend(path)
+
+    stored_at = time.time() - 5
+    worker_a.set("voc_status:default", {"now": None}, ttl=60, stored_at=stored_at)
+    entry = worker_b.get("voc_status:default")
+    assert entry.value == {"now": None}
+    assert entry.stored_at == pytest.approx(stored_at)
+    assert worker_b.get("voc_status:other") is None
+
+    worker_a.close()  # pousse les compteurs de A
+    stats = worker_b.stats()
+    assert stats["backend"] == "sqlite"
+    assert stats["entries"] == 1
+    assert stats["namespaces"]["voc_status"] == {"hits": 1, "misses": 1, "sets": 1, "hit_rate": 0.5}
+
+    worker_b.delete_namespace("voc_status")
+    assert worker_a.get("voc_status:default") is None
+    worker_a.close()
+    worker_b.close()
+
+
+def test_incomplete_backend_fails_at_instantiation():
+    class NoStats(CacheBackend):
+        def _get(self, key, now): return None
+        def _set(self, key, payload, stored_at, expires_at): pass
+        def _delete(self, key): pass
+        def _delete_namespace(self, namespace): pass
+        def _clear(self): pass
+        def _flush_stats(self, pending): pass
+
+    with pytest.raises(TypeError):
+        NoStats()
+
+
+@pytest.mark.asyncio
+async def test_async_api_runs_blocking_backends_off_the_event_loop(tmp_path, monkeypatch):
+    backend = SQLiteCacheBackend(str(tmp_path / "cache.sqlite3"))
+    threads = []
+    original_get = SQLiteCacheBackend._get
+
+    def recording_get(self, key, now):
+        threads.append(threading.get_ident())
+        return original_get(self, key, now)
+
+    monkeypatch.setattr(SQLiteCacheBackend, "_get", recording_get)
+
+    await backend.aset("ns:a", {"v": 1}, ttl=60)
+    assert (await backend.aget("ns:a")).value == {"v": 1}
+    assert threads and threading.get_ident() not in threads
+    assert (await backend.astats())["entries"] == 1
+
+    await backend.adelete_namespace("ns")
+    assert await backend.aget("ns:a") is None
+    backend.close()
+
+
+def test_unknown_or_unavailable_backend_falls_back_to_memory():
+    assert isinstance(create_cache_backend("memcached"), MemoryCacheBackend)
+    assert create_cache_backend("redis").name in ("redis", "memory")
+
+
+@pytest.mark.asyncio
+async def test_get_cached_adopts_value_published_by_another_worker(tmp_path):
+    path = str(tmp_path / "cache.sqlite3")
+    flight = SingleFlight("test_shared")
+
+    # Worker A calcule et publie
+    set_cache_backend(SQLiteCacheBackend(path))
+    cache_a = {"data": None, "timestamp": 0, "ttl": 60}
+
+    async def compute_a():
+        cache_a["data"] = {"v": "A"}
+        cache_a["timestamp"] = time.time()
+        return cache_a["data"]
+
+    assert await get_cached(cache_a, flight, compute_a, shared=True) == {"v": "A"}
+
+    # Worker B (cache froid) reprend la valeur sans recalculer
+    set_cache_backend(SQLiteCacheBackend(path))
+    cache_b = {"data": None, "timestamp": 0, "ttl": 60}
+
+    async def compute_b():
+        raise AssertionError("la valeur partagée doit être reprise")
+
+    assert await get_cached(cache_b, flight, compute_b, shared=True) == {"v": "A"}
+    assert cache_b["timestamp"] == pytest.approx(cache_a["timestamp"])
+
+
+def test_daily_climate_is_reused_from_shared_cache(monkeypatch):
+    calls = []
+
+    def fake_moon_position():
+        calls.append(1)
+        return {"sign": "Leo", "degree": 130.0, "phase": "Pleine Lune"}
+
+    monkeypatch.setattr(daily_climate, "get_current_moon_position", fake_moon_position)
+    daily_climate.clear_cache()
+    first = daily_climate.get_daily_climate()
+
+    # Autre worker : cache du process vide, cache partagé rempli
+    daily_climate._CACHE["date"] = None
+    daily_climate._CACHE["data"] = None
+
+    assert daily_climate.get_daily_climate() == first
+    assert len(calls) == 1
+    daily_climate.clear_cache()
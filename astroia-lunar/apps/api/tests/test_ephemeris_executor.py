@@ -0,0 +1,125 @@
+"""
+Tests pour services/ephemeris_executor (calculs Swiss Ephemeris hors event loop)
+"""
+
+import asyncio
+import os
+import time
+from datetime import datetime, timezone
+
+import pytest
+
+from services import ephemeris_executor, moon_position
+from services.ephemeris_executor import (
+    calculate_houses_async,
+    ephemeris_executor_tasks_total,
+    find_lunar_return_async,
+    get_current_moon_position_async,
+    run_ephemeris,
+)
+from services.swiss_ephemeris import calculate_houses, find_lunar_return
+
+
+def _slow_task(seconds: float) -> int:
+    time.sleep(seconds)
+    return os.getpid()
+
+
+def _failing_task():
+    raise ValueError("boom")
+
+
+def _errors(function: str) -> float:
+    return ephemeris_executor_tasks_total.labels(function=function, status="error")._value.get()
+
+
+@pytest.fixture
+def process_pool(monkeypatch):
+    monkeypatch.setattr(ephemeris_executor.settings, "EPHEMERIS_POOL_SIZE", 1)
+    yield
+    ephemeris_executor.shutdown_ephemeris_executor()
+
+
+@pytest.mark.asyncio
+async def test_facades_match_sync_functions():
+    start = datetime(2026, 3, 1, tzinfo=timezone.utc)
+
+    assert await find_lunar_return_async(120.0, start, 31 * 24) == find_lunar_return(120.0, start, 31 * 24)
+    assert await calculate_houses_async(start, 48.85, 2.35) == calculate_houses(start, 48.85, 2.35)
+
+
+@pytest.mark.asyncio
+async def test_event_loop_stays_responsive():
+    """Le calcul tourne hors de l'event loop : les autres coroutines avancent"""
+    ticks = []
+
+    async def ticker():
+        for _ in range(5):
+            ticks.append(time.perf_counter())
+            await asyncio.sleep(0.01)
+
+    await asyncio.gather(run_ephemeris(_slow_task, 0.2), ticker())
+    assert len(ticks) == 5
+    assert ticks[-1] - ticks[0] < 0.15
+
+
+@pytest.mark.asyncio
+async def test_back_pressure_limits_in_flight(monkeypatch):
+    monkeypatch.setattr(ephemeris_executor.settings, "EPHEMERIS_POOL_MAX_IN_FLIGHT", 2)
+    monkeypatch.setattr(ephemeris_executor, "_SEMAPHORE", None)
+
+    peaks = []
+
+    async def observe():
+        for _ in range(10):
+            peaks.append((
+                ephemeris_executor.ephemeris_executor_in_flight._value.get(),
+                ephemeris_executor.ephemeris_executor_queue_depth._value.get(),
+            ))
+            await asyncio.sleep(0.01)
+
+    await asyncio.gather(*(run_ephemeris(_slow_task, 0.05) for _ in range(5)), observe())
+
+    assert max(in_flight for in_flight, _ in peaks) == 2
+    assert max(queued for _, queued in peaks) >= 1
+    assert ephemeris_executor.ephemeris_executor_in_flight._value.get() == 0
+    assert ephemeris_executor.ephemeris_executor_queue_depth._value.get() == 0
+
+
+@pytest.mark.asyncio
+async def test_errors_are_propagated_and_counted():
+    before = _errors("_failing_task")
+
+    with pytest.raises(ValueError):
+        await run_ephemeris(_failing_task)
+
+    assert _errors("_failing_task") == before + 1
+
+
+@pytest.mark.asyncio
+async def test_moon_position_cache_stays_in_api_process(monkeypatch):
+    moon_position.clear_cache()
+    calls = []
+
+    async def counting_run(fn, *args, **kwargs):
+        calls.append(fn.__name__)
+        return fn(*args, **kwargs)
+
+    monkeypatch.setattr(ephemeris_executor, "run_ephemeris", counting_run)
+
+    first = await get_current_moon_position_async()
+    second = await get_current_moon_position_async()
+
+    assert first == second
+    assert calls == ["compute_current_moon_position"]
+    assert moon_position.get_cached_moon_position() == first
+    moon_position.clear_cache()
+
+
+@pytest.mark.asyncio
+async def test_process_pool_runs_in_warm_worker(process_pool):
+    pid = await run_ephemeris(_slow_task, 0)
+    assert pid != os.getpid()
+
+    start = datetime(2026, 5, 1, tzinfo=timezone.utc)
+    assert await find_lunar_return_async(42.0, start, 31 * 24) == find_lunar_return(42.0, start, 31 * 24)
@@ -0,0 +1,122 @@
+"""
+Validation des tables d'éphémérides précalculées (services/ephemeris_tables)
+- Interpolation Hermite vs swe.calc_ut (< 1")
+- Lecture memory-mapped
+- Branchement dans swiss_ephemeris (table si couverte, pyswisseph sinon)
+"""
+
+import json
+
+import numpy as np
+import pytest
+
+from services import ephemeris_tables, swiss_ephemeris
+from services.ephemeris_tables import EphemerisTable, build_ephemeris_table, validate_table
+
+swe = ephemeris_tables.swe
+
+# 2026-01-01 → 2026-03-02, Lune + Soleil + Mercure (rétrogradation en février-mars 2026)
+START_JD = 2461041.5
+END_JD = START_JD + 60
+BODIES = [swe.MOON, swe.SUN, swe.MERCURY]
+
+
+@pytest.fixture(scope="module")
+def table(tmp_path_factory):
+    path = tmp_path_factory.mktemp("ephemeris") / "table.npy"
+    return build_ephemeris_table(path, BODIES, START_JD, END_JD, 1 / 24)
+
+
+@pytest.fixture
+def default_table(table):
+    ephemeris_tables.set_default_table(table)
+    yield table
+    ephemeris_tables.reset_default_table()
+
+
+def test_table_is_memory_mapped(table):
+    assert isinstance(table.data, np.memmap)
+    assert not table.data.flags.writeable
+    assert table.data.shape == (60 * 24 + 1, 3, 2)
+    assert table.end_jd == pytest.approx(END_JD)
+
+
+def test_table_matches_calc_ut_to_the_arcsecond(table):
+    """Validation contre swe.calc_ut sur 500 instants aléatoires"""
+    report = validate_table(table, samples=500, seed=7)
+
+    for body in BODIES:
+        assert report[body]["max_longitude_arcsec"] < 1.0
+        assert report[body]["max_speed_error"] < 1e-3
+
+
+def test_scalar_and_vector_paths_agree(table):
+    jds = np.linspace(START_JD + 0.01, END_JD - 0.01, 97)
+    positions = table.positions(jds, [swe.SUN, swe.MOON])
+
+    for i, jd in enumerate(jds):
+        assert table.position(jd, swe.MOON) == pytest.approx(tuple(positions[i, 1]), abs=1e-9)
+        assert table.position(jd, swe.SUN) == pytest.approx(tuple(positions[i, 0]), abs=1e-9)
+
+
+def test_interpolation_across_zero_aries(table):
+    """Le passage 360° → 0° ne casse pas l'interpolation"""
+    jds = np.linspace(START_JD, END_JD, 60 * 24 * 4)
+    moon = table.positions(jds, [swe.MOON])[:, 0, 0]
+    wraps = np.flatnonzero(np.diff(moon) < -300)
+    assert wraps.size > 0
+
+    for i in wraps:
+        for jd in (jds[i], jds[i + 1]):
+            expected = swe.calc_ut(float(jd), swe.MOON, swe.FLG_SWIEPH)[0][0]
+            assert abs(swiss_ephemeris.angle_diff_signed(table.position(jd, swe.MOON)[0], expected)) < 1 / 3600
+
+
+def test_load_reads_metadata(table, tmp_path):
+    path = tmp_path / "copy.npy"
+    np.save(path, np.asarray(table.data))
+    ephemeris_tables._metadata_path(path).write_text(
+        json.dumps({"start_jd": START_JD, "step_days": 1 / 24, "bodies": BODIES})
+    )
+
+    loaded = EphemerisTable.load(path)
+    assert loaded.bodies == tuple(BODIES)
+    assert loaded.can_serve(START_JD, END_JD, [swe.MOON])
+    assert not loaded.can_serve(START_JD, END_JD + 1, [swe.MOON])
+    assert not loaded.can_serve(START_JD, END_JD, [swe.MARS])
+
+
+def test_swiss_ephemeris_served_from_table(default_table, monkeypatch):
+    """Dans la plage de la table, aucun appel pyswisseph"""
+    def no_calc_ut(*args, **kwargs):
+        raise AssertionError("calc_ut ne doit pas être appelé")
+
+    monkeypatch.setattr(swiss_ephemeris.swe, "calc_ut", no_calc_ut)
+
+    jds = np.linspace(START_JD + 1, START_JD + 2, 10)
+    positions = swiss_ephemeris.calc_positions_batch(jds, [swe.MOON, swe.SUN])
+    assert positions.shape == (10, 2, 2)
+    assert swiss_ephemeris.get_moon_longitude(START_JD + 1.5) == pytest.approx(
+        default_table.position(START_JD + 1.5, swe.MOON)[0]
+    )
+
+
+def test_swiss_ephemeris_falls_back_outside_table(default_table):
+    """Hors plage ou corps absent : calcul direct pyswisseph"""
+    jd = END_JD + 10
+    expected = swe.calc_ut(jd, swe.MOON, swe.FLG_SWIEPH | swe.FLG_SPEED)[0]
+    assert swiss_ephemeris.get_body_longitude_and_speed(jd, swe.MOON) == (expected[0], expected[3])
+
+    jd = START_JD + 5
+    expected = swe.calc_ut(jd, swe.MARS, swe.FLG_SWIEPH | swe.FLG_SPEED)[0]
+    positions = swiss_ephemeris.calc_positions_batch([jd], [swe.MOON, swe.MARS])
+    assert positions[0, 1, 0] == expected[0]
+
+
+def test_default_table_missing_file(monkeypatch, tmp_path):
+    monkeypatch.setattr(ephemeris_tables.settings, "EPHEMERIS_TABLE_PATH", str(tmp_path / "absent.npy"))
+    ephemeris_tables.reset_default_table()
+    try:
+        assert ephemeris_tables.get_default_table() is None
+    finally:
+        ephemeris_tables.reset_default_table()
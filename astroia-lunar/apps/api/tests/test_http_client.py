@@ -0,0 +1,176 @@
+"""
+Tests pour services/http_client (client sortant partagé, circuit breaker, débit)
+"""
+
+import asyncio
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import httpx
+import pytest
+from fastapi import HTTPException
+
+from services import http_client, rapidapi_client
+from services.http_client import CircuitBreaker, CircuitOpenError, TokenBucket
+
+
+def _response(status):
+    response = MagicMock()
+    response.status_code = status
+    response.text = f"HTTP {status}"
+    response.json.return_value = {"message": f"HTTP {status}"}
+    if status >= 400:
+        response.raise_for_status.side_effect = httpx.HTTPStatusError(
+            str(status), request=MagicMock(), response=response
+        )
+    return response
+
+
+def test_breaker_opens_after_threshold_then_half_opens():
+    breaker = CircuitBreaker("test", failure_threshold=2, reset_seconds=30)
+    breaker.record_failure()
+    breaker.before_request()
+    breaker.record_failure()
+
+    assert breaker.state == "open"
+    with pytest.raises(CircuitOpenError):
+        breaker.before_request()
+
+    breaker.opened_at -= 31
+    breaker.before_request()
+    assert breaker.state == "half_open"
+    with pytest.raises(CircuitOpenError):
+        breaker.before_request()  # Un seul appel d'essai à la fois
+
+    breaker.record_success()
+    assert breaker.state == "closed"
+
+
+def test_failed_trial_reopens_breaker():
+    breaker = CircuitBreaker("test", failure_threshold=1, reset_seconds=30)
+    breaker.record_failure()
+    breaker.opened_at -= 31
+    breaker.before_request()
+    breaker.record_failure()
+
+    assert breaker.state == "open"
+
+
+def test_cancelled_non_trial_request_keeps_half_open_trial():
+    breaker = CircuitBreaker("test", failure_threshold=1, reset_seconds=30)
+    early = breaker.before_request()  # Parti circuit fermé : pas un essai
+    breaker.record_failure()
+    breaker.opened_at -= 31
+    trial = breaker.before_request()
+
+    assert early is None and trial is not None
+    breaker.record_cancelled(early)
+    with pytest.raises(CircuitOpenError):
+        breaker.before_request()  # L'essai est toujours en cours
+
+    breaker.record_cancelled(trial)
+    assert breaker.before_request() is not None
+
+
+@pytest.mark.asyncio
+async def test_token_bucket_spaces_requests_after_burst():
+    bucket = TokenBucket(rate_per_second=20, burst=2)
+    loop = asyncio.get_running_loop()
+
+    started = loop.time()
+    for _ in range(4):
+        await bucket.acquire()
+
+    assert loop.time() - started >= 0.09
+
+
+@pytest.mark.asyncio
+async def test_provider_failures_open_circuit_and_skip_network():
+    client = http_client.get_client("rapidapi")
+    threshold = http_client.get_circuit_breaker("rapidapi").failure_threshold
+
+    with patch.object(client, 'post', return_value=_response(503)) as mock_post:
+        for _ in range(threshold):
+            await http_client.post("rapidapi", "https://example.test/x", endpoint="/x")
+        with pytest.raises(CircuitOpenError):
+            await http_client.post("rapidapi", "https://example.test/x", endpoint="/x")
+
+    assert mock_post.call_count == threshold
+    assert http_client.get_http_stats()["rapidapi"]["circuit"] == "open"
+
+
+@pytest.mark.asyncio
+async def test_client_errors_do_not_open_circuit():
+    client = http_client.get_client("rapidapi")
+    threshold = http_client.get_circuit_breaker("rapidapi").failure_threshold
+
+    with patch.object(client, 'post', return_value=_response(422)):
+        for _ in range(threshold + 1):
+            await http_client.post("rapidapi", "https://example.test/x", endpoint="/x")
+
+    assert http_client.get_circuit_breaker("rapidapi").state == "closed"
+
+
+def _open_rapidapi_circuit():
+    breaker = http_client.get_circuit_breaker("rapidapi")
+    for _ in range(breaker.failure_threshold):
+        breaker.record_failure()
+
+
+@pytest.mark.parametrize("blocked_on", ["semaphore", "bucket"])
+@pytest.mark.asyncio
+async def test_trial_cancelled_while_waiting_releases_half_open_slot(blocked_on, monkeypatch):
+    state = http_client._get_provider("rapidapi")
+    _open_rapidapi_circuit()
+    state.breaker.opened_at -= state.breaker.reset_seconds + 1
+
+    if blocked_on == "semaphore":
+        monkeypatch.setattr(state, 'config', state.config._replace(max_concurrency=1))
+        monkeypatch.setattr(state, '_semaphore', None)
+        await state.semaphore().acquire()  # Créneau occupé par un autre appel
+    else:
+        monkeypatch.setattr(state, 'bucket', TokenBucket(rate_per_second=0.1, burst=1))
+        state.bucket.tokens = 0
+
+    with patch.object(state.client, 'post', return_value=_response(200)):
+        trial = asyncio.create_task(http_client.post("rapidapi", "https://example.test/x", endpoint="/x"))
+        await asyncio.sleep(0.05)
+        assert state.breaker.state == "half_open"
+        trial.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await trial
+
+        if blocked_on == "semaphore":
+            state.semaphore().release()
+        else:
+            state.bucket.refill()
+        await http_client.post("rapidapi", "https://example.test/x", endpoint="/x")
+
+    assert state.breaker.state == "closed"
+
+
+@pytest.mark.asyncio
+async def test_open_circuit_serves_stale_cache():
+    path = rapidapi_client.LUNAR_RETURN_REPORT_PATH
+    _open_rapidapi_circuit()
+
+    with patch.object(rapidapi_client.settings, 'DEV_MOCK_RAPIDAPI', False), \
+         patch('services.rapidapi_cache.lookup', AsyncMock(return_value={"value": {"report": "cached"}, "fresh": False, "age": 1e7})), \
+         patch.object(http_client.get_client("rapidapi"), 'post') as mock_post:
+        result = await rapidapi_client.post_json(path, {"month": "2025-03"})
+
+    assert result == {"report": "cached"}
+    mock_post.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_open_circuit_falls_back_to_mock_or_503():
+    _open_rapidapi_circuit()
+
+    with patch.object(rapidapi_client.settings, 'DEV_MOCK_RAPIDAPI', False):
+        mansion = await rapidapi_client.post_json(rapidapi_client.LUNAR_MANSIONS_PATH, {"date": "2025-03-10"})
+        with pytest.raises(HTTPException) as exc_info:
+            await rapidapi_client.post_json("/api/v3/unmocked", {})
+
+    assert mansion
+    assert exc_info.value.status_code == 503
+    assert exc_info.value.detail["code"] == "PROVIDER_CIRCUIT_OPEN"
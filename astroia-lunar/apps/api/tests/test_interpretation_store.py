@@ -0,0 +1,181 @@
+"""
+Tests du store immuable des interprétations pré-générées (chargement en bloc, swap, lectures sans DB)
+"""
+
+import uuid
+from unittest.mock import AsyncMock, patch
+
+import pytest
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from models.pregenerated_lunar_interpretation import PregeneratedLunarInterpretation
+from models.pregenerated_natal_aspect import PregeneratedNatalAspect
+from models.pregenerated_natal_interpretation import PregeneratedNatalInterpretation
+from services import interpretation_store
+from services.aspect_explanation_service import load_pregenerated_aspect_interpretation
+from services.interpretation_cache_service import (
+    get_cache_stats,
+    get_lunar_approach_cached,
+    get_lunar_climate_cached,
+    get_lunar_focus_cached,
+    get_lunar_v2_full_cached,
+    get_natal_pregenerated_cached,
+)
+from services.interpretation_store import (
+    ASPECTS,
+    LUNAR,
+    InterpretationStore,
+    get_interpretation_store,
+    load_interpretation_store,
+    reload_interpretation_store,
+)
+
+
+def _lunar_row(moon_sign, moon_house, lunar_ascendant, version, text, weekly_advice=None, lang='fr'):
+    return PregeneratedLunarInterpretation(
+        id=str(uuid.uuid4()),
+        moon_sign=moon_sign,
+        moon_house=moon_house,
+        lunar_ascendant=lunar_ascendant,
+        version=version,
+        lang=lang,
+        interpretation_full=text,
+        weekly_advice=weekly_advice,
+        length=len(text),
+    )
+
+
+@pytest.fixture
+async def seeded_db(test_db):
+    test_db.add_all([
+        _lunar_row("Aries", 0, "_climate_", 1, "Climat Bélier"),
+        _lunar_row("_focus_", 3, "_focus_", 1, "Focus M3"),
+        _lunar_row("_approach_", 0, "Leo", 1, "Approche Lion"),
+        _lunar_row("Aries", 1, "Taurus", 2, "Mois v2", {"week_1": "Lance-toi"}),
+        _lunar_row("Aries", 1, "Taurus", 2, "Month v2", lang='en'),
+        PregeneratedNatalInterpretation(
+            id=str(uuid.uuid4()), subject="sun", sign="aries", house=1, version=2, lang='fr', content="Soleil Bélier M1", length=16
+        ),
+        PregeneratedNatalAspect(
+            id=str(uuid.uuid4()), planet1="sun", planet2="venus", aspect_type="conjunction", version=5, lang='fr',
+            content="Soleil conjoint Vénus", length=21
+        ),
+    ])
+    await test_db.commit()
+    return test_db
+
+
+@pytest.fixture
+def no_db():
+    """Session dont toute requête fait échouer le test"""
+    db = AsyncMock(spec=AsyncSession)
+    db.execute.side_effect = AssertionError("requête DB inattendue")
+    return db
+
+
+@pytest.mark.asyncio
+async def test_bulk_load_splits_layers_and_langs(seeded_db):
+    store = await load_interpretation_store(seeded_db, ['fr'])
+
+    assert store.sizes() == {"lunar": 4, "natal": 1, "aspects": 1}
+    assert store.table(LUNAR)[("Aries", 1, "Taurus", 2, 'fr')] == ("Mois v2", {"week_1": "Lance-toi"})
+    assert ("Aries", 1, "Taurus", 2, 'en') not in store.table(LUNAR)
+    assert store.is_complete('fr') and not store.is_complete('en')
+
+
+@pytest.mark.asyncio
+async def test_lookups_are_served_without_db(seeded_db, no_db):
+    interpretation_store.set_interpretation_store(await load_interpretation_store(seeded_db, ['fr']))
+
+    assert await get_lunar_climate_cached(no_db, "Aries", version=1) == "Climat Bélier"
+    assert await get_lunar_focus_cached(no_db, 3, version=1) == "Focus M3"
+    assert await get_lunar_approach_cached(no_db, "Leo", version=1) == "Approche Lion"
+    assert await get_lunar_v2_full_cached(no_db, "Aries", 1, "Taurus") == ("Mois v2", {"week_1": "Lance-toi"})
+    assert await get_natal_pregenerated_cached(no_db, "sun", "aries", 1) == "Soleil Bélier M1"
+    assert await load_pregenerated_aspect_interpretation("Venus", "Sun", "conjunction", no_db) == "Soleil conjoint Vénus"
+
+    # Langue chargée : une clé absente n'existe pas en DB
+    assert await get_lunar_v2_full_cached(no_db, "Pisces", 12, "Pisces") is None
+    no_db.execute.assert_not_called()
+
+    stats = get_cache_stats()
+    assert stats["lunar_climate"]["size"] == 1
+    assert stats["lunar_v2_full"]["size"] == 1
+    assert stats["natal_pregenerated"]["age_seconds"] is not None
+
+
+@pytest.mark.asyncio
+async def test_unloaded_lang_is_fetched_once_by_copy_on_write(seeded_db):
+    loaded = await load_interpretation_store(seeded_db, ['fr'])
+    interpretation_store.set_interpretation_store(loaded)
+
+    with patch('services.interpretation_cache_service._fetch_lunar_v2_full_from_db') as mock_fetch:
+        mock_fetch.return_value = ("Month v2", None)
+
+        for _ in range(3):
+            assert await get_lunar_v2_full_cached(AsyncMock(), "Aries", 1, "Taurus", lang='en') == ("Month v2", None)
+
+    assert mock_fetch.call_count == 1
+    # L'ancien snapshot n'est jamais modifié
+    assert ("Aries", 1, "Taurus", 2, 'en') not in loaded.table(LUNAR)
+    assert get_interpretation_store().table(LUNAR)[("Aries", 1, "Taurus", 2, 'en')] == ("Month v2", None)
+    assert get_interpretation_store().is_complete('fr')
+
+
+@pytest.mark.asyncio
+async def test_reload_swaps_snapshot(seeded_db):
+    session_factory = async_sessionmaker(seeded_db.bind, class_=AsyncSession, expire_on_commit=False)
+    previous = get_interpretation_store()
+
+    store = await reload_interpretation_store(['fr', 'en'], session_factory=session_factory)
+
+    assert store is get_interpretation_store()
+    assert store is not previous
+    assert store.sizes()[LUNAR] == 5
+    assert store.loaded_at is not None
+
+
+@pytest.mark.asyncio
+async def test_stale_snapshot_is_reloaded_in_background(seeded_db):
+    session_factory = async_sessionmaker(seeded_db.bind, class_=AsyncSession, expire_on_commit=False)
+    loaded = await load_interpretation_store(seeded_db, ['fr'])
+    loaded.loaded_at -= 3600
+    interpretation_store.set_interpretation_store(loaded)
+
+    # Ligne écrite par un script de génération après le chargement
+    seeded_db.add(PregeneratedNatalInterpretation(
+        id=str(uuid.uuid4()), subject="moon", sign="leo", house=5, version=2, lang='fr', content="Lune Lion M5", length=12
+    ))
+    await seeded_db.commit()
+
+    with patch('database.AsyncSessionLocal', session_factory), \
+         patch('services.interpretation_store.settings.INTERPRETATION_STORE_TTL_SECONDS', 900):
+        # Snapshot périmé servi pendant le rechargement, un seul rechargement lancé
+        assert await get_natal_pregenerated_cached(seeded_db, "moon", "leo", 5) is None
+        reload_task = interpretation_store._RELOAD_TASK
+        assert await get_natal_pregenerated_cached(seeded_db, "sun", "aries", 1) == "Soleil Bélier M1"
+        assert interpretation_store._RELOAD_TASK is reload_task
+
+        await reload_task
+        assert await get_natal_pregenerated_cached(seeded_db, "moon", "leo", 5) == "Lune Lion M5"
+        assert get_interpretation_store().loaded_at > loaded.loaded_at
+
+
+@pytest.mark.asyncio
+async def test_failed_reload_keeps_previous_snapshot():
+    current = InterpretationStore(aspects={("sun", "venus", "trine", 5, 'fr'): "Trigone"}, langs=['fr'])
+    interpretation_store.set_interpretation_store(current)
+
+    def broken_factory():
+        raise ConnectionError("DB indisponible")
+
+    assert await reload_interpretation_store(['fr'], session_factory=broken_factory) is None
+    assert get_interpretation_store() is current
+    assert get_interpretation_store().table(ASPECTS)[("sun", "venus", "trine", 5, 'fr')] == "Trigone"
+
+
+def test_snapshot_tables_are_read_only():
+    store = InterpretationStore(natal={("sun", "aries", 1, 2, 'fr'): "Soleil"})
+
+    with pytest.raises(TypeError):
+        store.table("natal")[("moon", "aries", 1, 2, 'fr')] = "Lune"
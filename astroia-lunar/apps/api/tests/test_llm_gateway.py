@@ -0,0 +1,162 @@
+"""
+Tests de services/llm_gateway contre un faux serveur Anthropic local (ASGI)
+"""
+
+import asyncio
+import time
+from unittest.mock import patch
+
+import httpx
+import pytest
+from anthropic import AsyncAnthropic, RateLimitError
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse
+
+from services import llm_gateway
+from services.llm_gateway import LLMTimeoutError
+
+
+class FakeAnthropic:
+    """POST /v1/messages : délai et statut par modèle, suivi des appels en vol"""
+
+    def __init__(self):
+        self.delays = {}
+        self.statuses = {}
+        self.texts = {}
+        self.requests = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.cancelled = 0
+        self.app = FastAPI()
+        self.app.post("/v1/messages")(self.messages)
+
+    async def messages(self, request: Request):
+        body = await request.json()
+        model = body["model"]
+        self.requests.append((request.headers, body))
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            await asyncio.sleep(self.delays.get(model, 0))
+        except asyncio.CancelledError:
+            self.cancelled += 1
+            raise
+        finally:
+            self.in_flight -= 1
+
+        status = self.statuses.get(model, 200)
+        if status != 200:
+            return JSONResponse(
+                {"type": "error", "error": {"type": "rate_limit_error", "message": "slow down"}},
+                status_code=status,
+            )
+        return {
+            "id": "msg_fake",
+            "type": "message",
+            "role": "assistant",
+            "model": model,
+            "content": [{"type": "text", "text": self.texts.get(model, f"réponse {model}")}],
+            "stop_reason": "end_turn",
+            "stop_sequence": None,
+            "usage": {"input_tokens": 12, "output_tokens": 34},
+        }
+
+
+@pytest.fixture
+def fake_server():
+    server = FakeAnthropic()
+    llm_gateway.set_client(AsyncAnthropic(
+        api_key="test-key",
+        base_url="http://fake-anthropic",
+        max_retries=0,
+        http_client=httpx.AsyncClient(transport=httpx.ASGITransport(app=server.app)),
+    ))
+    return server
+
+
+async def _ask(model="claude-test", **kwargs):
+    message = await llm_gateway.create_message(
+        model=model, max_tokens=50, messages=[{"role": "user", "content": "Bonjour"}], **kwargs
+    )
+    return message.content[0].text
+
+
+@pytest.mark.asyncio
+async def test_create_message_goes_through_shared_client(fake_server):
+    assert await _ask(system=[{"type": "text", "text": "astro", "cache_control": {"type": "ephemeral"}}]) == "réponse claude-test"
+
+    headers, body = fake_server.requests[0]
+    assert headers["x-api-key"] == "test-key"
+    assert body["system"][0]["cache_control"] == {"type": "ephemeral"}
+    assert body["max_tokens"] == 50
+
+
+@pytest.mark.asyncio
+async def test_timeout_cancels_the_request(fake_server):
+    fake_server.delays["claude-test"] = 5
+
+    started = time.perf_counter()
+    with pytest.raises(LLMTimeoutError):
+        await _ask(timeout=0.2)
+
+    assert time.perf_counter() - started < 1
+    assert fake_server.cancelled == 1
+    assert fake_server.in_flight == 0
+
+
+@pytest.mark.asyncio
+async def test_global_concurrency_is_bounded(fake_server):
+    fake_server.delays = {"claude-a": 0.1, "claude-b": 0.1}
+
+    with patch('services.llm_gateway.settings.LLM_MAX_CONCURRENCY', 2):
+        texts = await asyncio.gather(*(_ask(model) for model in ["claude-a", "claude-b"] * 3))
+
+    assert len(texts) == 6
+    assert fake_server.max_in_flight == 2
+
+
+@pytest.mark.asyncio
+async def test_rate_limit_is_per_model(fake_server):
+    with patch('services.llm_gateway.settings.LLM_REQUESTS_PER_MINUTE', 600), \
+         patch('services.llm_gateway.settings.LLM_RATE_BURST', 1):
+        started = time.perf_counter()
+        await asyncio.gather(_ask("claude-a"), _ask("claude-b"))
+        assert time.perf_counter() - started < 0.09  # Un token disponible par modèle
+
+        started = time.perf_counter()
+        await asyncio.gather(_ask("claude-a"), _ask("claude-a"))
+        # 10 req/s : chaque nouvel appel sur claude-a attend ~0.1s
+        assert time.perf_counter() - started >= 0.15
+
+
+@pytest.mark.asyncio
+async def test_api_errors_are_propagated(fake_server):
+    fake_server.statuses["claude-test"] = 429
+
+    with pytest.raises(RateLimitError):
+        await _ask()
+
+
+@pytest.mark.asyncio
+async def test_missing_api_key_is_reported():
+    llm_gateway.set_client(None)
+    with patch('services.llm_gateway.settings.ANTHROPIC_API_KEY', ""):
+        with pytest.raises(ValueError):
+            await _ask()
+
+
+@pytest.mark.asyncio
+async def test_natal_generation_falls_back_to_haiku_through_gateway(fake_server):
+    from services.natal_interpretation_service import generate_with_sonnet_fallback_haiku
+
+    fake_server.statuses["claude-3-5-sonnet-20241022"] = 429
+    fake_server.texts["claude-3-haiku-20240307"] = "Texte natal. " * 80
+
+    with patch('services.natal_interpretation_service.settings.NATAL_LLM_MODE', "anthropic"):
+        text, model = await generate_with_sonnet_fallback_haiku(
+            "sun", {"subject_label": "Soleil", "sign": "Verseau", "house": 11}, version=4, skip_pregenerated=True
+        )
+
+    assert model == "haiku"
+    assert text.startswith("Texte natal.")
+    assert [body["model"] for _, body in fake_server.requests] == ["claude-3-5-sonnet-20241022", "claude-3-haiku-20240307"]
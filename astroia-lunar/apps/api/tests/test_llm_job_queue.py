@@ -0,0 +1,257 @@
+"""
+Tests de la file des générations LLM (services/llm_job_queue) et des chemins
+rapides natal / lunaire (LLM_JOB_QUEUE_ENABLED)
+"""
+
+import asyncio
+import uuid
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, patch
+
+import pytest
+from sqlalchemy import delete, select
+
+from conftest import TestSessionLocal, override_get_db
+from database import get_db
+from main import app
+from models.llm_generation_job import LLMGenerationJob
+from models.lunar_interpretation import LunarInterpretation
+from models.lunar_return import LunarReturn
+from models.natal_interpretation import NatalInterpretation
+from routes.auth import get_current_user
+from services import llm_job_queue
+from services.llm_job_queue import (
+    PRIORITY_BACKGROUND,
+    PRIORITY_INTERACTIVE,
+    claim_jobs,
+    enqueue_job,
+    enqueue_natal_job,
+    run_pending_jobs,
+)
+from services.natal_interpretation_service import PROMPT_VERSION
+
+CHART_ID = "chart-queue-1"
+PAYLOAD = {"subject_label": "Mars", "sign": "Bélier", "house": 1}
+
+
+@pytest.fixture(autouse=True)
+async def queue_db(test_client):
+    """File et sessions des workers sur la DB de test, table vidée"""
+    async with TestSessionLocal() as session:
+        await session.execute(delete(LLMGenerationJob))
+        await session.commit()
+    with patch('services.llm_job_queue.AsyncSessionLocal', TestSessionLocal), \
+         patch.object(NatalInterpretation.__table__.c.id.default, 'arg', lambda ctx: str(uuid.uuid4())), \
+         patch.object(LunarInterpretation.__table__.c.id.default, 'arg', lambda ctx: str(uuid.uuid4())), \
+         patch('services.llm_job_queue.settings.LLM_JOB_RETRY_BASE_SECONDS', 0):
+        yield test_client
+
+
+async def _jobs():
+    async with TestSessionLocal() as session:
+        return (await session.execute(select(LLMGenerationJob).order_by(LLMGenerationJob.id))).scalars().all()
+
+
+async def _fake_llm(subject, chart_payload, version=None, db=None, skip_pregenerated=False, defer_llm=False):
+    return f"{subject} via LLM", "sonnet"
+
+
+@pytest.mark.asyncio
+async def test_enqueue_is_deduplicated_and_requeued_after_done():
+    first = await enqueue_job("natal", "natal:k", {"a": 1}, user_id=1, priority=PRIORITY_BACKGROUND)
+    second = await enqueue_job("natal", "natal:k", {"a": 1}, user_id=1, priority=PRIORITY_INTERACTIVE)
+
+    assert second.id == first.id
+    jobs = await _jobs()
+    assert len(jobs) == 1 and jobs[0].priority == PRIORITY_INTERACTIVE
+
+    async with TestSessionLocal() as session:
+        job = await session.get(LLMGenerationJob, first.id)
+        job.status, job.attempts, job.last_error = "failed", 3, "boom"
+        await session.commit()
+
+    requeued = await enqueue_job("natal", "natal:k", {"a": 2}, user_id=1)
+    assert requeued.id == first.id
+    assert (requeued.status, requeued.attempts, requeued.last_error, requeued.payload) == ("pending", 0, None, {"a": 2})
+
+
+@pytest.mark.asyncio
+async def test_claim_follows_priority_then_age():
+    await enqueue_job("natal", "natal:low", {}, priority=PRIORITY_BACKGROUND)
+    await enqueue_job("natal", "natal:high", {}, priority=PRIORITY_INTERACTIVE)
+    await enqueue_job("natal", "natal:high-2", {}, priority=PRIORITY_INTERACTIVE)
+
+    claimed = await claim_jobs("w1", limit=2)
+
+    assert [job.dedupe_key for job in claimed] == ["natal:high", "natal:high-2"]
+    assert all(job.status == "running" and job.attempts == 1 and job.locked_by == "w1" for job in claimed)
+    assert [job.dedupe_key for job in await claim_jobs("w2", limit=5)] == ["natal:low"]
+
+
+@pytest.mark.asyncio
+async def test_natal_job_saves_interpretation():
+    job = await enqueue_natal_job(1, CHART_ID, "mars", "fr", PROMPT_VERSION, PAYLOAD)
+
+    with patch('services.natal_interpretation_service.generate_with_sonnet_fallback_haiku', side_effect=_fake_llm):
+        assert await run_pending_jobs("w1") == 1
+
+    async with TestSessionLocal() as session:
+        saved = (await session.execute(
+            select(NatalInterpretation).where(NatalInterpretation.chart_id == CHART_ID)
+        )).scalar_one()
+        done = await session.get(LLMGenerationJob, job.id)
+    assert saved.output_text == "mars via LLM"
+    assert (done.status, done.result_id, done.locked_by) == ("done", str(saved.id), None)
+
+
+@pytest.mark.asyncio
+async def test_failures_are_retried_then_marked_failed():
+    await enqueue_natal_job(1, CHART_ID, "mars", "fr", PROMPT_VERSION, PAYLOAD)
+    llm = AsyncMock(side_effect=[RuntimeError("overloaded"), ("Texte", "placeholder-auth-error"), RuntimeError("still down")])
+
+    with patch('services.natal_interpretation_service.generate_with_sonnet_fallback_haiku', llm), \
+         patch('services.llm_job_queue.settings.LLM_JOB_MAX_ATTEMPTS', 3):
+        # Backoff nul : les trois tentatives s'enchaînent
+        assert await run_pending_jobs("w1") == 3
+
+    [job] = await _jobs()
+    assert (job.status, job.attempts) == ("failed", 3)
+    assert job.last_error == "RuntimeError: still down"
+    async with TestSessionLocal() as session:
+        # Placeholder (clé invalide) jamais sauvegardé comme interprétation
+        assert (await session.execute(select(NatalInterpretation))).scalars().all() == []
+
+
+@pytest.mark.asyncio
+async def test_retry_waits_for_backoff():
+    await enqueue_natal_job(1, CHART_ID, "mars", "fr", PROMPT_VERSION, PAYLOAD)
+
+    with patch('services.natal_interpretation_service.generate_with_sonnet_fallback_haiku', AsyncMock(side_effect=RuntimeError("x"))), \
+         patch('services.llm_job_queue.settings.LLM_JOB_RETRY_BASE_SECONDS', 60):
+        assert await run_pending_jobs("w1") == 1
+
+    [job] = await _jobs()
+    assert job.status == "pending"
+    assert await claim_jobs("w1") == []
+
+
+@pytest.mark.asyncio
+async def test_expired_lease_is_reclaimed():
+    job = await enqueue_job("natal", "natal:stuck", {})
+    [claimed] = await claim_jobs("crashed-worker")
+    assert await claim_jobs("w2") == []
+
+    async with TestSessionLocal() as session:
+        stuck = await session.get(LLMGenerationJob, claimed.id)
+        stuck.locked_at = datetime.now(timezone.utc) - timedelta(hours=1)
+        await session.commit()
+
+    [reclaimed] = await claim_jobs("w2")
+    assert (reclaimed.id, reclaimed.locked_by, reclaimed.attempts) == (job.id, "w2", 2)
+
+
+@pytest.mark.asyncio
+async def test_worker_loop_stops_cleanly():
+    stop = asyncio.Event()
+    with patch('services.llm_job_queue.settings.LLM_JOB_POLL_SECONDS', 0.01):
+        task = asyncio.create_task(llm_job_queue.worker_loop("w1", stop))
+        await asyncio.sleep(0.05)
+        stop.set()
+        await asyncio.wait_for(task, timeout=1)
+
+
+# === CHEMIN RAPIDE NATAL ===
+
+@pytest.fixture
+def natal_queue_client(queue_db):
+    app.dependency_overrides[get_db] = override_get_db
+    app.dependency_overrides[get_current_user] = lambda: SimpleNamespace(id=1)
+    with patch('config.settings.LLM_JOB_QUEUE_ENABLED', True), \
+         patch('config.settings.NATAL_LLM_MODE', "anthropic"):
+        yield queue_db
+    app.dependency_overrides.pop(get_current_user, None)
+
+
+def _natal_request(**extra):
+    return {"chart_id": CHART_ID, "subject": "mars", "chart_payload": PAYLOAD, **extra}
+
+
+@pytest.mark.asyncio
+async def test_natal_miss_returns_placeholder_then_generated_text(natal_queue_client):
+    llm = AsyncMock(side_effect=_fake_llm)
+    with patch('services.natal_interpretation_service.generate_with_sonnet_fallback_haiku', llm):
+        response = await natal_queue_client.post("/api/natal/interpretation", json=_natal_request())
+
+        body = response.json()
+        assert response.status_code == 200
+        assert body["id"] is None and body["cached"] is False
+        assert body["job"]["status"] == "pending"
+        llm.assert_not_awaited()
+
+        # Redemandé pendant la génération : même job
+        again = (await natal_queue_client.post("/api/natal/interpretation", json=_natal_request())).json()
+        assert again["job"]["id"] == body["job"]["id"]
+
+        await run_pending_jobs("w1")
+
+    status = (await natal_queue_client.get(f"/api/llm-jobs/{body['job']['id']}")).json()
+    assert status["status"] == "done" and status["result_id"]
+
+    served = (await natal_queue_client.post("/api/natal/interpretation", json=_natal_request())).json()
+    assert (served["text"], served["cached"], served["job"]) == ("mars via LLM", True, None)
+
+
+@pytest.mark.asyncio
+async def test_job_status_is_private(natal_queue_client):
+    job = await enqueue_job("natal", "natal:other-user", {}, user_id=2)
+
+    response = await natal_queue_client.get(f"/api/llm-jobs/{job.id}")
+    assert response.status_code == 404
+
+
+@pytest.mark.asyncio
+async def test_natal_batch_enqueues_misses(natal_queue_client):
+    response = await natal_queue_client.post("/api/natal/interpretations/batch", json={
+        "chart_id": CHART_ID,
+        "items": [{"subject": "mars", "chart_payload": PAYLOAD}],
+    })
+
+    lines = [line for line in response.text.splitlines()]
+    assert '"job":{"id"' in lines[0]
+    assert lines[-1].endswith('"errors":0,"pending":1}')
+    assert [job.dedupe_key for job in await _jobs()] == [f"natal:1:{CHART_ID}:mars:fr:v{PROMPT_VERSION}"]
+
+
+# === CHEMIN RAPIDE LUNAIRE ===
+
+@pytest.mark.asyncio
+async def test_lunar_miss_serves_template_and_job_fills_db():
+    from services.lunar_interpretation_generator import generate_or_get_interpretation
+
+    async with TestSessionLocal() as session:
+        lunar_return = LunarReturn(
+            user_id=1, month="2026-10", return_date=datetime(2026, 10, 20, tzinfo=timezone.utc),
+            moon_sign="Aries", moon_house=1, lunar_ascendant="Leo", aspects=[]
+        )
+        session.add(lunar_return)
+        await session.commit()
+        lunar_return_id = lunar_return.id
+
+    claude = AsyncMock(return_value=("Texte Claude", None, {"context": 1}))
+    with patch('services.lunar_interpretation_generator.settings.LLM_JOB_QUEUE_ENABLED', True), \
+         patch('services.lunar_interpretation_generator._generate_via_claude', claude):
+        async with TestSessionLocal() as session:
+            _, _, source, _ = await generate_or_get_interpretation(session, lunar_return_id, 1, subject='full')
+        assert source in ('db_template', 'hardcoded')
+        claude.assert_not_awaited()
+
+        assert await run_pending_jobs("w1") == 1
+        claude.assert_awaited_once()
+
+        async with TestSessionLocal() as session:
+            output, _, source, _ = await generate_or_get_interpretation(session, lunar_return_id, 1, subject='full')
+
+    assert (output, source) == ("Texte Claude", 'db_temporal')
+    [job] = await _jobs()
+    assert (job.kind, job.status) == ("lunar", "done")
@@ -0,0 +1,177 @@
+"""
+Tests du cache de génération lunaire par caractéristiques du thème
+(services/lunar_generation_cache) et de son branchement dans _generate_via_claude
+"""
+
+import uuid
+from datetime import datetime, timezone
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, patch
+
+import pytest
+from sqlalchemy import select
+
+from conftest import TestSessionLocal
+from models.lunar_interpretation import LunarInterpretation
+from models.lunar_return import LunarReturn
+from services import lunar_generation_cache
+from services.lunar_interpretation_generator import PROMPT_MAX_ASPECTS, generate_or_get_interpretation
+
+ASPECTS = [
+    {"first_planet": "Moon", "second_planet": "Venus", "aspect": "trine", "orb": 1.2},
+    {"first_planet": "Sun", "second_planet": "Mars", "aspect": "square", "orb": 3.4},
+]
+
+
+def _context(**overrides):
+    context = {
+        'lunar_return_id': 1, 'user_id': 1, 'month': "2026-10", 'return_date': "2026-10-20T00:00:00",
+        'moon_sign': "Aries", 'moon_house': 1, 'lunar_ascendant': "Leo", 'aspects': ASPECTS,
+        'planets': {}, 'houses': {}, 'subject': 'full', 'version': 2, 'lang': 'fr',
+    }
+    context.update(overrides)
+    return context
+
+
+def _message(text="Texte partagé"):
+    return SimpleNamespace(
+        content=[SimpleNamespace(text=text)],
+        usage=SimpleNamespace(input_tokens=300, output_tokens=900),
+    )
+
+
+@pytest.fixture(autouse=True)
+def string_interpretation_ids():
+    """DB de test SQLite : UUID stockés en String(36)"""
+    with patch.object(LunarInterpretation.__table__.c.id.default, 'arg', lambda ctx: str(uuid.uuid4())):
+        yield
+
+
+async def _lunar_return(user_id, month, **fields):
+    fields = {"moon_sign": "Aries", "moon_house": 1, "lunar_ascendant": "Leo", "aspects": ASPECTS, **fields}
+    async with TestSessionLocal() as session:
+        lunar_return = LunarReturn(
+            user_id=user_id, month=month, return_date=datetime(2026, int(month[-2:]), 20, tzinfo=timezone.utc), **fields
+        )
+        session.add(lunar_return)
+        await session.commit()
+        return lunar_return.id
+
+
+async def _generate(lunar_return_id, user_id, **kwargs):
+    async with TestSessionLocal() as session:
+        return await generate_or_get_interpretation(session, lunar_return_id, user_id, subject='full', **kwargs)
+
+
+async def _interpretation_id(session, lunar_return_id):
+    return (await session.execute(
+        select(LunarInterpretation.id).where(LunarInterpretation.lunar_return_id == lunar_return_id)
+    )).scalar_one()
+
+
+def test_key_ignores_user_fields_and_unused_features():
+    base = lunar_generation_cache.cache_key(_context(), "claude-opus")
+
+    assert lunar_generation_cache.cache_key(
+        _context(lunar_return_id=42, user_id=7, month="2027-03", return_date=None, planets={"sun": 1}),
+        "claude-opus"
+    ) == base
+    # Orbe absent du prompt, aspects au-delà du top N ignorés
+    extra = ASPECTS + [{"first_planet": "Pluto", "second_planet": "Moon", "aspect": "opposition"}] * 5
+    assert lunar_generation_cache.cache_key(_context(aspects=[dict(a, orb=0) for a in extra]), "claude-opus") == \
+        lunar_generation_cache.cache_key(_context(aspects=extra), "claude-opus")
+
+    # Tous les aspects du prompt comptent, y compris le dernier repris
+    fifth = ASPECTS + [{"first_planet": "Saturn", "second_planet": "Moon", "aspect": "trine"}] * (PROMPT_MAX_ASPECTS - 2)
+    other_fifth = fifth[:-1] + [{"first_planet": "Saturn", "second_planet": "Moon", "aspect": "square"}]
+    assert lunar_generation_cache.cache_key(_context(aspects=fifth), "claude-opus") != \
+        lunar_generation_cache.cache_key(_context(aspects=other_fifth), "claude-opus")
+
+    assert lunar_generation_cache.cache_key(_context(moon_house=2), "claude-opus") != base
+    assert lunar_generation_cache.cache_key(_context(), "claude-haiku") != base
+    assert lunar_generation_cache.cache_key(_context(lang="en"), "claude-opus") != base
+    # Climat : seul le signe de la Lune compte
+    assert lunar_generation_cache.cache_key(_context(subject='climate', moon_house=2, lunar_ascendant="Virgo"), "m") == \
+        lunar_generation_cache.cache_key(_context(subject='climate'), "m")
+
+
+@pytest.mark.asyncio
+async def test_identical_context_reuses_generation_across_users_and_months(test_client):
+    first_id = await _lunar_return(1, "2026-10")
+    second_id = await _lunar_return(2, "2026-11")
+
+    create = AsyncMock(return_value=_message())
+    with patch('services.lunar_interpretation_generator.llm_gateway.create_message', create):
+        first = await _generate(first_id, 1)
+        second = await _generate(second_id, 2)
+
+    create.assert_awaited_once()
+    assert first[:3] == second[:3] == ("Texte partagé", None, 'claude')
+
+    async with TestSessionLocal() as session:
+        saved = await session.get(LunarInterpretation, (await _interpretation_id(session, second_id)))
+    assert (saved.user_id, saved.output_text) == (2, "Texte partagé")
+
+    stats = (await test_client.get("/api/lunar/interpretation/generation_cache_stats")).json()
+    assert stats["subjects"]["full"] == {"hits": 1, "misses": 1, "bypass": 0, "hit_rate": 0.5}
+    assert (stats["generations_avoided"], stats["tokens_saved"]) == (1, {"input": 300, "output": 900})
+
+
+@pytest.mark.asyncio
+async def test_different_features_trigger_a_new_generation(test_client):
+    first_id = await _lunar_return(1, "2026-10")
+    other_id = await _lunar_return(2, "2026-10", moon_house=4)
+
+    create = AsyncMock(side_effect=[_message("Maison 1"), _message("Maison 4")])
+    with patch('services.lunar_interpretation_generator.llm_gateway.create_message', create):
+        assert (await _generate(first_id, 1))[0] == "Maison 1"
+        assert (await _generate(other_id, 2))[0] == "Maison 4"
+
+    assert create.await_count == 2
+
+
+@pytest.mark.asyncio
+async def test_force_regenerate_bypasses_shared_generation(test_client):
+    first_id = await _lunar_return(1, "2026-10")
+    second_id = await _lunar_return(2, "2026-11")
+    third_id = await _lunar_return(3, "2026-12")
+
+    create = AsyncMock(side_effect=[_message("Première"), _message("Nouvelle")])
+    with patch('services.lunar_interpretation_generator.llm_gateway.create_message', create):
+        await _generate(first_id, 1)
+        regenerated = await _generate(second_id, 2, force_regenerate=True)
+        # Le texte régénéré remplace l'entrée partagée
+        reused = await _generate(third_id, 3)
+
+    assert create.await_count == 2
+    assert (regenerated[0], reused[0]) == ("Nouvelle", "Nouvelle")
+    assert lunar_generation_cache.get_cache_stats()["subjects"]["full"]["bypass"] == 1
+
+
+@pytest.mark.asyncio
+async def test_month_personalization_is_applied_on_top_of_shared_text(test_client):
+    first_id = await _lunar_return(1, "2026-10")
+    second_id = await _lunar_return(2, "2026-11")
+
+    with patch('services.lunar_interpretation_generator.llm_gateway.create_message', AsyncMock(return_value=_message())), \
+         patch('services.lunar_generation_cache.settings.LUNAR_GENERATION_PERSONALIZATION', "month"):
+        first = await _generate(first_id, 1)
+        second = await _generate(second_id, 2)
+
+    assert first[0] == "_Octobre 2026_\n\nTexte partagé"
+    assert second[0] == "_Novembre 2026_\n\nTexte partagé"
+
+
+@pytest.mark.asyncio
+async def test_cache_can_be_disabled(test_client):
+    first_id = await _lunar_return(1, "2026-10")
+    second_id = await _lunar_return(2, "2026-11")
+
+    create = AsyncMock(return_value=_message())
+    with patch('services.lunar_interpretation_generator.llm_gateway.create_message', create), \
+         patch('services.lunar_interpretation_generator.settings.LUNAR_GENERATION_CACHE_ENABLED', False):
+        await _generate(first_id, 1)
+        await _generate(second_id, 2)
+
+    assert create.await_count == 2
+    assert lunar_generation_cache.get_cache_stats()["generations_avoided"] == 0
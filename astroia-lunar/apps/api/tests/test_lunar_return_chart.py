@@ -0,0 +1,97 @@
+"""
+Tests de régression du moteur local de thème de révolution lunaire (services/lunar_return_chart)
+contre des instantanés au format API Ephemeris (tests/fixtures/lunar_return_chart_snapshots.json)
+
+Les instantanés viennent de l'ancien chemin mock local (utils.ephemeris_mock), pas
+du fournisseur : ils figent le calcul, ils ne prouvent pas la parité avec l'API réelle.
+"""
+
+import json
+from datetime import datetime
+from pathlib import Path
+
+import pytest
+
+from services import ephemeris_tables
+from services.lunar_return_chart import compute_lunar_return_chart, compute_lunar_return_charts
+from services.lunar_returns_service import _sign_degree_to_longitude
+from services.swiss_ephemeris import angle_diff_signed, find_lunar_return
+
+SNAPSHOTS = json.loads(
+    (Path(__file__).parent / "fixtures" / "lunar_return_chart_snapshots.json").read_text(encoding="utf-8")
+)["cases"]
+
+# Tolérances de régression (secondes de temps, degrés d'arc)
+RETURN_TIME_TOLERANCE_SECONDS = 120
+LONGITUDE_TOLERANCE_DEGREES = 0.1
+
+
+@pytest.fixture(autouse=True)
+def no_precomputed_table():
+    ephemeris_tables.set_default_table(None)
+    yield
+    ephemeris_tables.reset_default_table()
+
+
+def _aspect_keys(aspects):
+    return {(aspect["planet1"], aspect["planet2"], aspect["type"]) for aspect in aspects}
+
+
+def _local_chart(case):
+    request = case["request"]
+    return_dt = datetime.fromisoformat(case["response"]["return_datetime"])
+    return compute_lunar_return_chart(return_dt, request["birth_latitude"], request["birth_longitude"])
+
+
+@pytest.mark.parametrize("case", SNAPSHOTS, ids=lambda case: case["request"]["target_month"])
+def test_same_raw_data_shape_as_snapshot(case):
+    chart = _local_chart(case)
+    expected = case["response"]
+
+    assert set(chart) == set(expected)
+    assert set(chart["moon"]) >= {"sign", "degree", "house"}
+    assert set(chart["ascendant"]) >= {"sign", "degree"}
+    assert set(chart["planets"]) == set(expected["planets"])
+    assert set(chart["houses"]) == set(expected["houses"])
+
+
+@pytest.mark.parametrize("case", SNAPSHOTS, ids=lambda case: case["request"]["target_month"])
+def test_chart_matches_snapshot(case):
+    chart = _local_chart(case)
+    expected = case["response"]
+
+    assert chart["ascendant"]["sign"] == expected["ascendant"]["sign"]
+    assert chart["ascendant"]["degree"] == pytest.approx(expected["ascendant"]["degree"], abs=LONGITUDE_TOLERANCE_DEGREES)
+    assert chart["moon"]["sign"] == expected["moon"]["sign"]
+    assert chart["moon"]["house"] == expected["moon"]["house"]
+
+    for name, planet in expected["planets"].items():
+        assert abs(angle_diff_signed(chart["planets"][name]["longitude"], planet["longitude"])) < LONGITUDE_TOLERANCE_DEGREES
+        assert chart["planets"][name]["house"] == planet["house"]
+
+    for house, cusp in expected["houses"].items():
+        assert abs(angle_diff_signed(chart["houses"][house]["cusp"], cusp["cusp"])) < LONGITUDE_TOLERANCE_DEGREES
+
+    assert _aspect_keys(chart["aspects"]) == _aspect_keys(expected["aspects"])
+
+
+@pytest.mark.parametrize("case", SNAPSHOTS, ids=lambda case: case["request"]["target_month"])
+def test_return_instant_matches_snapshot(case):
+    request = case["request"]
+    natal_lon = _sign_degree_to_longitude(request["natal_moon_sign"], request["natal_moon_degree"])
+    year, month = map(int, request["target_month"].split("-"))
+    expected = datetime.fromisoformat(case["response"]["return_datetime"])
+
+    found = find_lunar_return(natal_lon, datetime(year, month, 1, tzinfo=expected.tzinfo), 31 * 24)
+
+    assert abs((found - expected).total_seconds()) < RETURN_TIME_TOLERANCE_SECONDS
+
+
+def test_batch_matches_single_charts():
+    case = SNAPSHOTS[0]
+    request = case["request"]
+    return_dt = datetime.fromisoformat(case["response"]["return_datetime"])
+
+    charts = compute_lunar_return_charts([return_dt, return_dt], request["birth_latitude"], request["birth_longitude"])
+
+    assert charts == [_local_chart(case), _local_chart(case)]
@@ -0,0 +1,102 @@
+"""
+Tests pour la génération des 12 révolutions lunaires en un passage
+(série Swiss Ephemeris → mois YYYY-MM → thèmes locaux → insertion groupée)
+"""
+
+from datetime import datetime, timezone
+from unittest.mock import AsyncMock, patch
+
+import pytest
+from sqlalchemy import select
+
+from models.lunar_return import LunarReturn
+from services.ephemeris_executor import find_lunar_return_series_async
+from services.lunar_returns_service import (
+    _generate_rolling_returns,
+    _months_span,
+    group_lunar_returns_by_month,
+)
+
+
+def _utc(*args):
+    return datetime(*args, tzinfo=timezone.utc)
+
+
+def test_months_span_crosses_year():
+    assert _months_span(["2026-11", "2026-12", "2027-01"]) == (_utc(2026, 11, 1), _utc(2027, 2, 1))
+
+
+def test_group_by_month_handles_two_returns_and_none():
+    returns = [_utc(2026, 1, 1, 3), _utc(2026, 1, 28, 10), _utc(2026, 2, 24, 17), _utc(2026, 4, 20)]
+
+    grouped = group_lunar_returns_by_month(returns, ["2026-01", "2026-02", "2026-03"])
+
+    assert grouped == {
+        "2026-01": [_utc(2026, 1, 1, 3), _utc(2026, 1, 28, 10)],
+        "2026-02": [_utc(2026, 2, 24, 17)],
+        "2026-03": [],
+    }
+
+
+@pytest.mark.asyncio
+async def test_rolling_returns_single_series_and_bulk_insert(test_db):
+    months = [f"2026-{m:02d}" for m in range(1, 13)]
+    api_mock = AsyncMock(return_value={})
+
+    with patch("services.lunar_returns_service.ephemeris_client.calculate_lunar_return", new=api_mock), \
+         patch("services.lunar_returns_service.find_lunar_return_series_async",
+               wraps=find_lunar_return_series_async) as series_mock:
+        generated = await _generate_rolling_returns(
+            db=test_db,
+            user_id=1,
+            correlation_id="test-series",
+            months=months,
+            natal_moon_degree=15.5,
+            natal_moon_sign="Aries",
+            birth_latitude=48.85,
+            birth_longitude=2.35,
+            birth_timezone="Europe/Paris",
+        )
+        await test_db.commit()
+
+    assert generated == 12
+    assert series_mock.await_count == 1
+    assert api_mock.await_count == 0  # thèmes calculés localement
+
+    result = await test_db.execute(select(LunarReturn).where(LunarReturn.user_id == 1))
+    rows = sorted(result.scalars().all(), key=lambda row: row.month)
+    assert [row.month for row in rows] == months
+    for row in rows:
+        return_date = row.return_date.replace(tzinfo=timezone.utc) if row.return_date.tzinfo is None else row.return_date
+        assert return_date.strftime("%Y-%m") == row.month
+        assert row.lunar_ascendant != "Unknown"
+        assert len(row.houses) == 12
+
+
+@pytest.mark.asyncio
+async def test_rolling_returns_skips_existing_months(test_db):
+    test_db.add(LunarReturn(
+        user_id=1, month="2026-03", return_date=_utc(2026, 3, 10), lunar_ascendant="Virgo"
+    ))
+    await test_db.commit()
+
+    with patch("services.lunar_returns_service.ephemeris_client.calculate_lunar_return",
+               new=AsyncMock(return_value={})):
+        generated = await _generate_rolling_returns(
+            db=test_db,
+            user_id=1,
+            correlation_id="test-existing",
+            months=["2026-02", "2026-03", "2026-04"],
+            natal_moon_degree=2.0,
+            natal_moon_sign="Cancer",
+            birth_latitude=48.85,
+            birth_longitude=2.35,
+            birth_timezone="Europe/Paris",
+        )
+        await test_db.commit()
+
+    assert generated == 3
+    result = await test_db.execute(
+        select(LunarReturn).where(LunarReturn.user_id == 1, LunarReturn.month == "2026-03")
+    )
+    assert [row.lunar_ascendant for row in result.scalars().all()] == ["Virgo"]
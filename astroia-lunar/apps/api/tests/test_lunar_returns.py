@@ -41,9 +41,9 @@ async def test_success_generate_201(override_dependencies):
     }
     
     # Mock ephemeris client et interpretation
-    with patch("routes.lunar_returns.ephemeris_client.calculate_lunar_return", 
+    with patch("services.lunar_returns_service.ephemeris_client.calculate_lunar_return", 
                new_callable=AsyncMock, return_value=mock_ephemeris_response), \
-         patch("routes.lunar_returns.generate_lunar_return_interpretation", return_value="Test interpretation"):
+         patch("services.lunar_returns_service.generate_lunar_return_interpretation", return_value="Test interpretation"):
         
         async with AsyncClient(app=app, base_url="http://test") as client:
             response = await client.post(
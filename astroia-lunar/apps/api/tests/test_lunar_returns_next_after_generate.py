@@ -63,9 +63,9 @@ async def test_next_returns_200_after_generate(override_dependencies):
         call_count[0] += 1
         return mock_ephemeris_response(target_month)
     
-    with patch("routes.lunar_returns.ephemeris_client.calculate_lunar_return", 
+    with patch("services.lunar_returns_service.ephemeris_client.calculate_lunar_return", 
                new_callable=AsyncMock, side_effect=mock_calculate_lunar_return), \
-         patch("routes.lunar_returns.generate_lunar_return_interpretation", return_value="Test interpretation"):
+         patch("services.lunar_returns_service.generate_lunar_return_interpretation", return_value="Test interpretation"):
         
         async with AsyncClient(app=app, base_url="http://test") as client:
             # Étape 1: Générer les retours
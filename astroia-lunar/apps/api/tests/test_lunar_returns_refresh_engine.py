@@ -0,0 +1,126 @@
+"""
+Tests du moteur de refresh batch des lunar returns (parallélisme, timeout, reprise)
+"""
+
+import asyncio
+from unittest.mock import patch
+
+import pytest
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from models.lunar_refresh_checkpoint import LunarRefreshCheckpoint
+from services.lunar_returns_service import _percentile, _refresh_users_concurrently
+
+
+@pytest.fixture
+def session_factory(test_db):
+    return async_sessionmaker(test_db.bind, class_=AsyncSession, expire_on_commit=False)
+
+
+def test_percentile_nearest_rank():
+    assert _percentile([], 95) == 0.0
+    assert _percentile([3.0], 95) == 3.0
+    assert _percentile([float(i) for i in range(1, 101)], 95) == 95.0
+
+
+@pytest.mark.asyncio
+async def test_users_refreshed_in_parallel_with_bounded_concurrency(test_db, session_factory):
+    running = 0
+    peak = 0
+    seen = []
+
+    async def fake_generate(user_id, db, force_regenerate=False):
+        nonlocal running, peak
+        running += 1
+        peak = max(peak, running)
+        await asyncio.sleep(0.02)
+        running -= 1
+        seen.append(user_id)
+        return {"success": True}
+
+    with patch("services.lunar_returns_service.generate_lunar_returns_for_user", side_effect=fake_generate):
+        stats = await _refresh_users_concurrently(
+            db=test_db,
+            user_ids=list(range(1, 11)),
+            run_key="test:parallel",
+            log_tag="TEST",
+            concurrency=3,
+            session_factory=session_factory
+        )
+
+    assert sorted(seen) == list(range(1, 11))
+    assert peak == 3
+    assert stats["successful"] == 10
+    assert stats["failed"] == 0
+    assert stats["users_per_second"] > 0
+    assert stats["p95_user_seconds"] >= 0.02
+
+    result = await test_db.execute(
+        select(LunarRefreshCheckpoint).where(LunarRefreshCheckpoint.run_key == "test:parallel")
+    )
+    assert {c.user_id for c in result.scalars().all() if c.status == "success"} == set(range(1, 11))
+
+
+@pytest.mark.asyncio
+async def test_timeout_and_errors_are_checkpointed(test_db, session_factory):
+    async def fake_generate(user_id, db, force_regenerate=False):
+        if user_id == 1:
+            await asyncio.sleep(5)
+        if user_id == 2:
+            raise ValueError("Signe lunaire invalide")
+        return {"success": True}
+
+    with patch("services.lunar_returns_service.generate_lunar_returns_for_user", side_effect=fake_generate):
+        stats = await _refresh_users_concurrently(
+            db=test_db,
+            user_ids=[1, 2, 3],
+            run_key="test:errors",
+            log_tag="TEST",
+            concurrency=3,
+            user_timeout_seconds=0.05,
+            session_factory=session_factory
+        )
+
+    assert stats["successful"] == 1
+    assert stats["failed"] == 2
+    assert stats["timeouts"] == 1
+    assert {e["user_id"] for e in stats["errors"]} == {1, 2}
+
+    result = await test_db.execute(
+        select(LunarRefreshCheckpoint).where(LunarRefreshCheckpoint.run_key == "test:errors")
+    )
+    statuses = {c.user_id: c.status for c in result.scalars().all()}
+    assert statuses == {1: "timeout", 2: "failed", 3: "success"}
+
+
+@pytest.mark.asyncio
+async def test_interrupted_run_resumes_from_checkpoint(test_db, session_factory):
+    """Un run relancé avec le même run_key ne refait que les users non terminés"""
+    async def crashing_generate(user_id, db, force_regenerate=False):
+        if user_id > 3:
+            raise RuntimeError("DB connection lost")
+        return {"success": True}
+
+    with patch("services.lunar_returns_service.generate_lunar_returns_for_user", side_effect=crashing_generate):
+        first = await _refresh_users_concurrently(
+            db=test_db, user_ids=[1, 2, 3, 4, 5], run_key="test:resume",
+            log_tag="TEST", concurrency=2, session_factory=session_factory
+        )
+    assert first["successful"] == 3
+
+    seen = []
+
+    async def fake_generate(user_id, db, force_regenerate=False):
+        seen.append(user_id)
+        return {"success": True}
+
+    with patch("services.lunar_returns_service.generate_lunar_returns_for_user", side_effect=fake_generate):
+        second = await _refresh_users_concurrently(
+            db=test_db, user_ids=[1, 2, 3, 4, 5], run_key="test:resume",
+            log_tag="TEST", concurrency=2, session_factory=session_factory
+        )
+
+    assert sorted(seen) == [4, 5]
+    assert second["skipped"] == 3
+    assert second["successful"] == 2
@@ -208,12 +208,9 @@ async def test_e2e_generator_claude_source_metadata():
     mock_db.add = MagicMock()
 
     # Mock Claude API
-    with patch('services.lunar_interpretation_generator.Anthropic') as mock_anthropic:
-        mock_client = MagicMock()
-        mock_response = MagicMock()
-        mock_response.content = [MagicMock(text="Interprétation test générée par Claude")]
-        mock_client.messages.create.return_value = mock_response
-        mock_anthropic.return_value = mock_client
+    mock_response = MagicMock()
+    mock_response.content = [MagicMock(text="Interprétation test générée par Claude")]
+    with patch('services.lunar_interpretation_generator.llm_gateway.create_message', AsyncMock(return_value=mock_response)):
 
         output, weekly, source, model = await generate_or_get_interpretation(
             db=mock_db,
@@ -280,10 +277,7 @@ async def test_e2e_generator_db_template_fallback():
     mock_db.execute.side_effect = mock_execute_side_effect
 
     # Mock Claude API pour échouer
-    with patch('services.lunar_interpretation_generator.Anthropic') as mock_anthropic:
-        mock_client = MagicMock()
-        mock_client.messages.create.side_effect = Exception("Claude API timeout")
-        mock_anthropic.return_value = mock_client
+    with patch('services.lunar_interpretation_generator.llm_gateway.create_message', AsyncMock(side_effect=Exception("Claude API timeout"))):
 
         output, weekly, source, model = await generate_or_get_interpretation(
             db=mock_db,
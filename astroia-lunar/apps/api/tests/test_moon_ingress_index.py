@@ -0,0 +1,122 @@
+"""
+Tests pour services/moon_ingress_index (index partagé des ingress de la Lune)
+"""
+
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from services import moon_ingress_index, swiss_ephemeris
+from services.moon_ingress_index import (
+    INGRESS_INDEX_MAX_GAP_DAYS,
+    MoonIngressIndex,
+    get_moon_ingress_index,
+    save_moon_ingress_index,
+    set_moon_ingress_index,
+)
+from services.swiss_ephemeris import _moon_ingresses, datetime_to_julian_day
+
+START_JD = datetime_to_julian_day(datetime(2026, 3, 1, tzinfo=timezone.utc))
+
+
+@pytest.fixture
+def index():
+    fresh = MoonIngressIndex()
+    set_moon_ingress_index(fresh)
+    yield fresh
+    set_moon_ingress_index(None)
+
+
+@pytest.fixture
+def solver_calls(monkeypatch):
+    """Compte les résolutions Newton d'ingress (swiss_ephemeris._moon_ingresses)"""
+    calls = []
+    original = swiss_ephemeris._moon_ingresses
+
+    def counting(start_jd, end_jd):
+        calls.append((start_jd, end_jd))
+        return original(start_jd, end_jd)
+
+    monkeypatch.setattr(swiss_ephemeris, "_moon_ingresses", counting)
+    return calls
+
+
+def test_ingresses_between_matches_solver(index):
+    expected = _moon_ingresses(START_JD, START_JD + 20)
+    assert index.ingresses_between(START_JD, START_JD + 20) == expected
+    # ~2.5 jours par signe
+    assert 7 <= len(expected) <= 9
+
+
+def test_lookups_inside_range_do_not_resolve(index, solver_calls):
+    index.ingresses_between(START_JD, START_JD + 10)
+    assert len(solver_calls) == 1
+
+    for offset in range(20):
+        jd = START_JD + offset * 0.5
+        ingress_jd, sign = index.next_ingress(jd)
+        assert ingress_jd > jd
+        assert index.previous_ingress(ingress_jd) == (ingress_jd, sign)
+    assert len(solver_calls) == 1
+
+
+def test_incremental_extension_keeps_index_sorted_and_unique(index, solver_calls):
+    index.ingresses_between(START_JD, START_JD + 5)
+    index.ingresses_between(START_JD + 60, START_JD + 65)
+    index.ingresses_between(START_JD - 60, START_JD - 55)
+
+    jds = [jd for jd, _ in index.ingresses_between(index.start_jd, index.end_jd)]
+    assert jds == sorted(jds)
+    assert all(b - a > 1.5 for a, b in zip(jds, jds[1:]))
+    assert index.ingresses_between(START_JD - 60, START_JD + 65) == _moon_ingresses(START_JD - 60, START_JD + 65)
+    assert len(solver_calls) == 3
+
+
+def test_extension_never_mutates_a_published_snapshot(index):
+    """Un lecteur sans verrou garde des jds et signes alignés pendant une extension arrière"""
+    index.ingresses_between(START_JD, START_JD + 10)
+    jds, signs, start_jd, end_jd = index._state
+    before = (list(jds), list(signs))
+
+    index.ingresses_between(START_JD - 40, START_JD - 35)
+
+    assert (jds, signs) == before
+    assert index._state[0] is not jds
+    assert index.start_jd < start_jd and index.end_jd == end_jd
+    assert index.ingresses_between(START_JD - 40, START_JD + 10) == _moon_ingresses(START_JD - 40, START_JD + 10)
+
+
+def test_far_range_is_solved_without_indexing(index):
+    index.ingresses_between(START_JD, START_JD + 5)
+    far = START_JD - 2 * INGRESS_INDEX_MAX_GAP_DAYS
+
+    assert index.ingresses_between(far, far + 5) == _moon_ingresses(far, far + 5)
+    assert index.start_jd > far
+
+
+def test_save_and_reload(index, monkeypatch, tmp_path):
+    path = tmp_path / "ingresses.json"
+    monkeypatch.setattr(moon_ingress_index.settings, "MOON_INGRESS_INDEX_PATH", str(path))
+    index.ingresses_between(START_JD, START_JD + 30)
+
+    assert save_moon_ingress_index() is True
+    set_moon_ingress_index(None)
+
+    reloaded = get_moon_ingress_index()
+    assert reloaded is not index
+    assert reloaded.covers(START_JD, START_JD + 30)
+    assert reloaded.ingresses_between(START_JD, START_JD + 30) == index.ingresses_between(START_JD, START_JD + 30)
+
+
+def test_void_of_course_reads_shared_index(index, solver_calls):
+    """calculate_void_of_course / find_next_moon_sign_change ne re-résolvent pas les ingress"""
+    dt = datetime(2026, 3, 5, 12, tzinfo=timezone.utc)
+    swiss_ephemeris.calculate_void_of_course(dt)
+    first_calls = len(solver_calls)
+
+    swiss_ephemeris.calculate_void_of_course(dt + timedelta(hours=6))
+    swiss_ephemeris.find_next_moon_sign_change(dt + timedelta(hours=12))
+    swiss_ephemeris.find_void_of_course_windows(dt, dt + timedelta(days=5))
+
+    assert first_calls == 1
+    assert len(solver_calls) == first_calls
@@ -0,0 +1,164 @@
+"""
+Tests de parité du moteur de thème natal local (services/natal_chart_engine)
+
+Référence : réponse RapidAPI /api/v3/charts/natal enregistrée dans
+tests/fixtures/natal_chart_sample.json (Manaus, 1989-11-01 13:20 America/Manaus).
+"""
+
+import json
+from datetime import datetime, timezone
+from pathlib import Path
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+from services.natal_chart_engine import (
+    NATAL_ASPECT_ORBS,
+    NATAL_ASPECT_POINTS,
+    birth_data_to_utc,
+    compute_natal_chart,
+)
+from services.natal_reading_service import (
+    get_natal_chart,
+    parse_aspects_from_natal_chart,
+    parse_positions_from_natal_chart,
+)
+
+FIXTURE_PATH = Path(__file__).parent / "fixtures" / "natal_chart_sample.json"
+with open(FIXTURE_PATH, 'r') as f:
+    RECORDED = json.load(f)
+
+# Coordonnées de la requête enregistrée (non stockées dans la fixture) : centre de Manaus
+BIRTH_DATA = {
+    "year": 1989, "month": 11, "day": 1, "hour": 13, "minute": 20, "second": 0,
+    "city": "Manaus", "country_code": "BR",
+    "latitude": -3.119, "longitude": -60.0217, "timezone": "America/Manaus",
+}
+
+RECORDED_POSITIONS = {p["name"]: p for p in RECORDED["chart_data"]["planetary_positions"]}
+# Angles : dépendent des coordonnées exactes de la requête d'origine
+ANGLES = {"Ascendant", "Medium_Coeli"}
+
+
+@pytest.fixture(scope="module")
+def local_chart():
+    return compute_natal_chart(BIRTH_DATA)
+
+
+def _aspect_key(aspect):
+    return frozenset((aspect["point1"], aspect["point2"])), aspect["aspect_type"]
+
+
+def test_birth_time_is_converted_to_utc():
+    assert birth_data_to_utc(BIRTH_DATA) == datetime(1989, 11, 1, 17, 20, tzinfo=timezone.utc)
+    assert birth_data_to_utc({**BIRTH_DATA, "timezone": "Nowhere/Unknown"}).hour == 13
+
+
+@pytest.mark.parametrize("name", [name for name in RECORDED_POSITIONS if name != "Chiron"])
+def test_positions_match_recorded_response(local_chart, name):
+    recorded = RECORDED_POSITIONS[name]
+    local = next(p for p in local_chart["chart_data"]["planetary_positions"] if p["name"] == name)
+
+    tolerance = 0.1 if name in ANGLES else 0.02
+    assert local["absolute_longitude"] == pytest.approx(recorded["absolute_longitude"], abs=tolerance)
+    assert local["sign"] == recorded["sign"]
+    assert local["house"] == recorded["house"]
+    assert local["is_retrograde"] == recorded["is_retrograde"]
+
+
+def test_positions_keep_recorded_order(local_chart):
+    names = [p["name"] for p in local_chart["chart_data"]["planetary_positions"]]
+    recorded_names = [name for name in RECORDED_POSITIONS if name in names]
+
+    assert names[:len(recorded_names)] == recorded_names
+
+
+ASPECT_ANGLES = {"conjunction": 0, "sextile": 60, "square": 90, "trine": 120, "opposition": 180}
+
+
+def _separation(point1, point2):
+    lon1 = RECORDED_POSITIONS[point1]["absolute_longitude"]
+    lon2 = RECORDED_POSITIONS[point2]["absolute_longitude"]
+    separation = abs(lon1 - lon2) % 360
+    return min(separation, 360 - separation)
+
+
+def _expected_aspects():
+    """Aspects des longitudes enregistrées selon les orbes "standard" (un seul par paire)"""
+    expected = set()
+    for i, point1 in enumerate(NATAL_ASPECT_POINTS):
+        for point2 in NATAL_ASPECT_POINTS[i + 1:]:
+            separation = _separation(point1, point2)
+            for aspect_type, angle in ASPECT_ANGLES.items():
+                if abs(separation - angle) <= NATAL_ASPECT_ORBS[aspect_type]:
+                    expected.add((frozenset((point1, point2)), aspect_type))
+                    break
+    return expected
+
+
+def test_recorded_aspects_are_found(local_chart):
+    local = {_aspect_key(a): a for a in local_chart["chart_data"]["aspects"]}
+
+    checked = 0
+    for aspect in RECORDED["chart_data"]["aspects"]:
+        # Ne comparer que les aspects cohérents avec les longitudes enregistrées
+        if abs(_separation(aspect["point1"], aspect["point2"]) - ASPECT_ANGLES[aspect["aspect_type"]]) > 8:
+            continue
+
+        assert _aspect_key(aspect) in local
+        assert local[_aspect_key(aspect)]["orb"] == pytest.approx(abs(aspect["orb"]), abs=0.05)
+        checked += 1
+
+    assert checked >= 4
+
+
+def test_every_local_aspect_is_expected(local_chart):
+    # La fixture ne liste qu'un extrait des aspects (Saturne-Neptune à 0.7° absent) :
+    # la référence est recalculée depuis ses longitudes avec les orbes par type
+    local = [_aspect_key(a) for a in local_chart["chart_data"]["aspects"]]
+
+    assert set(local) == _expected_aspects()
+    assert len(local) == len(set(local))
+    for aspect in local_chart["chart_data"]["aspects"]:
+        assert aspect["orb"] <= NATAL_ASPECT_ORBS[aspect["aspect_type"]]
+
+
+def test_house_cusps_feed_the_route_schema(local_chart):
+    cusps = local_chart["chart_data"]["house_cusps"]
+    ascendant = RECORDED_POSITIONS["Ascendant"]["absolute_longitude"]
+
+    assert [c["house"] for c in cusps] == list(range(1, 13))
+    assert cusps[0]["absolute_longitude"] == pytest.approx(ascendant, abs=0.1)
+    assert all(0 <= c["degree"] < 30 for c in cusps)
+
+
+def test_parsers_read_local_chart_like_recorded(local_chart):
+    local_positions = {p["name"]: p for p in parse_positions_from_natal_chart(local_chart)}
+    recorded_positions = {p["name"]: p for p in parse_positions_from_natal_chart(RECORDED)}
+
+    for name, recorded in recorded_positions.items():
+        if name == "Chiron" and name not in local_positions:
+            continue
+        assert local_positions[name]["sign_fr"] == recorded["sign_fr"]
+        assert local_positions[name]["degree"] == pytest.approx(recorded["degree"], abs=0.1)
+
+    assert parse_aspects_from_natal_chart(local_chart)
+
+
+@pytest.mark.asyncio
+async def test_get_natal_chart_is_local_by_default():
+    with patch('services.natal_reading_service.call_rapidapi_natal_chart', new_callable=AsyncMock) as mock_api:
+        data = await get_natal_chart(BIRTH_DATA)
+
+    mock_api.assert_not_called()
+    assert data["chart_data"]["planetary_positions"][0]["name"] == "Sun"
+
+
+@pytest.mark.asyncio
+async def test_get_natal_chart_can_use_rapidapi():
+    with patch('services.natal_reading_service.settings.NATAL_CHART_ENGINE', "rapidapi"), \
+         patch('services.natal_reading_service.call_rapidapi_natal_chart', AsyncMock(return_value=RECORDED)) as mock_api:
+        data = await get_natal_chart(BIRTH_DATA)
+
+    mock_api.assert_awaited_once_with(BIRTH_DATA)
+    assert data is RECORDED
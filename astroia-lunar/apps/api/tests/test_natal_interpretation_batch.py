@@ -0,0 +1,157 @@
+"""
+Tests pour POST /api/natal/interpretations/batch (lot de sujets, flux NDJSON)
+"""
+
+import asyncio
+import json
+import uuid
+from types import SimpleNamespace
+from unittest.mock import patch
+
+import pytest
+from sqlalchemy import event, select
+
+from conftest import TestSessionLocal, override_get_db, test_engine
+from database import get_db
+from main import app
+from models.natal_interpretation import NatalInterpretation
+from models.pregenerated_natal_interpretation import PregeneratedNatalInterpretation
+from routes.auth import get_current_user
+from services.natal_interpretation_service import PROMPT_VERSION
+
+CHART_ID = "chart-batch-1"
+PAYLOADS = {
+    "sun": {"subject_label": "Soleil", "sign": "Verseau", "house": 11},
+    "moon": {"subject_label": "Lune", "sign": "Taureau", "house": 2},
+    "mars": {"subject_label": "Mars", "sign": "Bélier", "house": 1},
+    "venus": {"subject_label": "Vénus", "sign": "Poissons", "house": 12},
+}
+
+
+@pytest.fixture(autouse=True)
+def string_interpretation_ids():
+    """DB de test SQLite : UUID stockés en String(36)"""
+    with patch.object(NatalInterpretation.__table__.c.id.default, 'arg', lambda ctx: str(uuid.uuid4())):
+        yield
+
+
+@pytest.fixture
+async def batch_client(test_client):
+    async with TestSessionLocal() as session:
+        session.add(NatalInterpretation(
+            id=str(uuid.uuid4()), user_id=1, chart_id=CHART_ID, subject="sun", lang="fr", version=PROMPT_VERSION,
+            input_json=PAYLOADS["sun"], output_text="Soleil déjà généré"
+        ))
+        session.add(PregeneratedNatalInterpretation(
+            id=str(uuid.uuid4()), subject="moon", sign="taurus", house=2, version=PROMPT_VERSION, lang="fr",
+            content="Lune pré-générée", length=16
+        ))
+        await session.commit()
+
+    app.dependency_overrides[get_db] = override_get_db
+    app.dependency_overrides[get_current_user] = lambda: SimpleNamespace(id=1)
+    yield test_client
+    app.dependency_overrides.pop(get_current_user, None)
+
+
+def _request(*subjects, **extra):
+    return {
+        "chart_id": CHART_ID,
+        "items": [{"subject": subject, "chart_payload": PAYLOADS[subject]} for subject in subjects],
+        **extra,
+    }
+
+
+def _lines(response):
+    return [json.loads(line) for line in response.text.splitlines()]
+
+
+async def _fake_llm(subject, chart_payload, version=None, db=None, skip_pregenerated=False, defer_llm=False):
+    await asyncio.sleep(0.2)
+    return f"{subject} via LLM", "sonnet"
+
+
+@pytest.mark.asyncio
+async def test_batch_streams_cached_pregenerated_then_generated(batch_client):
+    with patch('routes.natal_interpretation.AsyncSessionLocal', TestSessionLocal), \
+         patch('routes.natal_interpretation.generate_with_sonnet_fallback_haiku', side_effect=_fake_llm) as llm:
+        response = await batch_client.post("/api/natal/interpretations/batch", json=_request("sun", "moon", "mars", "venus"))
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    lines = _lines(response)
+
+    assert [(line["subject"], line["cached"]) for line in lines[:2]] == [("sun", True), ("moon", False)]
+    assert lines[0]["text"] == "Soleil déjà généré"
+    assert lines[1]["text"] == "Lune pré-générée"
+    assert {line["subject"]: line["text"] for line in lines[2:4]} == {"mars": "mars via LLM", "venus": "venus via LLM"}
+    assert lines[-1] == {"done": True, "total": 4, "cached": 1, "generated": 3, "errors": 0, "pending": 0}
+
+    # LLM uniquement pour les vrais miss, sans relecture du pré-généré
+    assert sorted(call.kwargs["subject"] for call in llm.call_args_list) == ["mars", "venus"]
+    assert all(call.kwargs["skip_pregenerated"] for call in llm.call_args_list)
+
+    async with TestSessionLocal() as session:
+        rows = (await session.execute(select(NatalInterpretation.subject).where(NatalInterpretation.chart_id == CHART_ID))).scalars().all()
+    assert sorted(rows) == ["mars", "moon", "sun", "venus"]
+
+
+@pytest.mark.asyncio
+async def test_batch_uses_two_reads_and_concurrent_generation(batch_client):
+    statements = []
+
+    def record(conn, cursor, statement, *args):
+        if statement.lstrip().upper().startswith("SELECT"):
+            statements.append(statement)
+
+    event.listen(test_engine.sync_engine, "before_cursor_execute", record)
+    try:
+        with patch('routes.natal_interpretation.AsyncSessionLocal', TestSessionLocal), \
+             patch('routes.natal_interpretation.generate_with_sonnet_fallback_haiku', side_effect=_fake_llm), \
+             patch('routes.natal_interpretation.settings.NATAL_INTERPRETATION_BATCH_CONCURRENCY', 4):
+            started = asyncio.get_running_loop().time()
+            response = await batch_client.post("/api/natal/interpretations/batch", json=_request("sun", "moon", "mars", "venus"))
+            elapsed = asyncio.get_running_loop().time() - started
+    finally:
+        event.remove(test_engine.sync_engine, "before_cursor_execute", record)
+
+    assert response.status_code == 200
+    # Deux générations de 0.2s en parallèle
+    assert elapsed < 0.38
+    reads = [s for s in statements if "natal_interpretations" in s or "pregenerated" in s]
+    # 1 lecture existants + 1 lecture pré-générés, puis 1 relecture par sujet généré (upsert)
+    assert sum("pregenerated_natal_interpretations" in s for s in reads) == 1
+    assert sum("FROM natal_interpretations" in s for s in reads) == 3
+
+
+@pytest.mark.asyncio
+async def test_failed_subject_is_reported_without_failing_batch(batch_client):
+    async def failing_llm(subject, **kwargs):
+        raise RuntimeError("anthropic down")
+
+    with patch('routes.natal_interpretation.AsyncSessionLocal', TestSessionLocal), \
+         patch('routes.natal_interpretation.generate_with_sonnet_fallback_haiku', side_effect=failing_llm):
+        response = await batch_client.post("/api/natal/interpretations/batch", json=_request("sun", "mars"))
+
+    lines = _lines(response)
+    assert lines[0]["subject"] == "sun"
+    assert lines[1] == {"subject": "mars", "chart_id": CHART_ID, "error": "anthropic down", "status_code": 500}
+    assert lines[-1]["errors"] == 1
+
+
+@pytest.mark.asyncio
+async def test_force_refresh_regenerates_existing_rows(batch_client):
+    with patch('routes.natal_interpretation.AsyncSessionLocal', TestSessionLocal), \
+         patch('routes.natal_interpretation.generate_with_sonnet_fallback_haiku', side_effect=_fake_llm):
+        response = await batch_client.post(
+            "/api/natal/interpretations/batch",
+            json=_request("sun", "sun", force_refresh=True)
+        )
+
+    lines = _lines(response)
+    assert lines[0]["text"] == "sun via LLM" and lines[0]["cached"] is False
+    assert lines[-1]["total"] == 1
+
+    async with TestSessionLocal() as session:
+        rows = (await session.execute(select(NatalInterpretation).where(NatalInterpretation.subject == "sun"))).scalars().all()
+    assert [row.output_text for row in rows] == ["sun via LLM"]
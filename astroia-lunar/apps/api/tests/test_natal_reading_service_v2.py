@@ -2,15 +2,19 @@
 Tests unitaires pour le service de lecture natale V2
 """
 
+import asyncio
 import json
+import time
 import pytest
 from pathlib import Path
+from unittest.mock import patch
 
 from services.natal_reading_service import (
     parse_positions_from_natal_chart,
     parse_aspects_from_natal_chart,
     build_summary,
-    generate_cache_key
+    generate_cache_key,
+    generate_natal_reading
 )
 
 
@@ -228,6 +232,130 @@ def test_parse_positions_handles_missing_chart_data():
     assert positions == []
 
 
+# === generate_natal_reading : appels thème + rapport en parallèle ===
+
+BIRTH_DATA = {"year": 1989, "month": 11, "day": 1, "hour": 13, "minute": 20, "city": "Manaus"}
+
+
+def _slow(result, delay, calls=None):
+    async def call(*args, **kwargs):
+        if calls is not None:
+            calls.append(time.perf_counter())
+        await asyncio.sleep(delay)
+        return result
+    return call
+
+
+@pytest.mark.asyncio
+async def test_generate_reading_runs_chart_and_report_concurrently():
+    """Le rapport part en même temps que le thème : durée ≈ max, pas somme"""
+    calls = []
+    with patch('services.natal_reading_service.get_natal_chart', _slow(SAMPLE_CHART, 0.2, calls)), \
+         patch('services.natal_reading_service.call_rapidapi_natal_report', _slow({}, 0.2, calls)):
+        started = time.perf_counter()
+        result = await generate_natal_reading(BIRTH_DATA)
+        elapsed = time.perf_counter() - started
+
+    assert elapsed < 0.35
+    assert abs(calls[0] - calls[1]) < 0.05
+    metadata = result['metadata']
+    assert metadata['legs']['chart']['status'] == 'ok'
+    assert metadata['legs']['report']['status'] == 'ok'
+    assert metadata['legs']['report']['duration_ms'] >= 150
+    assert metadata['degraded'] == []
+    assert len(result['reading']['positions']) == 14
+
+
+@pytest.mark.asyncio
+async def test_generate_reading_degrades_when_report_times_out():
+    """Rapport trop lent : lecture servie sans interprétations, sans attendre le rapport"""
+    with patch('services.natal_reading_service.settings.NATAL_READING_REPORT_TIMEOUT', 0.1), \
+         patch('services.natal_reading_service.get_natal_chart', _slow(SAMPLE_CHART, 0)), \
+         patch('services.natal_reading_service.call_rapidapi_natal_report', _slow({}, 5)):
+        started = time.perf_counter()
+        result = await generate_natal_reading(BIRTH_DATA)
+        elapsed = time.perf_counter() - started
+
+    assert elapsed < 1
+    assert result['metadata']['legs']['report']['status'] == 'timeout'
+    assert result['metadata']['degraded'] == ['report']
+    assert result['reading']['interpretations']['general_summary'] is None
+    assert result['reading']['positions']
+
+
+@pytest.mark.asyncio
+async def test_generate_reading_cancels_report_when_chart_fails():
+    """Thème en échec : erreur propagée, rapport annulé"""
+    report_cancelled = asyncio.Event()
+
+    async def report(*args, **kwargs):
+        try:
+            await asyncio.sleep(5)
+        except asyncio.CancelledError:
+            report_cancelled.set()
+            raise
+
+    async def chart(*args, **kwargs):
+        await asyncio.sleep(0.05)
+        raise RuntimeError("ephemeris down")
+
+    with patch('services.natal_reading_service.get_natal_chart', chart), \
+         patch('services.natal_reading_service.call_rapidapi_natal_report', report):
+        with pytest.raises(RuntimeError):
+            await generate_natal_reading(BIRTH_DATA)
+        await asyncio.wait_for(report_cancelled.wait(), timeout=1)
+
+
+@pytest.mark.asyncio
+async def test_generate_reading_awaits_cancelled_report_before_raising():
+    """Thème en échec : le rapport annulé est attendu (issue récupérée) avant de propager l'erreur"""
+    report_finished = []
+
+    async def report(*args, **kwargs):
+        try:
+            await asyncio.sleep(5)
+        except asyncio.CancelledError:
+            await asyncio.sleep(0.01)  # Nettoyage du client HTTP
+            report_finished.append(True)
+            raise
+
+    async def chart(*args, **kwargs):
+        await asyncio.sleep(0.05)
+        raise RuntimeError("ephemeris down")
+
+    with patch('services.natal_reading_service.get_natal_chart', chart), \
+         patch('services.natal_reading_service.call_rapidapi_natal_report', report):
+        with pytest.raises(RuntimeError, match="ephemeris down"):
+            await generate_natal_reading(BIRTH_DATA)
+
+    assert report_finished == [True]
+
+
+@pytest.mark.asyncio
+async def test_failed_report_duration_is_measured_from_its_own_start():
+    async def report(*args, **kwargs):
+        await asyncio.sleep(0.05)
+        raise RuntimeError("report down")
+
+    with patch('services.natal_reading_service.get_natal_chart', _slow(SAMPLE_CHART, 0.3)), \
+         patch('services.natal_reading_service.call_rapidapi_natal_report', report):
+        result = await generate_natal_reading(BIRTH_DATA)
+
+    report_leg = result['metadata']['legs']['report']
+    assert report_leg['status'] == 'error'
+    assert report_leg['duration_ms'] < 250
+    assert result['metadata']['total_ms'] >= 300
+
+
+@pytest.mark.asyncio
+async def test_generate_reading_without_interpretations_skips_report():
+    with patch('services.natal_reading_service.get_natal_chart', _slow(SAMPLE_CHART, 0)), \
+         patch('services.natal_reading_service.call_rapidapi_natal_report', _slow({}, 0)):
+        result = await generate_natal_reading(BIRTH_DATA, {'include_interpretations': False})
+
+    assert result['metadata']['legs']['report'] == {'status': 'skipped', 'duration_ms': None}
+    assert result['metadata']['degraded'] == []
+
+
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])
-
@@ -3,12 +3,13 @@ Tests unitaires pour le client RapidAPI
 Vérifie les retries, exponential backoff, timeouts, et gestion d'erreurs
 """
 
+import time
 import pytest
 from unittest.mock import AsyncMock, patch, MagicMock
 import httpx
 from fastapi import HTTPException
 
-from services import rapidapi_client
+from services import http_client, rapidapi_client
 
 
 @pytest.mark.asyncio
@@ -20,7 +21,7 @@ async def test_post_json_success():
     
     # Désactiver le mode mock pour ce test
     with patch.object(rapidapi_client.settings, 'DEV_MOCK_RAPIDAPI', False), \
-         patch.object(rapidapi_client.client, 'post', return_value=mock_response) as mock_post:
+         patch.object(http_client.get_client("rapidapi"), 'post', return_value=mock_response) as mock_post:
         result = await rapidapi_client.post_json("/test/path", {"key": "value"})
         
         assert result == {"status": "success", "data": {"moon": "Taurus"}}
@@ -44,7 +45,7 @@ async def test_post_json_retry_on_429():
     
     # Désactiver le mode mock pour ce test
     with patch.object(rapidapi_client.settings, 'DEV_MOCK_RAPIDAPI', False), \
-         patch.object(rapidapi_client.client, 'post') as mock_post:
+         patch.object(http_client.get_client("rapidapi"), 'post') as mock_post:
         mock_post.side_effect = [
             mock_response_error,
             mock_response_success
@@ -74,7 +75,7 @@ async def test_post_json_retry_on_500():
     
     # Désactiver le mode mock pour ce test
     with patch.object(rapidapi_client.settings, 'DEV_MOCK_RAPIDAPI', False), \
-         patch.object(rapidapi_client.client, 'post') as mock_post:
+         patch.object(http_client.get_client("rapidapi"), 'post') as mock_post:
         mock_post.side_effect = [
             mock_response_error,
             mock_response_success
@@ -99,7 +100,7 @@ async def test_post_json_max_retries_exceeded():
     
     # Désactiver le mode mock pour ce test
     with patch.object(rapidapi_client.settings, 'DEV_MOCK_RAPIDAPI', False), \
-         patch.object(rapidapi_client.client, 'post', return_value=mock_response_error):
+         patch.object(http_client.get_client("rapidapi"), 'post', return_value=mock_response_error):
         with patch('asyncio.sleep', return_value=None):
             with pytest.raises(HTTPException) as exc_info:
                 await rapidapi_client.post_json("/test/path", {})
@@ -123,7 +124,7 @@ async def test_post_json_non_retriable_error():
     
     # Désactiver le mode mock pour ce test
     with patch.object(rapidapi_client.settings, 'DEV_MOCK_RAPIDAPI', False), \
-         patch.object(rapidapi_client.client, 'post', return_value=mock_response_error):
+         patch.object(http_client.get_client("rapidapi"), 'post', return_value=mock_response_error):
         with pytest.raises(HTTPException) as exc_info:
             await rapidapi_client.post_json("/test/path", {})
         
@@ -140,7 +141,7 @@ async def test_post_json_timeout_retry():
     """Test retry sur timeout"""
     # Désactiver le mode mock pour ce test
     with patch.object(rapidapi_client.settings, 'DEV_MOCK_RAPIDAPI', False), \
-         patch.object(rapidapi_client.client, 'post') as mock_post:
+         patch.object(http_client.get_client("rapidapi"), 'post') as mock_post:
         # Premier appel: timeout, deuxième: succès
         mock_response_success = MagicMock()
         mock_response_success.status_code = 200
@@ -163,7 +164,7 @@ async def test_post_json_timeout_max_retries():
     """Test échec après MAX_RETRIES timeouts"""
     # Désactiver le mode mock pour ce test
     with patch.object(rapidapi_client.settings, 'DEV_MOCK_RAPIDAPI', False), \
-         patch.object(rapidapi_client.client, 'post', side_effect=httpx.TimeoutException("Timeout")):
+         patch.object(http_client.get_client("rapidapi"), 'post', side_effect=httpx.TimeoutException("Timeout")):
         with patch('asyncio.sleep', return_value=None):
             with pytest.raises(HTTPException) as exc_info:
                 await rapidapi_client.post_json("/test/path", {})
@@ -191,7 +192,7 @@ async def test_exponential_backoff():
     
     # Désactiver le mode mock pour ce test
     with patch.object(rapidapi_client.settings, 'DEV_MOCK_RAPIDAPI', False), \
-         patch.object(rapidapi_client.client, 'post', return_value=mock_response_error):
+         patch.object(http_client.get_client("rapidapi"), 'post', return_value=mock_response_error):
         with patch('asyncio.sleep', side_effect=mock_sleep):
             try:
                 await rapidapi_client.post_json("/test/path", {})
@@ -224,7 +225,7 @@ async def test_post_json_403_not_subscribed_fallback_mock():
         "403", request=MagicMock(), response=mock_response_error
     )
 
-    with patch.object(rapidapi_client.client, 'post', return_value=mock_response_error):
+    with patch.object(http_client.get_client("rapidapi"), 'post', return_value=mock_response_error):
         # Appel sur endpoint Lunar Mansion (qui a un mock disponible)
         result = await rapidapi_client.post_json(
             rapidapi_client.LUNAR_MANSIONS_PATH,
@@ -270,7 +271,7 @@ async def test_post_json_429_rate_limit_returns_429():
             "429", request=MagicMock(), response=mock_response_error
         )
 
-        with patch.object(rapidapi_client.client, 'post', return_value=mock_response_error):
+        with patch.object(http_client.get_client("rapidapi"), 'post', return_value=mock_response_error):
             with patch('asyncio.sleep', return_value=None):
                 with pytest.raises(HTTPException) as exc_info:
                     await rapidapi_client.post_json("/test/path", {})
@@ -407,3 +408,97 @@ async def test_mock_metadata_preserved_after_normalization():
     assert normalized_return.get("_reason") == "DEV_MOCK_RAPIDAPI enabled or RapidAPI not subscribed"
     assert normalized_return["moon_sign"] == "Gemini"
 
+
+
+def _success_response(data):
+    response = MagicMock()
+    response.status_code = 200
+    response.json.return_value = data
+    return response
+
+
+def _error_response(status):
+    response = MagicMock()
+    response.status_code = status
+    response.text = f"HTTP {status}"
+    response.json.return_value = {"message": f"HTTP {status}"}
+    response.raise_for_status.side_effect = httpx.HTTPStatusError(
+        str(status), request=MagicMock(), response=response
+    )
+    return response
+
+
+@pytest.mark.asyncio
+async def test_post_json_serves_identical_payload_from_cache():
+    """Même endpoint + même payload (ordre des clés indifférent) → un seul appel fournisseur"""
+    from services import rapidapi_cache
+
+    with patch.object(rapidapi_client.settings, 'DEV_MOCK_RAPIDAPI', False), \
+         patch.object(http_client.get_client("rapidapi"), 'post', return_value=_success_response({"mansion": 7})) as mock_post:
+        first = await rapidapi_client.post_json(rapidapi_client.LUNAR_MANSIONS_PATH, {"a": 1, "b": {"c": 2, "d": 3}})
+        second = await rapidapi_client.post_json(rapidapi_client.LUNAR_MANSIONS_PATH, {"b": {"d": 3, "c": 2}, "a": 1})
+        other = await rapidapi_client.post_json(rapidapi_client.LUNAR_MANSIONS_PATH, {"a": 2})
+
+    assert first == second == other == {"mansion": 7}
+    assert mock_post.call_count == 2
+
+    stats = rapidapi_cache.get_cache_stats()["endpoints"][rapidapi_client.LUNAR_MANSIONS_PATH]
+    assert stats["hits"] == 1 and stats["misses"] == 2
+    assert stats["saved_calls"] == 1 and stats["saved_usd"] > 0
+
+
+@pytest.mark.asyncio
+async def test_post_json_serves_stale_response_when_provider_fails():
+    """Entrée périmée + 5xx après retries → dernière réponse connue (stale-if-error)"""
+    from services import rapidapi_cache
+
+    path = rapidapi_client.VOID_OF_COURSE_PATH
+    with patch.object(rapidapi_client.settings, 'DEV_MOCK_RAPIDAPI', False), \
+         patch.object(http_client.get_client("rapidapi"), 'post', return_value=_success_response({"is_void": False})):
+        await rapidapi_client.post_json(path, {"date": "2025-03-10"})
+
+    expired = rapidapi_cache.get_policy(path).ttl + 1
+    with patch.object(rapidapi_client.settings, 'DEV_MOCK_RAPIDAPI', False), \
+         patch.object(http_client.get_client("rapidapi"), 'post', return_value=_error_response(503)) as mock_post, \
+         patch('services.rapidapi_cache.time.time', return_value=time.time() + expired), \
+         patch('asyncio.sleep', return_value=None):
+        result = await rapidapi_client.post_json(path, {"date": "2025-03-10"})
+
+    assert result == {"is_void": False}
+    assert mock_post.call_count == rapidapi_client.MAX_RETRIES
+    stats = rapidapi_cache.get_cache_stats()
+    assert stats["endpoints"][path]["stale"] == stats["stale_served"] == 1
+    # Le fournisseur a été appelé : aucun appel économisé
+    assert stats["endpoints"][path]["saved_calls"] == 0
+
+
+@pytest.mark.asyncio
+async def test_post_json_does_not_serve_stale_on_client_error():
+    """422 (payload invalide) → erreur propagée même si une réponse périmée existe"""
+    path = rapidapi_client.LUNAR_MANSIONS_PATH
+    with patch.object(rapidapi_client.settings, 'DEV_MOCK_RAPIDAPI', False), \
+         patch.object(http_client.get_client("rapidapi"), 'post', return_value=_success_response({"mansion": 7})):
+        await rapidapi_client.post_json(path, {"a": 1})
+
+    with patch.object(rapidapi_client.settings, 'DEV_MOCK_RAPIDAPI', False), \
+         patch.object(http_client.get_client("rapidapi"), 'post', return_value=_error_response(422)), \
+         patch('services.rapidapi_cache.time.time', return_value=time.time() + 30 * 86400):
+        with pytest.raises(HTTPException) as exc_info:
+            await rapidapi_client.post_json(path, {"a": 1})
+
+    assert exc_info.value.status_code == 422
+
+
+@pytest.mark.asyncio
+async def test_response_cache_persists_in_sqlite_file(tmp_path):
+    """Le fichier SQLite survit à la fermeture du backend (redémarrage)"""
+    from services import rapidapi_cache
+    from services.cache_backend import SQLiteCacheBackend
+
+    db_path = str(tmp_path / "rapidapi_cache.sqlite3")
+    rapidapi_cache.set_response_cache(SQLiteCacheBackend(db_path))
+    await rapidapi_cache.store("/api/v3/lunar/phases", {"year": 2025}, {"phases": [1, 2]})
+    rapidapi_cache.set_response_cache(SQLiteCacheBackend(db_path))
+
+    cached = await rapidapi_cache.lookup("/api/v3/lunar/phases", {"year": 2025})
+    assert cached["value"] == {"phases": [1, 2]} and cached["fresh"]
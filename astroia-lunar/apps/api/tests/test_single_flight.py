@@ -0,0 +1,162 @@
+"""
+Tests pour services/single_flight (coalescence des calculs partagés, stale-while-revalidate)
+"""
+
+import asyncio
+import time
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+from services import ephemeris_executor, moon_position
+from services.daily_climate import clear_cache as clear_daily_climate_cache, get_daily_climate_async
+from services.ephemeris_executor import get_current_moon_position_async
+from services.interpretation_cache_service import get_lunar_v2_full_cached
+from services.single_flight import SingleFlight, get_cached
+
+
+def _cache(data=None, age: float = 0.0, ttl: float = 60):
+    return {"data": data, "timestamp": time.time() - age if data is not None else 0, "ttl": ttl}
+
+
+@pytest.mark.asyncio
+async def test_concurrent_callers_share_one_computation():
+    flight = SingleFlight("test")
+    calls = []
+
+    async def compute():
+        calls.append(1)
+        await asyncio.sleep(0.01)
+        return {"value": 42}
+
+    results = await asyncio.gather(*(flight.do("key", compute) for _ in range(10)))
+
+    assert len(calls) == 1
+    assert all(result is results[0] for result in results)
+    assert not flight.in_flight("key")
+
+
+@pytest.mark.asyncio
+async def test_error_reaches_every_waiter_and_is_not_cached():
+    flight = SingleFlight("test")
+    calls = []
+
+    async def failing():
+        calls.append(1)
+        await asyncio.sleep(0.01)
+        raise ValueError("boom")
+
+    results = await asyncio.gather(*(flight.do("key", failing) for _ in range(3)), return_exceptions=True)
+    assert len(calls) == 1
+    assert all(isinstance(result, ValueError) for result in results)
+
+    with pytest.raises(ValueError):
+        await flight.do("key", failing)
+    assert len(calls) == 2
+
+
+@pytest.mark.asyncio
+async def test_cancelled_caller_does_not_cancel_others():
+    flight = SingleFlight("test")
+
+    async def compute():
+        await asyncio.sleep(0.02)
+        return "done"
+
+    first = asyncio.create_task(flight.do("key", compute))
+    second = asyncio.create_task(flight.do("key", compute))
+    await asyncio.sleep(0)
+    first.cancel()
+
+    assert await second == "done"
+
+
+@pytest.mark.asyncio
+async def test_get_cached_serves_stale_and_refreshes_once():
+    flight = SingleFlight("test")
+    cache = _cache({"v": "old"}, age=70, ttl=60)
+    refreshed = asyncio.Event()
+
+    async def refresh():
+        await asyncio.sleep(0.01)
+        cache["data"] = {"v": "new"}
+        cache["timestamp"] = time.time()
+        refreshed.set()
+        return cache["data"]
+
+    foreground = AsyncMock(side_effect=AssertionError("pas de calcul au premier plan"))
+    results = await asyncio.gather(*(
+        get_cached(cache, flight, foreground, stale_ttl=30, refresh=refresh) for _ in range(5)
+    ))
+
+    assert all(result == {"v": "old"} for result in results)
+    await asyncio.wait_for(refreshed.wait(), timeout=1)
+    assert await get_cached(cache, flight, foreground, stale_ttl=30) == {"v": "new"}
+
+
+@pytest.mark.asyncio
+async def test_get_cached_recomputes_past_stale_window():
+    flight = SingleFlight("test")
+    cache = _cache({"v": "old"}, age=200, ttl=60)
+
+    async def compute():
+        cache["data"] = {"v": "new"}
+        cache["timestamp"] = time.time()
+        return cache["data"]
+
+    assert await get_cached(cache, flight, compute, stale_ttl=30) == {"v": "new"}
+
+
+@pytest.mark.asyncio
+async def test_moon_position_cold_cache_runs_one_ephemeris_task(monkeypatch):
+    moon_position.clear_cache()
+    calls = []
+
+    async def slow_run(fn, *args, **kwargs):
+        calls.append(fn.__name__)
+        await asyncio.sleep(0.01)
+        return fn(*args, **kwargs)
+
+    monkeypatch.setattr(ephemeris_executor, "run_ephemeris", slow_run)
+
+    results = await asyncio.gather(*(get_current_moon_position_async() for _ in range(8)))
+
+    assert calls == ["compute_current_moon_position"]
+    assert all(result == results[0] for result in results)
+    moon_position.clear_cache()
+
+
+@pytest.mark.asyncio
+async def test_daily_climate_cold_cache_is_built_once(monkeypatch):
+    clear_daily_climate_cache()
+    moon = {"sign": "Leo", "degree": 130.0, "phase": "Pleine Lune"}
+    moon_calls = []
+
+    async def fake_moon_position():
+        moon_calls.append(1)
+        await asyncio.sleep(0.01)
+        return moon
+
+    monkeypatch.setattr(ephemeris_executor, "get_current_moon_position_async", fake_moon_position)
+
+    results = await asyncio.gather(*(get_daily_climate_async() for _ in range(5)))
+
+    assert len(moon_calls) == 1
+    assert all(result is results[0] for result in results)
+    assert results[0]["moon"] == moon
+    clear_daily_climate_cache()
+
+
+@pytest.mark.asyncio
+async def test_interpretation_miss_is_fetched_once_for_concurrent_requests():
+    async def slow_fetch(*args, **kwargs):
+        await asyncio.sleep(0.01)
+        return ("Mois v2", None)
+
+    with patch('services.interpretation_cache_service._fetch_lunar_v2_full_from_db', side_effect=slow_fetch) as mock_fetch:
+        results = await asyncio.gather(*(
+            get_lunar_v2_full_cached(AsyncMock(), "Aries", 1, "Taurus", lang='en') for _ in range(6)
+        ))
+
+    assert mock_fetch.call_count == 1
+    assert all(result == ("Mois v2", None) for result in results)
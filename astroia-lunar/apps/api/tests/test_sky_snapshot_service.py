@@ -0,0 +1,131 @@
+"""
+Tests pour services/sky_snapshot_service (instantanés du ciel précalculés)
+"""
+
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from models.sky_snapshot import SkySnapshot
+from services import moon_position, sky_snapshot_service
+from services.sky_snapshot_service import (
+    compute_sky_snapshots,
+    get_current_moon_position,
+    get_day_sky,
+    moon_position_at,
+    refresh_sky_snapshots,
+)
+from services.swiss_ephemeris import find_void_of_course_windows, get_moon_position
+from sqlalchemy import func, select
+
+START = datetime(2025, 3, 10, tzinfo=timezone.utc)
+
+
+@pytest.fixture(autouse=True)
+def clear_snapshot_cache():
+    sky_snapshot_service.clear_cache()
+    yield
+    sky_snapshot_service.clear_cache()
+
+
+def test_compute_produces_hour_and_day_rows():
+    rows = compute_sky_snapshots(START + timedelta(hours=7), days=2)
+
+    hours = [row for row in rows if row["granularity"] == "hour"]
+    days = [row for row in rows if row["granularity"] == "day"]
+    assert len(hours) == 48 and len(days) == 2
+    assert hours[0]["at"] == START and days[1]["at"] == START + timedelta(days=1)
+
+    reference = get_moon_position(START + timedelta(hours=5))
+    assert hours[5]["moon_longitude"] == pytest.approx(reference.longitude, abs=1e-3)
+    assert hours[5]["moon_sign"] == reference.sign
+    assert hours[5]["mansion_id"] == hours[5]["data"]["mansion"]["number"]
+
+
+def test_day_rows_carry_voc_windows_and_hour_flags():
+    rows = compute_sky_snapshots(START, days=3)
+    windows = find_void_of_course_windows(START, START + timedelta(days=3))
+    assert windows
+
+    day_rows = [row for row in rows if row["granularity"] == "day"]
+    listed = {w["start_at"] for row in day_rows for w in row["data"]["voc_windows"]}
+    assert listed == {window.start_time.isoformat() for window in windows}
+
+    for row in rows:
+        if row["granularity"] != "hour":
+            continue
+        expected = any(w.start_time <= row["at"] < w.end_time for w in windows)
+        assert row["data"]["is_voc"] == expected
+
+
+def test_moon_position_is_extrapolated_within_the_hour():
+    at = START + timedelta(hours=3)
+    snapshot = next(row for row in compute_sky_snapshots(START, days=1) if row["at"] == at)
+
+    position = moon_position_at(snapshot, at + timedelta(minutes=50))
+    reference = get_moon_position(at + timedelta(minutes=50))
+
+    assert position["degree"] == pytest.approx(reference.longitude, abs=0.02)
+    assert position["sign"] == reference.sign
+
+
+@pytest.mark.asyncio
+async def test_refresh_replaces_window_and_serves_reads(test_db):
+    assert await refresh_sky_snapshots(test_db, start=START, days=2) == 50
+    assert await refresh_sky_snapshots(test_db, start=START, days=2) == 50
+
+    count = await test_db.scalar(select(func.count()).select_from(SkySnapshot))
+    assert count == 50
+
+    sky = await get_day_sky(test_db, START.date(), include_hours=True)
+    assert sky["date"] == "2025-03-10"
+    assert len(sky["hours"]) == 24
+    assert sky["moon"] == {
+        "sign": get_moon_position(START + timedelta(hours=12)).sign,
+        "degree": pytest.approx(get_moon_position(START + timedelta(hours=12)).longitude, abs=0.01),
+        "phase": sky["moon"]["phase"],
+    }
+    assert await get_day_sky(test_db, (START + timedelta(days=5)).date()) is None
+
+
+@pytest.mark.asyncio
+async def test_refresh_is_skipped_while_another_worker_holds_the_lock():
+    db = AsyncMock()
+    db.get_bind = MagicMock(return_value=SimpleNamespace(dialect=SimpleNamespace(name="postgresql")))
+    db.execute.return_value = MagicMock(scalar=MagicMock(return_value=False))
+
+    with patch('services.ephemeris_executor.run_ephemeris') as run_ephemeris:
+        assert await refresh_sky_snapshots(db, start=START, days=2) == 0
+
+    run_ephemeris.assert_not_called()
+    assert "pg_try_advisory_xact_lock" in str(db.execute.call_args.args[0])
+    db.rollback.assert_awaited_once()
+    db.commit.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_current_position_reads_snapshot_then_memory(test_db):
+    now = datetime.now(timezone.utc)
+    await refresh_sky_snapshots(test_db, start=now, days=1)
+    expected = moon_position.compute_current_moon_position()
+
+    with patch.object(test_db, 'execute', wraps=test_db.execute) as spy:
+        first = await get_current_moon_position(test_db)
+        second = await get_current_moon_position(test_db)
+
+    assert spy.call_count == 1
+    assert first["sign"] == expected["sign"]
+    assert first["degree"] == pytest.approx(expected["degree"], abs=0.05)
+    assert second["sign"] == first["sign"]
+
+
+@pytest.mark.asyncio
+async def test_current_position_falls_back_to_ephemeris(test_db):
+    fallback = {"sign": "Leo", "degree": 130.0, "phase": "Pleine Lune"}
+
+    with patch('services.ephemeris_executor.get_current_moon_position_async', return_value=fallback) as mock_compute:
+        assert await get_current_moon_position(test_db) == fallback
+
+    mock_compute.assert_called_once()
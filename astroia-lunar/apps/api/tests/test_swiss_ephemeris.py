@@ -0,0 +1,326 @@
+"""
+Tests pour services/swiss_ephemeris (solveurs d'événements lunaires)
+- Lunar Return (Newton)
+- Void of Course exact (aspects + ingress)
+- Noyau batch (calc_positions_batch)
+- Phases lunaires exactes (élongation)
+"""
+
+from datetime import datetime, timedelta, timezone
+from itertools import islice
+
+import pytest
+
+from services import ephemeris_tables, swiss_ephemeris
+from services.swiss_ephemeris import (
+    ASPECT_SEPARATIONS,
+    VOC_PLANETS,
+    angle_diff_signed,
+    angle_diff_signed_batch,
+    calc_positions_batch,
+    calculate_void_of_course,
+    datetime_to_julian_day,
+    datetimes_to_julian_days,
+    degree_to_sign,
+    find_lunar_phase_changes,
+    find_lunar_return,
+    find_lunar_return_series,
+    find_principal_lunar_phases,
+    find_next_moon_sign_change,
+    find_void_of_course_windows,
+    get_moon_longitude,
+    get_moon_position,
+    iter_lunar_phase_events,
+    iter_lunar_returns,
+    julian_day_grid,
+    _find_lunar_return_scan,
+)
+
+
+@pytest.fixture(autouse=True)
+def no_precomputed_table():
+    """Ces tests valident le calcul direct pyswisseph (table précalculée désactivée)"""
+    ephemeris_tables.set_default_table(None)
+    yield
+    ephemeris_tables.reset_default_table()
+
+
+@pytest.mark.parametrize("natal_lon", [0.0, 45.3, 129.99, 180.0, 271.5, 359.9])
+def test_find_lunar_return_matches_scan(natal_lon):
+    """Newton et scan historique trouvent le même retour (< 60s d'écart)"""
+    start = datetime(2026, 3, 1, tzinfo=timezone.utc)
+
+    newton = find_lunar_return(natal_lon, start, search_window_hours=31 * 24)
+    scan = _find_lunar_return_scan(natal_lon, start, search_window_hours=31 * 24)
+
+    assert newton is not None and scan is not None
+    assert abs((newton - scan).total_seconds()) < 60
+
+
+def test_find_lunar_return_precision():
+    """La Lune est à moins d'une minute d'arc de la position natale"""
+    natal_lon = 212.42
+    result = find_lunar_return(natal_lon, datetime(2026, 1, 1, tzinfo=timezone.utc), 31 * 24)
+
+    moon_lon = get_moon_longitude(datetime_to_julian_day(result))
+    assert abs(angle_diff_signed(moon_lon, natal_lon)) < 1 / 60
+    assert result.tzinfo is not None
+
+
+def test_find_lunar_return_first_crossing_in_window():
+    """Retourne le premier passage après start_dt"""
+    start = datetime(2026, 5, 10, 6, 0, tzinfo=timezone.utc)
+    first = find_lunar_return(100.0, start, 31 * 24)
+    second = find_lunar_return(100.0, first + timedelta(hours=1), 31 * 24)
+
+    assert start <= first <= start + timedelta(days=28)
+    assert 27 < (second - first).total_seconds() / 86400 < 28
+
+
+def test_find_lunar_return_none_outside_window():
+    """None si le prochain passage tombe hors de la fenêtre"""
+    start = datetime(2026, 5, 10, tzinfo=timezone.utc)
+    first = find_lunar_return(100.0, start, 31 * 24)
+    hours_before = int((first - start).total_seconds() // 3600) - 1
+
+    assert find_lunar_return(100.0, start, search_window_hours=hours_before) is None
+
+
+@pytest.mark.parametrize("natal_lon", [3.7, 151.2, 344.0])
+def test_lunar_return_series_matches_independent_searches(natal_lon):
+    """La série en un passage retrouve les retours calculés un par un"""
+    start = datetime(2026, 1, 1, tzinfo=timezone.utc)
+    series = find_lunar_return_series(natal_lon, start, count=13)
+
+    expected = []
+    cursor = start
+    for _ in range(13):
+        found = find_lunar_return(natal_lon, cursor, 31 * 24)
+        expected.append(found)
+        cursor = found + timedelta(hours=1)
+
+    assert len(series) == 13
+    for got, want in zip(series, expected):
+        assert abs((got - want).total_seconds()) < 60
+    for previous, following in zip(series, series[1:]):
+        assert 27 < (following - previous).total_seconds() / 86400 < 27.7
+
+
+def test_lunar_return_series_end_bound_and_laziness():
+    start = datetime(2026, 1, 1, tzinfo=timezone.utc)
+    end = datetime(2027, 1, 1, tzinfo=timezone.utc)
+
+    bounded = find_lunar_return_series(200.0, start, end_dt=end)
+    assert 13 <= len(bounded) <= 14
+    assert all(start <= dt <= end for dt in bounded)
+
+    assert list(islice(iter_lunar_returns(200.0, start), 3)) == bounded[:3]
+
+    with pytest.raises(ValueError):
+        find_lunar_return_series(200.0, start)
+
+
+def test_lunar_return_series_uses_few_calc_ut_calls(monkeypatch):
+    """Chaque retour prédit depuis le précédent coûte moins qu'une recherche isolée"""
+    calls = []
+    original = swiss_ephemeris.swe.calc_ut
+
+    def counting_calc_ut(*args, **kwargs):
+        calls.append(args)
+        return original(*args, **kwargs)
+
+    monkeypatch.setattr(swiss_ephemeris.swe, "calc_ut", counting_calc_ut)
+    find_lunar_return_series(300.0, datetime(2026, 7, 1, tzinfo=timezone.utc), count=12)
+
+    assert 0 < len(calls) <= 12 * 6
+
+
+def test_find_lunar_return_uses_few_calc_ut_calls(monkeypatch):
+    """Le solveur Newton reste sous 10 appels calc_ut par retour"""
+    calls = []
+    original = swiss_ephemeris.swe.calc_ut
+
+    def counting_calc_ut(*args, **kwargs):
+        calls.append(args)
+        return original(*args, **kwargs)
+
+    monkeypatch.setattr(swiss_ephemeris.swe, "calc_ut", counting_calc_ut)
+    find_lunar_return(300.0, datetime(2026, 7, 1, tzinfo=timezone.utc), 31 * 24)
+
+    assert 0 < len(calls) <= 10
+
+
+def _separation(jd, planet_name):
+    body = getattr(swiss_ephemeris.swe, planet_name.upper())
+    return (get_moon_longitude(jd) - swiss_ephemeris.get_planet_longitude(jd, body)) % 360
+
+
+def test_find_void_of_course_windows_exact_boundaries():
+    """Chaque fenêtre commence sur un aspect exact et finit sur un ingress exact"""
+    start = datetime(2026, 2, 1, tzinfo=timezone.utc)
+    windows = find_void_of_course_windows(start, start + timedelta(days=30))
+
+    # ~2.5 jours par signe → une douzaine de fenêtres par mois
+    assert 10 <= len(windows) <= 15
+    assert windows == sorted(windows, key=lambda w: w.start_time)
+
+    for window in windows:
+        assert window.start_time < window.end_time
+        end_lon = get_moon_longitude(datetime_to_julian_day(window.end_time))
+        assert abs(angle_diff_signed(end_lon, round(end_lon / 30) * 30)) < 0.01
+        assert degree_to_sign(end_lon + 0.01) == window.to_sign
+
+        if window.last_aspect:
+            aspect_jd = datetime_to_julian_day(window.start_time)
+            separation = _separation(aspect_jd, window.last_aspect["with"])
+            angles = [a for a, name in ASPECT_SEPARATIONS if name == window.last_aspect["type"]]
+            assert min(abs(angle_diff_signed(separation, a)) for a in angles) < 0.01
+
+
+def test_find_void_of_course_windows_no_aspect_inside():
+    """Aucun aspect majeur n'est exact pendant une fenêtre VoC (échantillonnage 15 min)"""
+    start = datetime(2026, 6, 1, tzinfo=timezone.utc)
+    windows = find_void_of_course_windows(start, start + timedelta(days=10))
+
+    for window in windows:
+        jd = datetime_to_julian_day(window.start_time) + 1 / 1440
+        end_jd = datetime_to_julian_day(window.end_time)
+        previous = {name: _separation(jd, name) for name in VOC_PLANETS}
+        while jd < end_jd:
+            jd = min(jd + 1 / 96, end_jd)
+            for name in VOC_PLANETS:
+                separation = _separation(jd, name)
+                travelled = (separation - previous[name]) % 360
+                for angle, _ in ASPECT_SEPARATIONS:
+                    assert not 0 < (angle - previous[name]) % 360 <= travelled
+                previous[name] = separation
+
+
+def test_calculate_void_of_course_consistent_with_windows():
+    """calculate_void_of_course retrouve la fenêtre calculée par le moteur"""
+    start = datetime(2026, 3, 1, tzinfo=timezone.utc)
+    window = find_void_of_course_windows(start, start + timedelta(days=5))[0]
+
+    inside = window.start_time + (window.end_time - window.start_time) / 2
+    status = calculate_void_of_course(inside)
+    assert status["is_void"] is True
+    assert status["void_start"] == window.start_time
+    assert status["void_end"] == window.end_time
+    assert status["current_sign"] == window.from_sign
+    assert status["next_sign"] == window.to_sign
+
+    before = window.start_time - timedelta(minutes=5)
+    if window.last_aspect and before > start:
+        assert calculate_void_of_course(before)["is_void"] is False
+
+
+def test_find_next_moon_sign_change_exact():
+    """Le changement de signe est exact à la seconde près"""
+    start = datetime(2026, 4, 1, 12, tzinfo=timezone.utc)
+    ingress = find_next_moon_sign_change(start)
+
+    before = get_moon_longitude(datetime_to_julian_day(ingress - timedelta(seconds=5)))
+    after = get_moon_longitude(datetime_to_julian_day(ingress + timedelta(seconds=5)))
+    assert degree_to_sign(before) != degree_to_sign(after)
+
+    hours_until = int((ingress - start).total_seconds() // 3600)
+    assert find_next_moon_sign_change(start, max_hours=hours_until) is None
+
+
+def test_julian_day_grid_matches_scalar_conversion():
+    """La grille et la conversion vectorisée correspondent à datetime_to_julian_day"""
+    start = datetime(2026, 1, 1, 3, 30, tzinfo=timezone.utc)
+    step = timedelta(minutes=30)
+    grid = julian_day_grid(start, start + timedelta(hours=5), step)
+    dts = [start + step * i for i in range(len(grid))]
+
+    assert len(grid) == 11
+    expected = [datetime_to_julian_day(dt) for dt in dts]
+    assert max(abs(grid - expected)) < 1e-8
+    assert max(abs(datetimes_to_julian_days(dts) - expected)) < 1e-8
+    assert len(julian_day_grid(start, start - step, step)) == 0
+
+
+def test_calc_positions_batch_matches_scalar_helpers():
+    """Le noyau batch renvoie les mêmes longitudes/vitesses que les helpers scalaires"""
+    swe = swiss_ephemeris.swe
+    bodies = [swe.MOON, swe.SUN, swe.MARS]
+    jds = julian_day_grid(
+        datetime(2026, 8, 1, tzinfo=timezone.utc),
+        datetime(2026, 8, 3, tzinfo=timezone.utc),
+        timedelta(hours=6),
+    )
+    positions = calc_positions_batch(jds, bodies)
+
+    assert positions.shape == (len(jds), len(bodies), 2)
+    for i, jd in enumerate(jds):
+        for j, body in enumerate(bodies):
+            lon, speed = swiss_ephemeris.get_body_longitude_and_speed(float(jd), body)
+            assert positions[i, j, 0] == pytest.approx(lon, abs=1e-9)
+            assert positions[i, j, 1] == pytest.approx(speed, abs=1e-9)
+
+    assert calc_positions_batch([], bodies).shape == (0, 3, 2)
+
+
+def test_angle_diff_signed_batch_matches_scalar():
+    """La version vectorisée suit angle_diff_signed"""
+    angles = [0.0, 10.0, 179.0, 181.0, 350.0, 359.9]
+    diffs = angle_diff_signed_batch(angles, 5.0)
+    for angle, diff in zip(angles, diffs):
+        assert diff == pytest.approx(angle_diff_signed(angle, 5.0))
+
+
+def test_find_lunar_phase_changes_exact_boundaries():
+    """Chaque changement tombe sur une frontière exacte et devance l'échantillon horaire"""
+    start = datetime(2026, 1, 1, tzinfo=timezone.utc)
+    changes = find_lunar_phase_changes(start, start + timedelta(days=30))
+
+    # 8 phases par mois synodique (~29.5 jours)
+    assert 7 <= len(changes) <= 9
+    for change in changes:
+        instant = datetime.fromisoformat(change["datetime"])
+        # Secondes tronquées : la phase est acquise 1s après
+        assert get_moon_position(instant + timedelta(seconds=1)).phase == change["phase"]
+        assert get_moon_position(instant - timedelta(seconds=1)).phase != change["phase"]
+        assert change["moon_sign"] == degree_to_sign(change["moon_longitude"])
+
+
+def test_find_principal_lunar_phases_known_dates():
+    """Phases principales de janvier 2026 (à la minute près)"""
+    events = find_principal_lunar_phases(
+        datetime(2026, 1, 1, tzinfo=timezone.utc),
+        datetime(2026, 2, 1, tzinfo=timezone.utc),
+    )
+
+    expected = [
+        ("Pleine Lune", datetime(2026, 1, 3, 10, 3, tzinfo=timezone.utc)),
+        ("Dernier Quartier", datetime(2026, 1, 10, 15, 48, tzinfo=timezone.utc)),
+        ("Nouvelle Lune", datetime(2026, 1, 18, 19, 52, tzinfo=timezone.utc)),
+        ("Premier Quartier", datetime(2026, 1, 26, 4, 47, tzinfo=timezone.utc)),
+    ]
+    assert [e.phase for e in events] == [phase for phase, _ in expected]
+    for event, (_, instant) in zip(events, expected):
+        assert event.kind == "principal_phase"
+        assert abs((event.time - instant).total_seconds()) <= 60
+
+
+def test_iter_lunar_phase_events_is_lazy_and_ordered(monkeypatch):
+    """Sans fin de plage, le générateur ne calcule que ce qui est consommé"""
+    calls = []
+    original = swiss_ephemeris.swe.calc_ut
+
+    def counting_calc_ut(*args, **kwargs):
+        calls.append(args)
+        return original(*args, **kwargs)
+
+    monkeypatch.setattr(swiss_ephemeris.swe, "calc_ut", counting_calc_ut)
+    events = list(islice(iter_lunar_phase_events(datetime(2026, 6, 1, tzinfo=timezone.utc)), 12))
+
+    assert [e.time for e in events] == sorted(e.time for e in events)
+    # 12 cibles par cycle : 8 frontières (22.5° + 45°k) et 4 phases principales (90°k)
+    assert sum(e.kind == "principal_phase" for e in events) == 4
+    assert len({e.elongation for e in events}) == 12
+    # ~4 itérations Newton × 2 corps + longitude de la Lune par événement
+    assert len(calls) <= 12 * 12
+    # Un cycle complet = un mois synodique (~29.5 jours)
+    assert 26 < (events[-1].time - events[0].time).days < 30
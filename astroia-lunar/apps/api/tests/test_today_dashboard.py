@@ -0,0 +1,115 @@
+"""
+Tests pour GET /api/lunar/today (tableau de bord agrégé, ETag/304, Cache-Control)
+"""
+
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+from conftest import TestSessionLocal, override_get_db
+from database import get_db
+from main import app
+from routes.auth import get_current_user
+from routes.lunar import _seconds_until_next_change
+from services import daily_climate, moon_position, sky_snapshot_service, voc_cache_service
+from services.sky_snapshot_service import refresh_sky_snapshots
+from utils.http_cache import compute_etag, etag_matches
+
+LUNAR_RETURN = {"id": 1, "month": "2025-03", "moon_sign": "Leo", "end_date": None}
+
+
+@pytest.fixture
+async def dashboard_client(test_client):
+    async with TestSessionLocal() as session:
+        await refresh_sky_snapshots(session, days=2)
+
+    # D'autres tests vident dependency_overrides : réappliquer la DB de test
+    app.dependency_overrides[get_db] = override_get_db
+    app.dependency_overrides[get_current_user] = lambda: SimpleNamespace(id=1)
+    with patch('routes.lunar_returns.get_current_lunar_return', AsyncMock(return_value=LUNAR_RETURN)):
+        yield test_client
+
+    app.dependency_overrides.pop(get_current_user, None)
+    for service in (sky_snapshot_service, daily_climate, moon_position, voc_cache_service):
+        service.clear_cache()
+
+
+@pytest.mark.asyncio
+async def test_today_aggregates_parts_with_etag(dashboard_client):
+    response = await dashboard_client.get("/api/lunar/today")
+
+    assert response.status_code == 200
+    data = response.json()
+    assert data["degraded"] == []
+    assert data["lunar_return"] == LUNAR_RETURN
+    assert data["moon"]["sign"] and data["daily_climate"]["insight"]["title"]
+    assert data["mansion"]["mansion_id"] == data["mansion"]["data"]["mansion"]["number"]
+    assert datetime.fromisoformat(data["next_change_at"]) > datetime.now(timezone.utc)
+
+    stable = {**data, "moon": {k: v for k, v in data["moon"].items() if k != "degree"}}
+    assert response.headers["etag"] == "W/" + compute_etag(stable)
+    cache_control = response.headers["cache-control"]
+    assert cache_control.startswith("private, max-age=")
+    assert 0 < int(cache_control.rsplit("=", 1)[1]) <= 300
+    assert "expires" in response.headers
+
+
+@pytest.mark.asyncio
+async def test_today_returns_304_for_matching_etag(dashboard_client):
+    with patch('services.sky_snapshot_service.moon_position_at', return_value={"sign": "Leo", "degree": 130.0, "phase": "Pleine Lune"}):
+        first = await dashboard_client.get("/api/lunar/today")
+        second = await dashboard_client.get("/api/lunar/today", headers={"If-None-Match": first.headers["etag"]})
+
+    assert second.status_code == 304
+    assert second.content == b""
+    assert second.headers["etag"] == first.headers["etag"]
+
+
+@pytest.mark.asyncio
+async def test_today_returns_304_two_minutes_later_while_the_moon_advances(dashboard_client):
+    # ~0.55°/h : la Lune avance de ~0.02° en 2 minutes, sans changer de signe ni de phase
+    degree = [130.0]
+
+    def position(snapshot, at):
+        return {"sign": "Leo", "degree": degree[0], "phase": "Pleine Lune"}
+
+    with patch('services.sky_snapshot_service.moon_position_at', side_effect=position):
+        first = await dashboard_client.get("/api/lunar/today")
+        degree[0] = 130.02
+        later = await dashboard_client.get("/api/lunar/today", headers={"If-None-Match": first.headers["etag"]})
+
+    assert first.status_code == 200
+    assert later.status_code == 304
+    assert later.headers["etag"] == first.headers["etag"]
+
+
+@pytest.mark.asyncio
+async def test_failed_part_is_degraded_and_not_cached(dashboard_client):
+    with patch('services.voc_cache_service.get_voc_status_cached', AsyncMock(side_effect=RuntimeError("db down"))):
+        response = await dashboard_client.get("/api/lunar/today")
+
+    assert response.status_code == 200
+    assert response.json()["voc"] is None
+    assert response.json()["degraded"] == ["voc"]
+    assert response.headers["cache-control"] == "private, no-cache"
+
+
+def test_max_age_follows_next_sky_change():
+    now = datetime.now(timezone.utc)
+    payload = {
+        "next_change_at": (now + timedelta(seconds=90)).isoformat(),
+        "voc": {"now": None, "next": {"start_at": (now + timedelta(hours=3)).isoformat()}},
+        "lunar_return": None,
+    }
+
+    assert 85 <= _seconds_until_next_change(payload, now) <= 90
+
+
+def test_etag_matching_accepts_lists_and_weak_validators():
+    assert etag_matches('"abc", W/"def"', '"def"')
+    assert etag_matches('"def"', 'W/"def"')
+    assert etag_matches("*", '"abc"')
+    assert not etag_matches('"abc"', '"def"')
+    assert not etag_matches(None, '"abc"')
@@ -8,6 +8,7 @@ Tests pour le service de cache VoC (voc_cache_service.py)
 
 import pytest
 import pytest_asyncio
+from contextlib import asynccontextmanager
 from datetime import datetime, timedelta, timezone
 from unittest.mock import AsyncMock, patch, MagicMock
 from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession
@@ -27,6 +28,17 @@ def clear_voc_cache():
     voc_cache_service.clear_cache()
 
 
+@pytest.fixture(autouse=True)
+def flight_uses_test_session():
+    """Les calculs partagés ouvrent leur propre session : ici, celle passée par le test"""
+    @asynccontextmanager
+    async def given_session(db):
+        yield db
+
+    with patch.object(voc_cache_service, "detached_session", given_session):
+        yield
+
+
 @pytest_asyncio.fixture
 async def db_session():
     """
@@ -221,7 +233,7 @@ class TestVoCCacheService:
         await voc_cache_service.get_voc_status_cached(db_session)
 
         # Vérifier que le cache a des données
-        stats = voc_cache_service.get_cache_stats()
+        stats = await voc_cache_service.get_cache_stats()
         assert stats["voc_status"]["has_data"] is True
 
         # Act: sauvegarder une nouvelle fenêtre
@@ -232,13 +244,14 @@ class TestVoCCacheService:
         )
 
         # Assert: cache invalidé
-        stats_after = voc_cache_service.get_cache_stats()
+        stats_after = await voc_cache_service.get_cache_stats()
         assert stats_after["voc_status"]["has_data"] is False
 
-    def test_get_cache_stats(self):
+    @pytest.mark.asyncio
+    async def test_get_cache_stats(self):
         """Test: récupérer les stats de cache"""
         # Act
-        stats = voc_cache_service.get_cache_stats()
+        stats = await voc_cache_service.get_cache_stats()
 
         # Assert
         assert "voc_status" in stats
@@ -353,3 +366,26 @@ class TestVoCCachePerformance:
         # Assert: devrait être rapide grâce à la parallélisation
         assert elapsed < 1.0  # Moins de 1 seconde
         assert result is not None
+
+
+class TestVoCEphemerisPopulate:
+    """Tests du remplissage des fenêtres VoC depuis Swiss Ephemeris (sans RapidAPI)"""
+
+    @pytest.mark.asyncio
+    async def test_populate_voc_windows_from_ephemeris(self):
+        """Test: chaque fenêtre calculée est sauvegardée avec la source swiss_ephemeris"""
+        start = datetime(2026, 5, 1, tzinfo=timezone.utc)
+        db = MagicMock()
+
+        with patch.object(voc_cache_service, "save_voc_window_safe", new=AsyncMock()) as save_mock:
+            count = await voc_cache_service.populate_voc_windows_from_ephemeris(db, start_at=start, days=30)
+
+        assert count == save_mock.await_count
+        assert 10 <= count <= 15
+
+        first_call = save_mock.await_args_list[0].kwargs
+        assert first_call["db"] is db
+        assert first_call["start_at"] < first_call["end_at"]
+        assert first_call["source"]["provider"] == "swiss_ephemeris"
+        assert "from_sign" in first_call["source"]
+        assert "to_sign" in first_call["source"]
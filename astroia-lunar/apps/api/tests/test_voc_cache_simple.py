@@ -3,8 +3,10 @@ Tests simplifiés pour le service de cache VoC (voc_cache_service.py)
 Tests unitaires sans dépendance DB réelle
 """
 
+import asyncio
 import pytest
 import time
+from contextlib import asynccontextmanager
 from datetime import datetime, timedelta, timezone
 from unittest.mock import AsyncMock, MagicMock, patch
 
@@ -20,6 +22,17 @@ def clear_voc_cache():
     voc_cache_service.clear_cache()
 
 
+@pytest.fixture(autouse=True)
+def flight_uses_test_session():
+    """Les calculs partagés ouvrent leur propre session : ici, celle passée par le test"""
+    @asynccontextmanager
+    async def given_session(db):
+        yield db
+
+    with patch.object(voc_cache_service, "detached_session", given_session):
+        yield
+
+
 class TestVoCCacheLogic:
     """Tests de la logique de cache sans DB réelle"""
 
@@ -40,10 +53,11 @@ class TestVoCCacheLogic:
         assert voc_cache_service._VOC_CURRENT_CACHE["data"] is None
         assert voc_cache_service._VOC_CURRENT_CACHE["timestamp"] == 0
 
-    def test_get_cache_stats_empty(self):
+    @pytest.mark.asyncio
+    async def test_get_cache_stats_empty(self):
         """Test: stats de cache vide"""
         # Act
-        stats = voc_cache_service.get_cache_stats()
+        stats = await voc_cache_service.get_cache_stats()
 
         # Assert
         assert "voc_status" in stats
@@ -51,14 +65,15 @@ class TestVoCCacheLogic:
         assert stats["voc_status"]["has_data"] is False
         assert stats["voc_current"]["has_data"] is False
 
-    def test_get_cache_stats_with_data(self):
+    @pytest.mark.asyncio
+    async def test_get_cache_stats_with_data(self):
         """Test: stats de cache avec données"""
         # Setup: remplir le cache
         voc_cache_service._VOC_STATUS_CACHE["data"] = {"test": "data"}
         voc_cache_service._VOC_STATUS_CACHE["timestamp"] = time.time()
 
         # Act
-        stats = voc_cache_service.get_cache_stats()
+        stats = await voc_cache_service.get_cache_stats()
 
         # Assert
         assert stats["voc_status"]["has_data"] is True
@@ -158,6 +173,40 @@ class TestVoCCacheLogic:
         # Vérifier que le cache est rempli
         assert voc_cache_service._VOC_STATUS_CACHE["data"] == result
 
+    @pytest.mark.asyncio
+    async def test_cancelled_leader_does_not_break_coalesced_callers(self):
+        """Test: le calcul partagé n'utilise pas la session de la requête leader"""
+        request_db = AsyncMock()
+        request_db.execute = AsyncMock(side_effect=AssertionError("session de la requête utilisée"))
+
+        flight_db = AsyncMock()
+        mock_scalars = MagicMock()
+        mock_scalars.first = MagicMock(return_value=None)
+        mock_result = MagicMock()
+        mock_result.scalars = MagicMock(return_value=mock_scalars)
+
+        async def slow_execute(*args, **kwargs):
+            await asyncio.sleep(0.01)
+            return mock_result
+
+        flight_db.execute = AsyncMock(side_effect=slow_execute)
+
+        @asynccontextmanager
+        async def own_session(db):
+            yield flight_db
+
+        with patch.object(voc_cache_service, "detached_session", own_session):
+            leader = asyncio.create_task(voc_cache_service.get_current_voc_cached(request_db))
+            follower = asyncio.create_task(voc_cache_service.get_current_voc_cached(request_db))
+            await asyncio.sleep(0)
+            leader.cancel()  # ex: client déconnecté, session de get_db fermée
+
+            result = await follower
+
+        assert result["is_active"] is False
+        request_db.execute.assert_not_called()
+        flight_db.execute.assert_called_once()
+
     @pytest.mark.asyncio
     async def test_cache_ttl_expiration(self):
         """Test: cache expire après TTL"""
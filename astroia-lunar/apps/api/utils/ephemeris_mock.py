@@ -14,19 +14,9 @@ logger = logging.getLogger(__name__)
 try:
     from services.swiss_ephemeris import (
         find_lunar_return,
-        get_moon_position,
-        get_sun_position,
-        datetime_to_julian_day,
-        get_moon_longitude,
-        get_sun_longitude,
-        degree_to_sign,
-        calculate_houses,
-        get_ascendant,
-        get_planet_house,
-        get_all_planet_positions,
-        calculate_all_aspects,
         SWISS_EPHEMERIS_AVAILABLE as SWE_AVAILABLE
     )
+    from services.lunar_return_chart import compute_lunar_return_chart
     SWISS_EPHEMERIS_AVAILABLE = SWE_AVAILABLE
 except (ImportError, AttributeError):
     SWISS_EPHEMERIS_AVAILABLE = False
@@ -218,52 +208,23 @@ def generate_mock_lunar_return(
                 f"✅ Lunar Return calculé: {return_dt.isoformat()}"
             )
 
-        # Calculer les positions planétaires à ce moment
-        moon_pos = get_moon_position(return_dt)
-        sun_pos = get_sun_position(return_dt)
+        # Thème complet à l'instant exact (même moteur que la génération en production)
+        result = compute_lunar_return_chart(return_dt, birth_latitude, birth_longitude)
 
-        # Initialiser les variables avec valeurs par défaut
-        ascendant_degree = 10.5
-        all_planets = {}
-        all_aspects = []
-
-        # Calculer l'Ascendant RÉEL avec Swiss Ephemeris
-        asc_data = get_ascendant(return_dt, birth_latitude, birth_longitude)
-        if asc_data:
-            ascendant_sign = asc_data["sign"]
-            ascendant_degree = asc_data["degree"]
-            logger.info(f"✅ Ascendant calculé: {ascendant_sign} {ascendant_degree:.1f}°")
-        else:
-            # Fallback si échec
-            ascendant_sign_index = return_dt.hour % len(_ASCENDANT_SIGNS)
-            ascendant_sign = _ASCENDANT_SIGNS[ascendant_sign_index]
-            logger.warning(f"⚠️ Fallback Ascendant: {ascendant_sign}")
-
-        # Calculer les maisons RÉELLES avec Swiss Ephemeris
-        houses_data = calculate_houses(return_dt, birth_latitude, birth_longitude)
-        if houses_data:
-            # Calculer la maison de la Lune
-            moon_house = get_planet_house(moon_pos.longitude, houses_data.cusps)
-            logger.info(f"✅ Lune en Maison {moon_house}")
+        if "ascendant" not in result:
+            # Fallback si le calcul des maisons échoue
+            ascendant_sign = _ASCENDANT_SIGNS[return_dt.hour % len(_ASCENDANT_SIGNS)]
+            result["ascendant"] = {"sign": ascendant_sign, "degree": 10.5}
+            result["moon"]["house"] = (return_dt.hour % 12) + 1
+            logger.warning(f"⚠️ Fallback Ascendant: {ascendant_sign}, Maison Lune: {result['moon']['house']}")
         else:
-            moon_house = (return_dt.hour % 12) + 1
-            logger.warning(f"⚠️ Fallback Maison Lune: {moon_house}")
-
-        # Calculer TOUTES les positions planétaires
-        all_planets = get_all_planet_positions(return_dt)
-
-        # Ajouter les maisons aux planètes si on a les cusps
-        if houses_data:
-            for planet_name, planet_data in all_planets.items():
-                planet_data["house"] = get_planet_house(planet_data["longitude"], houses_data.cusps)
+            logger.info(
+                f"✅ Ascendant calculé: {result['ascendant']['sign']} {result['ascendant']['degree']:.1f}°, "
+                f"Lune en Maison {result['moon']['house']}, {len(result['aspects'])} aspects"
+            )
 
-        # Calculer les ASPECTS RÉELS
-        planet_longitudes = {name: data["longitude"] for name, data in all_planets.items()}
-        all_aspects = calculate_all_aspects(planet_longitudes, orb=8.0)
-        logger.info(f"✅ {len(all_aspects)} aspects calculés")
+        return result
 
-        return_datetime_str = return_dt.isoformat()
-        
     else:
         # Fallback: placeholder amélioré (approximation réaliste sans Swiss Ephemeris)
         logger.warning(
@@ -318,61 +279,27 @@ def generate_mock_lunar_return(
         
         # Maison de la Lune (1-12, variée)
         moon_house = (month_offset % 12) + 1
-        
-        moon_pos = None
-        sun_pos = None
     
-    # Construire la réponse avec données Swiss Ephemeris si disponibles
-    if SWISS_EPHEMERIS_AVAILABLE and moon_pos:
-        # Données complètes calculées (variables initialisées plus haut)
-        result = {
-            "return_datetime": return_datetime_str,
-            "ascendant": {
-                "sign": ascendant_sign,
-                "degree": ascendant_degree
-            },
-            "moon": {
-                "sign": moon_pos.sign,
-                "degree": moon_pos.degree,
-                "house": moon_house,
-                "longitude": moon_pos.longitude
-            },
-            "planets": all_planets if all_planets else {
-                "Moon": {"sign": moon_pos.sign, "degree": moon_pos.degree},
-                "Sun": {"sign": sun_pos.sign, "degree": sun_pos.degree} if sun_pos else {}
-            },
-            "houses": {},
-            "aspects": all_aspects
-        }
-
-        # Ajouter les cusps des maisons si disponibles
-        if houses_data:
-            for i, cusp in enumerate(houses_data.cusps):
-                result["houses"][str(i + 1)] = {
-                    "cusp": round(cusp, 2),
-                    "sign": degree_to_sign(cusp)
-                }
-    else:
-        # Fallback placeholder
-        result = {
-            "return_datetime": return_datetime_str,
-            "ascendant": {
-                "sign": ascendant_sign,
-                "degree": 10.5
-            },
-            "moon": {
-                "sign": natal_moon_sign,
-                "degree": natal_moon_degree,
-                "house": moon_house
-            },
-            "planets": {
-                "Moon": {"sign": natal_moon_sign, "degree": natal_moon_degree},
-            },
-            "houses": {
-                "1": {"sign": ascendant_sign, "degree": 10.5},
-            },
-            "aspects": []
-        }
+    # Fallback placeholder
+    result = {
+        "return_datetime": return_datetime_str,
+        "ascendant": {
+            "sign": ascendant_sign,
+            "degree": 10.5
+        },
+        "moon": {
+            "sign": natal_moon_sign,
+            "degree": natal_moon_degree,
+            "house": moon_house
+        },
+        "planets": {
+            "Moon": {"sign": natal_moon_sign, "degree": natal_moon_degree},
+        },
+        "houses": {
+            "1": {"sign": ascendant_sign, "degree": 10.5},
+        },
+        "aspects": []
+    }
 
     return result
 
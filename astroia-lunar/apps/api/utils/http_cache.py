@@ -0,0 +1,82 @@
+"""
+Helpers de cache HTTP (ETag / If-None-Match / Cache-Control)
+
+Pour les endpoints interrogés en boucle par le mobile : l'ETag est le hash
+du JSON canonique, une requête If-None-Match identique reçoit 304 sans corps.
+Si le corps contient des valeurs qui dérivent en continu (position extrapolée),
+l'ETag faible (W/) est calculé sur la partie stable seulement.
+"""
+
+import hashlib
+import json
+from datetime import datetime, timedelta, timezone
+from email.utils import format_datetime
+from typing import Any, Dict, Optional
+
+from fastapi import Request, Response
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+
+
+def compute_etag(content: Any) -> str:
+    """ETag fort : sha256 du JSON canonique (clés triées), tronqué à 32 caractères"""
+    canonical = json.dumps(content, sort_keys=True, separators=(",", ":"), ensure_ascii=False)
+    return '"' + hashlib.sha256(canonical.encode("utf-8")).hexdigest()[:32] + '"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """
+    Vrai si l'en-tête If-None-Match contient etag (comparaison faible, RFC 9110)
+
+    Accepte une liste séparée par des virgules, le préfixe W/ et "*".
+    """
+    if not if_none_match:
+        return False
+    etag = etag.removeprefix("W/")
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate == "*" or candidate.removeprefix("W/") == etag:
+            return True
+    return False
+
+
+def cache_headers(etag: str, max_age: int, private: bool = True, now: Optional[datetime] = None) -> Dict[str, str]:
+    """ETag + Cache-Control + Expires cohérents (Expires = maintenant + max_age)"""
+    now = now or datetime.now(timezone.utc)
+    max_age = max(0, int(max_age))
+    scope = "private" if private else "public"
+    return {
+        "ETag": etag,
+        "Cache-Control": f"{scope}, max-age={max_age}" if max_age else f"{scope}, no-cache",
+        "Expires": format_datetime(now + timedelta(seconds=max_age), usegmt=True),
+    }
+
+
+def cached_json_response(
+    request: Request,
+    content: Any,
+    max_age: int,
+    private: bool = True,
+    etag_content: Optional[Any] = None
+) -> Response:
+    """
+    JSONResponse avec ETag, ou 304 si le client a déjà cette version
+
+    Args:
+        request: Requête (lecture de If-None-Match)
+        content: Corps (encodé par jsonable_encoder)
+        max_age: Durée de fraîcheur côté client (secondes)
+        private: Cache-Control private (réponse propre à l'utilisateur)
+        etag_content: Partie stable du corps servant de validateur
+            (ETag faible W/) ; défaut : le corps entier (ETag fort)
+    """
+    encoded = jsonable_encoder(content)
+    if etag_content is None:
+        etag = compute_etag(encoded)
+    else:
+        etag = "W/" + compute_etag(jsonable_encoder(etag_content))
+    headers = cache_headers(etag, max_age, private=private)
+
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=304, headers=headers)
+    return JSONResponse(content=encoded, headers=headers)